@@ -13,10 +13,13 @@ import os
 from datetime import datetime, timedelta
 from pathlib import Path
 import hashlib
+import threading
+import time
 from io import BytesIO
 
 # Database module voor Supabase
 import database as db
+import planning_index as pidx  # Vooraf berekende opzoekstructuren voor de planning
 import ti_sync  # Koppeling met Teamindeling database
 
 # Geofiltering - alleen toegang vanuit Nederland
@@ -25,9 +28,150 @@ import ti_sync  # Koppeling met Teamindeling database
 db.check_geo_access()
 
 # Versie informatie
-APP_VERSIE = "1.38.0"
-APP_VERSIE_DATUM = "2026-03-06"
+APP_VERSIE = "1.38.25"
+APP_VERSIE_DATUM = "2026-10-16"
 APP_CHANGELOG = """
+### v1.38.25 (2026-10-16)
+**Index eerste inschrijving:**
+- Inschrijfmomenten voor de puntenberekening komen uit een bijgehouden tabel, alleen voor de posities die herberekend worden
+- Nieuwe inschrijvingen worden direct meegenomen
+
+### v1.38.24 (2026-10-16)
+**Achtergrondcontrole voor gespeelde wedstrijden:**
+- Ontbrekende punten, solo-markeringen en bevestigingsstatussen worden op de achtergrond aangevuld
+- Het bevestigen-scherm leest alleen en toont het rapport van de laatste controle
+
+### v1.38.23 (2026-10-16)
+**Gedeeld klassement:**
+- Punten- en begeleidersklassement worden één keer per datawijziging opgebouwd en door alle sessies gedeeld
+- Eigen positie in het klassement is een directe opzoeking
+
+### v1.38.22 (2026-10-16)
+**Beloningen via events, synchronisatie als controle:**
+- Terugdraaien van bevestigingen boekt events in plaats van de beloningen te herschrijven
+- Herberekening van punten boekt correcties voor al geboekte wedstrijden
+- Beloningen synchroniseren is nu een controle die afwijkingen rapporteert; corrigeren gaat via correctieboekingen
+
+### v1.38.21 (2026-10-16)
+**Snellere herberekening van wedstrijdpunten:**
+- Instellingen, pools en eigen wedstrijden worden één keer per herberekening bepaald
+- Nieuw: 'Bekijk wijzigingen' toont de puntverschillen zonder op te slaan
+- Alleen de puntenkolommen worden (parallel, met versiecheck) opgeslagen
+
+### v1.38.20 (2026-10-16)
+**Dagoverzicht in één keer berekend:**
+- Beschikbare teams en dag-indicator per speeldag komen uit één batchberekening voor de hele kalender
+- Pools per dag worden niet meer per wedstrijd opnieuw opgevraagd
+
+### v1.38.19 (2026-10-16)
+**Open wedstrijden per speler vooraf berekend:**
+- Per scheidsrechter een gesorteerde lijst van open wedstrijden als 1e en 2e scheids
+- Bij in- of uitschrijven wordt alleen die wedstrijd opnieuw beoordeeld
+- Fix: get_beschikbare_wedstrijden gebruikte een niet-bestaande variabele (max_niveau) en laadde onnodig het oude inschrijvingenbestand
+
+### v1.38.18 (2026-10-16)
+**Rekencache voor kandidaten, beschikbare wedstrijden en pools:**
+- Resultaten worden per sessie bewaard tot de volgende schrijfactie (data-generatie)
+- Alle schrijffuncties in database.py verhogen de data-generatie
+- Treffers/missers zichtbaar onder Instellingen → Over
+
+### v1.38.17 (2026-10-16)
+**Werklast-tellers per scheidsrechter:**
+- Aantal wedstrijden (totaal, op niveau, per niveau, als 1e/2e) wordt bijgehouden bij elke toewijzing i.p.v. per speler het hele seizoen door te lopen
+- Kandidatenlijst, klassement en scheidsrechtersoverzicht lezen uit deze tellers
+
+### v1.38.16 (2026-10-16)
+**Beschikbaarheidskalender per scheidsrechter:**
+- Blokkades, blessure en zondag worden één keer per scheidsrechter voorbewerkt (dag-bitmap) i.p.v. per wedstrijd opnieuw geparsed
+- Kalender wordt direct bijgewerkt als een speler of de TC dagen blokkeert
+
+### v1.38.15 (2026-10-16)
+**Wedstrijddatum één keer parsen:**
+- Loaders leveren wedstrijden als WedstrijdRecord (dict) met vooraf geparste datum, epoch-minuten, datum-key en weekdag
+- Datumparsing in pool-, kandidaten-, capaciteits- en weergavefuncties gebruikt het record i.p.v. strptime
+
+### v1.38.14 (2026-10-16)
+**Toewijzingsindex voor overlap-checks:**
+- Check op overlappende fluitwedstrijden zoekt alleen in de eigen toewijzingen (binary search) i.p.v. alle wedstrijden
+- Index wordt direct bijgewerkt bij inschrijven, afmelden en TC toewijzing
+
+### v1.38.13 (2026-10-16)
+**Pool-berekening voor alle wedstrijden tegelijk:**
+- Poolgroottes worden in één keer berekend (scheidsrechter x wedstrijd matrix met NumPy) en hergebruikt tot de data wijzigt
+- Pool-badges, dagindicator en pool bonus gebruiken dezelfde berekening
+
+### v1.38.12 (2026-10-16)
+**Teamherkenning via voorberekende index:**
+- Eigen-team-check in pool, kandidaten, beschikbare wedstrijden en dagindicator gebruikt een genormaliseerde team-index i.p.v. herhaalde string-matching
+
+### v1.38.11 (2026-10-16)
+**Snellere eigen-wedstrijd check:**
+- Nieuwe planning_index module: per eigen team de gesorteerde blokkadevensters (thuis / uit incl. reistijd)
+- heeft_eigen_wedstrijd is nu een binary search i.p.v. een scan over alle wedstrijden
+- Index wordt herbouwd na elke schrijfactie (data-generatie in database.py)
+
+### v1.38.10 (2026-10-16)
+**Registratie log analyse in de database:**
+- Inschrijfstatistieken, tijdlijn en eerste inschrijfmomenten worden in de database geaggregeerd (views), met lokale terugval
+- Registratie logs worden per pagina opgehaald (keyset paginatie) i.p.v. de hele tabel in één keer
+
+### v1.38.9 (2026-10-16)
+**Beloningen als ledger:**
+- Punten en strikes worden per gebeurtenis opgeslagen (beloning_events) met een totaal per speler (beloning_totalen)
+- Gelijktijdig bevestigen door twee TC-leden overschrijft elkaars punten niet meer
+- Dubbele bevestiging van dezelfde wedstrijd wordt in de database tegengehouden
+- Bestaande beloningen worden bij de eerste keer laden automatisch overgezet
+
+### v1.38.8 (2026-10-16)
+**Sneller laden van pagina's:**
+- Tabellen voor speler- en beheerderpagina worden parallel opgehaald (ongeveer één round-trip bij een koude start)
+- Nieuwe prefetch_pagina_data() in database.py met getypeerde DataBundel
+
+### v1.38.7 (2026-10-16)
+**Optionele lokale replica:**
+- 💾 Optionele SQLite kopie van wedstrijden, scheidsrechters, beloningen en instellingen (LOKALE_REPLICA_PAD)
+- 🛟 Bij storing van Supabase: laatst bekende data in alleen-lezen modus met melding
+- ⚡ Koude start vanuit de replica, daarna alleen de wijzigingen ophalen
+
+### v1.38.6 (2026-10-16)
+**Audit logging op de achtergrond:**
+- ⚡ Registratie- en beschikbaarheidslogs worden gebundeld op de achtergrond weggeschreven
+- 🔁 Bij storing: opnieuw proberen met oplopende wachttijd
+- 💾 Bij afsluiten of aanhoudende storing: logs lokaal bewaard en bij herstart alsnog verstuurd
+- 🌐 IP-bepaling voor beschikbaarheidslog zonder externe landopzoeking
+
+### v1.38.5 (2026-10-16)
+**Snellere bulk import:**
+- ⚡ Import van scheidsrechters en wedstrijden in batches i.p.v. per rij
+- 🔁 Mislukte batch: opnieuw proberen, daarna foute rijen isoleren via halvering
+- 📋 Optioneel rapport per rij (ok/fout met melding)
+
+### v1.38.4 (2026-10-16)
+**Gerichte opslag per wedstrijd:**
+- ⚡ Bij opslaan van één wedstrijd worden alleen gewijzigde kolommen verstuurd
+- 🛡️ Versiecheck op updated_at: gelijktijdige wijzigingen van anderen worden samengevoegd
+- ⚠️ Bij een conflict op hetzelfde veld wordt niet overschreven maar een waarschuwing getoond
+
+### v1.38.3 (2026-10-16)
+**Lichtere planning view voor spelers:**
+- ⚡ Speler view laadt wedstrijden zonder puntendetails en heraanmeldingen
+- 🔍 Detailkolommen per wedstrijd op te halen via laad_wedstrijd_details()
+- 🛡️ Opslaan vanuit de planning view laat bestaande puntendetails ongemoeid
+
+### v1.38.2 (2026-10-16)
+**Incrementele verversing wedstrijden:**
+- ⚡ Na schrijfacties worden alleen gewijzigde wedstrijden opgehaald (updated_at watermark)
+- 🗑️ Verwijderde wedstrijden worden gedetecteerd via de lichte wed_id lijst
+- 🛡️ Elke 30 minuten een volledige herlaad als controle
+- 🕐 Directe updates (solo-correctie, NBB-nummers, begeleiders reset) zetten nu updated_at
+
+### v1.38.1 (2026-10-16)
+**Gedeelde data-cache voor alle sessies:**
+- ⚡ Wedstrijden en scheidsrechters worden één keer per server geladen i.p.v. per sessie
+- 🔄 Schrijfacties werken de gedeelde cache direct bij (write-through)
+- 🛡️ Sessies krijgen een eigen kopie; vangnet: gedeelde cache verloopt na 5 minuten
+- 🔄 'Ververs data' leegt nu ook de gedeelde cache
+
 ### v1.38.0 (2026-03-06)
 **Bidirectionele sync CP ↔ BOB:**
 - 🔄 Per wedstrijd kiezen: "CP is leidend", "BOB is leidend" of "Overslaan"
@@ -1492,6 +1636,10 @@ def laad_scheidsrechters() -> dict:
 def laad_wedstrijden() -> dict:
     return db.laad_wedstrijden()
 
+def laad_wedstrijden_planning() -> dict:
+    """Wedstrijden zonder detailkolommen (punten_details, heraanmeldingen)"""
+    return db.laad_wedstrijden_planning()
+
 def laad_inschrijvingen() -> dict:
     # Inschrijvingen zitten nu in wedstrijden (scheids_1, scheids_2)
     return {}
@@ -1505,13 +1653,23 @@ def sla_scheidsrechters_op(data: dict):
 def sla_scheidsrechter_op(nbb_nummer: str, data: dict):
     """Sla één scheidsrechter op (sneller dan bulk)"""
     db.sla_scheidsrechter_op(nbb_nummer, data)
+    # Geblokkeerde dagen / blessure / zondag kunnen gewijzigd zijn
+    werk_beschikbaarheid_bij(nbb_nummer)
 
 def sla_wedstrijden_op(data: dict):
     db.sla_wedstrijden_op(data)
 
-def sla_wedstrijd_op(wed_id: str, data: dict):
-    """Sla één wedstrijd op (sneller dan bulk)"""
-    db.sla_wedstrijd_op(wed_id, data)
+def sla_wedstrijd_op(wed_id: str, data: dict) -> bool:
+    """
+    Sla één wedstrijd op (sneller dan bulk).
+    
+    Returns:
+        False als niet opgeslagen (bv. versieconflict; de cache bevat dan de actuele rij)
+    """
+    opgeslagen = db.sla_wedstrijd_op(wed_id, data)
+    # Posities kunnen gewijzigd zijn (inschrijven, afmelden, TC toewijzing, conflict)
+    werk_toewijzing_bij(wed_id)
+    return opgeslagen
 
 def sla_inschrijvingen_op(data: dict):
     # Niet meer nodig - inschrijvingen zitten in wedstrijden
@@ -1665,7 +1823,7 @@ def bepaal_beschikbare_teams(wed_datum_str: str, alle_wedstrijden: dict,
         uitteam = wed.get("uitteam", "")
         
         try:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
         except (ValueError, TypeError, KeyError):
             continue
         
@@ -1827,7 +1985,7 @@ def toon_tafel_officials():
         if not (team_match(thuisteam, "MSE-1") or team_match(thuisteam, "M20-1")):
             continue
         try:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
         except (ValueError, TypeError):
             continue
         tafel_wedstrijden.append({
@@ -2150,7 +2308,7 @@ def toon_tafel_teammanager_view():
         if not wed:
             continue
         try:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
         except (ValueError, TypeError):
             continue
         if wed_datum < datetime.now() - timedelta(hours=2):
@@ -2176,7 +2334,7 @@ def toon_tafel_teammanager_view():
                                    key=lambda x: wedstrijden.get(x[0], {}).get("datum", "")):
         wed = wedstrijden.get(wed_id, {})
         try:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
             if wed_datum < datetime.now() - timedelta(hours=2):
                 continue
         except:
@@ -2196,10 +2354,17 @@ def toon_tafel_teammanager_view():
 # BELONINGSSYSTEEM FUNCTIES
 # ============================================================
 
-def get_speler_stats(nbb_nummer: str) -> dict:
-    """Haal punten en strikes op voor een speler."""
-    beloningen = laad_beloningen()
-    speler_data = beloningen.get("spelers", {}).get(nbb_nummer, {})
+def get_speler_stats(nbb_nummer: str, historie: bool = True) -> dict:
+    """
+    Haal punten en strikes op voor een speler.
+    
+    Met historie=False zonder logregels uit de ledger (alleen de standen), voor
+    lussen over alle spelers.
+    """
+    if historie:
+        speler_data = db.laad_speler_historie(nbb_nummer)
+    else:
+        speler_data = laad_beloningen().get("spelers", {}).get(nbb_nummer, {})
     return {
         "punten": speler_data.get("punten", 0),
         "strikes": speler_data.get("strikes", 0),
@@ -2224,29 +2389,62 @@ def get_top_scheidsrechters(n: int = 3) -> list:
     punten_lijst.sort(key=lambda x: x["punten"], reverse=True)
     return punten_lijst[:n]
 
-def get_punten_klassement_met_positie(eigen_nbb: str) -> dict:
+@st.cache_resource
+def _get_klassementen() -> dict:
+    """Proces-brede klassementen, gedeeld door alle sessies (cached)"""
+    return {"lock": threading.Lock(), "items": {}}
+
+def get_klassement(soort: str, sleutel: tuple, bouw) -> pidx.Klassement:
     """
-    Haal punten klassement op met top 3 en eigen positie.
+    Haal een klassement op dat door alle sessies gedeeld wordt.
     
-    Alle spelers staan in het klassement, maar spelers die hun minimum op eigen
-    niveau nog niet hebben gehaald krijgen een indicator met het aantal nog
-    te fluiten wedstrijden.
+    Het klassement wordt opnieuw opgebouwd (met bouw()) zodra de sleutel anders
+    is; de aanroeper neemt daarin de generatie op waar het klassement van afhangt.
+    bouw() laadt zelf verse, proces-brede data (niet de sessie-cache van wie er
+    als eerste om vraagt), want het resultaat wordt aan iedereen getoond.
     
-    Returns: {"top3": [...], "eigen": {"positie": N, "naam": ..., "punten": ..., "nog_nodig": int} of None}
+    Er bouwt één sessie tegelijk; de andere sessies tonen zolang het vorige
+    klassement (alleen zonder vorig klassement wachten ze). Daarna zijn top 3
+    en eigen positie opzoekingen.
     """
-    beloningen = laad_beloningen()
-    scheidsrechters = laad_scheidsrechters()
+    klassementen = _get_klassementen()
+    item = klassementen["items"].get(soort)
+    if item is not None and item[0] == sleutel:
+        return item[1]
+    
+    if not klassementen["lock"].acquire(blocking=item is None):
+        return item[1]
+    try:
+        # Andere sessie kan het klassement inmiddels gebouwd hebben
+        item = klassementen["items"].get(soort)
+        if item is None or item[0] != sleutel:
+            item = (sleutel, bouw())
+            klassementen["items"][soort] = item
+        return item[1]
+    finally:
+        klassementen["lock"].release()
+
+def _bouw_punten_klassement() -> pidx.Klassement:
+    """
+    Bouw het punten klassement, met per speler het aantal nog te fluiten wedstrijden.
+    Punten komen direct uit de database, wedstrijden en scheidsrechters uit de
+    gedeelde snapshots (zie get_klassement).
+    """
+    punten_per_speler = db.laad_punten_vers()
+    scheidsrechters = db.laad_scheidsrechters_gedeeld()
+    wedstrijden, _ = db.laad_wedstrijden_gedeeld()
+    index = pidx.ToewijzingIndex(wedstrijden)
     
     punten_lijst = []
     
-    for nbb, data in beloningen.get("spelers", {}).items():
-        punten = data.get("punten", 0)
+    for nbb, punten in punten_per_speler.items():
         if nbb in scheidsrechters:
-            naam = scheidsrechters[nbb].get("naam", "Onbekend")
+            scheids = scheidsrechters[nbb]
+            naam = scheids.get("naam", "Onbekend")
             
-            # Check of minimum op eigen niveau is gehaald
-            niveau_stats = tel_wedstrijden_op_eigen_niveau(nbb)
-            nog_nodig = max(0, niveau_stats["min_wedstrijden"] - niveau_stats["op_niveau"])
+            # Check of minimum op eigen niveau is gehaald (zelfde telling als tel_wedstrijden_op_eigen_niveau)
+            op_niveau = index.aantal_op_niveau(nbb, scheids.get("niveau_1e_scheids", 1))
+            nog_nodig = max(0, scheids.get("min_wedstrijden", 0) - op_niveau)
             
             punten_lijst.append({
                 "nbb": nbb, 
@@ -2255,31 +2453,41 @@ def get_punten_klassement_met_positie(eigen_nbb: str) -> dict:
                 "nog_nodig": nog_nodig  # 0 = gekwalificeerd, >0 = nog X wedstrijden nodig
             })
     
-    # Sorteer op punten (hoogste eerst), dan op naam
-    punten_lijst.sort(key=lambda x: (-x["punten"], x["naam"]))
+    # Gesorteerd op punten (hoogste eerst), dan op naam
+    return pidx.Klassement(punten_lijst, "punten")
+
+def get_punten_klassement_met_positie(eigen_nbb: str) -> dict:
+    """
+    Haal punten klassement op met top 3 en eigen positie.
+    
+    Alle spelers staan in het klassement, maar spelers die hun minimum op eigen
+    niveau nog niet hebben gehaald krijgen een indicator met het aantal nog
+    te fluiten wedstrijden.
+    
+    Het klassement zelf wordt gedeeld door alle sessies (zie get_klassement).
+    
+    Returns: {"top3": [...], "eigen": {"positie": N, "naam": ..., "punten": ..., "nog_nodig": int} of None}
+    """
+    beloningen = laad_beloningen()
+    scheidsrechters = laad_scheidsrechters()
+    
+    klassement = get_klassement(
+        "punten", (db.klassement_generatie(), beloningen.get("seizoen")), _bouw_punten_klassement
+    )
     
     # Top 3
-    top3 = punten_lijst[:3]
-    
-    # Eigen positie zoeken
-    eigen = None
-    for i, speler in enumerate(punten_lijst):
-        if speler["nbb"] == eigen_nbb:
-            eigen = {
-                "positie": i + 1,
-                **speler
-            }
-            break
+    top3 = klassement.top(3)
+    
+    # Eigen positie
+    eigen = klassement.eigen(eigen_nbb)
     
     # Als eigen niet in lijst staat (0 punten), voeg toe
     if eigen is None and eigen_nbb in scheidsrechters:
         niveau_stats = tel_wedstrijden_op_eigen_niveau(eigen_nbb)
         nog_nodig = max(0, niveau_stats["min_wedstrijden"] - niveau_stats["op_niveau"])
         eigen_punten = beloningen.get("spelers", {}).get(eigen_nbb, {}).get("punten", 0)
-        # Tel hoeveel spelers meer punten hebben
-        positie = sum(1 for s in punten_lijst if s["punten"] > eigen_punten) + 1
         eigen = {
-            "positie": positie,
+            "positie": klassement.positie_voor_score(eigen_punten),
             "nbb": eigen_nbb,
             "naam": scheidsrechters[eigen_nbb].get("naam", "Onbekend"),
             "punten": eigen_punten,
@@ -2376,13 +2584,13 @@ def get_top_begeleiders(n: int = 3) -> list:
     begeleiders_lijst.sort(key=lambda x: x["begeleidingen"], reverse=True)
     return begeleiders_lijst[:n]
 
-def get_begeleiders_klassement_met_positie(eigen_nbb: str) -> dict:
+def _bouw_begeleiders_klassement() -> pidx.Klassement:
     """
-    Haal begeleiders klassement op met top 3 en eigen positie.
-    Returns: {"top3": [...], "eigen": {"positie": N, "naam": ..., "begeleidingen": ...} of None}
+    Bouw het begeleiders klassement (gespeelde wedstrijden met positieve feedback),
+    uit de gedeelde snapshots (zie get_klassement).
     """
-    scheidsrechters = laad_scheidsrechters()
-    wedstrijden = laad_wedstrijden()
+    scheidsrechters = db.laad_scheidsrechters_gedeeld()
+    wedstrijden, _ = db.laad_wedstrijden_gedeeld()
     feedback_data = laad_begeleiding_feedback()
     
     # Tel begeleidingen per MSE (zelfde logica als get_top_begeleiders)
@@ -2451,142 +2659,75 @@ def get_begeleiders_klassement_met_positie(eigen_nbb: str) -> dict:
                 begeleiding_count[scheids_1_nbb] = 0
             begeleiding_count[scheids_1_nbb] += 1
     
-    # Maak lijst en sorteer
+    # Maak lijst; gesorteerd op begeleidingen (hoogste eerst), dan op naam
     begeleiders_lijst = []
     for nbb, count in begeleiding_count.items():
         naam = scheidsrechters.get(nbb, {}).get("naam", "Onbekend")
         begeleiders_lijst.append({"nbb": nbb, "naam": naam, "begeleidingen": count})
     
-    # Sorteer op begeleidingen (hoogste eerst), dan op naam
-    begeleiders_lijst.sort(key=lambda x: (-x["begeleidingen"], x["naam"]))
+    return pidx.Klassement(begeleiders_lijst, "begeleidingen")
+
+def get_begeleiders_klassement_met_positie(eigen_nbb: str) -> dict:
+    """
+    Haal begeleiders klassement op met top 3 en eigen positie.
+    
+    Het klassement wordt gedeeld door alle sessies (zie get_klassement) en per
+    uur ververst, omdat wedstrijden dan naar het verleden schuiven; feedback
+    opslaan is een schrijfactie en ververst het direct.
+    
+    Returns: {"top3": [...], "eigen": {"positie": N, "naam": ..., "begeleidingen": ...} of None}
+    """
+    scheidsrechters = laad_scheidsrechters()
+    
+    klassement = get_klassement(
+        "begeleiders", (db.data_generatie(), datetime.now().strftime("%Y-%m-%d %H")), _bouw_begeleiders_klassement
+    )
     
     # Top 3
-    top3 = begeleiders_lijst[:3]
-    
-    # Eigen positie zoeken
-    eigen = None
-    for i, begeleider in enumerate(begeleiders_lijst):
-        if begeleider["nbb"] == eigen_nbb:
-            eigen = {
-                "positie": i + 1,
-                "nbb": begeleider["nbb"],
-                "naam": begeleider["naam"],
-                "begeleidingen": begeleider["begeleidingen"]
-            }
-            break
+    top3 = klassement.top(3)
+    
+    # Eigen positie
+    eigen = klassement.eigen(eigen_nbb)
     
     # Als eigen niet in lijst staat (0 begeleidingen)
     if eigen is None and eigen_nbb in scheidsrechters:
-        eigen_count = begeleiding_count.get(eigen_nbb, 0)
-        # Tel hoeveel begeleiders meer begeleidingen hebben
-        positie = sum(1 for b in begeleiders_lijst if b["begeleidingen"] > eigen_count) + 1
         eigen = {
-            "positie": positie,
+            "positie": klassement.positie_voor_score(0),
             "nbb": eigen_nbb,
             "naam": scheidsrechters[eigen_nbb].get("naam", "Onbekend"),
-            "begeleidingen": eigen_count
+            "begeleidingen": 0
         }
     
     return {"top3": top3, "eigen": eigen}
 
 def voeg_punten_toe(nbb_nummer: str, punten: int, reden: str, wed_id: str = None, berekening: dict = None):
     """Voeg punten toe aan een speler met volledige berekening voor transparantie."""
-    beloningen = laad_beloningen()
-    if nbb_nummer not in beloningen["spelers"]:
-        beloningen["spelers"][nbb_nummer] = {"punten": 0, "strikes": 0, "gefloten_wedstrijden": [], "strike_log": []}
-    
     if wed_id:
-        # Voorkom dubbele bevestiging: check of wed_id al bestaat
-        bestaande_wedstrijden = beloningen["spelers"][nbb_nummer].get("gefloten_wedstrijden", [])
-        al_geregistreerd = any(w.get("wed_id") == wed_id for w in bestaande_wedstrijden)
-        if al_geregistreerd:
-            # Wedstrijd al bevestigd — sla op zonder punten toe te voegen
-            print(f"[voeg_punten_toe] Dubbele bevestiging voorkomen: {nbb_nummer} - {wed_id}")
-            return
-        
-        registratie = {
-            "wed_id": wed_id,
-            "punten": punten,
-            "reden": reden,
-            "geregistreerd_op": datetime.now().isoformat()
-        }
-        if berekening:
-            registratie["berekening"] = berekening
-        beloningen["spelers"][nbb_nummer]["gefloten_wedstrijden"].append(registratie)
-    
-    beloningen["spelers"][nbb_nummer]["punten"] += punten
-    sla_beloningen_op(beloningen)
+        # Dubbele bevestiging van dezelfde wedstrijd wordt in de database tegengehouden
+        db.boek_beloning_event(
+            nbb_nummer, "wedstrijd", punten=punten, reden=reden, wed_id=wed_id,
+            details={"berekening": berekening} if berekening else None
+        )
+    else:
+        db.boek_beloning_event(nbb_nummer, "punten", punten=punten, reden=reden)
 
 def voeg_strike_toe(nbb_nummer: str, strikes: int, reden: str):
     """Voeg strikes toe aan een speler."""
-    beloningen = laad_beloningen()
-    if nbb_nummer not in beloningen["spelers"]:
-        beloningen["spelers"][nbb_nummer] = {"punten": 0, "strikes": 0, "gefloten_wedstrijden": [], "strike_log": []}
-    
-    oude_strikes = beloningen["spelers"][nbb_nummer].get("strikes", 0)
-    beloningen["spelers"][nbb_nummer]["strikes"] = oude_strikes + strikes
-    nieuwe_strikes = beloningen["spelers"][nbb_nummer]["strikes"]
-    
-    beloningen["spelers"][nbb_nummer]["strike_log"].append({
-        "strikes": strikes,
-        "oude_stand": oude_strikes,
-        "nieuwe_stand": nieuwe_strikes,
-        "reden": reden,
-        "datum": datetime.now().isoformat()
-    })
-    sla_beloningen_op(beloningen)
+    db.boek_beloning_event(nbb_nummer, "strike", strikes=strikes, reden=reden)
 
 def verwijder_strike(nbb_nummer: str, strikes: int, reden: str):
     """Verwijder strikes van een speler (door klusje of extra wedstrijd)."""
-    beloningen = laad_beloningen()
-    if nbb_nummer not in beloningen["spelers"]:
-        beloningen["spelers"][nbb_nummer] = {"punten": 0, "strikes": 0, "gefloten_wedstrijden": [], "strike_log": [], "punten_log": []}
-    
-    oude_strikes = beloningen["spelers"][nbb_nummer].get("strikes", 0)
-    beloningen["spelers"][nbb_nummer]["strikes"] = max(0, oude_strikes - strikes)
-    nieuwe_strikes = beloningen["spelers"][nbb_nummer]["strikes"]
-    
-    # Zorg dat strike_log bestaat
-    if "strike_log" not in beloningen["spelers"][nbb_nummer]:
-        beloningen["spelers"][nbb_nummer]["strike_log"] = []
-    
-    beloningen["spelers"][nbb_nummer]["strike_log"].append({
-        "strikes": -strikes,
-        "oude_stand": oude_strikes,
-        "nieuwe_stand": nieuwe_strikes,
-        "reden": reden,
-        "datum": datetime.now().isoformat()
-    })
-    sla_beloningen_op(beloningen)
+    db.boek_beloning_event(nbb_nummer, "strike", strikes=-strikes, reden=reden)
 
 def pas_punten_aan(nbb_nummer: str, punten: int, reden: str):
     """
     Pas punten aan voor een speler (positief = bijboeken, negatief = afboeken).
     Wordt gelogd in punten_log voor transparantie.
     """
-    beloningen = laad_beloningen()
-    if nbb_nummer not in beloningen["spelers"]:
-        beloningen["spelers"][nbb_nummer] = {"punten": 0, "strikes": 0, "gefloten_wedstrijden": [], "strike_log": [], "punten_log": []}
-    
-    # Zorg dat punten_log bestaat (voor bestaande spelers)
-    if "punten_log" not in beloningen["spelers"][nbb_nummer]:
-        beloningen["spelers"][nbb_nummer]["punten_log"] = []
-    
-    oude_punten = beloningen["spelers"][nbb_nummer]["punten"]
-    beloningen["spelers"][nbb_nummer]["punten"] = max(0, oude_punten + punten)  # Niet onder 0
-    nieuwe_punten = beloningen["spelers"][nbb_nummer]["punten"]
-    
-    beloningen["spelers"][nbb_nummer]["punten_log"].append({
-        "punten": punten,
-        "oude_stand": oude_punten,
-        "nieuwe_stand": nieuwe_punten,
-        "reden": reden,
-        "datum": datetime.now().isoformat(),
-        "handmatig": True
-    })
-    sla_beloningen_op(beloningen)
+    db.boek_beloning_event(nbb_nummer, "punten", punten=punten, reden=reden, details={"handmatig": True})
 
-def is_lastig_tijdstip(nbb_nummer: str, wed_datum: datetime, wedstrijden: dict, scheidsrechters: dict, wed_id: str = None) -> bool:
+def is_lastig_tijdstip(nbb_nummer: str, wed_datum: datetime, wedstrijden: dict, scheidsrechters: dict, wed_id: str = None,
+                       index: pidx.PlanningIndex = None) -> bool:
     """
     Check of dit een 'extra inspanning' is voor de speler (apart komen/blijven).
     
@@ -2603,6 +2744,9 @@ def is_lastig_tijdstip(nbb_nummer: str, wed_datum: datetime, wedstrijden: dict,
     
     Let op: coaches worden hier NORMAAL beoordeeld (op basis van eigen wedstrijden).
     De coach-bonus is een APARTE bonus in bereken_punten_voor_wedstrijd().
+    
+    Met index (planning index van dezelfde wedstrijden/scheidsrechters) worden de
+    eigen wedstrijden van die dag opgezocht i.p.v. alle wedstrijden te doorlopen.
     """
     scheids = scheidsrechters.get(nbb_nummer, {})
     eigen_teams = scheids.get("eigen_teams", [])
@@ -2618,26 +2762,32 @@ def is_lastig_tijdstip(nbb_nummer: str, wed_datum: datetime, wedstrijden: dict,
     
     wed_dag = wed_datum.date()
     
-    eigen_wedstrijden_vandaag = []
-    for w_id, wed in wedstrijden.items():
-        # Check of dit een eigen wedstrijd is
-        is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams)
-        is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams)
-        
-        is_eigen_wed = False
-        if wed.get("type") == "uit" and is_eigen_thuis:
-            is_eigen_wed = True
-        elif wed.get("type") != "uit" and (is_eigen_thuis or is_eigen_uit):
-            is_eigen_wed = True
-        
-        if is_eigen_wed:
-            eigen_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
-            if eigen_datum.date() == wed_dag:
-                eigen_wedstrijden_vandaag.append({
-                    "datum": eigen_datum,
-                    "type": wed.get("type", "thuis"),
-                    "thuis": wed.get("type") != "uit"
-                })
+    if index is not None:
+        eigen_wedstrijden_vandaag = [
+            {"datum": datum, "thuis": is_thuis}
+            for datum, is_thuis in index.eigen_wedstrijden_op_dag(nbb_nummer, wed_dag)
+        ]
+    else:
+        eigen_wedstrijden_vandaag = []
+        for w_id, wed in wedstrijden.items():
+            # Check of dit een eigen wedstrijd is
+            is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams)
+            is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams)
+            
+            is_eigen_wed = False
+            if wed.get("type") == "uit" and is_eigen_thuis:
+                is_eigen_wed = True
+            elif wed.get("type") != "uit" and (is_eigen_thuis or is_eigen_uit):
+                is_eigen_wed = True
+            
+            if is_eigen_wed:
+                eigen_datum = pidx.wed_datum(wed)
+                if eigen_datum.date() == wed_dag:
+                    eigen_wedstrijden_vandaag.append({
+                        "datum": eigen_datum,
+                        "type": wed.get("type", "thuis"),
+                        "thuis": wed.get("type") != "uit"
+                    })
     
     # Geen eigen wedstrijd op deze dag = extra (moet apart komen)
     if not eigen_wedstrijden_vandaag:
@@ -2658,44 +2808,65 @@ def is_lastig_tijdstip(nbb_nummer: str, wed_datum: datetime, wedstrijden: dict,
     
     return False
 
-def zoek_inschrijf_moment(nbb_nummer: str, wed_id: str) -> datetime:
+def _inschrijf_momenten() -> dict:
     """
-    Zoek het werkelijke inschrijfmoment op uit registratie_log.
-    Gebruikt een session_state cache om herhaalde database calls te voorkomen.
+    Sessie-cache {(nbb, wed_id): datetime of None} met opgezochte inschrijfmomenten.
     
-    Returns: datetime van eerste inschrijving, of None als niet gevonden.
+    Een gevonden eerste inschrijving verandert niet meer; combinaties zonder
+    inschrijving worden na een schrijfactie (data-generatie) opnieuw opgezocht.
     """
     cache_key = "_registratie_log_cache"
+    generatie = db.data_generatie()
+    cache = st.session_state.get(cache_key)
+    if cache is None:
+        cache = {"generatie": generatie, "momenten": {}}
+        st.session_state[cache_key] = cache
+    elif cache["generatie"] != generatie:
+        cache["momenten"] = {slot: moment for slot, moment in cache["momenten"].items() if moment is not None}
+        cache["generatie"] = generatie
+    return cache["momenten"]
+
+def laad_inschrijf_momenten(slots, momenten: dict = None) -> None:
+    """
+    Zoek de inschrijfmomenten van deze (nbb, wed_id) combinaties in één keer op
+    (alleen wat nog niet in de sessie-cache staat). Roep aan vóór een batch
+    zoek_inschrijf_moment aanroepen.
     
-    # Bouw cache als die er nog niet is
-    if cache_key not in st.session_state:
-        try:
-            alle_logs = db.laad_registratie_logs()
-            # Bouw lookup: (nbb, wed_id) -> oudste inschrijf-tijdstip
-            lookup = {}
-            for log in alle_logs:
-                if log.get("actie") != "inschrijven":
-                    continue
-                key = (log.get("nbb_nummer", ""), log.get("wed_id", ""))
-                tijdstip = log.get("tijdstip", "")
-                if not tijdstip:
-                    continue
-                try:
-                    dt = datetime.fromisoformat(tijdstip.replace("Z", "+00:00"))
-                    if dt.tzinfo is not None:
-                        dt = dt.replace(tzinfo=None)
-                    # Bewaar oudste inschrijving per combinatie
-                    if key not in lookup or dt < lookup[key]:
-                        lookup[key] = dt
-                except:
-                    continue
-            st.session_state[cache_key] = lookup
-        except Exception:
-            st.session_state[cache_key] = {}
+    Args:
+        momenten: Optioneel - eigen cache i.p.v. de sessie-cache (achtergrondcontrole)
+    """
+    if momenten is None:
+        momenten = _inschrijf_momenten()
+    ontbrekend = {slot for slot in slots if slot not in momenten}
+    if not ontbrekend:
+        return
     
-    return st.session_state[cache_key].get((nbb_nummer, wed_id))
+    eerste = db.laad_eerste_inschrijvingen_voor(ontbrekend)
+    for slot in ontbrekend:
+        moment = None
+        tijdstip = eerste.get(slot)
+        if tijdstip:
+            try:
+                moment = datetime.fromisoformat(tijdstip.replace("Z", "+00:00"))
+                if moment.tzinfo is not None:
+                    moment = moment.replace(tzinfo=None)
+            except:
+                moment = None
+        momenten[slot] = moment
+
+def zoek_inschrijf_moment(nbb_nummer: str, wed_id: str) -> datetime:
+    """
+    Zoek het werkelijke inschrijfmoment op (eerste inschrijving uit registratie_log,
+    via de tabel eerste_inschrijvingen). Gebruikt een session_state cache om
+    herhaalde database calls te voorkomen; zie laad_inschrijf_momenten voor bulk.
+    
+    Returns: datetime van eerste inschrijving, of None als niet gevonden.
+    """
+    laad_inschrijf_momenten([(nbb_nummer, wed_id)])
+    return _inschrijf_momenten().get((nbb_nummer, wed_id))
 
-def is_last_minute_inval(wed_id: str, wed_datum: datetime, registratie_moment: datetime = None) -> dict:
+def is_last_minute_inval(wed_id: str, wed_datum: datetime, registratie_moment: datetime = None,
+                         beloningsinst: dict = None) -> dict:
     """
     Check of dit een last-minute inval is.
     
@@ -2703,10 +2874,12 @@ def is_last_minute_inval(wed_id: str, wed_datum: datetime, registratie_moment: d
         wed_id: ID van de wedstrijd
         wed_datum: Datum/tijd van de wedstrijd
         registratie_moment: Wanneer de speler zich inschreef (default: nu)
+        beloningsinst: Optioneel - al geladen beloningsinstellingen
     
     Returns: {"is_inval": bool, "bonus": int, "uren": int}
     """
-    beloningsinst = laad_beloningsinstellingen()
+    if beloningsinst is None:
+        beloningsinst = laad_beloningsinstellingen()
     moment = registratie_moment or datetime.now()
     verschil = wed_datum - moment
     uren = verschil.total_seconds() / 3600
@@ -2721,7 +2894,8 @@ def is_last_minute_inval(wed_id: str, wed_datum: datetime, registratie_moment: d
     else:
         return {"is_inval": False, "bonus": 0, "uren": 0}
 
-def bereken_punten_voor_wedstrijd(nbb_nummer: str, wed_id: str, wedstrijden: dict, scheidsrechters: dict, bron: str = "zelf", inschrijf_moment: datetime = None) -> dict:
+def bereken_punten_voor_wedstrijd(nbb_nummer: str, wed_id: str, wedstrijden: dict, scheidsrechters: dict, bron: str = "zelf", inschrijf_moment: datetime = None,
+                                  context: dict = None) -> dict:
     """
     Bereken hoeveel punten een speler krijgt voor een wedstrijd.
     
@@ -2737,6 +2911,7 @@ def bereken_punten_voor_wedstrijd(nbb_nummer: str, wed_id: str, wedstrijden: dic
               - "uitnodiging": Via MSE begeleidingsuitnodiging (alle bonussen)
               - "heraanmelding": Speler die zich eerder had afgemeld (ALLEEN basis)
         inschrijf_moment: Werkelijk moment van inschrijving (default: nu = real-time registratie)
+        context: Optioneel - gedeelde gegevens voor een batch (zie maak_punten_context)
     
     Returns: {"basis": int, "coach_bonus": int, "lastig_tijdstip": int, "inval_bonus": int, "pool_bonus": int, "totaal": int, "details": str, "berekening": dict}
     
@@ -2745,9 +2920,9 @@ def bereken_punten_voor_wedstrijd(nbb_nummer: str, wed_id: str, wedstrijden: dic
     - TC moet toewijzen = minimale beloning (alleen basis)
     - Dit stimuleert spelers om zelf in te schrijven ipv te wachten op TC
     """
-    beloningsinst = laad_beloningsinstellingen()
+    beloningsinst = context["beloningsinst"] if context else laad_beloningsinstellingen()
     wed = wedstrijden.get(wed_id, {})
-    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+    wed_datum = pidx.wed_datum(wed)
     nu = datetime.now()
     
     # Gebruik werkelijk inschrijfmoment als opgegeven, anders nu (real-time)
@@ -2781,19 +2956,23 @@ def bereken_punten_voor_wedstrijd(nbb_nummer: str, wed_id: str, wedstrijden: dic
         # Solo fluiten geeft ALTIJD extra bonus
         lastig = beloningsinst["punten_lastig_tijdstip"]
     else:
-        lastig = beloningsinst["punten_lastig_tijdstip"] if is_lastig_tijdstip(nbb_nummer, wed_datum, wedstrijden, scheidsrechters, wed_id) else 0
+        index = context["index"] if context else None
+        lastig = beloningsinst["punten_lastig_tijdstip"] if is_lastig_tijdstip(nbb_nummer, wed_datum, wedstrijden, scheidsrechters, wed_id, index=index) else 0
     
     # Last-minute inval bonus - ALLEEN bij vervanging of uitnodiging (niet bij TC of zelf)
     inval_bonus = 0
     inval_info = {"is_inval": False, "bonus": 0, "uren": 0}
     
     if bron in ["vervanging", "uitnodiging"]:
-        inval_info = is_last_minute_inval(wed_id, wed_datum, registratie_moment)
+        inval_info = is_last_minute_inval(wed_id, wed_datum, registratie_moment, beloningsinst)
         inval_bonus = inval_info["bonus"]
     
     # Pool bonus - NIET bij TC-toewijzing of heraanmelding
     pool_bonus = 0
-    pool_size = bereken_pool_voor_wedstrijd(wed_id, wedstrijden, scheidsrechters)
+    if context:
+        pool_size = context["pools"].get(wed_id, 0)
+    else:
+        pool_size = bereken_pool_voor_wedstrijd(wed_id, wedstrijden, scheidsrechters)
     pool_categorie = ""
     
     if not geen_pool_inval:
@@ -2870,6 +3049,14 @@ def toon_error_met_scroll(melding: str):
     """
     st.error(melding)
 
+def toon_conflict_en_ververs():
+    """
+    Meld dat een wedstrijd intussen elders gewijzigd is en herlaad de pagina.
+    De cache bevat na het conflict al de actuele rij; de toast blijft staan na de rerun.
+    """
+    st.toast("⚠️ Deze wedstrijd is intussen gewijzigd, de actuele gegevens worden getoond.")
+    st.rerun()
+
 def scroll_naar_warning():
     """
     Placeholder functie - scroll is uitgeschakeld.
@@ -3013,7 +3200,8 @@ def schrijf_in_als_scheids(nbb_nummer: str, wed_id: str, positie: str, wedstrijd
               - "heraanmelding": Speler die zich eerder had afgemeld meldt zich opnieuw aan
     
     Returns:
-        dict met punten_info bij succes, {"error": "bezet", ...} bij race condition
+        dict met punten_info bij succes, {"error": "bezet", ...} bij race condition,
+        {"error": "conflict", ...} als de rij intussen elders gewijzigd is (niet opgeslagen)
     
     De punten worden BEREKEND en OPGESLAGEN bij de wedstrijd, maar NIET toegekend aan de speler.
     Punten worden pas toegekend wanneer de TC de wedstrijd bevestigt als "gefloten".
@@ -3080,15 +3268,18 @@ def schrijf_in_als_scheids(nbb_nummer: str, wed_id: str, positie: str, wedstrijd
             if (a.get("nbb") if isinstance(a, dict) else a) != nbb_nummer
         ]
     
-    # Sla op naar database
-    sla_wedstrijd_op(wed_id, verse_wed)
+    # Sla op naar database; bij een versieconflict is er niets opgeslagen en
+    # bevat de cache al de actuele rij: niet loggen en geen lokale update
+    if not sla_wedstrijd_op(wed_id, verse_wed):
+        return {"error": "conflict", "huidige_scheids": None, "huidige_naam": "iemand anders"}
     
     # Update ook de lokale cache zodat UI correct is
     wedstrijden[wed_id] = verse_wed
+    werk_toewijzing_bij(wed_id)
     
     # Log de inschrijving voor gedragsanalyse
     try:
-        wed_datum = datetime.strptime(verse_wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(verse_wed)
         actie = "heraanmelden" if was_eerder_afgemeld else "inschrijven"
         db.log_registratie(nbb_nummer, wed_id, positie, actie, wed_datum)
     except:
@@ -3127,7 +3318,11 @@ def bevestig_wedstrijd_gefloten(wed_id: str, positie: str, bevestigd_door: str)
     if not nbb_nummer:
         return False
     
-    # Haal opgeslagen punten op
+    # Haal opgeslagen punten op (nog niet door de achtergrondcontrole aangevuld: nu berekenen)
+    if wed.get(punten_kolom) is None:
+        punten_info = bereken_punten_voor_wedstrijd(nbb_nummer, wed_id, wedstrijden, laad_scheidsrechters(), "zelf")
+        wed[punten_kolom] = punten_info["totaal"]
+        wed[details_kolom] = punten_info
     punten = wed.get(punten_kolom, 0)
     punten_details = wed.get(details_kolom, {})
     
@@ -3136,8 +3331,11 @@ def bevestig_wedstrijd_gefloten(wed_id: str, positie: str, bevestigd_door: str)
     wed[bevestigd_op_kolom] = datetime.now().isoformat()
     wed[bevestigd_door_kolom] = bevestigd_door
     
-    # Sla wedstrijd update op
-    sla_wedstrijden_op(wedstrijden)
+    # Sla alleen deze wedstrijd op (met versiecheck); bij een conflict is er niets
+    # opgeslagen en worden er ook geen punten toegekend
+    if not sla_wedstrijd_op(wed_id, wed):
+        toon_conflict_en_ververs()
+        return False
     
     # Ken punten toe aan speler
     if punten and punten > 0:
@@ -3207,8 +3405,9 @@ def bevestig_solo_gefloten(wed_id: str, positie: str, bevestigd_door: str) -> di
         wed[f"{andere_positie}_status"] = "niet_ingevuld_solo"
         andere_afgehandeld = "lege positie afgesloten"
     
-    # Sla op
-    sla_wedstrijd_op(wed_id, wed)
+    # Sla op; bij een versieconflict niet bevestigen (cache bevat de actuele rij)
+    if not sla_wedstrijd_op(wed_id, wed):
+        return {"success": False, "error": "Wedstrijd is intussen gewijzigd, ververs de pagina"}
     
     # Bevestig via standaard flow
     bevestig_wedstrijd_gefloten(wed_id, positie, bevestigd_door)
@@ -3272,7 +3471,8 @@ def verwerk_afmelding_zonder_vervanging(wed_id: str, afgemelde_positie: str, bev
         nieuwe_punten = punten_info["totaal"]
     
     # Sla op
-    sla_wedstrijd_op(wed_id, wed)
+    if not sla_wedstrijd_op(wed_id, wed):
+        return {"success": False, "error": "Wedstrijd is intussen gewijzigd, ververs de pagina"}
     
     return {
         "success": True,
@@ -3424,7 +3624,7 @@ def markeer_no_show_met_invaller(wed_id: str, positie: str, invaller_nbb: str, b
     inval_bonus = beloningsinst.get("punten_inval_24u", 5)  # Maximale bonus want last-minute
     
     # Check lastig tijdstip voor invaller
-    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+    wed_datum = pidx.wed_datum(wed)
     lastig_bonus = beloningsinst.get("punten_lastig_tijdstip", 1) if is_lastig_tijdstip(invaller_nbb, wed_datum, wedstrijden, scheidsrechters, wed_id) else 0
     
     totaal_punten = basis_punten + inval_bonus + lastig_bonus
@@ -3535,7 +3735,8 @@ def markeer_no_show_met_externe(wed_id: str, positie: str, bevestigd_door: str)
 def draai_bevestiging_terug(wed_id: str, positie: str, teruggedraaid_door: str) -> dict:
     """
     Draai een bevestiging terug (gefloten of no-show).
-    Haalt de toegekende punten of strikes terug.
+    Haalt de toegekende punten of strikes terug als beloning-events; alleen de
+    statuskolommen van deze wedstrijd worden opgeslagen.
     
     Args:
         wed_id: ID van de wedstrijd
@@ -3543,7 +3744,8 @@ def draai_bevestiging_terug(wed_id: str, positie: str, teruggedraaid_door: str)
         teruggedraaid_door: Naam/ID van TC-lid die terugdraait
     
     Returns:
-        dict met info over wat teruggedraaid is, of None bij fout
+        dict met info over wat teruggedraaid is, None als er niets terug te draaien is,
+        of {"error": "conflict"} als de wedstrijd intussen elders gewijzigd is (niets opgeslagen)
     """
     wedstrijden = laad_wedstrijden()
     scheidsrechters = laad_scheidsrechters()
@@ -3574,35 +3776,20 @@ def draai_bevestiging_terug(wed_id: str, positie: str, teruggedraaid_door: str)
         "actie": ""
     }
     
+    # Bepaal eerst wat teruggeboekt moet worden (uit de huidige status)
+    boekingen = []
     if huidige_status == "gefloten":
-        # Haal punten terug
+        # Haal punten terug (als events: registratie eraf + logregel voor de controle)
         punten = wed.get(punten_kolom, 0)
         if punten and nbb_nummer in beloningen.get("spelers", {}):
-            speler_data = beloningen["spelers"][nbb_nummer]
-            
-            # Trek punten af
-            speler_data["punten"] = max(0, speler_data.get("punten", 0) - punten)
-            
-            # Verwijder registratie uit gefloten_wedstrijden
-            speler_data["gefloten_wedstrijden"] = [
-                w for w in speler_data.get("gefloten_wedstrijden", [])
-                if w.get("wed_id") != wed_id
+            wed_label = f"{wed.get('thuisteam')} vs {wed.get('uitteam')}"
+            boekingen = [
+                {"nbb_nummer": nbb_nummer, "soort": "wedstrijd_terug",
+                 "reden": f"Bevestiging teruggedraaid: {wed_label}", "wed_id": wed_id},
+                {"nbb_nummer": nbb_nummer, "soort": "punten", "punten": -punten,
+                 "reden": f"Bevestiging teruggedraaid: {wed_label}",
+                 "details": {"handmatig": True, "teruggedraaid_door": teruggedraaid_door}}
             ]
-            
-            # Log de correctie
-            if "punten_log" not in speler_data:
-                speler_data["punten_log"] = []
-            speler_data["punten_log"].append({
-                "punten": -punten,
-                "oude_stand": speler_data["punten"] + punten,
-                "nieuwe_stand": speler_data["punten"],
-                "reden": f"Bevestiging teruggedraaid: {wed.get('thuisteam')} vs {wed.get('uitteam')}",
-                "datum": datetime.now().isoformat(),
-                "handmatig": True,
-                "teruggedraaid_door": teruggedraaid_door
-            })
-            
-            sla_beloningen_op(beloningen)
             resultaat["actie"] = f"{punten} punten teruggehaald"
     
     elif huidige_status == "no_show" or huidige_status == "no_show_externe":
@@ -3611,28 +3798,24 @@ def draai_bevestiging_terug(wed_id: str, positie: str, teruggedraaid_door: str)
         strikes = beloningsinst.get("strikes_no_show", 5)
         
         if nbb_nummer in beloningen.get("spelers", {}):
-            speler_data = beloningen["spelers"][nbb_nummer]
-            
-            # Trek strikes af
-            speler_data["strikes"] = max(0, speler_data.get("strikes", 0) - strikes)
-            
-            # Log de correctie
-            speler_data["strike_log"].append({
-                "strikes": -strikes,
+            boekingen = [{
+                "nbb_nummer": nbb_nummer, "soort": "strike", "strikes": -strikes,
                 "reden": f"No-show teruggedraaid: {wed.get('thuisteam')} vs {wed.get('uitteam')}",
-                "datum": datetime.now().isoformat(),
-                "teruggedraaid_door": teruggedraaid_door
-            })
-            
-            sla_beloningen_op(beloningen)
+                "details": {"teruggedraaid_door": teruggedraaid_door}
+            }]
             resultaat["actie"] = f"{strikes} strikes teruggehaald"
     
-    # Reset wedstrijd status
+    # Reset wedstrijd status en sla eerst op: bij een versieconflict is er niets
+    # opgeslagen en wordt er ook niets teruggeboekt (anders dubbel bij opnieuw proberen)
     wed[status_kolom] = None
     wed[bevestigd_op_kolom] = None
     wed[bevestigd_door_kolom] = None
     
-    sla_wedstrijden_op(wedstrijden)
+    if not sla_wedstrijd_op(wed_id, wed):
+        return {"error": "conflict"}
+    
+    if boekingen:
+        db.boek_beloning_events(boekingen)
     
     return resultaat
 
@@ -3640,7 +3823,8 @@ def get_te_bevestigen_wedstrijden() -> list:
     """
     Haal wedstrijden op die in het verleden liggen en nog niet volledig bevestigd zijn.
     
-    Herberekent automatisch punten als deze ontbreken (NULL).
+    Alleen lezen: ontbrekende punten (NULL) worden door de achtergrondcontrole
+    aangevuld (zie start_reconciliatie).
     
     Returns:
         Lijst van wedstrijden met openstaande bevestigingen
@@ -3650,8 +3834,6 @@ def get_te_bevestigen_wedstrijden() -> list:
     nu = datetime.now()
     
     te_bevestigen = []
-    wedstrijden_bijgewerkt = False
-    gewijzigde_wed_ids = set()
     
     for wed_id, wed in wedstrijden.items():
         if wed.get("geannuleerd", False):
@@ -3659,7 +3841,7 @@ def get_te_bevestigen_wedstrijden() -> list:
         
         # Parse datum
         try:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
         except:
             continue
         
@@ -3675,22 +3857,6 @@ def get_te_bevestigen_wedstrijden() -> list:
         scheids_2 = wed.get("scheids_2")
         scheids_2_status = wed.get("scheids_2_status")
         
-        # NIEUW: Herbereken punten als ze ontbreken (oude inschrijvingen)
-        # Gebruik bron="zelf" als default (geeft alle bonussen)
-        if scheids_1 and wed.get("scheids_1_punten_berekend") is None and not scheids_1_status:
-            punten_info = bereken_punten_voor_wedstrijd(scheids_1, wed_id, wedstrijden, scheidsrechters, "zelf")
-            wed["scheids_1_punten_berekend"] = punten_info["totaal"]
-            wed["scheids_1_punten_details"] = punten_info
-            wedstrijden_bijgewerkt = True
-            gewijzigde_wed_ids.add(wed_id)
-        
-        if scheids_2 and wed.get("scheids_2_punten_berekend") is None and not scheids_2_status:
-            punten_info = bereken_punten_voor_wedstrijd(scheids_2, wed_id, wedstrijden, scheidsrechters, "zelf")
-            wed["scheids_2_punten_berekend"] = punten_info["totaal"]
-            wed["scheids_2_punten_details"] = punten_info
-            wedstrijden_bijgewerkt = True
-            gewijzigde_wed_ids.add(wed_id)
-        
         # Heeft deze wedstrijd openstaande bevestigingen?
         scheids_1_open = scheids_1 and not scheids_1_status
         scheids_2_open = scheids_2 and not scheids_2_status
@@ -3726,12 +3892,6 @@ def get_te_bevestigen_wedstrijden() -> list:
                 "scheids_2_open": scheids_2_open
             })
     
-    # Sla bijgewerkte wedstrijden op
-    if wedstrijden_bijgewerkt:
-        # Sla alleen gewijzigde wedstrijden op (per record, niet bulk)
-        for w_id in gewijzigde_wed_ids:
-            sla_wedstrijd_op(w_id, wedstrijden[w_id])
-    
     # Sorteer op datum (oudste eerst)
     return sorted(te_bevestigen, key=lambda x: x["wed_datum"])
 
@@ -3760,7 +3920,8 @@ def herbereken_ontbrekende_punten() -> dict:
     3. Solo wedstrijd zonder extra bonus - ontbrekende solo bonus
     
     Returns:
-        dict met aantal bijgewerkte posities
+        dict met aantal bijgewerkte posities; "conflicten" telt wedstrijden die
+        intussen elders gewijzigd zijn en daarom niet opgeslagen
     """
     wedstrijden = laad_wedstrijden()
     scheidsrechters = laad_scheidsrechters()
@@ -3768,8 +3929,16 @@ def herbereken_ontbrekende_punten() -> dict:
     bijgewerkt_null = 0
     bijgewerkt_tc = 0
     bijgewerkt_solo = 0
+    conflicten = 0
     gewijzigde_wedstrijden = set()
     
+    # Inschrijfmomenten van alle onbevestigde posities in één keer
+    laad_inschrijf_momenten([
+        (wed[positie], wed_id)
+        for wed_id, wed in wedstrijden.items() if not wed.get("geannuleerd", False)
+        for positie in ["scheids_1", "scheids_2"] if wed.get(positie) and not wed.get(f"{positie}_status")
+    ])
+    
     for wed_id, wed in wedstrijden.items():
         if wed.get("geannuleerd", False):
             continue
@@ -3840,30 +4009,54 @@ def herbereken_ontbrekende_punten() -> dict:
     totaal = bijgewerkt_null + bijgewerkt_tc + bijgewerkt_solo
     # Sla PER WEDSTRIJD op (voorkomt dataverlies door bulk operatie)
     for wed_id in gewijzigde_wedstrijden:
-        sla_wedstrijd_op(wed_id, wedstrijden[wed_id])
+        if not sla_wedstrijd_op(wed_id, wedstrijden[wed_id]):
+            conflicten += 1
     
     return {
         "ontbrekende_punten": bijgewerkt_null,
         "tc_correcties": bijgewerkt_tc,
         "solo_correcties": bijgewerkt_solo,
+        "conflicten": conflicten,
         "totaal": totaal
     }
 
-def herbereken_alle_wedstrijdpunten() -> dict:
+def maak_punten_context(wedstrijden: dict, scheidsrechters: dict, index: pidx.PlanningIndex = None,
+                        beloningsinst: dict = None) -> dict:
     """
-    Herbereken punten voor ALLE wedstrijden met een scheidsrechter.
+    Gedeelde gegevens voor een batch puntenberekening (zie bereken_punten_voor_wedstrijd):
+    beloningsinstellingen en pools van alle wedstrijden worden één keer opgehaald,
+    eigen wedstrijden per (scheidsrechter, dag) komen uit de planning index.
+    """
+    if index is None:
+        index = get_planning_index(wedstrijden, scheidsrechters)
+    return {
+        "beloningsinst": beloningsinst or laad_beloningsinstellingen(),
+        "pools": index.bereken_pools(True),
+        "index": index
+    }
+
+def bereken_puntenwijzigingen(wedstrijden: dict, scheidsrechters: dict) -> dict:
+    """
+    Herbereken de punten van ALLE ingeschreven posities in één doorgang, zonder op te slaan.
     Gebruikt het werkelijke inschrijfmoment uit registratie_log.
-    Slaat PER WEDSTRIJD op (niet bulk) om dataverlies te voorkomen.
     
-    Gebruik na wijzigingen aan puntenregels om alle bestaande data bij te werken.
+    Returns dict met:
+    - gecontroleerd: aantal posities
+    - wijzigingen: lijst van {wed_id, positie, nbb, punten_info} die bijgewerkt moeten worden
+    - detail_log: lijst van {nbb, naam, wed_id, oud, nieuw, details} met gewijzigde punten
     """
-    wedstrijden = laad_wedstrijden()
-    scheidsrechters = laad_scheidsrechters()
-    nu = datetime.now()
+    context = maak_punten_context(wedstrijden, scheidsrechters)
+    
+    # Inschrijfmomenten van alle te controleren posities in één keer
+    laad_inschrijf_momenten([
+        (wed[positie], wed_id)
+        for wed_id, wed in wedstrijden.items() if not wed.get("geannuleerd", False)
+        for positie in ["scheids_1", "scheids_2"] if wed.get(positie)
+    ])
     
-    bijgewerkt = 0
+    gecontroleerd = 0
+    wijzigingen = []
     detail_log = []
-    gewijzigde_wedstrijden = set()  # Track welke wedstrijden gewijzigd zijn
     
     for wed_id, wed in wedstrijden.items():
         if wed.get("geannuleerd", False):
@@ -3873,6 +4066,7 @@ def herbereken_alle_wedstrijdpunten() -> dict:
             nbb = wed.get(positie)
             if not nbb:
                 continue
+            gecontroleerd += 1
             
             # Haal huidige waarden op
             oud_punten = wed.get(f"{positie}_punten_berekend")
@@ -3885,15 +4079,13 @@ def herbereken_alle_wedstrijdpunten() -> dict:
             moment = zoek_inschrijf_moment(nbb, wed_id)
             
             # Herbereken
-            punten_info = bereken_punten_voor_wedstrijd(nbb, wed_id, wedstrijden, scheidsrechters, bron, inschrijf_moment=moment)
+            punten_info = bereken_punten_voor_wedstrijd(nbb, wed_id, wedstrijden, scheidsrechters, bron,
+                                                        inschrijf_moment=moment, context=context)
             nieuw_punten = punten_info["totaal"]
             
             # Update als er verschil is OF als er geen details waren
             if oud_punten != nieuw_punten or not isinstance(details, dict) or details.get("coach_bonus") is None:
-                wed[f"{positie}_punten_berekend"] = nieuw_punten
-                wed[f"{positie}_punten_details"] = punten_info
-                bijgewerkt += 1
-                gewijzigde_wedstrijden.add(wed_id)
+                wijzigingen.append({"wed_id": wed_id, "positie": positie, "nbb": nbb, "punten_info": punten_info})
                 
                 if oud_punten != nieuw_punten:
                     scheids_naam = scheidsrechters.get(nbb, {}).get("naam", nbb)
@@ -3906,17 +4098,88 @@ def herbereken_alle_wedstrijdpunten() -> dict:
                         "details": punten_info["details"]
                     })
     
-    # Sla PER WEDSTRIJD op (voorkomt dataverlies door bulk operatie)
-    for wed_id in gewijzigde_wedstrijden:
-        sla_wedstrijd_op(wed_id, wedstrijden[wed_id])
+    return {"gecontroleerd": gecontroleerd, "wijzigingen": wijzigingen, "detail_log": detail_log}
+
+def boek_puntencorrecties(verschillen: list, werkset: dict = None) -> int:
+    """
+    Boek gewijzigde wedstrijdpunten als correctie-event op het totaal van de speler.
+    Alleen voor wedstrijden die al geboekt zijn (in gefloten_wedstrijden van de speler).
+    
+    Args:
+        verschillen: lijst van (wed_id, nbb, oude punten, nieuwe punten)
+        werkset: Optioneel - zie maak_sessie_werkset (default: deze sessie)
+    
+    Returns:
+        Aantal geboekte correcties
+    """
+    if werkset is None:
+        spelers = db.laad_beloningen_met_historie().get("spelers", {})
+        boek = db.boek_beloning_events
+    else:
+        spelers = werkset["beloningen"].get("spelers", {})
+        boek = werkset["boek"]
+    boekingen = []
+    for wed_id, nbb, oud, nieuw in verschillen:
+        geboekt = spelers.get(nbb, {}).get("gefloten_wedstrijden", [])
+        if oud != nieuw and any(w.get("wed_id") == wed_id for w in geboekt):
+            boekingen.append({
+                "nbb_nummer": nbb, "soort": "correctie", "punten": nieuw - oud, "wed_id": wed_id,
+                "reden": f"Herberekening wedstrijdpunten: {oud} → {nieuw}"
+            })
+    return boek(boekingen) if boekingen else 0
+
+def herbereken_alle_wedstrijdpunten() -> dict:
+    """
+    Herbereken punten voor ALLE wedstrijden met een scheidsrechter.
+    Gebruikt het werkelijke inschrijfmoment uit registratie_log.
+    
+    Berekening in één doorgang (bereken_puntenwijzigingen); daarna worden alleen
+    de puntenkolommen van gewijzigde wedstrijden opgeslagen, per wedstrijd met
+    versiecheck (db.sla_wedstrijdpunten_op). Wedstrijden die intussen door
+    iemand anders gewijzigd zijn worden overgeslagen (conflicten).
+    
+    Al geboekte wedstrijden (in gefloten_wedstrijden van de speler) krijgen het
+    verschil als correctie-event, zodat de puntentotalen meelopen zonder
+    volledige synchronisatie.
+    
+    Gebruik na wijzigingen aan puntenregels om alle bestaande data bij te werken.
+    """
+    wedstrijden = laad_wedstrijden()
+    scheidsrechters = laad_scheidsrechters()
+    
+    resultaat = bereken_puntenwijzigingen(wedstrijden, scheidsrechters)
+    
+    gewijzigde_wedstrijden = set()
+    verschillen = []  # (wed_id, nbb, oud, nieuw)
+    for wijziging in resultaat["wijzigingen"]:
+        wed_id, nbb = wijziging["wed_id"], wijziging["nbb"]
+        wed = wedstrijden[wed_id]
+        positie = wijziging["positie"]
+        oud_punten = wed.get(f"{positie}_punten_berekend")
+        nieuw_punten = wijziging["punten_info"]["totaal"]
+        wed[f"{positie}_punten_berekend"] = nieuw_punten
+        wed[f"{positie}_punten_details"] = wijziging["punten_info"]
+        gewijzigde_wedstrijden.add(wed_id)
+        
+        if oud_punten is not None and oud_punten != nieuw_punten:
+            verschillen.append((wed_id, nbb, oud_punten, nieuw_punten))
+    
+    opslag = db.sla_wedstrijdpunten_op(wedstrijden, sorted(gewijzigde_wedstrijden))
+    niet_opgeslagen = set(opslag["conflicten"]) | set(opslag["fouten"])
+    
+    # Totalen bijwerken voor opgeslagen wedstrijden
+    totalen_gecorrigeerd = boek_puntencorrecties([v for v in verschillen if v[0] not in niet_opgeslagen])
     
     return {
-        "bijgewerkt": bijgewerkt,
-        "punten_gewijzigd": len(detail_log),
-        "detail_log": detail_log
+        "bijgewerkt": sum(1 for w in resultaat["wijzigingen"] if w["wed_id"] not in niet_opgeslagen),
+        "punten_gewijzigd": sum(1 for item in resultaat["detail_log"] if item["wed_id"] not in niet_opgeslagen),
+        "totalen_gecorrigeerd": totalen_gecorrigeerd,
+        "detail_log": [item for item in resultaat["detail_log"] if item["wed_id"] not in niet_opgeslagen],
+        "conflicten": opslag["conflicten"],
+        "fouten": opslag["fouten"]
     }
 
-def herstel_bevestigingsstatussen() -> dict:
+def herstel_bevestigingsstatussen(werkset: dict = None) -> dict:
     """
     Herstel verloren bevestigingsstatussen uit beloningen data.
     
@@ -3925,12 +4188,20 @@ def herstel_bevestigingsstatussen() -> dict:
     - Alleen herstellen als huidige status NULL is (geen bestaande statussen overschrijven)
     - Per wedstrijd opslaan (geen bulk)
     
+    Args:
+        werkset: Optioneel - zie maak_sessie_werkset (default: deze sessie)
+    
     Returns:
         dict met dry_run resultaten en detail_log
     """
-    beloningen = laad_beloningen()
-    wedstrijden = laad_wedstrijden()
-    scheidsrechters = laad_scheidsrechters()
+    if werkset is None:
+        beloningen = db.laad_beloningen_met_historie()
+        wedstrijden = laad_wedstrijden()
+        scheidsrechters = laad_scheidsrechters()
+    else:
+        beloningen = werkset["beloningen"]
+        wedstrijden = werkset["wedstrijden"]
+        scheidsrechters = werkset["scheidsrechters"]
     
     # Stap 1: Bouw mapping (nbb, wed_id) → bevestigingsdata uit beloningen
     bevestigingen_uit_beloningen = {}  # (nbb, wed_id) → {geregistreerd_op, punten}
@@ -3998,25 +4269,35 @@ def herstel_bevestigingsstatussen() -> dict:
         "bevestigingen_in_beloningen": len(bevestigingen_uit_beloningen)
     }
 
-def voer_herstel_bevestigingen_uit() -> dict:
+def voer_herstel_bevestigingen_uit(werkset: dict = None) -> dict:
     """
     Voer het daadwerkelijke herstel uit (na dry-run goedkeuring).
     - Herstelt bevestigingsstatussen uit beloningen
     - Detecteert en markeert solo wedstrijden
     - Herberekent punten voor solo wedstrijden (solo bonus)
     Slaat per wedstrijd op (geen bulk).
+    
+    Args:
+        werkset: Optioneel - zie maak_sessie_werkset (default: deze sessie)
     """
+    werkset = werkset or maak_sessie_werkset()
+    
     # Haal hersteldata op
-    herstel_data = herstel_bevestigingsstatussen()
+    herstel_data = herstel_bevestigingsstatussen(werkset)
     
     if herstel_data["totaal"] == 0:
         return {"hersteld": 0, "solo_hersteld": 0, "detail_log": []}
     
-    wedstrijden = laad_wedstrijden()
-    scheidsrechters = laad_scheidsrechters()
+    wedstrijden = werkset["wedstrijden"]
+    scheidsrechters = werkset["scheidsrechters"]
     detail_log = []
     hersteld_per_wedstrijd = {}
-    solo_hersteld = 0
+    verschillen = []  # (wed_id, nbb, geboekte punten, herberekende punten)
+    
+    momenten = werkset["momenten"]
+    laad_inschrijf_momenten([
+        (item["nbb"], item["wed_id"]) for item in herstel_data["te_herstellen"] if item.get("is_solo")
+    ], momenten)
     
     for item in herstel_data["te_herstellen"]:
         wed_id = item["wed_id"]
@@ -4046,18 +4327,20 @@ def voer_herstel_bevestigingen_uit() -> dict:
             if isinstance(details, dict) and isinstance(details.get("berekening"), dict):
                 bron = details["berekening"].get("bron", "zelf")
             
-            moment = zoek_inschrijf_moment(item["nbb"], wed_id)
+            moment = momenten.get((item["nbb"], wed_id))
             punten_info = bereken_punten_voor_wedstrijd(
-                item["nbb"], wed_id, wedstrijden, scheidsrechters, bron, inschrijf_moment=moment
+                item["nbb"], wed_id, wedstrijden, scheidsrechters, bron, inschrijf_moment=moment,
+                context=_werkset_context(werkset)
             )
             wed[f"{positie}_punten_berekend"] = punten_info["totaal"]
             wed[f"{positie}_punten_details"] = punten_info
-            solo_hersteld += 1
+            verschillen.append((wed_id, item["nbb"], item["punten"], punten_info["totaal"]))
         
         hersteld_per_wedstrijd[wed_id] = True
         
         solo_label = " 🎯 solo" if item.get("is_solo") else ""
         detail_log.append({
+            "wed_id": wed_id,
             "scheids_naam": item["scheids_naam"],
             "wed_label": item["wed_label"],
             "wed_datum": item["wed_datum"],
@@ -4067,25 +4350,35 @@ def voer_herstel_bevestigingen_uit() -> dict:
             "nieuwe_punten": wed.get(f"{positie}_punten_berekend") if item.get("is_solo") else None
         })
     
-    # Sla PER WEDSTRIJD op
-    for wed_id in hersteld_per_wedstrijd:
-        sla_wedstrijd_op(wed_id, wedstrijden[wed_id])
+    # Sla PER WEDSTRIJD op (niet opgeslagen bij versieconflict: dan ook niets boeken)
+    niet_opgeslagen = {
+        wed_id for wed_id in hersteld_per_wedstrijd
+        if not werkset["sla_op"](wed_id, wedstrijden[wed_id])
+    }
     
+    # Totalen meenemen met de solo-punten
+    boek_puntencorrecties([v for v in verschillen if v[0] not in niet_opgeslagen], werkset)
+    
+    detail_log = [item for item in detail_log if item["wed_id"] not in niet_opgeslagen]
     return {
         "hersteld": len(detail_log),
-        "solo_hersteld": solo_hersteld,
+        "solo_hersteld": sum(1 for item in detail_log if item["is_solo"]),
         "detail_log": detail_log
     }
 
-def detecteer_ontbrekende_solo() -> dict:
+def detecteer_ontbrekende_solo(werkset: dict = None) -> dict:
     """
     Detecteer wedstrijden die solo gefloten zijn maar niet als solo_compleet gemarkeerd.
     
     Criteria: wedstrijd in het verleden, één positie met status "gefloten", 
     andere positie leeg (geen scheids), solo_compleet is False.
     """
-    wedstrijden = laad_wedstrijden()
-    scheidsrechters = laad_scheidsrechters()
+    if werkset is None:
+        wedstrijden = laad_wedstrijden()
+        scheidsrechters = laad_scheidsrechters()
+    else:
+        wedstrijden = werkset["wedstrijden"]
+        scheidsrechters = werkset["scheidsrechters"]
     nu = datetime.now()
     
     te_corrigeren = []
@@ -4098,7 +4391,7 @@ def detecteer_ontbrekende_solo() -> dict:
         
         # Alleen wedstrijden in het verleden
         try:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
             if wed_datum > nu:
                 continue
         except:
@@ -4137,24 +4430,30 @@ def detecteer_ontbrekende_solo() -> dict:
         "totaal": len(te_corrigeren)
     }
 
-def corrigeer_ontbrekende_solo() -> dict:
+def corrigeer_ontbrekende_solo(werkset: dict = None) -> dict:
     """
     Corrigeer wedstrijden die solo gefloten zijn maar niet als solo_compleet gemarkeerd.
     
-    Gebruikt directe Supabase update (niet full record upsert) om serialisatieproblemen te voorkomen.
-    Stap 1: Zet solo_compleet + status via gerichte update
-    Stap 2: Herbereken punten met solo bonus
+    Zet solo_compleet + status van de lege positie en herberekent de punten met
+    solo bonus; per wedstrijd één opslag (alleen gewijzigde kolommen, met versiecheck).
+    
+    Args:
+        werkset: Optioneel - zie maak_sessie_werkset (default: deze sessie)
     """
-    detectie = detecteer_ontbrekende_solo()
+    werkset = werkset or maak_sessie_werkset()
+    detectie = detecteer_ontbrekende_solo(werkset)
     
     if detectie["totaal"] == 0:
-        return {"gecorrigeerd": 0, "detail_log": []}
+        return {"gecorrigeerd": 0, "fouten": [], "detail_log": []}
     
-    wedstrijden = laad_wedstrijden()
-    scheidsrechters = laad_scheidsrechters()
+    wedstrijden = werkset["wedstrijden"]
+    scheidsrechters = werkset["scheidsrechters"]
     detail_log = []
     fouten = []
     
+    momenten = werkset["momenten"]
+    laad_inschrijf_momenten([(item["nbb"], item["wed_id"]) for item in detectie["te_corrigeren"]], momenten)
+    
     for item in detectie["te_corrigeren"]:
         wed_id = item["wed_id"]
         positie = item["positie"]
@@ -4165,21 +4464,7 @@ def corrigeer_ontbrekende_solo() -> dict:
         
         andere_positie = "scheids_2" if positie == "scheids_1" else "scheids_1"
         
-        # Stap 1: Directe database update (alleen de velden die we nodig hebben)
-        try:
-            supabase = db.get_supabase_client()
-            update_data = {"solo_compleet": True}
-            
-            # Zet andere positie status als die nog leeg is
-            if not wed.get(f"{andere_positie}_status"):
-                update_data[f"{andere_positie}_status"] = "niet_ingevuld_solo"
-            
-            supabase.table("wedstrijden").update(update_data).eq("wed_id", wed_id).execute()
-        except Exception as e:
-            fouten.append(f"{wed_id}: {e}")
-            continue
-        
-        # Update in-memory cache
+        # Stap 1: Markeer solo en sluit de lege positie af
         wed["solo_compleet"] = True
         if not wed.get(f"{andere_positie}_status"):
             wed[f"{andere_positie}_status"] = "niet_ingevuld_solo"
@@ -4190,9 +4475,9 @@ def corrigeer_ontbrekende_solo() -> dict:
         if isinstance(details, dict) and isinstance(details.get("berekening"), dict):
             bron = details["berekening"].get("bron", "zelf")
         
-        moment = zoek_inschrijf_moment(item["nbb"], wed_id)
         punten_info = bereken_punten_voor_wedstrijd(
-            item["nbb"], wed_id, wedstrijden, scheidsrechters, bron, inschrijf_moment=moment
+            item["nbb"], wed_id, wedstrijden, scheidsrechters, bron,
+            inschrijf_moment=momenten.get((item["nbb"], wed_id)), context=_werkset_context(werkset)
         )
         
         oud_punten = item["huidige_punten"]
@@ -4201,13 +4486,15 @@ def corrigeer_ontbrekende_solo() -> dict:
         wed[f"{positie}_punten_berekend"] = nieuw_punten
         wed[f"{positie}_punten_details"] = punten_info
         
-        # Stap 3: Sla punten apart op via full record (nu met solo_compleet=True in dict)
+        # Stap 3: Sla op; bij een versieconflict niets boeken (gemeld door de opslag)
         try:
-            sla_wedstrijd_op(wed_id, wed)
+            if not werkset["sla_op"](wed_id, wed):
+                continue
+            if oud_punten is not None:
+                boek_puntencorrecties([(wed_id, item["nbb"], oud_punten, nieuw_punten)], werkset)
         except Exception as e:
-            # Solo-markering is al opgeslagen via directe update
-            # Punten worden bij volgende herberekening gecorrigeerd
-            fouten.append(f"{wed_id} punten: {e}")
+            fouten.append(f"{wed_id}: {e}")
+            continue
         
         detail_log.append({
             "scheids_naam": item["scheids_naam"],
@@ -4219,28 +4506,18 @@ def corrigeer_ontbrekende_solo() -> dict:
             "details": punten_info["details"]
         })
     
-    # Invalideer cache zodat verse data wordt geladen bij rerun
-    if "_db_cache_wedstrijden" in st.session_state:
-        del st.session_state["_db_cache_wedstrijden"]
-    
     return {
         "gecorrigeerd": len(detail_log),
         "fouten": fouten,
         "detail_log": detail_log
     }
-    
-    return {
-        "gecorrigeerd": len(detail_log),
-        "detail_log": detail_log
-    }
 
-def check_beloningen_consistentie() -> dict:
+def _bereken_beloningsdrift(wedstrijden: dict, beloningen: dict) -> dict:
     """
-    Lichtgewicht check: vergelijk puntentotalen in beloningen met som van wedstrijdpunten.
-    Draait automatisch bij openen beloningenscherm.
+    Vergelijk de puntentotalen in beloningen met de verwachte stand:
+    punten op gespeelde wedstrijden (in het verleden, niet no-show/externe/afgemeld)
+    plus handmatige aanpassingen (punten_log). Schrijft niets.
     """
-    wedstrijden = laad_wedstrijden()
-    beloningen = laad_beloningen()
     nu = datetime.now()
     
     geen_punten_statussen = {"no_show", "externe_invaller", "afgemeld_zonder_vervanging", "niet_verschenen_solo", "niet_ingevuld_solo"}
@@ -4251,7 +4528,7 @@ def check_beloningen_consistentie() -> dict:
         if wed.get("geannuleerd", False):
             continue
         try:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
             if wed_datum > nu:
                 continue
         except:
@@ -4274,151 +4551,346 @@ def check_beloningen_consistentie() -> dict:
             handmatige_punten[nbb] = handmatige_punten.get(nbb, 0) + entry.get("punten", 0)
     
     # Vergelijk (skip ongeldige keys)
-    afwijkingen = 0
+    detail_log = []
     totaal_verschil = 0
     alle_nbbs = set(list(wedstrijd_punten.keys()) + list(beloningen.get("spelers", {}).keys()))
     alle_nbbs = {nbb for nbb in alle_nbbs if nbb and nbb != "null" and nbb != "None"}
     
-    for nbb in alle_nbbs:
-        verwacht = wedstrijd_punten.get(nbb, 0) + handmatige_punten.get(nbb, 0)
+    for nbb in sorted(alle_nbbs):
+        wed_pts = wedstrijd_punten.get(nbb, 0)
+        handmatig_pts = handmatige_punten.get(nbb, 0)
+        verwacht = wed_pts + handmatig_pts
         werkelijk = beloningen.get("spelers", {}).get(nbb, {}).get("punten", 0)
         
         if verwacht != werkelijk:
-            afwijkingen += 1
             totaal_verschil += abs(verwacht - werkelijk)
+            detail_log.append({
+                "nbb": nbb,
+                "oud": werkelijk,
+                "nieuw": verwacht,
+                "wed_pts": wed_pts,
+                "handmatig_pts": handmatig_pts
+            })
     
-    return {"afwijkingen": afwijkingen, "totaal_verschil": totaal_verschil}
+    return {
+        "afwijkingen": len(detail_log),
+        "totaal_verschil": totaal_verschil,
+        "spelers_gecontroleerd": len(alle_nbbs),
+        "totaal_wedstrijd_punten": sum(wedstrijd_punten.values()),
+        "totaal_handmatig": sum(handmatige_punten.values()),
+        "detail_log": detail_log
+    }
 
-def synchroniseer_beloningen() -> dict:
+def controleer_beloningen_drift() -> dict:
     """
-    Synchroniseer beloningen met wedstrijdpunten.
+    Controleer de bijgehouden puntentotalen tegen de wedstrijdpunten (alleen lezen).
     
-    Herberekent het puntentotaal per speler op basis van:
-    1. Punten op gespeelde wedstrijden (in het verleden, niet no-show/externe/afgemeld)
-    2. Handmatige aanpassingen (punten_log)
+    Het resultaat wordt bewaard tot de data wijzigt (zie get_planning_memo), of
+    tot het volgende uur (wedstrijden schuiven dan naar het verleden).
     
-    Behoudt: strike_log, strikes, punten_log
+    Returns:
+        dict met afwijkingen, totaal_verschil, spelers_gecontroleerd,
+        totaal_wedstrijd_punten, totaal_handmatig en detail_log
+        (lijst van {nbb, oud, nieuw, wed_pts, handmatig_pts})
     """
     wedstrijden = laad_wedstrijden()
-    beloningen = laad_beloningen()
-    nu = datetime.now()
+    beloningen = db.laad_beloningen_met_historie()
+    return get_planning_memo().haal_op(
+        ("beloningsdrift", datetime.now().strftime("%Y-%m-%d %H")), db.sessie_generatie(),
+        lambda: _bereken_beloningsdrift(wedstrijden, beloningen),
+        bronnen=(wedstrijden, beloningen)
+    )
+
+def check_beloningen_consistentie() -> dict:
+    """
+    Lichtgewicht check: vergelijk puntentotalen in beloningen met som van wedstrijdpunten.
+    Draait automatisch bij openen beloningenscherm.
+    """
+    drift = controleer_beloningen_drift()
+    return {"afwijkingen": drift["afwijkingen"], "totaal_verschil": drift["totaal_verschil"]}
+
+def synchroniseer_beloningen(corrigeer: bool = False) -> dict:
+    """
+    Controleer de beloningen tegen de wedstrijdpunten en rapporteer afwijkingen.
     
-    # Ruim ongeldige entries op (null keys, lege strings)
-    ongeldige_keys = [k for k in beloningen.get("spelers", {}).keys() 
-                      if not k or k == "null" or k == "None"]
-    for key in ongeldige_keys:
-        del beloningen["spelers"][key]
+    De totalen worden bijgehouden via events (bevestiging, no-show, terugdraaien,
+    handmatige aanpassing, herberekening); deze controle herschrijft niets.
+    Met corrigeer=True krijgt elke afwijkende speler één correctie-event.
     
-    # Statussen die GEEN punten opleveren
-    geen_punten_statussen = {"no_show", "externe_invaller", "afgemeld_zonder_vervanging", "niet_verschenen_solo", "niet_ingevuld_solo"}
+    Returns:
+        controleer_beloningen_drift() plus gecorrigeerd (aantal geboekte correcties)
+    """
+    resultaat = dict(controleer_beloningen_drift())
+    resultaat["gecorrigeerd"] = 0
+    
+    if corrigeer and resultaat["detail_log"]:
+        resultaat["gecorrigeerd"] = db.boek_beloning_events([
+            {"nbb_nummer": item["nbb"], "soort": "correctie", "punten": item["nieuw"] - item["oud"],
+             "reden": f"Correctie na controle beloningen: {item['oud']} → {item['nieuw']}"}
+            for item in resultaat["detail_log"]
+        ])
     
-    # Stap 1: Tel wedstrijdpunten per speler uit wedstrijden tabel
-    wedstrijd_punten = {}  # nbb -> totaal punten uit wedstrijden
-    wedstrijd_details = {}  # nbb -> lijst van {wed_id, punten, berekening}
+    return resultaat
+
+# ============================================================
+# ACHTERGRONDCONTROLE (RECONCILIATIE)
+# ============================================================
+#
+# Gespeelde wedstrijden kunnen gaten hebben die vroeger bij het openen van
+# het bevestigen-scherm werden gerepareerd: posities zonder punten, solo
+# wedstrijden zonder solo-markering en verloren bevestigingsstatussen.
+# Dat gebeurt nu in een achtergrondthread:
+# - start_reconciliatie wordt bij elke render van de beheerder view
+#   aangeroepen en start hoogstens eens per RECONCILIATIE_INTERVAL een run
+#   (één tegelijk per proces)
+# - de thread draait zonder sessie: hij laadt zijn eigen kopie van de
+#   gedeelde data en slaat op via de db.*_gedeeld functies, zodat hij niet
+#   tegelijk met de reruns van een sessie diens st.session_state wijzigt
+# - conflicten en fouten komen in het rapport (geen st.* vanuit de thread)
+# - het rapport van de laatste run staat proces-breed klaar; het
+#   bevestigen-scherm leest alleen (get_te_bevestigen_wedstrijden)
+#
+# De herstelfuncties werken op een werkset: de data plus hoe er opgeslagen
+# en geboekt wordt. Vanuit de beheer-knoppen is dat de sessie zelf
+# (maak_sessie_werkset), in de thread maak_achtergrond_werkset.
+# ============================================================
+
+RECONCILIATIE_INTERVAL = 900  # seconden tussen automatische runs
+
+@st.cache_resource
+def _get_reconciliatie() -> dict:
+    """Proces-brede status van de achtergrondcontrole (cached)"""
+    return {"lock": threading.Lock(), "bezig": False, "laatste_start": 0.0, "rapport": None}
+
+def maak_sessie_werkset() -> dict:
+    """
+    Werkset van deze sessie: sessie-caches, opslaan via sla_wedstrijd_op
+    (conflicten als st.warning) en boeken via db.boek_beloning_events.
+    """
+    return {
+        "wedstrijden": laad_wedstrijden(),
+        "scheidsrechters": laad_scheidsrechters(),
+        "beloningen": db.laad_beloningen_met_historie(),
+        "beloningsinst": None,
+        "index": None,
+        "context": None,
+        "momenten": _inschrijf_momenten(),
+        "sla_op": sla_wedstrijd_op,
+        "sla_punten_op": db.sla_wedstrijdpunten_op,
+        "boek": db.boek_beloning_events,
+        "conflicten": [],
+        "fouten": []
+    }
+
+def maak_achtergrond_werkset() -> dict:
+    """
+    Werkset zonder sessie (achtergrondcontrole): eigen kopie van de gedeelde
+    data, opslaan via db.sla_wedstrijd_op_gedeeld en boeken via
+    db.boek_beloning_events_gedeeld. Conflicten (wed_ids) en fouten worden in
+    de werkset verzameld in plaats van getoond.
+    """
+    wedstrijden, basis = db.laad_wedstrijden_gedeeld()
+    scheidsrechters = db.laad_scheidsrechters_gedeeld()
+    generatie = db.data_generatie()
+    kalender = pidx.BeschikbaarheidsKalender(scheidsrechters, generatie)
+    werkset = {
+        "wedstrijden": wedstrijden,
+        "scheidsrechters": scheidsrechters,
+        "beloningen": db.laad_beloningen_vers(),
+        "beloningsinst": db.laad_beloningsinstellingen_vers(),
+        "index": pidx.PlanningIndex(wedstrijden, scheidsrechters, generatie, kalender=kalender),
+        "context": None,
+        "momenten": {},
+        "boek": db.boek_beloning_events_gedeeld,
+        "conflicten": [],
+        "fouten": []
+    }
+    
+    def sla_punten_op(wedstrijden: dict, wed_ids: list) -> dict:
+        # Zelfde vorm als db.sla_wedstrijdpunten_op, per wedstrijd zonder sessie
+        resultaat = {"opgeslagen": [], "conflicten": [], "fouten": {}}
+        for wed_id in wed_ids:
+            try:
+                status = db.sla_wedstrijd_op_gedeeld(wed_id, wedstrijden[wed_id], basis)
+            except Exception as e:
+                status = f"opslaan mislukt ({e})"
+            if status == "ok":
+                resultaat["opgeslagen"].append(wed_id)
+            elif status == "conflict":
+                resultaat["conflicten"].append(wed_id)
+            else:
+                resultaat["fouten"][wed_id] = "wedstrijd bestaat niet meer" if status == "verwijderd" else status
+        return resultaat
+    
+    def sla_op(wed_id: str, wed: dict) -> bool:
+        opslag = sla_punten_op({wed_id: wed}, [wed_id])
+        werkset["conflicten"].extend(opslag["conflicten"])
+        werkset["fouten"].extend(f"{w}: {melding}" for w, melding in opslag["fouten"].items())
+        return bool(opslag["opgeslagen"])
+    
+    werkset["sla_op"] = sla_op
+    werkset["sla_punten_op"] = sla_punten_op
+    return werkset
+
+def _werkset_context(werkset: dict) -> dict:
+    """Gedeelde puntencontext van de werkset (één keer opgebouwd, zie maak_punten_context)"""
+    if werkset["context"] is None:
+        werkset["context"] = maak_punten_context(
+            werkset["wedstrijden"], werkset["scheidsrechters"],
+            index=werkset["index"], beloningsinst=werkset["beloningsinst"]
+        )
+    return werkset["context"]
+
+def vul_ontbrekende_punten_aan(werkset: dict = None) -> dict:
+    """
+    Bereken punten voor gespeelde posities zonder punten (NULL) en zonder status
+    (oude inschrijvingen). Gebruik bron="zelf" als default (geeft alle bonussen).
+    
+    Alleen de puntenkolommen worden opgeslagen, per wedstrijd met versiecheck
+    (werkset["sla_punten_op"], zie maak_sessie_werkset).
+    
+    Returns:
+        dict met aangevuld, detail_log, conflicten en fouten
+    """
+    werkset = werkset or maak_sessie_werkset()
+    wedstrijden = werkset["wedstrijden"]
+    scheidsrechters = werkset["scheidsrechters"]
+    nu = datetime.now()
+    
+    aangevuld = []  # (wed_id, positie, nbb, punten)
     
     for wed_id, wed in wedstrijden.items():
         if wed.get("geannuleerd", False):
             continue
         
-        # Alleen gespeelde wedstrijden (in het verleden)
+        # Alleen wedstrijden in het verleden
         try:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
-            if wed_datum > nu:
+            if pidx.wed_datum(wed) > nu:
                 continue
         except:
             continue
         
         for positie in ["scheids_1", "scheids_2"]:
             nbb = wed.get(positie)
-            status = wed.get(f"{positie}_status")
-            punten = wed.get(f"{positie}_punten_berekend")
-            
-            if not nbb or punten is None:
-                continue
-            
-            # Sla statussen over die geen punten opleveren
-            if status in geen_punten_statussen:
+            if not nbb or wed.get(f"{positie}_punten_berekend") is not None or wed.get(f"{positie}_status"):
                 continue
             
-            if nbb not in wedstrijd_punten:
-                wedstrijd_punten[nbb] = 0
-                wedstrijd_details[nbb] = []
-            
-            wedstrijd_punten[nbb] += punten
-            
-            details = wed.get(f"{positie}_punten_details", {})
-            berekening = details.get("berekening", {}) if isinstance(details, dict) else {}
-            
-            wedstrijd_details[nbb].append({
-                "wed_id": wed_id,
-                "punten": punten,
-                "datum": wed.get("datum", ""),
-                "reden": f"Wedstrijd {wed.get('thuisteam', '?')} vs {wed.get('uitteam', '?')}",
-                "geregistreerd_op": berekening.get("inschrijf_moment", datetime.now().isoformat()),
-                "berekening": berekening
-            })
+            punten_info = bereken_punten_voor_wedstrijd(nbb, wed_id, wedstrijden, scheidsrechters, "zelf",
+                                                        context=_werkset_context(werkset))
+            wed[f"{positie}_punten_berekend"] = punten_info["totaal"]
+            wed[f"{positie}_punten_details"] = punten_info
+            aangevuld.append((wed_id, positie, nbb, punten_info["totaal"]))
     
-    # Sorteer wedstrijd_details per speler op datum
-    for nbb in wedstrijd_details:
-        wedstrijd_details[nbb].sort(key=lambda x: x.get("datum", ""))
+    if not aangevuld:
+        return {"aangevuld": 0, "detail_log": [], "conflicten": [], "fouten": []}
     
-    # Stap 2: Tel handmatige aanpassingen per speler
-    handmatige_punten = {}
-    for nbb, speler_data in beloningen.get("spelers", {}).items():
-        handmatig_totaal = 0
-        for entry in speler_data.get("punten_log", []):
-            handmatig_totaal += entry.get("punten", 0)
-        handmatige_punten[nbb] = handmatig_totaal
+    opslag = werkset["sla_punten_op"](wedstrijden, sorted({wed_id for wed_id, *_ in aangevuld}))
+    niet_opgeslagen = set(opslag["conflicten"]) | set(opslag["fouten"])
     
-    # Stap 3: Werk beloningen bij
-    correcties = 0
-    wedstrijden_gewijzigd = False
-    detail_log = []
-    alle_nbbs = set(list(wedstrijd_punten.keys()) + list(beloningen.get("spelers", {}).keys()))
+    detail_log = [
+        {
+            "wed_id": wed_id,
+            "positie": positie,
+            "naam": scheidsrechters.get(nbb, {}).get("naam", nbb),
+            "punten": punten
+        }
+        for wed_id, positie, nbb, punten in aangevuld
+        if wed_id not in niet_opgeslagen
+    ]
+    return {
+        "aangevuld": len(detail_log),
+        "detail_log": detail_log,
+        "conflicten": opslag["conflicten"],
+        "fouten": [f"{wed_id}: {melding}" for wed_id, melding in opslag["fouten"].items()]
+    }
+
+def voer_reconciliatie_uit() -> dict:
+    """
+    Vul de gaten in gespeelde wedstrijden aan, in deze volgorde:
+    1. Verloren bevestigingsstatussen (voer_herstel_bevestigingen_uit)
+    2. Ontbrekende solo-markeringen (corrigeer_ontbrekende_solo)
+    3. Ontbrekende punten (vul_ontbrekende_punten_aan)
     
-    for nbb in alle_nbbs:
-        if nbb not in beloningen["spelers"]:
-            beloningen["spelers"][nbb] = {"punten": 0, "strikes": 0, "gefloten_wedstrijden": [], "strike_log": [], "punten_log": []}
-        
-        speler = beloningen["spelers"][nbb]
-        
-        # Nieuw totaal = wedstrijdpunten + handmatige aanpassingen
-        wed_pts = wedstrijd_punten.get(nbb, 0)
-        handmatig_pts = handmatige_punten.get(nbb, 0)
-        nieuw_totaal = wed_pts + handmatig_pts
-        
-        oud_totaal = speler.get("punten", 0)
-        
-        if oud_totaal != nieuw_totaal:
-            detail_log.append({
-                "nbb": nbb,
-                "oud": oud_totaal,
-                "nieuw": nieuw_totaal,
-                "wed_pts": wed_pts,
-                "handmatig_pts": handmatig_pts
-            })
-            speler["punten"] = nieuw_totaal
-            correcties += 1
-        
-        # Update gefloten_wedstrijden lijst
-        if nbb in wedstrijd_details:
-            oude_wed_ids = set(w.get("wed_id", "") for w in speler.get("gefloten_wedstrijden", []))
-            nieuwe_wed_ids = set(w.get("wed_id", "") for w in wedstrijd_details[nbb])
-            if oude_wed_ids != nieuwe_wed_ids:
-                wedstrijden_gewijzigd = True
-            speler["gefloten_wedstrijden"] = wedstrijd_details[nbb]
+    Draait zonder sessie (maak_achtergrond_werkset); conflicten en fouten
+    staan in het rapport.
     
-    if correcties > 0 or wedstrijden_gewijzigd:
-        sla_beloningen_op(beloningen)
+    Returns:
+        Rapport met gestart_op, duur (seconden), statussen_hersteld,
+        solo_gecorrigeerd, punten_aangevuld, conflicten, fouten en detail_log
+    """
+    gestart_op = datetime.now()
+    start = time.time()
+    
+    werkset = maak_achtergrond_werkset()
+    herstel = voer_herstel_bevestigingen_uit(werkset)
+    solo = corrigeer_ontbrekende_solo(werkset)
+    punten = vul_ontbrekende_punten_aan(werkset)
+    
+    detail_log = (
+        [f"Status hersteld: {item['scheids_naam']} — {item['wed_label']}" for item in herstel["detail_log"]]
+        + [f"Solo gemarkeerd: {item['scheids_naam']} — {item['wed_label']} "
+           f"({item['oud_punten']} → {item['nieuw_punten']} pt)" for item in solo["detail_log"]]
+        + [f"Punten aangevuld: {item['naam']} — {item['wed_id']} ({item['punten']} pt)" for item in punten["detail_log"]]
+    )
     
     return {
-        "correcties": correcties,
-        "spelers_gecontroleerd": len(alle_nbbs),
-        "totaal_wedstrijd_punten": sum(wedstrijd_punten.values()),
-        "totaal_handmatig": sum(handmatige_punten.values()),
+        "gestart_op": gestart_op,
+        "duur": time.time() - start,
+        "statussen_hersteld": herstel["hersteld"],
+        "solo_gecorrigeerd": solo["gecorrigeerd"],
+        "punten_aangevuld": punten["aangevuld"],
+        "conflicten": sorted(set(werkset["conflicten"]) | set(punten["conflicten"])),
+        "fouten": werkset["fouten"] + solo["fouten"] + punten["fouten"],
         "detail_log": detail_log
     }
 
+def _reconciliatie_taak(status: dict):
+    """Achtergrondthread: voer de controle uit en publiceer het rapport"""
+    try:
+        rapport = voer_reconciliatie_uit()
+    except Exception as e:
+        print(f"Achtergrondcontrole mislukt: {e} (niet kritisch)")
+        rapport = {
+            "gestart_op": datetime.fromtimestamp(status["laatste_start"]),
+            "duur": time.time() - status["laatste_start"],
+            "statussen_hersteld": 0, "solo_gecorrigeerd": 0, "punten_aangevuld": 0,
+            "conflicten": [], "fouten": [str(e)], "detail_log": []
+        }
+    with status["lock"]:
+        status["rapport"] = rapport
+        status["bezig"] = False
+
+def start_reconciliatie(nu_uitvoeren: bool = False) -> bool:
+    """
+    Start de achtergrondcontrole als er geen run bezig is en het interval
+    verstreken is (of nu_uitvoeren). Het scherm wacht er niet op.
+    
+    Returns:
+        True als er een run gestart is
+    """
+    status = _get_reconciliatie()
+    with status["lock"]:
+        if status["bezig"]:
+            return False
+        if not nu_uitvoeren and time.time() - status["laatste_start"] < RECONCILIATIE_INTERVAL:
+            return False
+        status["bezig"] = True
+        status["laatste_start"] = time.time()
+    
+    # Gedeelde resources op de hoofdthread aanmaken (cache_resource); de
+    # thread zelf krijgt bewust geen script-context van deze sessie
+    db.get_supabase_client()
+    
+    thread = threading.Thread(target=_reconciliatie_taak, args=(status,), name="bob-reconciliatie", daemon=True)
+    thread.start()
+    return True
+
+def get_reconciliatie_status() -> dict:
+    """{"bezig": bool, "rapport": rapport van de laatste run of None}"""
+    status = _get_reconciliatie()
+    with status["lock"]:
+        return {"bezig": status["bezig"], "rapport": status["rapport"]}
+
 # ============================================================
 # HELPER FUNCTIES
 # ============================================================
@@ -4632,93 +5104,137 @@ def is_inschrijving_open_incl_weekend(wed_datum: datetime, wed: dict, positie: s
     
     return (False, False)
 
+def get_beschikbaarheid(scheidsrechters: dict) -> pidx.BeschikbaarheidsKalender:
+    """
+    Haal de beschikbaarheidskalender (blokkades, blessure, zondag) op.
+    Na een schrijfactie van deze sessie (sessie-generatie) worden alleen gewijzigde
+    scheidsrechters opnieuw verwerkt; zie ook werk_beschikbaarheid_bij.
+    """
+    kalenders = st.session_state.setdefault("_beschikbaarheid_kalenders", {})
+    sleutel = id(scheidsrechters)
+    generatie = db.sessie_generatie()
+    
+    kalender = kalenders.get(sleutel)
+    if kalender is None or kalender.scheidsrechters is not scheidsrechters:
+        if sleutel not in kalenders and len(kalenders) >= 4:
+            kalenders.clear()
+        kalender = pidx.BeschikbaarheidsKalender(scheidsrechters, generatie)
+        kalenders[sleutel] = kalender
+    elif kalender.generatie != generatie:
+        kalender.synchroniseer()
+        kalender.generatie = generatie
+    return kalender
+
+def werk_beschikbaarheid_bij(nbb_nummer: str):
+    """Verwerk gewijzigde beschikbaarheid van een scheidsrechter direct in alle kalenders"""
+    for kalender in st.session_state.get("_beschikbaarheid_kalenders", {}).values():
+        kalender.werk_bij(nbb_nummer)
+
+def get_planning_index(wedstrijden: dict, scheidsrechters: dict) -> pidx.PlanningIndex:
+    """
+    Haal de planning index op voor deze wedstrijden en scheidsrechters.
+    Wordt herbouwd als er andere data geladen is of deze sessie iets opgeslagen
+    heeft (sessie-generatie uit database.py). Schrijfacties van andere sessies
+    wijzigen deze objecten niet, dus die kosten geen herbouw.
+    """
+    indexen = st.session_state.setdefault("_planning_indexen", {})
+    sleutel = (id(wedstrijden), id(scheidsrechters))
+    generatie = db.sessie_generatie()
+    
+    index = indexen.get(sleutel)
+    if (index is None or index.generatie != generatie
+            or index.wedstrijden is not wedstrijden or index.scheidsrechters is not scheidsrechters):
+        # Maximaal een paar varianten bewaren (bijv. planning view + volledige wedstrijden)
+        if sleutel not in indexen and len(indexen) >= 4:
+            indexen.clear()
+        index = pidx.PlanningIndex(wedstrijden, scheidsrechters, generatie,
+                                   kalender=get_beschikbaarheid(scheidsrechters))
+        indexen[sleutel] = index
+    return index
+
+# Maximaal aantal bewaarde rekenresultaten (kandidaten, beschikbare wedstrijden, pools)
+PLANNING_MEMO_GROOTTE = 512
+
+def get_planning_memo() -> pidx.GeneratieMemo:
+    """
+    Haal de rekencache van deze sessie op.
+    Resultaten blijven geldig tot de volgende schrijfactie van deze sessie
+    (sessie-generatie); bronnen bewaken dat het om dezelfde data gaat.
+    """
+    memo = st.session_state.get("_planning_memo")
+    if memo is None:
+        memo = pidx.GeneratieMemo(PLANNING_MEMO_GROOTTE)
+        st.session_state["_planning_memo"] = memo
+    return memo
+
 def heeft_eigen_wedstrijd(nbb_nummer: str, datum_tijd: datetime, wedstrijden: dict, scheidsrechters: dict) -> bool:
     """
     Check of scheidsrechter op dit tijdstip een eigen wedstrijd heeft.
     Houdt rekening met reistijd bij uitwedstrijden.
+    Gebruikt de planning index (binary search per eigen team).
     """
-    scheids = scheidsrechters.get(nbb_nummer, {})
-    eigen_teams = scheids.get("eigen_teams", [])
-    
-    if not eigen_teams:
-        return False
-    
-    for wed_id, wed in wedstrijden.items():
-        # Check of dit een wedstrijd is van een eigen team (flexibele matching)
-        is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams)
-        is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams)
-        
-        is_eigen_wed = False
-        if wed.get("type") == "uit":
-            # Bij uitwedstrijd: thuisteam is het eigen team dat uit speelt
-            if is_eigen_thuis:
-                is_eigen_wed = True
-        else:
-            # Bij thuiswedstrijd: check beide teams
-            if is_eigen_thuis or is_eigen_uit:
-                is_eigen_wed = True
-        
-        if not is_eigen_wed:
-            continue
-        
-        # Bereken tijdsvenster van deze wedstrijd
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
-        
-        # Wedstrijd duurt ongeveer 1,5 uur
-        wed_duur = timedelta(hours=1, minutes=30)
-        
-        # Bij uitwedstrijden: reistijd ervoor en erna
-        if wed.get("type") == "uit":
-            reistijd = timedelta(minutes=wed.get("reistijd_minuten", 60))
-            wed_start = wed_datum - reistijd
-            wed_eind = wed_datum + wed_duur + reistijd
-        else:
-            # Thuiswedstrijd: 30 min ervoor aanwezig
-            wed_start = wed_datum - timedelta(minutes=30)
-            wed_eind = wed_datum + wed_duur
-        
-        # Check overlap: kan niet fluiten als eigen wedstrijd overlapt
-        # Fluitwedstrijd duurt ook ~1,5 uur, moet 30 min van tevoren aanwezig zijn
-        fluit_start = datum_tijd - timedelta(minutes=30)
-        fluit_eind = datum_tijd + wed_duur
-        
-        # Overlap als: fluit_start < wed_eind AND fluit_eind > wed_start
-        if fluit_start < wed_eind and fluit_eind > wed_start:
-            return True
-    
-    return False
+    return get_planning_index(wedstrijden, scheidsrechters).heeft_eigen_wedstrijd(nbb_nummer, datum_tijd)
 
-def heeft_overlappende_fluitwedstrijd(nbb_nummer: str, huidige_wed_id: str, datum_tijd: datetime, wedstrijden: dict) -> bool:
-    """
-    Check of scheidsrechter al is ingeschreven voor een andere wedstrijd die overlapt.
-    Wedstrijden duren ~1,5 uur, scheidsrechter moet 30 min van tevoren aanwezig zijn.
-    """
-    wed_duur = timedelta(hours=1, minutes=30)
-    aanwezig_voor = timedelta(minutes=30)
-    
-    # Tijdsvenster van de wedstrijd waar we naar kijken
-    nieuwe_start = datum_tijd - aanwezig_voor
-    nieuwe_eind = datum_tijd + wed_duur
-    
-    for wed_id, wed in wedstrijden.items():
-        # Skip de huidige wedstrijd
-        if wed_id == huidige_wed_id:
-            continue
-        
-        # Check of speler is ingeschreven voor deze wedstrijd
-        if wed.get("scheids_1") != nbb_nummer and wed.get("scheids_2") != nbb_nummer:
-            continue
-        
-        # Bereken tijdsvenster van de bestaande wedstrijd
-        bestaande_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
-        bestaande_start = bestaande_datum - aanwezig_voor
-        bestaande_eind = bestaande_datum + wed_duur
-        
-        # Check overlap
-        if nieuwe_start < bestaande_eind and nieuwe_eind > bestaande_start:
-            return True
-    
-    return False
+def get_toewijzing_index(wedstrijden: dict) -> pidx.ToewijzingIndex:
+    """
+    Haal de toewijzingsindex (per scheidsrechter de gesorteerde fluittijden) op.
+    Na een schrijfactie van deze sessie (sessie-generatie) worden alleen gewijzigde wedstrijden
+    opnieuw verwerkt; zie ook werk_toewijzing_bij.
+    """
+    indexen = st.session_state.setdefault("_toewijzing_indexen", {})
+    sleutel = id(wedstrijden)
+    generatie = db.sessie_generatie()
+    
+    index = indexen.get(sleutel)
+    if index is None or index.wedstrijden is not wedstrijden:
+        if sleutel not in indexen and len(indexen) >= 4:
+            indexen.clear()
+        index = pidx.ToewijzingIndex(wedstrijden, generatie)
+        indexen[sleutel] = index
+    elif index.generatie != generatie:
+        index.synchroniseer()
+        index.generatie = generatie
+    return index
+
+def werk_toewijzing_bij(wed_id: str):
+    """Verwerk een gewijzigde scheidsrechterspositie direct in alle toewijzingsindexen en open lijsten"""
+    for index in st.session_state.get("_toewijzing_indexen", {}).values():
+        index.werk_bij(wed_id)
+    for lijsten in st.session_state.get("_open_lijsten", {}).values():
+        lijsten.werk_bij(wed_id)
+
+def get_open_lijsten(wedstrijden: dict, scheidsrechters: dict) -> pidx.OpenLijsten:
+    """
+    Haal per scheidsrechter de wedstrijden op die open staan als 1e en 2e
+    scheidsrechter (zie pidx.OpenLijsten). Na een schrijfactie worden alleen
+    gewijzigde wedstrijden opnieuw beoordeeld; zie ook werk_toewijzing_bij.
+    """
+    alle_lijsten = st.session_state.setdefault("_open_lijsten", {})
+    sleutel = (id(wedstrijden), id(scheidsrechters))
+    generatie = db.sessie_generatie()
+    index = get_planning_index(wedstrijden, scheidsrechters)
+    toewijzingen = get_toewijzing_index(wedstrijden)
+    
+    lijsten = alle_lijsten.get(sleutel)
+    if (lijsten is None or lijsten.wedstrijden is not wedstrijden
+            or lijsten.scheidsrechters is not scheidsrechters):
+        if sleutel not in alle_lijsten and len(alle_lijsten) >= 4:
+            alle_lijsten.clear()
+        lijsten = pidx.OpenLijsten(index, toewijzingen, generatie)
+        alle_lijsten[sleutel] = lijsten
+    elif (lijsten.generatie != generatie or lijsten.index is not index
+            or lijsten.toewijzingen is not toewijzingen):
+        lijsten.synchroniseer(index, toewijzingen)
+        lijsten.generatie = generatie
+    return lijsten
+
+def heeft_overlappende_fluitwedstrijd(nbb_nummer: str, huidige_wed_id: str, datum_tijd: datetime, wedstrijden: dict) -> bool:
+    """
+    Check of scheidsrechter al is ingeschreven voor een andere wedstrijd die overlapt.
+    Wedstrijden duren ~1,5 uur, scheidsrechter moet 30 min van tevoren aanwezig zijn.
+    Gebruikt de toewijzingsindex (binary search in de eigen toewijzingen).
+    """
+    return get_toewijzing_index(wedstrijden).heeft_overlap(nbb_nummer, huidige_wed_id, datum_tijd)
 
 def is_beschikbaar_voor_begeleiding(nbb_nummer: str, wed_id: str, wedstrijden: dict, scheidsrechters: dict) -> tuple[bool, str]:
     """
@@ -4732,7 +5248,7 @@ def is_beschikbaar_voor_begeleiding(nbb_nummer: str, wed_id: str, wedstrijden: d
     if not wed:
         return False, "Wedstrijd niet gevonden"
     
-    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+    wed_datum = pidx.wed_datum(wed)
     
     # Check: niet op zondag
     if scheids.get("niet_op_zondag", False) and wed_datum.weekday() == 6:
@@ -4800,7 +5316,7 @@ def analyseer_scheids_conflicten(nbb_nummer: str, wed_id: str, nieuwe_datum_tijd
         
         if is_eigen_wed:
             # Bereken tijdsvenster van deze wedstrijd
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
             
             if wed.get("type") == "uit":
                 reistijd = timedelta(minutes=wed.get("reistijd_minuten", 60))
@@ -4820,7 +5336,7 @@ def analyseer_scheids_conflicten(nbb_nummer: str, wed_id: str, nieuwe_datum_tijd
         
         # Check andere fluitwedstrijden
         elif wed.get("scheids_1") == nbb_nummer or wed.get("scheids_2") == nbb_nummer:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
             bestaande_start = wed_datum - aanwezig_voor
             bestaande_eind = wed_datum + wed_duur
             
@@ -4860,7 +5376,7 @@ def bepaal_scheids_status(nbb_nummer: str, wed: dict, scheids: dict, wedstrijden
         return {"ingeschreven_zelf": False, "bezet": True, "naam": naam, "beschikbaar": False, "reden": "", "nbb": andere_nbb, "wil_begeleiding": wil_begeleiding}
     
     # Positie is open - check of speler mag inschrijven
-    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+    wed_datum = pidx.wed_datum(wed)
     
     # Check BS2 vereiste - dit geldt ALTIJD, ook voor 2e scheidsrechter
     if wed.get("vereist_bs2", False) and not scheids.get("bs2_diploma", False):
@@ -4934,87 +5450,46 @@ def bepaal_scheids_status(nbb_nummer: str, wed: dict, scheids: dict, wedstrijden
 def get_beschikbare_wedstrijden(nbb_nummer: str, als_eerste: bool) -> list:
     """
     Haal wedstrijden op waar deze scheidsrechter zich voor kan inschrijven.
-    Filtert op niveau, eigen teams, zondag-restrictie, etc.
+    Filtert op niveau, eigen teams, zondag-restrictie, overlap, etc. (zie
+    get_open_lijsten; inschrijfdeadline wordt hier niet gecheckt).
     Sorteert zodat wedstrijden van eigen niveau eerst komen.
+    
+    Het resultaat wordt bewaard tot de data wijzigt (zie get_planning_memo).
     """
     scheidsrechters = laad_scheidsrechters()
     wedstrijden = laad_wedstrijden()
-    inschrijvingen = laad_inschrijvingen()
+    resultaat = get_planning_memo().haal_op(
+        ("beschikbaar", nbb_nummer, als_eerste), db.sessie_generatie(),
+        lambda: _bereken_beschikbare_wedstrijden(nbb_nummer, als_eerste),
+        bronnen=(wedstrijden, scheidsrechters)
+    )
+    # Kopieën, zodat aanroepers de cache niet kunnen wijzigen
+    return [dict(wed) for wed in resultaat]
+
+def _bereken_beschikbare_wedstrijden(nbb_nummer: str, als_eerste: bool) -> list:
+    """Bereken de beschikbare wedstrijden uit de open lijsten (zonder cache)"""
+    scheidsrechters = laad_scheidsrechters()
+    wedstrijden = laad_wedstrijden()
     
     if nbb_nummer not in scheidsrechters:
         return []
     
-    scheids = scheidsrechters[nbb_nummer]
-    niveau_1e = scheids.get("niveau_1e_scheids", 1)
-    # Voor 2e scheids: standaard max 1 niveau hoger dan eigen niveau
-    max_niveau_2e = min(niveau_1e + 1, 5)
+    eigen_niveau = scheidsrechters[nbb_nummer].get("niveau_1e_scheids", 1)
+    lijsten = get_open_lijsten(wedstrijden, scheidsrechters)
+    if als_eerste:
+        wed_ids = lijsten.open_als_1e(nbb_nummer)
+    else:
+        # Solo gefloten wedstrijden hebben geen 2e scheids nodig
+        wed_ids = [w for w in lijsten.open_als_2e(nbb_nummer)
+                   if not wedstrijden[w].get("solo_compleet", False)]
     
-    beschikbaar = []
-    for wed_id, wed in wedstrijden.items():
-        # Alleen thuiswedstrijden tonen (uitwedstrijden zijn alleen voor blokkade)
-        if wed.get("type") == "uit":
-            continue
-        
-        # Check BS2 vereiste - dit geldt ALTIJD
-        if wed.get("vereist_bs2", False) and not scheids.get("bs2_diploma", False):
-            continue
-        
-        # Check niveau
-        wed_niveau = wed["niveau"]
-        
-        if als_eerste:
-            # 1e scheidsrechter: gewoon niveau check
-            if wed_niveau > niveau_1e:
-                continue
-        else:
-            # 2e scheidsrechter: complexere logica
-            
-            # Skip solo_compleet wedstrijden (geen 2e scheids nodig)
-            if wed.get("solo_compleet", False):
-                continue
-            
-            if wed_niveau > max_niveau_2e:
-                # Check of er een MSE als 1e scheids is (dan geen limiet)
-                eerste_scheids_nbb = wed.get("scheids_1")
-                if eerste_scheids_nbb:
-                    eerste_scheids = scheidsrechters.get(eerste_scheids_nbb, {})
-                    is_mse = eerste_scheids.get("niveau_1e_scheids", 1) == 5 or any("MSE" in t.upper() for t in eerste_scheids.get("eigen_teams", []))
-                    if not is_mse:
-                        continue  # Te hoog, geen MSE
-                else:
-                    continue  # Te hoog, nog geen 1e scheids
-        
-        # Check eigen team (thuiswedstrijd van eigen team) - flexibele matching
-        eigen_teams = scheids.get("eigen_teams", [])
-        is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams)
-        is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams)
-        if is_eigen_thuis or is_eigen_uit:
-            continue
-        
-        # Check zondag
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
-        if scheids.get("niet_op_zondag", False) and wed_datum.weekday() == 6:
-            continue
-        
-        # Check of scheidsrechter op dit tijdstip een eigen wedstrijd heeft
-        if heeft_eigen_wedstrijd(nbb_nummer, wed_datum, wedstrijden, scheidsrechters):
-            continue
-        
-        # Check of al ingeschreven of toegewezen
-        positie = "scheids_1" if als_eerste else "scheids_2"
-        if wed.get(positie):
-            continue
-        
-        beschikbaar.append({
-            "id": wed_id,
-            **wed
-        })
+    beschikbaar = [{"id": wed_id, **wedstrijden[wed_id]} for wed_id in wed_ids]
     
-    # Sorteer: eerst wedstrijden van eigen niveau (hoogste dat ze mogen), dan aflopend niveau, dan datum
+    # Sorteer: eerst wedstrijden van eigen niveau, dan aflopend niveau, dan datum
     # Voorbeeld: scheids niveau 3 ziet eerst niveau 3, dan 2, dan 1
     return sorted(beschikbaar, key=lambda x: (
-        0 if x["niveau"] == max_niveau else 1,  # Eigen niveau eerst
-        -x["niveau"],  # Dan hoogste niveau eerst
+        0 if x.get("niveau", 1) == eigen_niveau else 1,  # Eigen niveau eerst
+        -x.get("niveau", 1),  # Dan hoogste niveau eerst
         x["datum"]  # Dan op datum
     ))
 
@@ -5025,24 +5500,11 @@ def tel_wedstrijden_scheidsrechter(nbb_nummer: str, alleen_niveau: int = None) -
     Args:
         nbb_nummer: NBB nummer van de scheidsrechter
         alleen_niveau: Indien opgegeven, tel alleen wedstrijden van exact dit niveau
-    """
-    wedstrijden = laad_wedstrijden()
-    
-    count = 0
-    for wed_id, wed in wedstrijden.items():
-        # Skip geannuleerde wedstrijden
-        if wed.get("geannuleerd", False):
-            continue
-            
-        if wed.get("scheids_1") == nbb_nummer or wed.get("scheids_2") == nbb_nummer:
-            if alleen_niveau is not None:
-                # Tel alleen wedstrijden van exact dit niveau
-                if wed.get("niveau", 1) == alleen_niveau:
-                    count += 1
-            else:
-                count += 1
     
-    return count
+    Leest de werklast-tellers van de toewijzingsindex (geannuleerde
+    wedstrijden tellen niet mee).
+    """
+    return get_toewijzing_index(laad_wedstrijden()).aantal_wedstrijden(nbb_nummer, alleen_niveau)
 
 def tel_open_posities_op_niveau(nbb_nummer: str, niveau: int) -> dict:
     """
@@ -5062,8 +5524,7 @@ def tel_open_posities_op_niveau(nbb_nummer: str, niveau: int) -> dict:
     if nbb_nummer not in scheidsrechters:
         return {"totaal_open": 0, "als_1e_open": 0, "als_2e_open": 0, "wedstrijden": []}
     
-    scheids = scheidsrechters[nbb_nummer]
-    eigen_teams = scheids.get("eigen_teams", [])
+    index = get_planning_index(wedstrijden, scheidsrechters)
     
     als_1e_open = 0
     als_2e_open = 0
@@ -5079,18 +5540,12 @@ def tel_open_posities_op_niveau(nbb_nummer: str, niveau: int) -> dict:
             continue
         
         # Alleen toekomstige wedstrijden
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(wed)
         if wed_datum <= nu:
             continue
         
         # Skip als dit eigen team is
-        is_eigen_team = False
-        if eigen_teams:
-            is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams)
-            is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams)
-            is_eigen_team = is_eigen_thuis or is_eigen_uit
-        
-        if is_eigen_team:
+        if index.teams.speelt_eigen_team(nbb_nummer, wed_id):
             continue
         
         # Check of al ingeschreven voor deze wedstrijd
@@ -5133,7 +5588,6 @@ def tel_wedstrijden_op_eigen_niveau(nbb_nummer: str) -> dict:
     - voldaan: of aan minimum is voldaan
     """
     scheidsrechters = laad_scheidsrechters()
-    wedstrijden = laad_wedstrijden()
     
     if nbb_nummer not in scheidsrechters:
         return {"totaal": 0, "op_niveau": 0, "niveau": 1, "min_wedstrijden": 0, "voldaan": True}
@@ -5142,19 +5596,11 @@ def tel_wedstrijden_op_eigen_niveau(nbb_nummer: str) -> dict:
     eigen_niveau = scheids.get("niveau_1e_scheids", 1)
     min_wed = scheids.get("min_wedstrijden", 0)
     
-    totaal = 0
-    op_niveau = 0
-    
-    for wed_id, wed in wedstrijden.items():
-        # Skip geannuleerde wedstrijden
-        if wed.get("geannuleerd", False):
-            continue
-            
-        if wed.get("scheids_1") == nbb_nummer or wed.get("scheids_2") == nbb_nummer:
-            totaal += 1
-            # Tel als "op niveau" als wedstrijd niveau >= eigen niveau (hoger niveau telt ook!)
-            if wed.get("niveau", 1) >= eigen_niveau:
-                op_niveau += 1
+    # Werklast-tellers (niet-geannuleerde wedstrijden), bijgehouden per toewijzing
+    index = get_toewijzing_index(laad_wedstrijden())
+    totaal = index.aantal_wedstrijden(nbb_nummer)
+    # Tel als "op niveau" als wedstrijd niveau >= eigen niveau (hoger niveau telt ook!)
+    op_niveau = index.aantal_op_niveau(nbb_nummer, eigen_niveau)
     
     return {
         "totaal": totaal,
@@ -5170,20 +5616,36 @@ def get_kandidaten_voor_wedstrijd(wed_id: str, als_eerste: bool, met_dispensatie
     Args:
         met_dispensatie: Als True, toon ook kandidaten die normaal geblokkeerd zijn
                         door BS2 of niveauvereiste. Worden apart gemarkeerd.
+    
+    Het resultaat wordt bewaard tot de data wijzigt (zie get_planning_memo).
     """
     scheidsrechters = laad_scheidsrechters()
     wedstrijden = laad_wedstrijden()
+    resultaat = get_planning_memo().haal_op(
+        ("kandidaten", wed_id, als_eerste, met_dispensatie), db.sessie_generatie(),
+        lambda: _bereken_kandidaten_voor_wedstrijd(wed_id, als_eerste, met_dispensatie),
+        bronnen=(wedstrijden, scheidsrechters)
+    )
+    # Kopieën, zodat aanroepers de cache niet kunnen wijzigen
+    return [dict(kandidaat) for kandidaat in resultaat]
+
+def _bereken_kandidaten_voor_wedstrijd(wed_id: str, als_eerste: bool, met_dispensatie: bool = False) -> list:
+    """Bereken de kandidaten voor een wedstrijd (zonder cache)"""
+    scheidsrechters = laad_scheidsrechters()
+    wedstrijden = laad_wedstrijden()
     
     if wed_id not in wedstrijden:
         return []
     
     wed = wedstrijden[wed_id]
-    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+    wed_datum = pidx.wed_datum(wed)
     wed_niveau = wed.get("niveau", 1)
     
     # NIEUW: Haal lijst van afgemelde scheidsrechters op
     afgemeld_door = wed.get("afgemeld_door") or []
     afgemelde_nbbs = [a.get("nbb") if isinstance(a, dict) else a for a in afgemeld_door]
+    index = get_planning_index(wedstrijden, scheidsrechters)
+    kalender = index.kalender
     
     kandidaten = []
     for nbb, scheids in scheidsrechters.items():
@@ -5237,41 +5699,20 @@ def get_kandidaten_voor_wedstrijd(wed_id: str, als_eerste: bool, met_dispensatie
                         continue  # Te hoog, nog geen 1e scheids
         
         # Check eigen team (thuiswedstrijd van eigen team) - flexibele matching
-        eigen_teams_scheids = scheids.get("eigen_teams", [])
-        is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams_scheids)
-        is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams_scheids)
-        if is_eigen_thuis or is_eigen_uit:
+        if index.teams.speelt_eigen_team(nbb, wed_id):
             continue
         
         # Check zondag
-        if scheids.get("niet_op_zondag", False) and wed_datum.weekday() == 6:
+        if kalender.is_zondag_uitgesloten(nbb, wed_datum):
             continue
         
-        # Check blessure status
-        geblesseerd_tm = scheids.get("geblesseerd_tm", "")
-        if geblesseerd_tm:
-            # Parse de blessure maand (bijv. "januari 2025")
-            try:
-                maand_namen = ["januari", "februari", "maart", "april", "mei", "juni", 
-                              "juli", "augustus", "september", "oktober", "november", "december"]
-                delen = geblesseerd_tm.split()
-                if len(delen) == 2:
-                    maand_naam, jaar = delen[0].lower(), int(delen[1])
-                    if maand_naam in maand_namen:
-                        blessure_maand = maand_namen.index(maand_naam) + 1
-                        # Wedstrijd valt in of voor de blessure maand?
-                        if (wed_datum.year < jaar or 
-                            (wed_datum.year == jaar and wed_datum.month <= blessure_maand)):
-                            continue  # Geblesseerd, niet beschikbaar
-            except:
-                pass  # Bij parse fout gewoon doorgaan
+        # Check blessure status (wedstrijd valt in of voor de blessure maand)
+        if kalender.is_geblesseerd(nbb, wed_datum):
+            continue  # Geblesseerd, niet beschikbaar
         
         # Check geblokkeerde dagen (speler heeft zelf aangegeven niet beschikbaar te zijn)
-        geblokkeerde_dagen = scheids.get("geblokkeerde_dagen", [])
-        if geblokkeerde_dagen:
-            wed_dag_str = wed_datum.strftime("%Y-%m-%d")
-            if wed_dag_str in geblokkeerde_dagen:
-                continue  # Speler heeft deze dag geblokkeerd
+        if kalender.is_geblokkeerd(nbb, wed_datum):
+            continue  # Speler heeft deze dag geblokkeerd
         
         # Check of scheidsrechter op dit tijdstip een eigen wedstrijd heeft
         if heeft_eigen_wedstrijd(nbb, wed_datum, wedstrijden, scheidsrechters):
@@ -5342,6 +5783,9 @@ def bereken_pool_voor_wedstrijd(wed_id: str, wedstrijden: dict, scheidsrechters:
     Bereken het aantal scheidsrechters dat beschikbaar is voor een wedstrijd.
     Houdt rekening met: niveau, BS2, eigen team, zondag, blessures, blokkades, tijdsoverlap.
     
+    De pools van alle wedstrijden worden in één keer berekend door de planning
+    index (scheidsrechter x wedstrijd matrix) en bewaard tot de data wijzigt.
+    
     Args:
         wed_id: ID van de wedstrijd
         wedstrijden: Dict van alle wedstrijden
@@ -5356,92 +5800,11 @@ def bereken_pool_voor_wedstrijd(wed_id: str, wedstrijden: dict, scheidsrechters:
     if wed_id not in wedstrijden:
         return 0
     
-    wed = wedstrijden[wed_id]
-    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
-    wed_niveau = wed.get("niveau", 1)
-    
-    # Haal lijst van afgemelde scheidsrechters op (die tellen niet mee in pool)
-    afgemeld_door = wed.get("afgemeld_door") or []
-    afgemelde_nbbs = [a.get("nbb") if isinstance(a, dict) else a for a in afgemeld_door]
-    
-    pool_count = 0
-    for nbb, scheids in scheidsrechters.items():
-        # Check of uitgesloten van pool (testgebruikers, reserves)
-        if scheids.get("uitgesloten_van_pool", False):
-            continue
-        
-        # GEWIJZIGD: Alleen al ingeschreven scheidsrechters uitsluiten als negeer_ingeschreven=False
-        if not negeer_ingeschreven:
-            if wed.get("scheids_1") == nbb or wed.get("scheids_2") == nbb:
-                continue
-        
-        # NIEUW: Check of deze scheidsrechter zich heeft afgemeld - die telt niet mee in pool
-        if nbb in afgemelde_nbbs:
-            continue
-        
-        # Check status - alleen "Actief" telt mee in pool
-        status = scheids.get("scheids_status", "Actief")
-        if status != "Actief":
-            continue  # "Op te leiden" en "Inactief" worden uitgesloten
-        
-        niveau_1e = scheids.get("niveau_1e_scheids", 1)
-        
-        # Check BS2 vereiste
-        if wed.get("vereist_bs2", False) and not scheids.get("bs2_diploma", False):
-            continue
-        
-        # Check niveau (moet op of boven wedstrijdniveau kunnen fluiten)
-        if wed_niveau > niveau_1e:
-            continue
-        
-        # Check eigen team
-        eigen_teams_scheids = scheids.get("eigen_teams", [])
-        is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams_scheids)
-        is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams_scheids)
-        if is_eigen_thuis or is_eigen_uit:
-            continue
-        
-        # Check zondag
-        if scheids.get("niet_op_zondag", False) and wed_datum.weekday() == 6:
-            continue
-        
-        # Check blessure status
-        geblesseerd_tm = scheids.get("geblesseerd_tm", "")
-        if geblesseerd_tm:
-            try:
-                maand_namen = ["januari", "februari", "maart", "april", "mei", "juni", 
-                              "juli", "augustus", "september", "oktober", "november", "december"]
-                delen = geblesseerd_tm.split()
-                if len(delen) == 2:
-                    maand_naam, jaar = delen[0].lower(), int(delen[1])
-                    if maand_naam in maand_namen:
-                        blessure_maand = maand_namen.index(maand_naam) + 1
-                        if (wed_datum.year < jaar or 
-                            (wed_datum.year == jaar and wed_datum.month <= blessure_maand)):
-                            continue
-            except:
-                pass
-        
-        # Check geblokkeerde dagen
-        geblokkeerde_dagen = scheids.get("geblokkeerde_dagen", [])
-        if geblokkeerde_dagen:
-            wed_dag_str = wed_datum.strftime("%Y-%m-%d")
-            if wed_dag_str in geblokkeerde_dagen:
-                continue
-        
-        # Check of scheidsrechter op dit tijdstip een eigen wedstrijd heeft
-        if heeft_eigen_wedstrijd(nbb, wed_datum, wedstrijden, scheidsrechters):
-            continue
-        
-        # Check of scheidsrechter al ingeschreven is voor een overlappende fluitwedstrijd
-        # GEWIJZIGD: Alleen checken als we niet negeren
-        if not negeer_ingeschreven:
-            if heeft_overlappende_fluitwedstrijd(nbb, wed_id, wed_datum, wedstrijden):
-                continue
-        
-        pool_count += 1
-    
-    return pool_count
+    return get_planning_memo().haal_op(
+        ("pool", wed_id, negeer_ingeschreven), db.sessie_generatie(),
+        lambda: get_planning_index(wedstrijden, scheidsrechters).bereken_pools(negeer_ingeschreven)[wed_id],
+        bronnen=(wedstrijden, scheidsrechters)
+    )
 
 
 def get_pool_indicator(pool_size: int) -> tuple[str, str]:
@@ -5462,122 +5825,12 @@ def get_beschikbare_teams_voor_dag(dag_datum: datetime, dag_items: list, wedstri
     Bepaal welke teams op een bepaalde dag kunnen fluiten voor de wedstrijden die er zijn.
     Kijkt naar: niveau van wedstrijden, beschikbaarheid, eigen wedstrijden.
     Returns een lijst van teamnamen, gesorteerd op niveau (hoogste eerst).
-    """
-    # Verzamel ALLE wedstrijden van deze dag (niet alleen de gefilterde dag_items)
-    dag_str = dag_datum.strftime("%Y-%m-%d")
-    alle_wed_van_dag = []
-    for wed_id, wed in wedstrijden.items():
-        if wed.get("geannuleerd", False):
-            continue
-        if wed.get("type") == "uit":
-            continue
-        wed_datum_str = wed["datum"][:10]  # "YYYY-MM-DD"
-        if wed_datum_str == dag_str:
-            alle_wed_van_dag.append({
-                "id": wed_id,
-                "niveau": wed.get("niveau", 1),
-                "thuisteam": wed.get("thuisteam", ""),
-                "uitteam": wed.get("uitteam", ""),
-                "wed_datum": datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M"),
-                "vereist_bs2": wed.get("vereist_bs2", False)
-            })
-    
-    if not alle_wed_van_dag:
-        return []
-    
-    # Bepaal het laagste niveau van de wedstrijden op deze dag
-    laagste_wed_niveau = min(w["niveau"] for w in alle_wed_van_dag)
-    
-    teams_met_niveau = {}
-    
-    for nbb, scheids in scheidsrechters.items():
-        # Check of uitgesloten van pool (testgebruikers, reserves)
-        if scheids.get("uitgesloten_van_pool", False):
-            continue
-        
-        # Check status - alleen "Actief" telt mee
-        status = scheids.get("scheids_status", "Actief")
-        if status != "Actief":
-            continue  # "Op te leiden" en "Inactief" worden uitgesloten
-        
-        niveau_1e = scheids.get("niveau_1e_scheids", 1)
-        
-        # Check of deze scheidsrechter minstens één wedstrijd kan fluiten qua niveau
-        if niveau_1e < laagste_wed_niveau:
-            continue  # Niveau te laag voor alle wedstrijden
-        
-        # Check zondag
-        if scheids.get("niet_op_zondag", False) and dag_datum.weekday() == 6:
-            continue
-        
-        # Check blessure status
-        geblesseerd_tm = scheids.get("geblesseerd_tm", "")
-        if geblesseerd_tm:
-            try:
-                maand_namen = ["januari", "februari", "maart", "april", "mei", "juni", 
-                              "juli", "augustus", "september", "oktober", "november", "december"]
-                delen = geblesseerd_tm.split()
-                if len(delen) == 2:
-                    maand_naam, jaar = delen[0].lower(), int(delen[1])
-                    if maand_naam in maand_namen:
-                        blessure_maand = maand_namen.index(maand_naam) + 1
-                        if (dag_datum.year < jaar or 
-                            (dag_datum.year == jaar and dag_datum.month <= blessure_maand)):
-                            continue
-            except:
-                pass
-        
-        # Check geblokkeerde dagen
-        geblokkeerde_dagen = scheids.get("geblokkeerde_dagen", [])
-        if geblokkeerde_dagen:
-            if dag_str in geblokkeerde_dagen:
-                continue
-        
-        # Check of scheidsrechter kan fluiten voor minstens één wedstrijd
-        # (niet eigen team, geen tijdsoverlap met eigen wedstrijd)
-        kan_minstens_een = False
-        eigen_teams_scheids = scheids.get("eigen_teams", [])
-        
-        for wed in alle_wed_van_dag:
-            wed_niveau = wed["niveau"]
-            if wed_niveau > niveau_1e:
-                continue  # Dit niveau kan deze scheids niet
-            
-            # Check BS2 vereiste
-            if wed.get("vereist_bs2", False) and not scheids.get("bs2_diploma", False):
-                continue
-            
-            # Check eigen team
-            is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams_scheids)
-            is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams_scheids)
-            if is_eigen_thuis or is_eigen_uit:
-                continue
-            
-            # Check tijdsoverlap met eigen wedstrijd
-            if heeft_eigen_wedstrijd(nbb, wed["wed_datum"], wedstrijden, scheidsrechters):
-                continue
-            
-            # Check of al ingeschreven voor overlappende fluitwedstrijd
-            if heeft_overlappende_fluitwedstrijd(nbb, wed["id"], wed["wed_datum"], wedstrijden):
-                continue
-            
-            kan_minstens_een = True
-            break
-        
-        if not kan_minstens_een:
-            continue
-        
-        # Haal teams van deze scheidsrechter
-        for team in eigen_teams_scheids:
-            if team not in teams_met_niveau:
-                teams_met_niveau[team] = niveau_1e
-            else:
-                # Houd hoogste niveau bij voor dit team
-                teams_met_niveau[team] = max(teams_met_niveau[team], niveau_1e)
     
-    # Sorteer op niveau (hoogste eerst) en dan alfabetisch
-    gesorteerd = sorted(teams_met_niveau.items(), key=lambda x: (-x[1], x[0]))
-    return [team for team, niveau in gesorteerd]
+    Gebruikt ALLE wedstrijden van de dag (niet alleen de gefilterde dag_items);
+    het dagoverzicht van de planning index berekent alle dagen in één keer.
+    """
+    dag = get_planning_index(wedstrijden, scheidsrechters).dag_overzicht().get(dag_datum.strftime("%Y-%m-%d"))
+    return list(dag["teams"]) if dag else []
 
 
 def format_beschikbare_teams(teams: list[str], max_tonen: int = 3) -> str:
@@ -5599,21 +5852,21 @@ def format_beschikbare_teams(teams: list[str], max_tonen: int = 3) -> str:
 def bereken_dag_indicator(dag_items: list, wedstrijden: dict, scheidsrechters: dict, nbb_nummer: str) -> tuple[str, str]:
     """
     Bereken de dag-indicator op basis van de laagste pool van wedstrijden die nog open posities hebben.
+    Pools komen uit het dagoverzicht van de planning index (alle dagen in één keer).
     Returns: (emoji, css_kleur)
     """
-    laagste_pool = float('inf')
+    dag_overzicht = get_planning_index(wedstrijden, scheidsrechters).dag_overzicht()
     
+    laagste_pool = float('inf')
     for item in dag_items:
         if item.get("type") != "fluiten":
             continue
         
-        # Skip wedstrijden die volledig bezet zijn (beide scheidsrechters toegewezen)
-        wed = wedstrijden.get(item["id"], {})
-        if wed.get("scheids_1") and wed.get("scheids_2"):
-            continue
-        
-        pool = bereken_pool_voor_wedstrijd(item["id"], wedstrijden, scheidsrechters)
-        laagste_pool = min(laagste_pool, pool)
+        # Alleen wedstrijden met een open positie hebben een pool in het dagoverzicht
+        dag = dag_overzicht.get(item["datum"][:10])
+        pool = dag["pools"].get(item["id"]) if dag else None
+        if pool is not None:
+            laagste_pool = min(laagste_pool, pool)
     
     if laagste_pool == float('inf'):
         return "🟢", "#4CAF50"  # Geen wedstrijden met open posities
@@ -5627,15 +5880,25 @@ def bereken_dag_indicator(dag_items: list, wedstrijden: dict, scheidsrechters: d
 
 def toon_speler_view(nbb_nummer: str):
     """Toon de inschrijfpagina voor een speler."""
-    scheidsrechters = laad_scheidsrechters()
+    # Alle tabellen voor deze pagina parallel ophalen (één round-trip i.p.v. 8)
+    pagina_data = db.prefetch_pagina_data(
+        "scheidsrechters", "wedstrijden_planning", "instellingen", "beloningen",
+        "beloningsinstellingen", "klusjes", "vervangingsverzoeken", "begeleidingsuitnodigingen"
+    )
+    scheidsrechters = pagina_data.scheidsrechters
     
     if nbb_nummer not in scheidsrechters:
         st.error("❌ Onbekend NBB-nummer. Neem contact op met de TC.")
         return
     
     scheids = scheidsrechters[nbb_nummer]
-    wedstrijden = laad_wedstrijden()
-    instellingen = laad_instellingen()
+    # Planning view: speler view heeft de grote detailkolommen niet nodig
+    wedstrijden = pagina_data.wedstrijden_planning
+    instellingen = pagina_data.instellingen
+    
+    # Supabase niet bereikbaar: data komt uit de lokale replica (alleen-lezen)
+    if db.is_replica_modus():
+        st.warning("⚠️ De database is tijdelijk niet bereikbaar. Je ziet de laatst bekende planning; inschrijven en wijzigen is even niet mogelijk.")
     
     # Haal speler stats vroeg op voor gebruik in sidebar
     speler_stats = get_speler_stats(nbb_nummer)
@@ -6107,7 +6370,7 @@ def toon_speler_view(nbb_nummer: str):
                     }
                     status_icon = status_icons.get(fb.get("status"), "?")
                     
-                    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                    wed_datum = pidx.wed_datum(wed)
                     st.caption(f"{status_icon} {wed_datum.strftime('%d-%m')} - {begeleider_naam}")
                     
                     # Wijzig knop (alleen voor echte feedback, niet voor bevestigingen)
@@ -6154,7 +6417,7 @@ def toon_speler_view(nbb_nummer: str):
                     continue
                 if wed.get("geannuleerd", False):
                     continue
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
                 if wed_datum > nu:
                     # Alleen de datum (zonder tijd)
                     wedstrijd_dagen.add(wed_datum.strftime("%Y-%m-%d"))
@@ -6217,7 +6480,7 @@ def toon_speler_view(nbb_nummer: str):
                                 continue
                             if wed.get("geannuleerd", False):
                                 continue
-                            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                            wed_datum = pidx.wed_datum(wed)
                             wed_dag_str = wed_datum.strftime("%Y-%m-%d")
                             
                             if wed_dag_str == dag_str:
@@ -6251,7 +6514,8 @@ def toon_speler_view(nbb_nummer: str):
                             wedstrijden[wed_id][positie] = None
                             wedstrijden[wed_id][f"{positie}_punten_berekend"] = None
                             wedstrijden[wed_id][f"{positie}_punten_details"] = None
-                            sla_wedstrijd_op(wed_id, wedstrijden[wed_id])
+                            if not sla_wedstrijd_op(wed_id, wedstrijden[wed_id]):
+                                toon_conflict_en_ververs()
                             
                             # Log
                             uitgeschreven_wedstrijden.append(f"{wed['thuisteam']} vs {wed['uitteam']} ({conflict['datum'][:10]})")
@@ -6665,7 +6929,7 @@ def toon_speler_view(nbb_nummer: str):
             continue
         
         # Is de wedstrijd al gespeeld?
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(wed)
         wed_eind = wed_datum + timedelta(hours=1, minutes=30)
         if wed_eind > nu:
             continue  # Wedstrijd nog niet afgelopen
@@ -6792,7 +7056,7 @@ def toon_speler_view(nbb_nummer: str):
             continue
         
         # Is de wedstrijd al gespeeld?
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(wed)
         wed_eind = wed_datum + timedelta(hours=1, minutes=30)
         if wed_eind > nu:
             continue
@@ -6877,7 +7141,7 @@ def toon_speler_view(nbb_nummer: str):
                 wed = wedstrijden.get(uitnodiging["wed_id"], {})
                 if not wed:
                     continue
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
                 dag = ["Ma", "Di", "Wo", "Do", "Vr", "Za", "Zo"][wed_datum.weekday()]
                 mse_naam = scheidsrechters.get(uitnodiging["mse_nbb"], {}).get("naam", "?")
                 
@@ -6891,7 +7155,8 @@ def toon_speler_view(nbb_nummer: str):
                         punten_info = bereken_punten_voor_wedstrijd(nbb_nummer, uitnodiging["wed_id"], wedstrijden, scheidsrechters, bron="uitnodiging")
                         wedstrijden[uitnodiging["wed_id"]]["scheids_2_punten_berekend"] = punten_info["totaal"]
                         wedstrijden[uitnodiging["wed_id"]]["scheids_2_punten_details"] = punten_info
-                        sla_wedstrijd_op(uitnodiging["wed_id"], wedstrijden[uitnodiging["wed_id"]])
+                        if not sla_wedstrijd_op(uitnodiging["wed_id"], wedstrijden[uitnodiging["wed_id"]]):
+                            toon_conflict_en_ververs()
                         uitnodigingen[uitnodiging["id"]]["status"] = "accepted"
                         uitnodigingen[uitnodiging["id"]]["bevestigd_op"] = datetime.now().isoformat()
                         sla_begeleidingsuitnodigingen_op(uitnodigingen)
@@ -6909,7 +7174,7 @@ def toon_speler_view(nbb_nummer: str):
                 wed = wedstrijden.get(verzoek["wed_id"], {})
                 if not wed:
                     continue
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
                 dag = ["Ma", "Di", "Wo", "Do", "Vr", "Za", "Zo"][wed_datum.weekday()]
                 aanvrager = scheidsrechters.get(verzoek["aanvrager_nbb"], {}).get("naam", "?")
                 # Preview met vervanging-bonus (omdat dit een vervangingsverzoek is)
@@ -6924,7 +7189,9 @@ def toon_speler_view(nbb_nummer: str):
                         # Vervanging via uitnodiging: bonus op basis van moment uitnodiging
                         # Geef aanvrager_nbb mee zodat zijn positie als "vrij" wordt beschouwd
                         resultaat = schrijf_in_als_scheids(nbb_nummer, verzoek["wed_id"], positie_key, wedstrijden, scheidsrechters, bron="vervanging", vervang_nbb=verzoek.get("aanvrager_nbb"))
-                        if resultaat is None or (isinstance(resultaat, dict) and resultaat.get("error")):
+                        if isinstance(resultaat, dict) and resultaat.get("error") == "conflict":
+                            toon_conflict_en_ververs()
+                        elif resultaat is None or (isinstance(resultaat, dict) and resultaat.get("error")):
                             naam = resultaat.get("huidige_naam", "iemand anders") if isinstance(resultaat, dict) else "iemand anders"
                             st.error(f"⚠️ Deze positie is al door **{naam}** ingenomen.")
                         else:
@@ -6948,13 +7215,13 @@ def toon_speler_view(nbb_nummer: str):
         nu = datetime.now()
         mijn_begeleidingen = [(wed_id, wed) for wed_id, wed in wedstrijden.items() 
                               if wed.get("begeleider") == nbb_nummer 
-                              and datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M") > nu
+                              and pidx.wed_datum(wed) > nu
                               and not wed.get("geannuleerd", False)]
         
         mijn_wed_als_1e_zonder_2e = [(wed_id, wed) for wed_id, wed in wedstrijden.items()
                                      if wed.get("scheids_1") == nbb_nummer 
                                      and not wed.get("scheids_2")
-                                     and datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M") > nu
+                                     and pidx.wed_datum(wed) > nu
                                      and not wed.get("geannuleerd", False)]
         
         if mijn_begeleidingen or mijn_wed_als_1e_zonder_2e:
@@ -7011,16 +7278,15 @@ def toon_speler_view(nbb_nummer: str):
     
     # Tel ingeschreven wedstrijden (alle, inclusief verleden)
     nu = datetime.now()
-    aantal_ingeschreven = sum(1 for wed in wedstrijden.values() 
-                              if (wed.get("scheids_1") == nbb_nummer or wed.get("scheids_2") == nbb_nummer))
+    aantal_ingeschreven = get_toewijzing_index(wedstrijden).aantal(nbb_nummer)
     
     # Tel eigen wedstrijden (thuis + uit) in doelmaand
     eigen_teams = scheids.get("eigen_teams", [])
     aantal_eigen_wed = sum(1 for wed in wedstrijden.values() 
-                          if datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M") > nu
+                          if pidx.wed_datum(wed) > nu
                           and not wed.get("geannuleerd", False)
-                          and datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M").month == doel_maand
-                          and datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M").year == doel_jaar
+                          and pidx.wed_datum(wed).month == doel_maand
+                          and pidx.wed_datum(wed).year == doel_jaar
                           and (any(team_match(wed["thuisteam"], et) for et in eigen_teams) 
                                or any(team_match(wed["uitteam"], et) for et in eigen_teams)))
     
@@ -7028,52 +7294,19 @@ def toon_speler_view(nbb_nummer: str):
     aantal_mijn_niveau = 0
     aantal_boven_niveau = 0
     aantal_buiten_maand = 0
-    max_niveau_2e = min(eigen_niveau + 1, 5)  # Max niveau als 2e scheids
     
-    for wed_id, wed in wedstrijden.items():
-        # Skip uitwedstrijden (die zijn voor blokkade, niet voor fluiten)
-        if wed.get("type") == "uit":
-            continue
-            
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
-        if wed_datum < nu or wed.get("geannuleerd", False):
+    # Alleen wedstrijden uit de open lijsten kunnen meetellen (thuis, geen eigen
+    # wedstrijd, plek vrij, geen overlap, zondag, BS2 en niveau al gecheckt)
+    open_lijsten = get_open_lijsten(wedstrijden, scheidsrechters)
+    open_als_1e = set(open_lijsten.open_als_1e(nbb_nummer))
+    open_als_2e = set(open_lijsten.open_als_2e(nbb_nummer))
+    
+    for wed_id in open_als_1e | open_als_2e:
+        wed = wedstrijden[wed_id]
+        wed_datum = pidx.wed_datum(wed)
+        if wed_datum < nu:
             continue
         
-        # Check of dit een eigen wedstrijd is (waar je zelf speelt)
-        is_eigen = (any(team_match(wed["thuisteam"], et) for et in eigen_teams) 
-                    or any(team_match(wed["uitteam"], et) for et in eigen_teams))
-        
-        if is_eigen:
-            continue  # Eigen wedstrijden niet meetellen voor niveau filters
-        
-        # Check of je al ingeschreven bent
-        al_ingeschreven = (wed.get("scheids_1") == nbb_nummer or wed.get("scheids_2") == nbb_nummer)
-        if al_ingeschreven:
-            continue  # Al ingeschreven, niet meer beschikbaar
-        
-        # Check of er nog plek is en of je kunt inschrijven
-        scheids_1_bezet = wed.get("scheids_1") is not None
-        scheids_2_bezet = wed.get("scheids_2") is not None
-        if scheids_1_bezet and scheids_2_bezet:
-            continue  # Geen plek meer
-        
-        # Extra beschikbaarheid checks
-        heeft_eigen = heeft_eigen_wedstrijd(nbb_nummer, wed_datum, wedstrijden, scheidsrechters)
-        if heeft_eigen:
-            continue  # Eigen wedstrijd op dit tijdstip
-        
-        heeft_overlap = heeft_overlappende_fluitwedstrijd(nbb_nummer, wed_id, wed_datum, wedstrijden)
-        if heeft_overlap:
-            continue  # Overlap met andere fluitwedstrijd
-        
-        zondag_blocked = scheids.get("niet_op_zondag", False) and wed_datum.weekday() == 6
-        if zondag_blocked:
-            continue  # Zondag restrictie
-        
-        bs2_blocked = wed.get("vereist_bs2", False) and not scheids.get("bs2_diploma", False)
-        if bs2_blocked:
-            continue  # BS2 vereist maar geen diploma
-        
         wed_niveau = wed.get("niveau", 1)
         is_in_doelmaand = wed_datum.month == doel_maand and wed_datum.year == doel_jaar
         
@@ -7082,17 +7315,8 @@ def toon_speler_view(nbb_nummer: str):
         deadline_open_2e, _ = is_inschrijving_open_incl_weekend(wed_datum, wed, "scheids_2")
         
         # Check of je kunt inschrijven op deze wedstrijd (per positie)
-        kan_als_1e = not scheids_1_bezet and wed_niveau <= eigen_niveau and deadline_open_1e
-        kan_als_2e = not scheids_2_bezet and deadline_open_2e
-        
-        if kan_als_2e and wed_niveau > max_niveau_2e:
-            # Boven max niveau voor 2e scheids - check of er MSE als 1e is
-            if scheids_1_bezet:
-                eerste_scheids = scheidsrechters.get(wed.get("scheids_1"), {})
-                is_mse = eerste_scheids.get("niveau_1e_scheids", 1) == 5 or any("MSE" in t.upper() for t in eerste_scheids.get("eigen_teams", []))
-                kan_als_2e = is_mse  # Alleen mogelijk met MSE
-            else:
-                kan_als_2e = False  # Geen 1e scheids, niveau te hoog
+        kan_als_1e = wed_id in open_als_1e and deadline_open_1e
+        kan_als_2e = wed_id in open_als_2e and deadline_open_2e
         
         kan_inschrijven = kan_als_1e or kan_als_2e
         
@@ -7156,7 +7380,7 @@ def toon_speler_view(nbb_nummer: str):
     
             if mijn_wedstrijden:
                 for wed in sorted(mijn_wedstrijden, key=lambda x: x["datum"]):
-                    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                    wed_datum = pidx.wed_datum(wed)
                     dag = ["Ma", "Di", "Wo", "Do", "Vr", "Za", "Zo"][wed_datum.weekday()]
             
                     # Check of er al een openstaand vervangingsverzoek is
@@ -7189,7 +7413,8 @@ def toon_speler_view(nbb_nummer: str):
                             st.info("🔄 Je zoekt vervanging - anderen kunnen nu overnemen")
                             if st.button("↩️ Annuleren (toch zelf doen)", key=f"annuleer_zoekt_{wed['id']}", type="secondary"):
                                 wedstrijden[wed["id"]][zoekt_key] = False
-                                sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                    toon_conflict_en_ververs()
                                 st.rerun()
                         elif wed_datum > datetime.now():
                             # Afmelden met expander voor opties (alleen voor toekomstige wedstrijden)
@@ -7205,7 +7430,8 @@ def toon_speler_view(nbb_nummer: str):
                                 st.caption("Je blijft staan totdat iemand overneemt. Geen strikes!")
                                 if st.button("🔄 Ik zoek vervanging", key=f"zoekt_vervanging_{wed['id']}", type="primary"):
                                     wedstrijden[wed["id"]][zoekt_key] = True
-                                    sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                    if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                        toon_conflict_en_ververs()
                                     st.success("✅ Anderen kunnen nu overnemen!")
                                     st.rerun()
                                 
@@ -7283,8 +7509,10 @@ def toon_speler_view(nbb_nummer: str):
                                     wedstrijden[wed["id"]][positie] = None
                                     wedstrijden[wed["id"]][punten_kolom] = None
                                     wedstrijden[wed["id"]][details_kolom] = None
-                                    sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
-                                
+                                    if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                        # Niet afgemeld: geen log en geen strikes
+                                        toon_conflict_en_ververs()
+                                    
                                     # Log de uitschrijving
                                     try:
                                         db.log_registratie(nbb_nummer, wed["id"], positie, "uitschrijven", wed_datum)
@@ -7305,16 +7533,17 @@ def toon_speler_view(nbb_nummer: str):
         # SECTIE: OVERNEMEN (wedstrijden waar iemand vervanging zoekt)
         # ============================================================
         
-        # Clear wedstrijden cache en laad vers voor actuele "zoekt vervanging" status
-        # NB: database.py gebruikt _db_cache_wedstrijden als key
-        if "_db_cache_wedstrijden" in st.session_state:
-            del st.session_state["_db_cache_wedstrijden"]
-        wedstrijden_vers = laad_wedstrijden()
+        # Clear wedstrijden sessie-cache en laad vers voor actuele "zoekt vervanging" status
+        # NB: database.py gebruikt _db_cache_wedstrijden_planning als key; de gedeelde snapshot
+        # wordt door alle schrijfacties bijgewerkt en hoeft hier niet geïnvalideerd te worden
+        if "_db_cache_wedstrijden_planning" in st.session_state:
+            del st.session_state["_db_cache_wedstrijden_planning"]
+        wedstrijden_vers = laad_wedstrijden_planning()
         
         # Zoek wedstrijden waar iemand vervanging zoekt en waar deze speler kan overnemen
         overneem_wedstrijden = []
         for wed_id, wed in wedstrijden_vers.items():
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
             
             # Skip verleden en geannuleerd
             if wed_datum < datetime.now() or wed.get("geannuleerd", False):
@@ -7422,19 +7651,28 @@ def toon_speler_view(nbb_nummer: str):
                             punten_kolom = f"{positie_key}_punten_berekend"
                             details_kolom = f"{positie_key}_punten_details"
                             
-                            # 1. Schrijf nieuwe scheids in (gebruik verse data!)
+                            # 1. Check met verse data uit de database ZONDER CACHE (de gedeelde
+                            #    snapshot kan achterlopen): zoekt dezelfde scheids nog vervanging?
+                            verse_wed = db.laad_wedstrijd_vers(item["id"])
+                            if (not verse_wed or verse_wed.get(positie_key) != oude_scheids_nbb
+                                    or not verse_wed.get(zoekt_key)):
+                                db.invalideer_cache("wedstrijden")
+                                toon_conflict_en_ververs()
+                            
+                            # 2. Schrijf nieuwe scheids in
                             wedstrijden_vers[item["id"]][positie_key] = nbb_nummer
                             wedstrijden_vers[item["id"]][zoekt_key] = False
                             
-                            # 2. Bereken en sla punten op voor nieuwe scheids
+                            # 3. Bereken en sla punten op voor nieuwe scheids
                             punten_info = bereken_punten_voor_wedstrijd(nbb_nummer, item["id"], wedstrijden_vers, scheidsrechters, bron="vervanging")
                             wedstrijden_vers[item["id"]][punten_kolom] = punten_info["totaal"]
                             wedstrijden_vers[item["id"]][details_kolom] = punten_info["details"]
                             
-                            # 3. Sla wedstrijd op
-                            sla_wedstrijd_op(item["id"], wedstrijden_vers[item["id"]])
+                            # 4. Sla wedstrijd op met versiecheck (bij conflict niets loggen en actuele rij tonen)
+                            if not sla_wedstrijd_op(item["id"], wedstrijden_vers[item["id"]]):
+                                toon_conflict_en_ververs()
                             
-                            # 4. Log de transacties
+                            # 5. Log de transacties
                             try:
                                 db.log_registratie(oude_scheids_nbb, item["id"], positie_key, "uitschrijven_via_overnemen", wed_datum)
                                 db.log_registratie(nbb_nummer, item["id"], positie_key, "inschrijven_via_overnemen", wed_datum)
@@ -7455,8 +7693,8 @@ def toon_speler_view(nbb_nummer: str):
         alle_items = []
     
         for wed_id, wed in wedstrijden.items():
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
-        
+            wed_datum = pidx.wed_datum(wed)
+            
             # Skip geannuleerde wedstrijden
             if wed.get("geannuleerd", False):
                 continue
@@ -7518,60 +7756,37 @@ def toon_speler_view(nbb_nummer: str):
                 else:
                     # Wedstrijd om te fluiten - pas niveau filters toe
                     wed_niveau = wed.get("niveau", 1)
-                    max_niveau_2e = min(eigen_niveau + 1, 5)
                     
                     # Filter op niveau
                     is_eigen_niv = wed_niveau == eigen_niveau
                     is_boven_niv = wed_niveau > eigen_niveau
                     
-                    # Check of je kunt inschrijven op deze wedstrijd
-                    scheids_1_bezet = wed.get("scheids_1") is not None
-                    scheids_2_bezet = wed.get("scheids_2") is not None
-                    
                     # Al ingeschreven op andere positie?
                     al_ingeschreven = wed.get("scheids_1") == nbb_nummer or wed.get("scheids_2") == nbb_nummer
                     
-                    # Eigen wedstrijd op dit tijdstip?
-                    heeft_eigen = heeft_eigen_wedstrijd(nbb_nummer, wed_datum, wedstrijden, scheidsrechters)
-                    
-                    # Overlap met andere fluitwedstrijd?
-                    heeft_overlap = heeft_overlappende_fluitwedstrijd(nbb_nummer, wed_id, wed_datum, wedstrijden)
-                    
-                    # Zondag restrictie?
-                    zondag_blocked = scheids.get("niet_op_zondag", False) and wed_datum.weekday() == 6
-                    
-                    # BS2 vereist maar geen diploma?
-                    bs2_blocked = wed.get("vereist_bs2", False) and not scheids.get("bs2_diploma", False)
+                    # Plek vrij, eigen wedstrijd, overlap, zondag, BS2 en niveau: uit de open lijsten
+                    open_1e = wed_id in open_als_1e
+                    open_2e = wed_id in open_als_2e
                     
                     # Check deadline per positie (normale deadline OF vrijgekomen door afmelding)
                     deadline_open_1e, uitzondering_1e = is_inschrijving_open_incl_weekend(wed_datum, wed, "scheids_1")
                     deadline_open_2e, uitzondering_2e = is_inschrijving_open_incl_weekend(wed_datum, wed, "scheids_2")
                     
-                    # Combineer niveau en deadline checks per positie
-                    kan_als_1e = not scheids_1_bezet and wed_niveau <= eigen_niveau and deadline_open_1e
-                    kan_als_2e = not scheids_2_bezet and deadline_open_2e
-                    
-                    if kan_als_2e and wed_niveau > max_niveau_2e:
-                        # Boven max niveau voor 2e scheids - check of er MSE als 1e is
-                        if scheids_1_bezet:
-                            eerste_scheids = scheidsrechters.get(wed.get("scheids_1"), {})
-                            is_mse = eerste_scheids.get("niveau_1e_scheids", 1) == 5 or any("MSE" in t.upper() for t in eerste_scheids.get("eigen_teams", []))
-                            kan_als_2e = is_mse
-                        else:
-                            kan_als_2e = False
-                    
-                    # Combineer alle checks
-                    kan_inschrijven = (kan_als_1e or kan_als_2e) and not al_ingeschreven and not heeft_eigen and not heeft_overlap and not zondag_blocked and not bs2_blocked
+                    # Combineer open lijst en deadline per positie
+                    kan_als_1e = open_1e and deadline_open_1e
+                    kan_als_2e = open_2e and deadline_open_2e
+                    kan_inschrijven = kan_als_1e or kan_als_2e
                     
                     # Weekend/afmelding uitzondering is True als minstens één positie via uitzondering open is
                     is_weekend_uitzondering = (kan_als_1e and uitzondering_1e) or (kan_als_2e and uitzondering_2e)
                     
                     # MSE's kunnen ook begeleiden (zonder te fluiten), maar alleen als ze BS2 hebben voor MSE wedstrijden
                     kan_begeleiden = False
-                    if is_mse and not heeft_eigen and not heeft_overlap and not al_ingeschreven and not bs2_blocked:
-                        al_begeleider = wed.get("begeleider") == nbb_nummer
-                        heeft_begeleider = wed.get("begeleider") is not None
-                        if not al_begeleider and not heeft_begeleider:
+                    if is_mse and not al_ingeschreven and wed.get("begeleider") is None:
+                        bs2_blocked = wed.get("vereist_bs2", False) and not scheids.get("bs2_diploma", False)
+                        if (not bs2_blocked
+                                and not heeft_eigen_wedstrijd(nbb_nummer, wed_datum, wedstrijden, scheidsrechters)
+                                and not heeft_overlappende_fluitwedstrijd(nbb_nummer, wed_id, wed_datum, wedstrijden)):
                             kan_begeleiden = True
                     
                     # Kan iets doen met deze wedstrijd?
@@ -7743,7 +7958,8 @@ def toon_speler_view(nbb_nummer: str):
                                         wedstrijden[wed["id"]]["scheids_1"] = None
                                         wedstrijden[wed["id"]]["scheids_1_punten_berekend"] = None
                                         wedstrijden[wed["id"]]["scheids_1_punten_details"] = None
-                                        sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                        if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                            toon_conflict_en_ververs()
                                         st.rerun()
                                 elif status_1e["bezet"]:
                                     # Check of deze scheids vervanging zoekt
@@ -7796,7 +8012,9 @@ def toon_speler_view(nbb_nummer: str):
                                                 # Gebruik nieuwe functie: punten worden opgeslagen maar niet toegekend
                                                 punten_definitief = schrijf_in_als_scheids(nbb_nummer, wed['id'], "scheids_1", wedstrijden, scheidsrechters)
                                                 
-                                                if punten_definitief is None or (isinstance(punten_definitief, dict) and punten_definitief.get("error")):
+                                                if isinstance(punten_definitief, dict) and punten_definitief.get("error") == "conflict":
+                                                    toon_conflict_en_ververs()
+                                                elif punten_definitief is None or (isinstance(punten_definitief, dict) and punten_definitief.get("error")):
                                                     naam = punten_definitief.get("huidige_naam", "iemand anders") if isinstance(punten_definitief, dict) else "iemand anders"
                                                     toon_error_met_scroll(f"⚠️ Deze positie is zojuist door **{naam}** ingenomen. Ververs de pagina.")
                                                 else:
@@ -7821,7 +8039,9 @@ def toon_speler_view(nbb_nummer: str):
                                                 # Direct inschrijven - punten worden opgeslagen maar niet toegekend
                                                 punten_definitief = schrijf_in_als_scheids(nbb_nummer, wed['id'], "scheids_1", wedstrijden, scheidsrechters)
                                                 
-                                                if punten_definitief is None or (isinstance(punten_definitief, dict) and punten_definitief.get("error")):
+                                                if isinstance(punten_definitief, dict) and punten_definitief.get("error") == "conflict":
+                                                    toon_conflict_en_ververs()
+                                                elif punten_definitief is None or (isinstance(punten_definitief, dict) and punten_definitief.get("error")):
                                                     naam = punten_definitief.get("huidige_naam", "iemand anders") if isinstance(punten_definitief, dict) else "iemand anders"
                                                     toon_error_met_scroll(f"⚠️ Deze positie is zojuist door **{naam}** ingenomen. Ververs de pagina.")
                                                 else:
@@ -7847,7 +8067,8 @@ def toon_speler_view(nbb_nummer: str):
                                         wedstrijden[wed["id"]]["scheids_2"] = None
                                         wedstrijden[wed["id"]]["scheids_2_punten_berekend"] = None
                                         wedstrijden[wed["id"]]["scheids_2_punten_details"] = None
-                                        sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                        if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                            toon_conflict_en_ververs()
                                         st.rerun()
                                 elif status_2e["bezet"]:
                                     # Check of deze scheids vervanging zoekt
@@ -7909,7 +8130,9 @@ def toon_speler_view(nbb_nummer: str):
                                                 # Gebruik nieuwe functie: punten worden opgeslagen maar niet toegekend
                                                 punten_definitief = schrijf_in_als_scheids(nbb_nummer, wed['id'], "scheids_2", wedstrijden, scheidsrechters)
                                                 
-                                                if punten_definitief is None or (isinstance(punten_definitief, dict) and punten_definitief.get("error")):
+                                                if isinstance(punten_definitief, dict) and punten_definitief.get("error") == "conflict":
+                                                    toon_conflict_en_ververs()
+                                                elif punten_definitief is None or (isinstance(punten_definitief, dict) and punten_definitief.get("error")):
                                                     naam = punten_definitief.get("huidige_naam", "iemand anders") if isinstance(punten_definitief, dict) else "iemand anders"
                                                     toon_error_met_scroll(f"⚠️ Deze positie is zojuist door **{naam}** ingenomen. Ververs de pagina.")
                                                 else:
@@ -7933,7 +8156,9 @@ def toon_speler_view(nbb_nummer: str):
                                                 # Direct inschrijven - punten worden opgeslagen maar niet toegekend
                                                 punten_definitief = schrijf_in_als_scheids(nbb_nummer, wed['id'], "scheids_2", wedstrijden, scheidsrechters)
                                                 
-                                                if punten_definitief is None or (isinstance(punten_definitief, dict) and punten_definitief.get("error")):
+                                                if isinstance(punten_definitief, dict) and punten_definitief.get("error") == "conflict":
+                                                    toon_conflict_en_ververs()
+                                                elif punten_definitief is None or (isinstance(punten_definitief, dict) and punten_definitief.get("error")):
                                                     naam = punten_definitief.get("huidige_naam", "iemand anders") if isinstance(punten_definitief, dict) else "iemand anders"
                                                     toon_error_met_scroll(f"⚠️ Deze positie is zojuist door **{naam}** ingenomen. Ververs de pagina.")
                                                 else:
@@ -8001,7 +8226,7 @@ def toon_speler_view(nbb_nummer: str):
                                                             st.rerun()
                                     elif not al_scheids:
                                         # MSE kan zich aanmelden als begeleider, maar niet bij eigen wedstrijd
-                                        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                                        wed_datum = pidx.wed_datum(wed)
                                         heeft_eigen = heeft_eigen_wedstrijd(nbb_nummer, wed_datum, wedstrijden, scheidsrechters)
                                         if not heeft_eigen:
                                             if st.button("🎓 Begeleider", key=f"beg_aanmeld_{wed['id']}", help="Aanmelden als begeleider (niet fluiten)"):
@@ -8015,6 +8240,12 @@ def toon_speler_view(nbb_nummer: str):
 
 def toon_beheerder_view():
     """Toon het beheerderspaneel."""
+    # Tabellen voor de beheer tabs parallel ophalen (vult de sessie-caches)
+    db.prefetch_pagina_data(
+        "scheidsrechters", "wedstrijden", "instellingen", "beloningen", "beloningsinstellingen",
+        "klusjes", "beschikbare_klusjes", "vervangingsverzoeken", "begeleidingsuitnodigingen"
+    )
+    
     # IP info in sidebar
     with st.sidebar:
         st.markdown("### 🔧 Beheerder")
@@ -8028,6 +8259,13 @@ def toon_beheerder_view():
             else:
                 st.error("❌ Geblokkeerd")
     
+    # Supabase niet bereikbaar: data komt uit de lokale replica (alleen-lezen)
+    if db.is_replica_modus():
+        st.warning("⚠️ Database niet bereikbaar - gegevens komen uit de lokale replica. Wijzigingen worden niet opgeslagen.")
+    else:
+        # Ontbrekende punten, solo-markeringen en statussen aanvullen (op de achtergrond)
+        start_reconciliatie()
+    
     # Header met logo en refresh knop
     logo_path = Path(__file__).parent / "logo.png"
     if logo_path.exists():
@@ -8040,10 +8278,8 @@ def toon_beheerder_view():
         with col_refresh:
             st.write("")  # Spacing
             if st.button("🔄 Ververs data", help="Laad alle data opnieuw uit de database"):
-                # Clear alle database caches
-                cache_keys = [key for key in st.session_state.keys() if key.startswith("_db_cache_")]
-                for key in cache_keys:
-                    del st.session_state[key]
+                # Clear alle database caches (sessie + gedeelde snapshot, volledige herlaad)
+                db.invalideer_cache(volledig=True)
                 st.rerun()
     else:
         col_title, col_refresh = st.columns([4, 1])
@@ -8053,10 +8289,8 @@ def toon_beheerder_view():
         with col_refresh:
             st.write("")  # Spacing
             if st.button("🔄 Ververs data", help="Laad alle data opnieuw uit de database"):
-                # Clear alle database caches
-                cache_keys = [key for key in st.session_state.keys() if key.startswith("_db_cache_")]
-                for key in cache_keys:
-                    del st.session_state[key]
+                # Clear alle database caches (sessie + gedeelde snapshot, volledige herlaad)
+                db.invalideer_cache(volledig=True)
                 st.rerun()
     
     # Statistieken berekenen
@@ -8091,7 +8325,7 @@ def toon_beheerder_view():
         if wed.get("geannuleerd", False):
             continue
         
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(wed)
         
         # Nog te spelen?
         if wed_datum > nu:
@@ -8161,7 +8395,7 @@ def toon_beheerder_view():
     for wed_id, wed in wedstrijden.items():
         if wed.get("geannuleerd", False):
             continue
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(wed)
         if wed_datum < nu:
             continue
         
@@ -8376,9 +8610,40 @@ def toon_bevestigen_wedstrijden():
                 melding.append(f"{resultaat['tc_correcties']} TC-toewijzingen gecorrigeerd naar 1 pt")
             if resultaat['solo_correcties'] > 0:
                 melding.append(f"{resultaat['solo_correcties']} solo wedstrijden extra bonus toegevoegd")
+            if resultaat['conflicten'] > 0:
+                st.toast(f"⚠️ {resultaat['conflicten']} wedstrijd(en) intussen gewijzigd en overgeslagen")
             st.success(f"✅ {', '.join(melding)}!")
             st.rerun()
     
+    # Achtergrondcontrole: rapport van de laatste run
+    reconciliatie = get_reconciliatie_status()
+    rapport = reconciliatie["rapport"]
+    col_controle, col_controle_knop = st.columns([3, 1])
+    with col_controle:
+        if reconciliatie["bezig"]:
+            st.caption("🔄 Achtergrondcontrole bezig (ontbrekende punten, solo-markeringen, statussen)...")
+        elif rapport:
+            st.caption(f"🔄 Laatste achtergrondcontrole {rapport['gestart_op'].strftime('%d-%m %H:%M')}: "
+                       f"{rapport['punten_aangevuld']} punten aangevuld, "
+                       f"{rapport['solo_gecorrigeerd']} solo-markeringen, "
+                       f"{rapport['statussen_hersteld']} statussen hersteld ({rapport['duur']:.1f}s)")
+        else:
+            st.caption("🔄 Achtergrondcontrole nog niet uitgevoerd")
+    with col_controle_knop:
+        if st.button("Nu controleren", key="bev_reconciliatie", disabled=reconciliatie["bezig"],
+                     use_container_width=True):
+            start_reconciliatie(nu_uitvoeren=True)
+            st.rerun()
+    if rapport and (rapport["detail_log"] or rapport["fouten"] or rapport["conflicten"]):
+        with st.expander("📋 Details achtergrondcontrole", expanded=False):
+            for fout in rapport["fouten"]:
+                st.error(f"❌ {fout}")
+            if rapport["conflicten"]:
+                st.warning(f"⚠️ {len(rapport['conflicten'])} wedstrijd(en) intussen door iemand anders gewijzigd; "
+                           "deze worden bij de volgende run opnieuw bekeken.")
+            for regel in rapport["detail_log"]:
+                st.caption(f"• {regel}")
+    
     # Haal wedstrijden op die bevestigd moeten worden
     te_bevestigen = get_te_bevestigen_wedstrijden()
     
@@ -8560,7 +8825,8 @@ def toon_bevestigen_wedstrijden():
                             if wed["wed_id"] in wedstrijden_data:
                                 wedstrijden_data[wed["wed_id"]]["scheids_1_punten_berekend"] = punten
                                 wedstrijden_data[wed["wed_id"]]["scheids_1_punten_details"] = details
-                                sla_wedstrijd_op(wed["wed_id"], wedstrijden_data[wed["wed_id"]])
+                                if not sla_wedstrijd_op(wed["wed_id"], wedstrijden_data[wed["wed_id"]]):
+                                    toon_conflict_en_ververs()
                         
                         # Bouw gedetailleerde breakdown met exacte getallen
                         breakdown_parts = []
@@ -8709,7 +8975,8 @@ def toon_bevestigen_wedstrijden():
                                     w["scheids_1_status"] = "externe_invaller"
                                     w["scheids_1_bevestigd_op"] = datetime.now().isoformat()
                                     w["scheids_1_bevestigd_door"] = "TC"
-                                    sla_wedstrijd_op(wed["wed_id"], w)
+                                    if not sla_wedstrijd_op(wed["wed_id"], w):
+                                        toon_conflict_en_ververs()
                                     st.success("👤 Externe invaller geregistreerd")
                                     st.rerun()
                             
@@ -8740,7 +9007,8 @@ def toon_bevestigen_wedstrijden():
                                         punten_info = bereken_punten_voor_wedstrijd(invaller_nbb, wed["wed_id"], wedstrijden_data, scheidsrechters, "vervanging")
                                         w["scheids_1_punten_berekend"] = punten_info["totaal"]
                                         w["scheids_1_punten_details"] = punten_info
-                                        sla_wedstrijd_op(wed["wed_id"], w)
+                                        if not sla_wedstrijd_op(wed["wed_id"], w):
+                                            toon_conflict_en_ververs()
                                         # Ken punten toe
                                         if punten_info["totaal"] > 0:
                                             reden = punten_info.get("details", f"Invaller {wed['thuisteam']} vs {wed['uitteam']}")
@@ -8797,7 +9065,8 @@ def toon_bevestigen_wedstrijden():
                             if wed["wed_id"] in wedstrijden_data:
                                 wedstrijden_data[wed["wed_id"]]["scheids_2_punten_berekend"] = punten
                                 wedstrijden_data[wed["wed_id"]]["scheids_2_punten_details"] = details
-                                sla_wedstrijd_op(wed["wed_id"], wedstrijden_data[wed["wed_id"]])
+                                if not sla_wedstrijd_op(wed["wed_id"], wedstrijden_data[wed["wed_id"]]):
+                                    toon_conflict_en_ververs()
                         
                         # Bouw gedetailleerde breakdown met exacte getallen
                         breakdown_parts = []
@@ -8945,7 +9214,8 @@ def toon_bevestigen_wedstrijden():
                                     w["scheids_2_status"] = "externe_invaller"
                                     w["scheids_2_bevestigd_op"] = datetime.now().isoformat()
                                     w["scheids_2_bevestigd_door"] = "TC"
-                                    sla_wedstrijd_op(wed["wed_id"], w)
+                                    if not sla_wedstrijd_op(wed["wed_id"], w):
+                                        toon_conflict_en_ververs()
                                     st.success("👤 Externe invaller geregistreerd")
                                     st.rerun()
                             
@@ -8974,7 +9244,8 @@ def toon_bevestigen_wedstrijden():
                                         punten_info = bereken_punten_voor_wedstrijd(invaller_nbb, wed["wed_id"], wedstrijden_data, scheidsrechters, "vervanging")
                                         w["scheids_2_punten_berekend"] = punten_info["totaal"]
                                         w["scheids_2_punten_details"] = punten_info
-                                        sla_wedstrijd_op(wed["wed_id"], w)
+                                        if not sla_wedstrijd_op(wed["wed_id"], w):
+                                            toon_conflict_en_ververs()
                                         if punten_info["totaal"] > 0:
                                             reden = punten_info.get("details", f"Invaller {wed['thuisteam']} vs {wed['uitteam']}")
                                             voeg_punten_toe(invaller_nbb, punten_info["totaal"], reden, wed["wed_id"], punten_info.get("berekening"))
@@ -9006,7 +9277,7 @@ def toon_bevestigen_wedstrijden():
         recent_bevestigd = []
         for wed_id, wed in wedstrijden_data.items():
             try:
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
             except:
                 continue
             
@@ -9079,7 +9350,9 @@ def toon_bevestigen_wedstrijden():
                 with col_actie:
                     if st.button("🔙 Terugdraaien", key=f"terug_{item['wed_id']}_{item['positie']}", type="secondary"):
                         resultaat = draai_bevestiging_terug(item["wed_id"], item["positie"], "TC")
-                        if resultaat:
+                        if resultaat and resultaat.get("error") == "conflict":
+                            toon_conflict_en_ververs()
+                        elif resultaat:
                             st.success(f"✅ Teruggedraaid: {resultaat['actie']}")
                             st.rerun()
                         else:
@@ -9108,7 +9381,7 @@ def toon_analyse_dashboard():
         }
     
     for wed_id, wed in wedstrijden.items():
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(wed)
         if wed_datum > nu:
             continue  # Alleen gespeelde wedstrijden
         
@@ -10052,7 +10325,7 @@ def genereer_open_posities_alert(weekend_dagen: list, wedstrijden: dict, scheids
             if wed.get("type") == "uit" or wed.get("geannuleerd"):
                 continue
             try:
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
             except:
                 continue
             
@@ -10270,7 +10543,7 @@ def toon_weekend_overzicht():
         if wed.get("type") == "uit":
             continue
         try:
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
             if wed_datum > datetime.now() - timedelta(days=7):  # Afgelopen week + toekomst
                 datums_met_wedstrijden.add(wed_datum.date())
         except:
@@ -10366,7 +10639,7 @@ def toon_weekend_overzicht():
             if wed.get("type") == "uit":
                 continue
             try:
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
             except:
                 continue
                 
@@ -10490,7 +10763,7 @@ def toon_weekend_overzicht():
             if not (team_match(thuisteam, "MSE-1") or team_match(thuisteam, "M20-1")):
                 continue
             try:
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
             except:
                 continue
             if wed_datum.date() != gekozen_datum:
@@ -10593,7 +10866,7 @@ def toon_weekend_overzicht():
             if wed.get("type") == "uit" or wed.get("geannuleerd"):
                 continue
             try:
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
             except:
                 continue
             if wed_datum.date() == dag:
@@ -10702,7 +10975,7 @@ def toon_wedstrijden_beheer():
             if wed.get("geannuleerd"):
                 continue
             try:
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
                 dagen_met_wedstrijden.add(wed_datum.date())
             except:
                 pass
@@ -10732,7 +11005,7 @@ def toon_wedstrijden_beheer():
                 if wed.get("geannuleerd"):
                     continue
                 try:
-                    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                    wed_datum = pidx.wed_datum(wed)
                     if wed_datum.date() == gekozen_dag:
                         wedstrijden_op_dag.append((wed_id, wed, wed_datum))
                 except:
@@ -10761,6 +11034,7 @@ def toon_wedstrijden_beheer():
                 if st.button("🚫 Annuleer deze dag", type="primary", key="bevestig_annuleer_dag"):
                     # Annuleer alle wedstrijden op deze dag - per wedstrijd opslaan (voorkomt race conditions)
                     aantal_geannuleerd = 0
+                    aantal_conflicten = 0
                     for wed_id, wed, wed_datum in wedstrijden_op_dag:
                         # Log afmelding voor scheidsrechters
                         for positie in ["scheids_1", "scheids_2"]:
@@ -10784,8 +11058,10 @@ def toon_wedstrijden_beheer():
                             "scheids_2_punten_details": None,
                             "begeleider": None
                         }
-                        sla_wedstrijd_op(wed_id, wed_data)
-                        aantal_geannuleerd += 1
+                        if sla_wedstrijd_op(wed_id, wed_data):
+                            aantal_geannuleerd += 1
+                        else:
+                            aantal_conflicten += 1
                     
                     # Clear alle bewerk session states voor deze wedstrijden
                     for wed_id, wed, wed_datum in wedstrijden_op_dag:
@@ -10793,6 +11069,8 @@ def toon_wedstrijden_beheer():
                             del st.session_state[f"bewerk_{wed_id}"]
                     
                     st.session_state.toon_annuleer_dag = False
+                    if aantal_conflicten > 0:
+                        st.toast(f"⚠️ {aantal_conflicten} wedstrijd(en) intussen gewijzigd en niet geannuleerd")
                     st.success(f"✅ {aantal_geannuleerd} wedstrijden geannuleerd, {len(unieke_scheids)} scheidsrechters afgemeld!")
                     st.rerun()
             
@@ -10857,7 +11135,7 @@ def toon_bewerk_formulier(wed: dict, wedstrijden: dict, scheidsrechters: dict, f
     st.markdown("**📝 Wedstrijd bewerken**")
     
     wed_data = wedstrijden[wed["id"]]
-    huidige_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+    huidige_datum = pidx.wed_datum(wed)
     
     # Unieke form key met context om duplicates te voorkomen
     with st.form(f"bewerk_form_{wed['id']}_{form_context}"):
@@ -11047,7 +11325,7 @@ def toon_wedstrijden_lijst(wedstrijden: dict, scheidsrechters: dict, instellinge
     
     # Toon wedstrijden
     for wed in wed_lijst:
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(wed)
         dag = ["Ma", "Di", "Wo", "Do", "Vr", "Za", "Zo"][wed_datum.weekday()]
         niveau_tekst = instellingen["niveaus"].get(str(wed["niveau"]), "")
         
@@ -11165,7 +11443,8 @@ def toon_wedstrijden_lijst(wedstrijden: dict, scheidsrechters: dict, instellinge
                                 nieuwe_zoekt_1 = st.checkbox("Zoekt", value=zoekt_1, key=f"zoekt1_{wed['id']}", help="Zoekt vervanging")
                                 if nieuwe_zoekt_1 != zoekt_1:
                                     wedstrijden[wed["id"]]["scheids_1_zoekt_vervanging"] = nieuwe_zoekt_1
-                                    sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                    if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                        toon_conflict_en_ververs()
                                     st.toast("✅ Zoekt vervanging aan" if nieuwe_zoekt_1 else "✅ Zoekt vervanging uit")
                         else:
                             # NIEUW: Toon afmeldingen voor deze positie
@@ -11199,12 +11478,15 @@ def toon_wedstrijden_lijst(wedstrijden: dict, scheidsrechters: dict, instellinge
                                             st.error("⚠️ Wedstrijd niet gevonden. Ververs de pagina.")
                                         elif isinstance(resultaat, dict) and resultaat.get("error") == "bezet":
                                             toon_error_met_scroll(f"⚠️ Positie al bezet door **{resultaat['huidige_naam']}**. Ververs de pagina.")
+                                        elif isinstance(resultaat, dict) and resultaat.get("error") == "conflict":
+                                            toon_conflict_en_ververs()
                                         else:
                                             if geeft_dispensatie:
                                                 # Sla dispensatie op bij de wedstrijd
                                                 wedstrijden[wed["id"]]["scheids_1_dispensatie"] = True
                                                 wedstrijden[wed["id"]]["scheids_1_dispensatie_reden"] = gekozen_kandidaat["dispensatie_reden"]
-                                                sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                                if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                                    toon_conflict_en_ververs()
                                             st.rerun()
                             else:
                                 st.warning("Geen geschikte kandidaten")
@@ -11226,7 +11508,8 @@ def toon_wedstrijden_lijst(wedstrijden: dict, scheidsrechters: dict, instellinge
                                 nieuwe_zoekt_2 = st.checkbox("Zoekt", value=zoekt_2, key=f"zoekt2_{wed['id']}", help="Zoekt vervanging")
                                 if nieuwe_zoekt_2 != zoekt_2:
                                     wedstrijden[wed["id"]]["scheids_2_zoekt_vervanging"] = nieuwe_zoekt_2
-                                    sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                    if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                        toon_conflict_en_ververs()
                                     st.toast("✅ Zoekt vervanging aan" if nieuwe_zoekt_2 else "✅ Zoekt vervanging uit")
                         else:
                             # NIEUW: Toon afmeldingen voor deze positie
@@ -11260,11 +11543,14 @@ def toon_wedstrijden_lijst(wedstrijden: dict, scheidsrechters: dict, instellinge
                                             st.error("⚠️ Wedstrijd niet gevonden. Ververs de pagina.")
                                         elif isinstance(resultaat, dict) and resultaat.get("error") == "bezet":
                                             toon_error_met_scroll(f"⚠️ Positie al bezet door **{resultaat['huidige_naam']}**. Ververs de pagina.")
+                                        elif isinstance(resultaat, dict) and resultaat.get("error") == "conflict":
+                                            toon_conflict_en_ververs()
                                         else:
                                             if geeft_dispensatie:
                                                 wedstrijden[wed["id"]]["scheids_2_dispensatie"] = True
                                                 wedstrijden[wed["id"]]["scheids_2_dispensatie_reden"] = gekozen_kandidaat["dispensatie_reden"]
-                                                sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                                if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                                    toon_conflict_en_ververs()
                                             st.rerun()
                             else:
                                 st.warning("Geen geschikte kandidaten")
@@ -11277,7 +11563,8 @@ def toon_wedstrijden_lijst(wedstrijden: dict, scheidsrechters: dict, instellinge
                             st.write(f"🎓 {begeleider_naam}")
                             if st.button("Verwijderen", key=f"del_beg_{wed['id']}"):
                                 wedstrijden[wed["id"]]["begeleider"] = None
-                                sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                    toon_conflict_en_ververs()
                                 st.rerun()
                         else:
                             # Toon alleen MSE's als opties
@@ -11293,7 +11580,8 @@ def toon_wedstrijden_lijst(wedstrijden: dict, scheidsrechters: dict, instellinge
                                     idx = keuzes.index(selectie) - 1
                                     if st.button("Toewijzen", key=f"assign_beg_{wed['id']}"):
                                         wedstrijden[wed["id"]]["begeleider"] = mse_kandidaten[idx][0]
-                                        sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                                        if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                            toon_conflict_en_ververs()
                                         st.rerun()
                             else:
                                 st.caption("Geen MSE beschikbaar")
@@ -11307,7 +11595,8 @@ def toon_wedstrijden_lijst(wedstrijden: dict, scheidsrechters: dict, instellinge
                                                   help="1 scheidsrechter is voldoende voor deze wedstrijd")
                         if nieuwe_solo != solo_compleet:
                             wedstrijden[wed["id"]]["solo_compleet"] = nieuwe_solo
-                            sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]])
+                            if not sla_wedstrijd_op(wed["id"], wedstrijden[wed["id"]]):
+                                toon_conflict_en_ververs()
                             st.toast("✅ Solo aan" if nieuwe_solo else "✅ Solo uit")
                         
                         # Bewerk toggle
@@ -11389,7 +11678,7 @@ def toon_wedstrijden_lijst(wedstrijden: dict, scheidsrechters: dict, instellinge
                     st.markdown("**📝 Uitwedstrijd bewerken**")
                     
                     wed_data = wedstrijden[wed["id"]]
-                    huidige_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                    huidige_datum = pidx.wed_datum(wed)
                     
                     with st.form(f"bewerk_uit_form_{wed['id']}"):
                         col_d, col_t, col_r = st.columns(3)
@@ -11528,7 +11817,7 @@ def toon_scheidsrechters_beheer():
     for wed_id, wed in wedstrijden.items():
         if wed.get("type", "thuis") != "thuis" or wed.get("geannuleerd", False):
             continue
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(wed)
         wed_dag_str = wed_datum.strftime("%Y-%m-%d")
         if wed_dag_str >= vandaag_str:
             wedstrijd_dagen_set.add(wed_dag_str)
@@ -11600,7 +11889,7 @@ def toon_scheidsrechters_beheer():
     overzicht_data = []
     for nbb, scheids in sorted(gefilterde_scheidsrechters.items(), key=lambda x: x[1]["naam"]):
         niveau_stats = tel_wedstrijden_op_eigen_niveau(nbb)
-        speler_stats = get_speler_stats(nbb)
+        speler_stats = get_speler_stats(nbb, historie=False)
         
         # Status icoon bepalen
         status = scheids.get("scheids_status", "Actief")
@@ -11790,7 +12079,7 @@ def toon_scheidsrechters_beheer():
                             continue
                         if wed.get("geannuleerd", False):
                             continue
-                        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                        wed_datum = pidx.wed_datum(wed)
                         wed_dag_str = wed_datum.strftime("%Y-%m-%d")
                         if wed_dag_str >= vandaag_str:
                             wedstrijd_dagen.add(wed_dag_str)
@@ -11881,7 +12170,7 @@ def toon_scheidsrechters_beheer():
                                     for wed_id, wed in wedstrijden.items():
                                         if wed.get("type", "thuis") != "thuis" or wed.get("geannuleerd", False):
                                             continue
-                                        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                                        wed_datum = pidx.wed_datum(wed)
                                         wed_dag_str = wed_datum.strftime("%Y-%m-%d")
                                         
                                         if wed_dag_str == dag_str:
@@ -11897,8 +12186,8 @@ def toon_scheidsrechters_beheer():
                                                 wedstrijden[wed_id][f"{positie}_zoekt_vervanging"] = False
                                                 wedstrijden[wed_id][f"{positie}_punten_berekend"] = None
                                                 wedstrijden[wed_id][f"{positie}_punten_details"] = None
-                                                sla_wedstrijd_op(wed_id, wedstrijden[wed_id])
-                                                uitgeschreven_wedstrijden.append(f"{wed['thuisteam']} vs {wed['uitteam']} ({wed_datum.strftime('%d-%m')})")
+                                                if sla_wedstrijd_op(wed_id, wedstrijden[wed_id]):
+                                                    uitgeschreven_wedstrijden.append(f"{wed['thuisteam']} vs {wed['uitteam']} ({wed_datum.strftime('%d-%m')})")
                             
                             scheidsrechters[nbb] = {
                                 "naam": nieuwe_naam,
@@ -11980,7 +12269,7 @@ def toon_scheidsrechters_beheer():
                         for wed_id, wed in laad_wedstrijden().items():
                             if wed.get("type", "thuis") != "thuis" or wed.get("geannuleerd", False):
                                 continue
-                            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                            wed_datum = pidx.wed_datum(wed)
                             wed_dag_str = wed_datum.strftime("%Y-%m-%d")
                             if wed_dag_str >= vandaag_str:
                                 wedstrijd_dagen.add(wed_dag_str)
@@ -12160,7 +12449,7 @@ def toon_capaciteit_monitor():
             continue
         if wed.get("geannuleerd", False):
             continue
-        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_datum = pidx.wed_datum(wed)
         if wed_datum > nu:
             toekomstige_wedstrijden[wed_id] = wed
     
@@ -12551,19 +12840,15 @@ def toon_beloningen_beheer():
             if "_registratie_log_cache" in st.session_state:
                 del st.session_state["_registratie_log_cache"]
             
-            # Stap 1: Herbereken alle wedstrijdpunten
+            # Herbereken alle wedstrijdpunten (totalen lopen mee via correctie-events)
             herbereken_result = herbereken_alle_wedstrijdpunten()
             
-            # Stap 2: Sync beloningen totalen
-            sync_result = synchroniseer_beloningen()
-            
             st.session_state[versie_key] = APP_VERSIE
             
             # Toon resultaat alleen als er iets gewijzigd is
-            wijzigingen = herbereken_result["punten_gewijzigd"] + sync_result["correcties"]
-            if wijzigingen > 0:
+            if herbereken_result["punten_gewijzigd"] > 0:
                 st.info(f"ℹ️ Update v{APP_VERSIE}: {herbereken_result['punten_gewijzigd']} wedstrijdpunten en "
-                        f"{sync_result['correcties']} totalen automatisch bijgewerkt.")
+                        f"{herbereken_result['totalen_gecorrigeerd']} totalen automatisch bijgewerkt.")
     
     # Lichtgewicht consistentie-check (na eventuele auto-correctie)
     inconsistenties = check_beloningen_consistentie()
@@ -12617,7 +12902,7 @@ def toon_beloningen_beheer():
             )[1]
         
         # Verzamel alle mutaties
-        beloningen = laad_beloningen()
+        beloningen = db.laad_beloningen_met_historie()
         nu = datetime.now()
         cutoff = nu - timedelta(days=dagen_terug)
         
@@ -12754,6 +13039,8 @@ def toon_beloningen_beheer():
         if not ranglijst:
             st.info("Nog geen punten geregistreerd.")
         else:
+            # Logregels van alle spelers in één keer (get_speler_stats leest hieruit)
+            db.laad_beloningen_met_historie()
             for idx, speler in enumerate(ranglijst, 1):
                 # Bepaal medaille
                 if idx == 1:
@@ -12807,7 +13094,7 @@ def toon_beloningen_beheer():
                                 wed_datum_str = ""
                                 if wed.get("datum"):
                                     try:
-                                        wed_datum_str = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M").strftime("%d-%m-%Y %H:%M")
+                                        wed_datum_str = pidx.wed_datum(wed).strftime("%d-%m-%Y %H:%M")
                                     except:
                                         wed_datum_str = wed["datum"]
                                 
@@ -12865,7 +13152,7 @@ def toon_beloningen_beheer():
             geselecteerde_nbb = speler_opties[geselecteerde_speler]
             
             # Toon huidige status
-            stats = get_speler_stats(geselecteerde_nbb)
+            stats = get_speler_stats(geselecteerde_nbb, historie=False)
             
             # Twee kolommen: Punten links, Strikes rechts
             col_punten, col_strikes = st.columns(2)
@@ -12938,8 +13225,7 @@ def toon_beloningen_beheer():
             # Historie tonen (compact)
             with st.expander("📜 Aanpassingshistorie", expanded=False):
                 # Haal punten_log op indien aanwezig
-                beloningen = laad_beloningen()
-                speler_data = beloningen.get("spelers", {}).get(geselecteerde_nbb, {})
+                speler_data = db.laad_speler_historie(geselecteerde_nbb)
                 punten_log = speler_data.get("punten_log", [])
                 strike_log = speler_data.get("strike_log", [])
                 
@@ -13004,7 +13290,7 @@ def toon_beloningen_beheer():
         # Filter spelers met strikes
         spelers_met_strikes = []
         for nbb, s in scheidsrechters.items():
-            stats = get_speler_stats(nbb)
+            stats = get_speler_stats(nbb, historie=False)
             if stats["strikes"] > 0:
                 spelers_met_strikes.append({
                     "nbb": nbb,
@@ -13103,7 +13389,7 @@ def toon_beloningen_beheer():
                 if not wed:
                     continue
                 
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
                 aanvrager = scheidsrechters.get(verzoek["aanvrager_nbb"], {}).get("naam", "Onbekend")
                 vervanger = scheidsrechters.get(verzoek["vervanger_nbb"], {}).get("naam", "Onbekend")
                 
@@ -13169,7 +13455,7 @@ def toon_beloningen_beheer():
             if not begeleider_nbb:
                 continue
             
-            wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+            wed_datum = pidx.wed_datum(wed)
             wed_eind = wed_datum + timedelta(hours=1, minutes=30)
             if wed_eind > nu:
                 continue  # Nog niet gespeeld
@@ -13298,7 +13584,7 @@ def toon_beloningen_beheer():
                 continue
             
             try:
-                wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                wed_datum = pidx.wed_datum(wed)
             except:
                 continue
             
@@ -13423,7 +13709,7 @@ def toon_beloningen_beheer():
         st.write("**Spelers met strikes**")
         st.caption("Overzicht van alle spelers die strikes hebben openstaan")
         
-        beloningen = laad_beloningen()
+        beloningen = db.laad_beloningen_met_historie()
         scheidsrechters_data = laad_scheidsrechters()
         
         # Verzamel spelers met strikes > 0
@@ -13514,7 +13800,29 @@ def toon_beloningen_beheer():
         st.write("**1. Wedstrijdpunten herberekenen**")
         st.caption("Berekent de punten per wedstrijd opnieuw op basis van de huidige regels. "
                    "Gebruik dit als puntenregels zijn gewijzigd (bijv. coach-bonus, solo-bonus).")
-        if st.button("🔁 Herbereken alle wedstrijdpunten", key="oh_herbereken", use_container_width=True):
+        col_voorbeeld, col_herbereken = st.columns(2)
+        with col_voorbeeld:
+            voorbeeld_gevraagd = st.button("🔍 Bekijk wijzigingen", key="oh_herbereken_voorbeeld", use_container_width=True)
+        with col_herbereken:
+            herbereken_gevraagd = st.button("🔁 Herbereken alle wedstrijdpunten", key="oh_herbereken", use_container_width=True)
+        
+        if voorbeeld_gevraagd:
+            # Alleen berekenen, niets opslaan
+            if "_registratie_log_cache" in st.session_state:
+                del st.session_state["_registratie_log_cache"]
+            voorbeeld = bereken_puntenwijzigingen(laad_wedstrijden(), laad_scheidsrechters())
+            if voorbeeld["detail_log"]:
+                st.info(f"ℹ️ {len(voorbeeld['detail_log'])} van {voorbeeld['gecontroleerd']} posities krijgen andere punten "
+                        f"({len(voorbeeld['wijzigingen'])} posities worden bijgewerkt). Er is nog niets opgeslagen.")
+                verschil = sum((item["nieuw"] or 0) - (item["oud"] or 0) for item in voorbeeld["detail_log"])
+                st.caption(f"Totaal verschil: {verschil:+d} punten")
+                for item in voorbeeld["detail_log"]:
+                    st.caption(f"• {item['naam']} ({item['wed_id']}): {item['oud']} → {item['nieuw']} ({item['details']})")
+            else:
+                st.success(f"✅ {voorbeeld['gecontroleerd']} posities gecontroleerd, alle punten kloppen "
+                           f"({len(voorbeeld['wijzigingen'])} posities krijgen alleen aangevulde details).")
+        
+        if herbereken_gevraagd:
             if "_registratie_log_cache" in st.session_state:
                 del st.session_state["_registratie_log_cache"]
             resultaat = herbereken_alle_wedstrijdpunten()
@@ -13524,17 +13832,31 @@ def toon_beloningen_beheer():
                     st.caption(f"• {item['naam']}: {item['oud']} → {item['nieuw']} ({item['details']})")
             else:
                 st.success(f"✅ {resultaat['bijgewerkt']} posities gecontroleerd, alle punten kloppen.")
+            if resultaat["conflicten"]:
+                st.warning(f"⚠️ {len(resultaat['conflicten'])} wedstrijd(en) zijn intussen door iemand anders gewijzigd "
+                           "en niet bijgewerkt. Herbereken nogmaals.")
         
         st.divider()
         
-        # Tool 2: Sync beloningen
-        st.write("**2. Beloningen synchroniseren**")
-        st.caption("Herberekent de puntentotalen per speler op basis van alle wedstrijdpunten + handmatige aanpassingen. "
-                   "Gebruik dit nadat wedstrijdpunten zijn herberekend of als totalen niet kloppen.")
-        if st.button("🔄 Sync beloningen", key="oh_sync", use_container_width=True):
-            resultaat = synchroniseer_beloningen()
-            if resultaat["correcties"] > 0:
-                st.success(f"✅ {resultaat['correcties']} speler(s) gecorrigeerd! ({resultaat['spelers_gecontroleerd']} gecontroleerd)")
+        # Tool 2: Controle beloningen
+        st.write("**2. Beloningen controleren**")
+        st.caption("Vergelijkt de puntentotalen per speler met alle wedstrijdpunten + handmatige aanpassingen. "
+                   "De totalen worden bij elke bevestiging, no-show, terugdraaiing en aanpassing direct bijgewerkt; "
+                   "deze controle wijzigt niets. Afwijkingen kun je hierna met correctieboekingen rechtzetten.")
+        col_sync1, col_sync2 = st.columns(2)
+        with col_sync1:
+            controle_gevraagd = st.button("🔍 Controleer beloningen", key="oh_sync", use_container_width=True)
+        with col_sync2:
+            correctie_gevraagd = st.button("🔄 Corrigeer afwijkingen", key="oh_sync_corrigeer", use_container_width=True)
+        
+        if controle_gevraagd or correctie_gevraagd:
+            resultaat = synchroniseer_beloningen(corrigeer=correctie_gevraagd)
+            if resultaat["afwijkingen"] > 0:
+                if correctie_gevraagd:
+                    st.success(f"✅ {resultaat['gecorrigeerd']} speler(s) gecorrigeerd! ({resultaat['spelers_gecontroleerd']} gecontroleerd)")
+                else:
+                    st.warning(f"⚠️ {resultaat['afwijkingen']} speler(s) wijken af "
+                               f"({resultaat['spelers_gecontroleerd']} gecontroleerd, verschil: {resultaat['totaal_verschil']} punten)")
                 scheidsrechters_sync = laad_scheidsrechters()
                 for item in resultaat.get("detail_log", []):
                     naam = scheidsrechters_sync.get(item["nbb"], {}).get("naam", item["nbb"])
@@ -13552,10 +13874,13 @@ def toon_beloningen_beheer():
                 if "_registratie_log_cache" in st.session_state:
                     del st.session_state["_registratie_log_cache"]
                 herbereken_result = herbereken_alle_wedstrijdpunten()
-                sync_result = synchroniseer_beloningen()
+                sync_result = synchroniseer_beloningen(corrigeer=True)
             
             st.success(f"✅ Klaar! {herbereken_result['punten_gewijzigd']} wedstrijdpunten gewijzigd, "
-                       f"{sync_result['correcties']} totalen gecorrigeerd.")
+                       f"{herbereken_result['totalen_gecorrigeerd'] + sync_result['gecorrigeerd']} totalen gecorrigeerd.")
+            if herbereken_result["conflicten"]:
+                st.warning(f"⚠️ {len(herbereken_result['conflicten'])} wedstrijd(en) zijn intussen door iemand anders "
+                           "gewijzigd en niet bijgewerkt. Voer de correctie nogmaals uit.")
             if herbereken_result["detail_log"]:
                 with st.expander("Details wedstrijdpunten"):
                     for item in herbereken_result["detail_log"]:
@@ -13566,7 +13891,8 @@ def toon_beloningen_beheer():
         # Tool 4: Herstel bevestigingsstatussen
         st.write("**4. Herstel bevestigingsstatussen**")
         st.caption("Herstel verloren bevestigingsstatussen (gefloten/no-show) uit de beloningen data. "
-                   "Alleen posities met status NULL worden hersteld — bestaande statussen worden nooit overschreven.")
+                   "Alleen posities met status NULL worden hersteld — bestaande statussen worden nooit overschreven. "
+                   "De achtergrondcontrole doet dit ook automatisch (zie ✅ Bevestigen).")
         
         # Dry run - toon wat er hersteld zou worden
         herstel_data = herstel_bevestigingsstatussen()
@@ -13603,7 +13929,8 @@ def toon_beloningen_beheer():
                         punten_tekst = f"{item['punten']} → {item['nieuwe_punten']} pt"
                     st.caption(f"✅ {item['scheids_naam']} ({pos_label}) — {item['wed_label']} — {punten_tekst}{solo_label}")
                 
-                st.info("💡 Draai nu 'Sync beloningen' om de puntentotalen bij te werken met de herberekende solo-punten.")
+                st.info("💡 De puntentotalen zijn bijgewerkt met de herberekende solo-punten. "
+                        "Gebruik 'Controleer beloningen' om dit na te lopen.")
                 st.rerun()
         
         st.divider()
@@ -13611,7 +13938,8 @@ def toon_beloningen_beheer():
         # Tool 5: Solo-correctie
         st.write("**5. Solo wedstrijden corrigeren**")
         st.caption("Detecteert wedstrijden met status 'gefloten' waar de andere positie leeg is. "
-                   "Markeert deze als solo_compleet en herberekent de punten met solo bonus.")
+                   "Markeert deze als solo_compleet en herberekent de punten met solo bonus. "
+                   "De achtergrondcontrole doet dit ook automatisch (zie ✅ Bevestigen).")
         
         solo_data = detecteer_ontbrekende_solo()
         
@@ -13642,7 +13970,7 @@ def toon_beloningen_beheer():
                         pos_label = "1e" if item["positie"] == "scheids_1" else "2e"
                         st.caption(f"🎯 {item['scheids_naam']} ({pos_label}) — {item['wed_label']} "
                                    f"— {item['oud_punten']} → {item['nieuw_punten']} pt ({item['details']})")
-                    st.info("💡 Draai nu 'Sync beloningen' om de puntentotalen bij te werken.")
+                    st.info("💡 De puntentotalen zijn bijgewerkt. Gebruik 'Controleer beloningen' om dit na te lopen.")
                 else:
                     st.warning("⚠️ Geen wedstrijden konden worden gecorrigeerd. Zie fouten hierboven.")
 
@@ -13714,8 +14042,8 @@ def toon_instellingen_beheer():
                     if wed.get("niveau") != nieuw_niveau:
                         wedstrijden[wed_id]["niveau"] = nieuw_niveau
                         # Sla individueel op om andere velden te behouden
-                        sla_wedstrijd_op(wed_id, wedstrijden[wed_id])
-                        aangepast += 1
+                        if sla_wedstrijd_op(wed_id, wedstrijden[wed_id]):
+                            aangepast += 1
             
             if aangepast > 0:
                 st.success(f"✅ {aangepast} wedstrijd(en) bijgewerkt naar correct niveau!")
@@ -13727,7 +14055,7 @@ def toon_instellingen_beheer():
                 for wed_id, wed in wedstrijden.items():
                     # Alleen toekomstige wedstrijden
                     try:
-                        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                        wed_datum = pidx.wed_datum(wed)
                         if wed_datum < nu:
                             continue
                     except:
@@ -14295,6 +14623,24 @@ def toon_instellingen_beheer():
         
         with st.expander("📋 Changelog"):
             st.markdown(APP_CHANGELOG)
+        
+        with st.expander("⚡ Rekencache"):
+            st.caption("Bewaarde kandidaten, beschikbare wedstrijden en pools van deze sessie. "
+                       "De cache wordt geleegd zodra er iets wordt opgeslagen.")
+            memo_stats = get_planning_memo().statistieken()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Treffers", memo_stats["treffers"])
+                st.metric("Missers", memo_stats["missers"])
+            with col2:
+                st.metric("Hit-ratio", f"{memo_stats['hit_ratio']:.0%}")
+                st.metric("Bewaard", f"{memo_stats['grootte']}/{memo_stats['max_grootte']}")
+            with col3:
+                st.metric("Invalidaties", memo_stats["invalidaties"])
+                st.metric("Data-generatie", memo_stats["generatie"] if memo_stats["generatie"] is not None else "-")
+            if st.button("🔄 Statistieken resetten", key="reset_rekencache"):
+                get_planning_memo().leeg()
+                st.rerun()
 
 def bepaal_niveau_uit_team(teamnaam: str) -> int:
     """Bepaal niveau 1-5 uit de teamnaam van Waterdragers.
@@ -14531,7 +14877,8 @@ def toon_synchronisatie_tab():
                                         # Directe UPDATE van alleen het nbb_wedstrijd_nr veld
                                         supabase = db.get_supabase_client()
                                         update_result = supabase.table("wedstrijden").update({
-                                            "nbb_wedstrijd_nr": nbb_nr
+                                            "nbb_wedstrijd_nr": nbb_nr,
+                                            "updated_at": datetime.now().isoformat()
                                         }).eq("wed_id", wed_id).execute()
                                         
                                         if update_result.data and len(update_result.data) > 0:
@@ -14549,8 +14896,7 @@ def toon_synchronisatie_tab():
                             status_text.empty()
                             
                             # Invalideer cache zodat we verse data krijgen
-                            if "_db_cache_wedstrijden" in st.session_state:
-                                del st.session_state["_db_cache_wedstrijden"]
+                            db.invalideer_cache("wedstrijden")
                             
                             # Toon resultaat
                             if bijgewerkt > 0:
@@ -14618,8 +14964,8 @@ def toon_synchronisatie_tab():
                                     
                                     # Opslaan
                                     try:
-                                        sla_wedstrijd_op(wed_id, wed_data)
-                                        toegevoegd += 1
+                                        if sla_wedstrijd_op(wed_id, wed_data):
+                                            toegevoegd += 1
                                     except Exception as e:
                                         st.error(f"Fout bij toevoegen: {e}")
                             
@@ -14902,8 +15248,10 @@ def toon_synchronisatie_tab():
                                             update_data.pop('geannuleerd_op', None)
 
                                         try:
-                                            sla_wedstrijd_op(wed_id, update_data)
-                                            bijgewerkt_bob += 1
+                                            if sla_wedstrijd_op(wed_id, update_data):
+                                                bijgewerkt_bob += 1
+                                            else:
+                                                fouten.append(f"⚠️ CP→BOB {wed_info}: intussen gewijzigd in BOB, overgeslagen")
                                         except Exception as e:
                                             fouten.append(f"❌ CP→BOB {wed_info}: {str(e)}")
                                     else:
@@ -14949,8 +15297,7 @@ def toon_synchronisatie_tab():
                                 st.warning("Los de fouten op en probeer opnieuw.")
                             else:
                                 # Invalideer cache en rerun
-                                if "_db_cache_wedstrijden" in st.session_state:
-                                    del st.session_state["_db_cache_wedstrijden"]
+                                db.invalideer_cache("wedstrijden")
                                 del st.session_state['cp_sync_resultaat']
                                 del st.session_state['cp_sync_uitgevoerd']
                                 st.rerun()
@@ -15954,7 +16301,7 @@ def toon_import_export():
                 for wed_id, wed in sorted(wedstrijden.items(), key=lambda x: x[1]["datum"]):
                     if wed.get("type", "thuis") != "thuis":
                         continue
-                    datum_obj = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                    datum_obj = pidx.wed_datum(wed)
                     scheids_1_naam = scheidsrechters.get(wed.get("scheids_1", ""), {}).get("naam", "")
                     scheids_2_naam = scheidsrechters.get(wed.get("scheids_2", ""), {}).get("naam", "")
                     begeleider_naam = scheidsrechters.get(wed.get("begeleider", ""), {}).get("naam", "")
@@ -15976,7 +16323,7 @@ def toon_import_export():
                 
                 output = "datum,tijd,thuisteam,uitteam,niveau,type,vereist_bs2,reistijd_minuten\n"
                 for wed_id, wed in sorted(wedstrijden.items(), key=lambda x: x[1]["datum"]):
-                    datum_obj = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+                    datum_obj = pidx.wed_datum(wed)
                     wed_type = wed.get("type", "thuis")
                     
                     output += f"{datum_obj.strftime('%Y-%m-%d')},{datum_obj.strftime('%H:%M')},"
@@ -16034,7 +16381,7 @@ def toon_import_export():
             
             if st.button("📥 Beloningen detail", use_container_width=True):
                 scheidsrechters = laad_scheidsrechters()
-                beloningen = laad_beloningen()
+                beloningen = db.laad_beloningen_met_historie()
                 
                 output = "nbb_nummer,naam,punten,strikes,aantal_registraties\n"
                 for nbb, data in beloningen.get("spelers", {}).items():
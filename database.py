@@ -18,12 +18,23 @@ DB_VERSIE = "1.32.21"
 import os
 import streamlit as st
 from supabase import create_client, Client
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import hashlib
 import secrets
 import requests
 import re
+import threading
+import copy
+import functools
+import time
+import queue
+import atexit
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from planning_index import WedstrijdRecord
 
 def _get_device_fingerprint() -> str:
     """Genereer een fingerprint gebaseerd op browser/device info"""
@@ -97,6 +108,586 @@ def get_supabase_client() -> Client:
     """Maak een Supabase client (cached)"""
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# ============================================================
+# GEDEELDE SNAPSHOT CACHE (PROCES-BREED)
+# ============================================================
+#
+# st.session_state is per browsersessie. Zonder gedeelde laag haalt elke speler
+# die zijn /?nbb= link opent de volledige wedstrijden- en scheidsrechterstabel
+# opnieuw op uit Supabase (op deadline-avonden 100+ keer binnen enkele minuten).
+#
+# De snapshot store bewaart per tabel één snapshot voor het hele proces:
+# - Een snapshot wordt NOOIT in-place gewijzigd; sessies krijgen een eigen
+#   (diepe) kopie in st.session_state, zodat wijzigingen in een sessie niet
+#   bij andere sessies lekken.
+# - Schrijffuncties schrijven door naar de database en vervangen daarna de
+#   snapshot (copy-on-write) of invalideren hem.
+# - SNAPSHOT_MAX_LEEFTIJD is een vangnet voor schrijfacties die buiten
+#   database.py om gaan (directe Supabase updates, andere app-instantie).
+# - Tabellen met een delta-loader (wedstrijden) worden na verloop of
+#   invalidatie incrementeel ververst op basis van een updated_at watermark;
+#   eens per VOLLEDIGE_HERLAAD_INTERVAL volgt een volledige herlaad als
+#   controle (vangt rijen zonder updated_at of met afwijkende klok).
+# - data_generatie() hoogt op bij elke write-through of invalidatie (proces-breed).
+#   klassement_generatie() alleen bij wijzigingen in punten of in de kolommen
+#   van _KLASSEMENT_KOLOMMEN, zodat het gedeelde klassement niet bij elke
+#   blokkade of vervangingsvlag opnieuw uit de database opgebouwd wordt.
+#   sessie_generatie() telt alleen die van de eigen sessie: afgeleide structuren
+#   over de sessie-data (planning_index, rekencache) verlopen alleen daardoor,
+#   want schrijfacties van andere sessies komen pas na een nieuwe load binnen.
+# ============================================================
+
+SNAPSHOT_MAX_LEEFTIJD = 300  # seconden
+VOLLEDIGE_HERLAAD_INTERVAL = 1800  # seconden
+DELTA_MARGE = 120  # seconden terug vanaf watermark (klokverschil tussen instanties)
+
+# Snapshots die afgeleid zijn van dezelfde databasetabel en mee moeten invalideren
+_AFGELEIDE_SNAPSHOTS = {
+    "wedstrijden": ["wedstrijden_planning", "wedstrijd_details"],
+    "beloningen": ["beloningen_historie", "beloningen_spelers"],
+}
+
+# Kolommen die het punten klassement voeden (namen, niveau, minimum, toewijzingen)
+_KLASSEMENT_KOLOMMEN = {
+    "wedstrijden": ("datum", "scheids_1", "scheids_2", "geannuleerd", "niveau"),
+    "scheidsrechters": ("naam", "niveau_1e_scheids", "min_wedstrijden"),
+}
+
+@st.cache_resource
+def _get_snapshot_store() -> dict:
+    """Proces-brede snapshot store, gedeeld door alle sessies (cached)"""
+    return {"lock": threading.Lock(), "tabel_locks": {}, "tabellen": {}}
+
+@st.cache_resource
+def _get_data_generatie() -> dict:
+    """Proces-brede tellers: elke schrijfactie, en alleen klassement-wijzigingen (cached)"""
+    return {"lock": threading.Lock(), "generatie": 0, "klassement": 0}
+
+def _verhoog_generatie():
+    """Markeer dat de data gewijzigd is (afgeleide indexen worden herbouwd)"""
+    teller = _get_data_generatie()
+    with teller["lock"]:
+        teller["generatie"] += 1
+    if _heeft_sessie():
+        st.session_state["_db_sessie_generatie"] = st.session_state.get("_db_sessie_generatie", 0) + 1
+
+def _verhoog_klassement_generatie():
+    """Markeer dat punten of toewijzingen gewijzigd zijn (klassement wordt herbouwd)"""
+    teller = _get_data_generatie()
+    with teller["lock"]:
+        teller["klassement"] += 1
+
+def _heeft_sessie() -> bool:
+    """Draait dit in een script run van een sessie (niet in een achtergrondthread)?"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return False
+    return get_script_run_ctx() is not None
+
+def data_generatie() -> int:
+    """Huidige data-generatie; verandert na elke schrijfactie of invalidatie"""
+    return _get_data_generatie()["generatie"]
+
+def klassement_generatie() -> int:
+    """Generatie van de klassement-data; verandert alleen als punten of toewijzingen wijzigen"""
+    return _get_data_generatie()["klassement"]
+
+def sessie_generatie() -> int:
+    """
+    Generatie van deze sessie; verandert alleen na schrijfacties of invalidaties
+    van de sessie zelf. Alleen die wijzigen de sessie-caches in-place; data van
+    andere sessies komt pas na een nieuwe load binnen (dan een ander object).
+    """
+    return st.session_state.get("_db_sessie_generatie", 0)
+
+def _verhoogt_generatie(functie):
+    """
+    Decorator voor schrijffuncties: verhoog de data-generatie na afloop (ook
+    bij een fout, want een deel kan al geschreven zijn). Gememoriseerde
+    resultaten en afgeleide indexen in app.py zijn daarna niet meer geldig.
+    
+    Niet voor device/wachtwoord-beheer en logging: die voeden geen afgeleide
+    planningsdata, en verify_device_token schrijft bij elke paginaload.
+    """
+    @functools.wraps(functie)
+    def wrapper(*args, **kwargs):
+        try:
+            return functie(*args, **kwargs)
+        finally:
+            _verhoog_generatie()
+    return wrapper
+
+def _get_tabel_lock(tabel: str) -> threading.Lock:
+    """Haal de laad-lock op voor een tabel (één gelijktijdige load per tabel)"""
+    store = _get_snapshot_store()
+    with store["lock"]:
+        if tabel not in store["tabel_locks"]:
+            store["tabel_locks"][tabel] = threading.Lock()
+        return store["tabel_locks"][tabel]
+
+def _snapshot_is_vers(entry: dict | None) -> bool:
+    """Check of een snapshot entry nog bruikbaar is zonder te verversen"""
+    if not entry or entry.get("verlopen"):
+        return False
+    return time.time() - entry["geladen_op"] < SNAPSHOT_MAX_LEEFTIJD
+
+def _lees_snapshot_entry(tabel: str, loader, delta_loader=None) -> dict:
+    """
+    Haal de gedeelde snapshot entry van een tabel op, laad via loader() indien nodig.
+    
+    Gelijktijdige sessies wachten op dezelfde load in plaats van elk zelf
+    de volledige tabel op te halen. De entry en entry["data"] mogen NIET
+    gewijzigd worden (gebruik copy.deepcopy voor een sessiekopie).
+    
+    Args:
+        tabel: Naam van de tabel
+        loader: Volledige load. Met delta_loader retourneert deze
+            (data, watermark, versies)
+        delta_loader: Optioneel - delta_loader(data, watermark, versies)
+            -> (data, watermark, versies)
+    """
+    store = _get_snapshot_store()
+    entry = store["tabellen"].get(tabel)
+    if _snapshot_is_vers(entry):
+        return entry
+    
+    # Storing: niet opnieuw op de timeout wachten (ook niet op de lock)
+    if _in_storing(tabel):
+        raise ConnectionError(f"Supabase niet bereikbaar ({tabel}), nieuwe poging na backoff")
+    
+    with _get_tabel_lock(tabel):
+        # Andere sessie kan de snapshot inmiddels geladen hebben
+        entry = store["tabellen"].get(tabel)
+        if _snapshot_is_vers(entry):
+            return entry
+        
+        # Wachtende sessies haken af als de load vóór hen net mislukt is
+        if not _mag_supabase_proberen(tabel):
+            raise ConnectionError(f"Supabase niet bereikbaar ({tabel}), nieuwe poging na backoff")
+        
+        try:
+            entry = _laad_snapshot_entry(tabel, entry, loader, delta_loader)
+        except Exception:
+            _markeer_storing(tabel)
+            raise
+        _herstel_storing(tabel)
+        return entry
+
+def _laad_snapshot_entry(tabel: str, entry: dict | None, loader, delta_loader=None) -> dict:
+    """(Her)laad de snapshot entry van een tabel; aanroeper houdt de tabel-lock vast"""
+    store = _get_snapshot_store()
+    if entry is None and delta_loader is not None:
+        # Koude start: begin vanuit de lokale replica en haal alleen de delta op
+        entry = _replica_snapshot_entry(tabel)
+    
+    nu = time.time()
+    
+    if delta_loader is None:
+        entry = {"data": loader(), "geladen_op": nu}
+        store["tabellen"][tabel] = entry
+        return entry
+    
+    # Incrementeel verversen als er een recente volledige load is
+    if (entry and entry.get("watermark")
+            and (entry.get("uit_replica")
+                 or nu - entry.get("volledig_geladen_op", 0) < VOLLEDIGE_HERLAAD_INTERVAL)):
+        try:
+            data, watermark, versies = delta_loader(
+                entry["data"], entry["watermark"], entry.get("versies", {})
+            )
+            entry = {
+                **entry,
+                "data": data,
+                "geladen_op": nu,
+                "watermark": watermark,
+                "versies": versies,
+                "verlopen": False,
+                "uit_replica": False
+            }
+            store["tabellen"][tabel] = entry
+            return entry
+        except Exception as e:
+            print(f"Delta refresh {tabel} mislukt, volledige herlaad: {e}")
+    
+    data, watermark, versies = loader()
+    entry = {
+        "data": data,
+        "geladen_op": nu,
+        "volledig_geladen_op": nu,
+        "watermark": watermark,
+        "versies": versies
+    }
+    store["tabellen"][tabel] = entry
+    return entry
+
+def _lees_snapshot(tabel: str, loader, delta_loader=None) -> dict:
+    """Haal de (immutable) data van de gedeelde snapshot op, zie _lees_snapshot_entry"""
+    return _lees_snapshot_entry(tabel, loader, delta_loader)["data"]
+
+def _werk_snapshot_bij(tabel: str, sleutel: str, data: dict | None, behoud: tuple = (),
+                       versie: str = None):
+    """
+    Write-through: vervang één rij in de gedeelde snapshot (copy-on-write).
+    data=None verwijdert de rij. Doet niets als de tabel niet geladen is.
+    
+    Kolommen in behoud die niet in data staan worden overgenomen uit de
+    bestaande rij (bijv. detailkolommen bij opslaan vanuit de planning view).
+    Met versie wordt ook de bekende updated_at van de rij bijgewerkt.
+    """
+    _verhoog_generatie()
+    kolommen = _KLASSEMENT_KOLOMMEN.get(tabel)
+    store = _get_snapshot_store()
+    with _get_tabel_lock(tabel):
+        entry = store["tabellen"].get(tabel)
+        if not entry:
+            if kolommen:
+                _verhoog_klassement_generatie()
+            return
+        nieuwe_data = dict(entry["data"])
+        nieuwe_versies = dict(entry.get("versies") or {})
+        oude_rij = entry["data"].get(sleutel)
+        if data is None:
+            nieuwe_data.pop(sleutel, None)
+            nieuwe_versies.pop(sleutel, None)
+        else:
+            rij = copy.deepcopy(data)
+            for kolom in behoud:
+                if kolom not in rij and kolom in (oude_rij or {}):
+                    rij[kolom] = oude_rij[kolom]
+            nieuwe_data[sleutel] = rij
+            if versie:
+                nieuwe_versies[sleutel] = versie
+        store["tabellen"][tabel] = {**entry, "data": nieuwe_data, "versies": nieuwe_versies}
+    
+    if kolommen and (data is None or oude_rij is None
+                     or any(rij.get(kolom) != oude_rij.get(kolom) for kolom in kolommen)):
+        _verhoog_klassement_generatie()
+
+def _invalideer_snapshot(tabel: str, volledig: bool = False):
+    """
+    Markeer de gedeelde snapshot van een tabel als verlopen.
+    
+    Tabellen met een watermark worden bij de volgende load incrementeel
+    ververst; met volledig=True (of zonder watermark) wordt de snapshot
+    verwijderd en volgt een volledige load.
+    """
+    if tabel in _KLASSEMENT_KOLOMMEN:
+        _verhoog_klassement_generatie()
+    store = _get_snapshot_store()
+    with _get_tabel_lock(tabel):
+        entry = store["tabellen"].get(tabel)
+        if not entry:
+            return
+        if volledig or not entry.get("watermark"):
+            store["tabellen"].pop(tabel, None)
+        else:
+            store["tabellen"][tabel] = {**entry, "verlopen": True}
+
+def invalideer_cache(tabel: str = None, volledig: bool = False):
+    """
+    Invalideer sessie-cache én gedeelde snapshot.
+    
+    Gebruik na schrijfacties die buiten database.py om gaan (bijv. directe
+    Supabase updates) of voor een expliciete "ververs data".
+    
+    Args:
+        tabel: Optioneel - alleen deze tabel (bijv. "wedstrijden"), anders alles
+        volledig: True = geen delta refresh, volledige herlaad uit de database
+    """
+    _verhoog_generatie()
+    if tabel:
+        for naam in [tabel] + _AFGELEIDE_SNAPSHOTS.get(tabel, []):
+            st.session_state.pop(f"_db_cache_{naam}", None)
+            _invalideer_snapshot(naam, volledig)
+        return
+    
+    for key in [k for k in st.session_state.keys() if k.startswith("_db_cache_")]:
+        del st.session_state[key]
+    store = _get_snapshot_store()
+    for tabel_naam in list(store["tabellen"].keys()):
+        _invalideer_snapshot(tabel_naam, volledig)
+
+# ============================================================
+# LOKALE REPLICA (SQLITE, OPTIONEEL)
+# ============================================================
+#
+# Optionele lokale kopie van wedstrijden, scheidsrechters, beloningen en
+# instellingen. Aanzetten via secret of omgevingsvariabele LOKALE_REPLICA_PAD
+# (pad naar een .sqlite bestand); zonder instelling is de replica uit.
+# - Loaders schrijven na elke succesvolle Supabase-load door naar de replica
+#   (wedstrijden incrementeel via de updated_at delta)
+# - Bij een Supabase-storing lezen loaders uit de replica: alleen-lezen
+#   modus, zichtbaar via is_replica_modus() (zie STORING hieronder)
+# - Koude start: de wedstrijden snapshot start vanuit de replica en haalt
+#   daarna alleen de delta op
+# Supabase blijft leidend: er wordt nooit alleen naar de replica geschreven.
+# ============================================================
+
+REPLICA_KOUDE_START_MAX_LEEFTIJD = 6 * 3600  # seconden sinds laatste volledige sync
+
+def _get_replica_pad() -> str | None:
+    """Pad van de lokale replica uit secrets of omgeving (None = uitgeschakeld)"""
+    try:
+        pad = st.secrets.get("LOKALE_REPLICA_PAD")
+    except Exception:
+        pad = None
+    return pad or os.environ.get("LOKALE_REPLICA_PAD") or None
+
+@st.cache_resource
+def _get_replica() -> dict | None:
+    """Open de lokale replica (cached, None als uitgeschakeld of niet beschikbaar)"""
+    pad = _get_replica_pad()
+    if not pad:
+        return None
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(pad)), exist_ok=True)
+        conn = sqlite3.connect(pad, check_same_thread=False, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS replica_rijen (
+                tabel TEXT NOT NULL,
+                sleutel TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at TEXT,
+                PRIMARY KEY (tabel, sleutel)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS replica_meta (
+                tabel TEXT PRIMARY KEY,
+                watermark TEXT,
+                volledig_gesynchroniseerd_op REAL,
+                gesynchroniseerd_op REAL
+            )
+        """)
+        conn.commit()
+        return {"conn": conn, "lock": threading.Lock(), "modus": {}}
+    except Exception as e:
+        print(f"Lokale replica niet beschikbaar (niet kritisch): {e}")
+        return None
+
+def _replica_vervang(tabel: str, rijen: dict, watermark: str = None, versies: dict = None):
+    """Vervang alle rijen van een tabel in de replica (na een volledige load)"""
+    replica = _get_replica()
+    if not replica:
+        return
+    versies = versies or {}
+    try:
+        nu = time.time()
+        with replica["lock"], replica["conn"] as conn:
+            conn.execute("DELETE FROM replica_rijen WHERE tabel = ?", (tabel,))
+            conn.executemany(
+                "INSERT INTO replica_rijen (tabel, sleutel, data, updated_at) VALUES (?, ?, ?, ?)",
+                [(tabel, str(sleutel), json.dumps(data, default=str), versies.get(sleutel))
+                 for sleutel, data in rijen.items()]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO replica_meta VALUES (?, ?, ?, ?)",
+                (tabel, watermark, nu, nu)
+            )
+        replica["modus"][tabel] = False
+    except Exception as e:
+        print(f"Lokale replica bijwerken mislukt (niet kritisch): {e}")
+
+def _replica_werk_bij(tabel: str, gewijzigd: dict, verwijderd: list = (),
+                      watermark: str = None, versies: dict = None):
+    """Werk gewijzigde/verwijderde rijen bij in de replica (na een delta load)"""
+    replica = _get_replica()
+    if not replica:
+        return
+    versies = versies or {}
+    try:
+        with replica["lock"], replica["conn"] as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO replica_rijen (tabel, sleutel, data, updated_at) VALUES (?, ?, ?, ?)",
+                [(tabel, str(sleutel), json.dumps(data, default=str), versies.get(sleutel))
+                 for sleutel, data in gewijzigd.items()]
+            )
+            conn.executemany(
+                "DELETE FROM replica_rijen WHERE tabel = ? AND sleutel = ?",
+                [(tabel, str(sleutel)) for sleutel in verwijderd]
+            )
+            bestaand = conn.execute(
+                "SELECT volledig_gesynchroniseerd_op FROM replica_meta WHERE tabel = ?", (tabel,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO replica_meta VALUES (?, ?, ?, ?)",
+                (tabel, watermark, bestaand[0] if bestaand else None, time.time())
+            )
+        replica["modus"][tabel] = False
+    except Exception as e:
+        print(f"Lokale replica bijwerken mislukt (niet kritisch): {e}")
+
+def _replica_lees(tabel: str) -> dict | None:
+    """
+    Lees een tabel uit de replica.
+    
+    Returns:
+        {"data", "watermark", "versies", "volledig_gesynchroniseerd_op"} of None
+    """
+    replica = _get_replica()
+    if not replica:
+        return None
+    try:
+        with replica["lock"]:
+            meta = replica["conn"].execute(
+                "SELECT watermark, volledig_gesynchroniseerd_op FROM replica_meta WHERE tabel = ?",
+                (tabel,)
+            ).fetchone()
+            if not meta:
+                return None
+            rijen = replica["conn"].execute(
+                "SELECT sleutel, data, updated_at FROM replica_rijen WHERE tabel = ?", (tabel,)
+            ).fetchall()
+        data = {sleutel: json.loads(data) for sleutel, data, _ in rijen}
+        if tabel == "wedstrijden":
+            data = {sleutel: WedstrijdRecord(rij) for sleutel, rij in data.items()}
+        return {
+            "data": data,
+            "watermark": meta[0],
+            "versies": {sleutel: updated_at for sleutel, _, updated_at in rijen},
+            "volledig_gesynchroniseerd_op": meta[1] or 0
+        }
+    except Exception as e:
+        print(f"Lokale replica lezen mislukt: {e}")
+        return None
+
+def _lees_uit_replica(tabel: str):
+    """Fallback bij Supabase-storing: data uit de replica (of None) en markeer alleen-lezen"""
+    gelezen = _replica_lees(tabel)
+    if gelezen is None:
+        return None
+    _get_replica()["modus"][tabel] = True
+    return gelezen["data"]
+
+def _replica_snapshot_entry(tabel: str) -> dict | None:
+    """Snapshot entry uit de replica voor een koude start (daarna volgt een delta)"""
+    gelezen = _replica_lees(tabel)
+    if not gelezen or not gelezen["watermark"]:
+        return None
+    if time.time() - gelezen["volledig_gesynchroniseerd_op"] > REPLICA_KOUDE_START_MAX_LEEFTIJD:
+        return None
+    return {
+        "data": gelezen["data"],
+        "geladen_op": 0,
+        "volledig_geladen_op": gelezen["volledig_gesynchroniseerd_op"],
+        "watermark": gelezen["watermark"],
+        "versies": gelezen["versies"],
+        "verlopen": True,
+        "uit_replica": True
+    }
+
+def is_replica_modus() -> bool:
+    """True als data uit de lokale replica (of een verlopen snapshot) komt omdat Supabase niet bereikbaar is"""
+    replica = _get_replica()
+    if replica and any(replica["modus"].values()):
+        return True
+    return any(storing["bediend"] for storing in list(_get_storing_status()["tabellen"].values()))
+
+# ============================================================
+# STORING (BACKOFF)
+# ============================================================
+#
+# Zonder backoff probeert tijdens een storing elke aanroep Supabase opnieuw
+# en wacht op de timeout (bij snapshot-tabellen ook nog met de tabel-lock
+# vast), waarna de replica telkens opnieuw gelezen en geparsed wordt.
+# - Na een mislukte load slaat het proces Supabase voor die tabel
+#   STORING_BACKOFF seconden over; daarna doet één aanroep een nieuwe poging
+# - Tijdens de storing komt de data uit de laatst geladen snapshot (ook als
+#   die verlopen is), anders uit de replica: één keer gelezen per storing
+# - Elke sessie krijgt per storing één eigen kopie, zodat id-geïndexeerde
+#   structuren en memo's in app.py niet bij elke aanroep herbouwd worden
+# - Een geslaagde load beëindigt de storing voor die tabel
+# ============================================================
+
+STORING_BACKOFF = 60  # seconden zonder Supabase-poging na een mislukte load
+
+@st.cache_resource
+def _get_storing_status() -> dict:
+    """Proces-brede storingsstatus per tabel (cached)"""
+    return {"lock": threading.Lock(), "tabellen": {}, "teller": 0}
+
+def _in_storing(tabel: str) -> bool:
+    """Loopt de backoff van een storing voor deze tabel nog?"""
+    storing = _get_storing_status()["tabellen"].get(tabel)
+    return storing is not None and time.time() < storing["tot"]
+
+def _mag_supabase_proberen(tabel: str) -> bool:
+    """
+    False tijdens de backoff. Na afloop mag precies één aanroep het opnieuw
+    proberen (de backoff wordt meteen verlengd); de rest blijft de
+    storingsdata gebruiken tot die poging slaagt.
+    """
+    status = _get_storing_status()
+    with status["lock"]:
+        storing = status["tabellen"].get(tabel)
+        if storing is None:
+            return True
+        if time.time() < storing["tot"]:
+            return False
+        storing["tot"] = time.time() + STORING_BACKOFF
+        return True
+
+def _markeer_storing(tabel: str):
+    """
+    Mislukte load: sla Supabase voor deze tabel STORING_BACKOFF seconden over.
+    Een lopende backoff wordt niet verlengd (anders volgt nooit een nieuwe poging).
+    """
+    status = _get_storing_status()
+    with status["lock"]:
+        storing = status["tabellen"].get(tabel)
+        if storing is None:
+            status["teller"] += 1
+            storing = {"storing_id": status["teller"], "replica": None,
+                       "replica_gelezen": False, "bediend": False, "tot": 0}
+            status["tabellen"][tabel] = storing
+        if time.time() >= storing["tot"]:
+            storing["tot"] = time.time() + STORING_BACKOFF
+
+def _herstel_storing(tabel: str):
+    """Geslaagde load: storing voorbij, de gecachte replica-data vervalt"""
+    status = _get_storing_status()
+    if tabel in status["tabellen"]:
+        with status["lock"]:
+            status["tabellen"].pop(tabel, None)
+
+def _lees_tijdens_storing(tabel: str, replica_tabel: str = None, projectie=None):
+    """
+    Alleen-lezen data voor deze sessie tijdens een storing (of None).
+    
+    Args:
+        tabel: Naam van de tabel (of snapshot) in storing
+        replica_tabel: Tabel in de replica als die afwijkt (bijv. planning)
+        projectie: Optioneel - projectie(replica_data) -> data (of None)
+    """
+    storing = _get_storing_status()["tabellen"].get(tabel)
+    if storing is None:
+        return None
+    
+    kopieen = st.session_state.setdefault("_db_storing_kopieen", {})
+    bewaard = kopieen.get(tabel)
+    if bewaard and bewaard[0] == storing["storing_id"]:
+        return bewaard[1]
+    
+    entry = _get_snapshot_store()["tabellen"].get(tabel)
+    if entry:
+        bron = entry["data"]
+    else:
+        if not storing["replica_gelezen"]:
+            storing["replica"] = _lees_uit_replica(replica_tabel or tabel)
+            storing["replica_gelezen"] = True
+        bron = storing["replica"]
+        if bron is not None and projectie is not None:
+            bron = projectie(bron)
+    if bron is None:
+        return None
+    
+    storing["bediend"] = True
+    kopie = copy.deepcopy(bron)
+    kopieen[tabel] = (storing["storing_id"], kopie)
+    return kopie
+
 # ============================================================
 # GEOFILTERING (VOORBEREID - WERKT MOMENTEEL NIET OP STREAMLIT CLOUD)
 # ============================================================
@@ -120,6 +711,39 @@ def _get_country_from_ip(ip: str) -> str:
     except:
         return "NL"  # Bij fout: toegang geven
 
+def _bepaal_client_ip() -> tuple[str, str, dict]:
+    """
+    Bepaal het publieke client IP uit de request headers (zonder netwerkcall).
+    
+    Returns:
+        (ip, gebruikte header, alle headers) - ip is "" als niet gevonden
+    """
+    headers = st.context.headers
+    
+    # Alle headers ophalen voor debug
+    all_headers = dict(headers)
+    
+    # Probeer verschillende headers (volgorde van meest naar minst betrouwbaar)
+    ip_headers = {
+        "X-Forwarded-For": headers.get("X-Forwarded-For", ""),
+        "X-Real-IP": headers.get("X-Real-IP", ""),
+        "CF-Connecting-IP": headers.get("CF-Connecting-IP", ""),  # Cloudflare
+        "True-Client-IP": headers.get("True-Client-IP", ""),  # Akamai
+        "X-Client-IP": headers.get("X-Client-IP", ""),
+        "Forwarded": headers.get("Forwarded", ""),
+    }
+    
+    # Neem eerste niet-lege, niet-private IP
+    for header_name, header_value in ip_headers.items():
+        if header_value:
+            # X-Forwarded-For kan meerdere IP's bevatten, pak de eerste
+            first_ip = header_value.split(",")[0].strip()
+            # Check of het geen privé IP is
+            if not first_ip.startswith(("10.", "192.168.", "172.16.", "172.17.", "172.18.", "172.19.", "172.20.", "172.21.", "172.22.", "172.23.", "172.24.", "172.25.", "172.26.", "172.27.", "172.28.", "172.29.", "172.30.", "172.31.", "127.", "169.254.")):
+                return first_ip, header_name, all_headers
+    
+    return "", "", all_headers
+
 def get_ip_info() -> dict:
     """
     Haal IP en land info op voor debug.
@@ -129,34 +753,7 @@ def get_ip_info() -> dict:
     retourneert voor het publieke IP.
     """
     try:
-        headers = st.context.headers
-        
-        # Alle headers ophalen voor debug
-        all_headers = dict(headers)
-        
-        # Probeer verschillende headers (volgorde van meest naar minst betrouwbaar)
-        ip_headers = {
-            "X-Forwarded-For": headers.get("X-Forwarded-For", ""),
-            "X-Real-IP": headers.get("X-Real-IP", ""),
-            "CF-Connecting-IP": headers.get("CF-Connecting-IP", ""),  # Cloudflare
-            "True-Client-IP": headers.get("True-Client-IP", ""),  # Akamai
-            "X-Client-IP": headers.get("X-Client-IP", ""),
-            "Forwarded": headers.get("Forwarded", ""),
-        }
-        
-        # Neem eerste niet-lege, niet-private IP
-        ip = ""
-        used_header = ""
-        for header_name, header_value in ip_headers.items():
-            if header_value:
-                # X-Forwarded-For kan meerdere IP's bevatten, pak de eerste
-                first_ip = header_value.split(",")[0].strip()
-                # Check of het geen privé IP is
-                if not first_ip.startswith(("10.", "192.168.", "172.16.", "172.17.", "172.18.", "172.19.", "172.20.", "172.21.", "172.22.", "172.23.", "172.24.", "172.25.", "172.26.", "172.27.", "172.28.", "172.29.", "172.30.", "172.31.", "127.", "169.254.")):
-                    ip = first_ip
-                    used_header = header_name
-                    break
-        
+        ip, used_header, all_headers = _bepaal_client_ip()
     except Exception as e:
         return {"ip": f"Error: {e}", "country": "?", "allowed": True, "all_headers": {}}
     
@@ -644,6 +1241,7 @@ def _parse_teams_from_cell(team_cell: str) -> list:
     
     return teams
 
+@_verhoogt_generatie
 def import_ledengegevens(df) -> tuple[int, int, int]:
     """
     Importeer ledengegevens (geboortedatum en teams) uit pandas DataFrame.
@@ -727,9 +1325,8 @@ def import_ledengegevens(df) -> tuple[int, int, int]:
         except Exception as e:
             errors += 1
     
-    # Invalideer cache
-    if "_db_cache_scheidsrechters" in st.session_state:
-        del st.session_state["_db_cache_scheidsrechters"]
+    # Invalideer cache (sessie + gedeelde snapshot)
+    invalideer_cache("scheidsrechters")
     
     return bijgewerkt, niet_gevonden, errors
 
@@ -737,8 +1334,25 @@ def import_ledengegevens(df) -> tuple[int, int, int]:
 # SCHEIDSRECHTERS
 # ============================================================
 
+def _haal_scheidsrechters_op() -> dict:
+    """Haal alle scheidsrechters op uit Supabase (zonder cache)"""
+    supabase = get_supabase_client()
+    response = supabase.table("scheidsrechters").select("*").execute()
+    
+    # Converteer naar dict met nbb_nummer als key
+    result = {}
+    for row in response.data:
+        nbb = row.pop("nbb_nummer")
+        # Verwijder database metadata velden
+        row.pop("created_at", None)
+        row.pop("updated_at", None)
+        result[nbb] = row
+    
+    _replica_vervang("scheidsrechters", result)
+    return result
+
 def laad_scheidsrechters() -> dict:
-    """Laad alle scheidsrechters uit Supabase (met caching)"""
+    """Laad alle scheidsrechters (sessie-cache, gevuld uit de gedeelde snapshot)"""
     cache_key = "_db_cache_scheidsrechters"
     
     # Return cached versie als beschikbaar
@@ -746,25 +1360,21 @@ def laad_scheidsrechters() -> dict:
         return st.session_state[cache_key]
     
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("scheidsrechters").select("*").execute()
-        
-        # Converteer naar dict met nbb_nummer als key
-        result = {}
-        for row in response.data:
-            nbb = row.pop("nbb_nummer")
-            # Verwijder database metadata velden
-            row.pop("created_at", None)
-            row.pop("updated_at", None)
-            result[nbb] = row
+        snapshot = _lees_snapshot("scheidsrechters", _haal_scheidsrechters_op)
         
-        # Cache resultaat
+        # Eigen kopie per sessie (snapshot blijft onveranderd)
+        result = copy.deepcopy(snapshot)
         st.session_state[cache_key] = result
         return result
     except Exception as e:
+        # Supabase niet bereikbaar: alleen-lezen storingsdata (niet in sessie-cache)
+        storingsdata = _lees_tijdens_storing("scheidsrechters")
+        if storingsdata is not None:
+            return storingsdata
         st.error(f"Fout bij laden scheidsrechters: {e}")
         return {}
 
+@_verhoogt_generatie
 def sla_scheidsrechters_op(scheidsrechters: dict) -> bool:
     """Sla alle scheidsrechters op naar Supabase (bulk)"""
     try:
@@ -785,15 +1395,15 @@ def sla_scheidsrechters_op(scheidsrechters: dict) -> bool:
             batch = records[i:i + batch_size]
             supabase.table("scheidsrechters").upsert(batch).execute()
         
-        # Invalideer cache
-        if "_db_cache_scheidsrechters" in st.session_state:
-            del st.session_state["_db_cache_scheidsrechters"]
+        # Invalideer cache (sessie + gedeelde snapshot)
+        invalideer_cache("scheidsrechters")
         
         return True
     except Exception as e:
         st.error(f"Fout bij opslaan scheidsrechters: {e}")
         return False
 
+@_verhoogt_generatie
 def sla_scheidsrechter_op(nbb_nummer: str, data: dict) -> bool:
     """Sla één scheidsrechter op naar Supabase"""
     try:
@@ -808,12 +1418,14 @@ def sla_scheidsrechter_op(nbb_nummer: str, data: dict) -> bool:
         # Update cache in-place (sneller dan volledig herladen)
         if "_db_cache_scheidsrechters" in st.session_state:
             st.session_state["_db_cache_scheidsrechters"][nbb_nummer] = data
+        _werk_snapshot_bij("scheidsrechters", nbb_nummer, data)
         
         return True
     except Exception as e:
         st.error(f"Fout bij opslaan scheidsrechter: {e}")
         return False
 
+@_verhoogt_generatie
 def verwijder_scheidsrechter(nbb_nummer: str) -> bool:
     """Verwijder een scheidsrechter"""
     try:
@@ -823,6 +1435,7 @@ def verwijder_scheidsrechter(nbb_nummer: str) -> bool:
         # Update cache in-place
         if "_db_cache_scheidsrechters" in st.session_state:
             st.session_state["_db_cache_scheidsrechters"].pop(nbb_nummer, None)
+        _werk_snapshot_bij("scheidsrechters", nbb_nummer, None)
         
         return True
     except Exception as e:
@@ -859,13 +1472,116 @@ def laad_wedstrijd_vers(wed_id: str) -> dict:
         row.pop("created_at", None)
         row.pop("updated_at", None)
         
-        return row
+        return WedstrijdRecord(row)
     except Exception as e:
         st.error(f"Fout bij laden wedstrijd {wed_id}: {e}")
         return None
 
+def _wedstrijd_uit_row(row: dict) -> tuple[str, dict, str | None]:
+    """Converteer een database rij naar (wed_id, data, updated_at)"""
+    row = dict(row)
+    wed_id = row.pop("wed_id")
+    # Converteer datum terug naar string formaat
+    if row.get("datum"):
+        dt = datetime.fromisoformat(row["datum"].replace("Z", "+00:00"))
+        row["datum"] = dt.strftime("%Y-%m-%d %H:%M")
+    # Verwijder database metadata velden
+    row.pop("created_at", None)
+    updated_at = row.pop("updated_at", None)
+    return wed_id, WedstrijdRecord(row), updated_at
+
+def _max_watermark(huidig: str | None, kandidaat: str | None) -> str | None:
+    """Hoogste updated_at van twee (ISO strings uit dezelfde database)"""
+    if not kandidaat:
+        return huidig
+    if not huidig:
+        return kandidaat
+    try:
+        a = datetime.fromisoformat(huidig.replace("Z", "+00:00"))
+        b = datetime.fromisoformat(kandidaat.replace("Z", "+00:00"))
+        return kandidaat if b > a else huidig
+    except (ValueError, TypeError):
+        return max(huidig, kandidaat)
+
+def _haal_wedstrijden_volledig(kolommen: str = "*") -> tuple[dict, str | None, dict]:
+    """
+    Haal alle wedstrijden op uit Supabase.
+    
+    Returns:
+        (wedstrijden, hoogste updated_at, {wed_id: updated_at})
+    """
+    supabase = get_supabase_client()
+    response = supabase.table("wedstrijden").select(kolommen).execute()
+    
+    # Converteer naar dict met wed_id als key
+    result = {}
+    versies = {}
+    watermark = None
+    for row in response.data:
+        wed_id, data, updated_at = _wedstrijd_uit_row(row)
+        result[wed_id] = data
+        versies[wed_id] = updated_at
+        watermark = _max_watermark(watermark, updated_at)
+    
+    if kolommen == "*":
+        _replica_vervang("wedstrijden", result, watermark, versies)
+    return result, watermark, versies
+
+def _haal_wedstrijden_op() -> dict:
+    """Haal alle wedstrijden op uit Supabase (zonder cache)"""
+    return _haal_wedstrijden_volledig()[0]
+
+def _haal_wedstrijden_delta(huidige: dict, watermark: str, versies: dict,
+                            kolommen: str = "*") -> tuple[dict, str, dict]:
+    """
+    Haal alleen gewijzigde wedstrijden op sinds de watermark en merge ze.
+    
+    - Rijen met updated_at >= watermark - DELTA_MARGE worden vervangen
+    - Verwijderde wedstrijden worden gedetecteerd via de (lichte) wed_id lijst
+    - Nieuwe wed_ids zonder updated_at worden alsnog los opgehaald
+    
+    De huidige dicts worden niet gewijzigd (snapshot is immutable).
+    """
+    supabase = get_supabase_client()
+    
+    wm = datetime.fromisoformat(watermark.replace("Z", "+00:00"))
+    vanaf = (wm - timedelta(seconds=DELTA_MARGE)).isoformat()
+    
+    gewijzigd = supabase.table("wedstrijden").select(kolommen).gte("updated_at", vanaf).execute()
+    id_response = supabase.table("wedstrijden").select("wed_id").execute()
+    
+    bestaande_ids = {row["wed_id"] for row in id_response.data}
+    
+    # Ondiepe kopie: rijen worden vervangen, nooit in-place gewijzigd
+    result = {wed_id: data for wed_id, data in huidige.items() if wed_id in bestaande_ids}
+    nieuwe_versies = {wed_id: v for wed_id, v in versies.items() if wed_id in bestaande_ids}
+    verwijderd = [wed_id for wed_id in huidige if wed_id not in bestaande_ids]
+    bijgewerkt = {}
+    
+    for row in gewijzigd.data:
+        wed_id, data, updated_at = _wedstrijd_uit_row(row)
+        result[wed_id] = data
+        bijgewerkt[wed_id] = data
+        nieuwe_versies[wed_id] = updated_at
+        watermark = _max_watermark(watermark, updated_at)
+    
+    # Nieuwe rijen zonder updated_at (bijv. handmatig ingevoerd)
+    ontbrekend = [wed_id for wed_id in bestaande_ids if wed_id not in result]
+    if ontbrekend:
+        extra = supabase.table("wedstrijden").select(kolommen).in_("wed_id", ontbrekend).execute()
+        for row in extra.data:
+            wed_id, data, updated_at = _wedstrijd_uit_row(row)
+            result[wed_id] = data
+            bijgewerkt[wed_id] = data
+            nieuwe_versies[wed_id] = updated_at
+            watermark = _max_watermark(watermark, updated_at)
+    
+    if kolommen == "*":
+        _replica_werk_bij("wedstrijden", bijgewerkt, verwijderd, watermark, nieuwe_versies)
+    return result, watermark, nieuwe_versies
+
 def laad_wedstrijden() -> dict:
-    """Laad alle wedstrijden uit Supabase (met caching)"""
+    """Laad alle wedstrijden (sessie-cache, gevuld uit de gedeelde snapshot)"""
     cache_key = "_db_cache_wedstrijden"
     
     # Return cached versie als beschikbaar
@@ -873,84 +1589,201 @@ def laad_wedstrijden() -> dict:
         return st.session_state[cache_key]
     
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("wedstrijden").select("*").execute()
+        entry = _lees_snapshot_entry("wedstrijden", _haal_wedstrijden_volledig, _haal_wedstrijden_delta)
         
-        # Converteer naar dict met wed_id als key
-        result = {}
-        for row in response.data:
-            wed_id = row.pop("wed_id")
-            # Converteer datum terug naar string formaat
-            if row.get("datum"):
-                dt = datetime.fromisoformat(row["datum"].replace("Z", "+00:00"))
-                row["datum"] = dt.strftime("%Y-%m-%d %H:%M")
-            # Verwijder database metadata velden
-            row.pop("created_at", None)
-            row.pop("updated_at", None)
-            result[wed_id] = row
+        # Eigen kopie per sessie (snapshot blijft onveranderd)
+        result = copy.deepcopy(entry["data"])
+        st.session_state[cache_key] = result
+        _zet_basis("wedstrijden", entry["data"], entry.get("versies"))
+        return result
+    except Exception as e:
+        # Supabase niet bereikbaar: alleen-lezen storingsdata (niet in sessie-cache)
+        storingsdata = _lees_tijdens_storing("wedstrijden")
+        if storingsdata is not None:
+            return storingsdata
+        st.error(f"Fout bij laden wedstrijden: {e}")
+        return {}
+
+# ============================================================
+# PLANNING VIEW (PROJECTIE ZONDER DETAILKOLOMMEN)
+# ============================================================
+#
+# De speler view, pool-indicator en beschikbaarheidschecks hebben de grote
+# JSON kolommen (puntenberekening per positie, heraanmeldingen) niet nodig.
+# laad_wedstrijden_planning() haalt alleen de planningskolommen op; detail-
+# kolommen worden per wedstrijd opgehaald met laad_wedstrijd_details().
+#
+# afgemeld_door hoort bij de planning: de pool-berekening sluit afgemelde
+# scheidsrechters uit.
+#
+# Opslaan vanuit de planning view is veilig: sla_wedstrijd(en)_op schrijft
+# detailkolommen alleen als ze in de data staan.
+# ============================================================
+
+WEDSTRIJD_DETAIL_KOLOMMEN = (
+    "scheids_1_punten_details",
+    "scheids_2_punten_details",
+    "heraanmeldingen",
+)
+
+WEDSTRIJD_PLANNING_KOLOMMEN = (
+    "wed_id", "datum", "thuisteam", "uitteam", "niveau", "vereist_bs2",
+    "scheids_1", "scheids_2", "begeleider", "type", "reistijd_minuten",
+    "geannuleerd", "veld", "updated_at", "nbb_wedstrijd_nr",
+    "scheids_1_status", "scheids_2_status",
+    "scheids_1_bevestigd_op", "scheids_2_bevestigd_op",
+    "scheids_1_bevestigd_door", "scheids_2_bevestigd_door",
+    "scheids_1_punten_berekend", "scheids_2_punten_berekend",
+    "afgemeld_door",
+    "scheids_1_zoekt_vervanging", "scheids_2_zoekt_vervanging",
+    "solo_compleet",
+)
+
+_PLANNING_SELECT = ",".join(WEDSTRIJD_PLANNING_KOLOMMEN)
+
+def _planning_projectie(data: dict) -> dict:
+    """Wedstrijd data zonder detailkolommen"""
+    return WedstrijdRecord({k: v for k, v in data.items() if k not in WEDSTRIJD_DETAIL_KOLOMMEN})
+
+def laad_wedstrijden_planning() -> dict:
+    """
+    Laad alle wedstrijden zonder detailkolommen (planning view).
+    
+    Zelfde structuur als laad_wedstrijden(), maar zonder
+    scheids_X_punten_details en heraanmeldingen. Bedoeld voor de speler view
+    en andere hot paths die alleen planning-informatie nodig hebben.
+    """
+    cache_key = "_db_cache_wedstrijden_planning"
+    
+    if cache_key in st.session_state:
+        return st.session_state[cache_key]
+    
+    try:
+        store = _get_snapshot_store()
+        volledig = store["tabellen"].get("wedstrijden")
         
-        # Cache resultaat
+        if _snapshot_is_vers(volledig) and "wedstrijden_planning" not in store["tabellen"]:
+            # Volledige snapshot is al geladen: projecteer lokaal (geen extra query)
+            basis = {wed_id: _planning_projectie(data) for wed_id, data in volledig["data"].items()}
+            versies = volledig.get("versies")
+        else:
+            entry = _lees_snapshot_entry(
+                "wedstrijden_planning",
+                lambda: _haal_wedstrijden_volledig(_PLANNING_SELECT),
+                lambda huidige, watermark, versies: _haal_wedstrijden_delta(
+                    huidige, watermark, versies, _PLANNING_SELECT
+                )
+            )
+            basis = entry["data"]
+            versies = entry.get("versies")
+        
+        result = copy.deepcopy(basis)
         st.session_state[cache_key] = result
+        _zet_basis("wedstrijden_planning", basis, versies)
         return result
     except Exception as e:
+        # Supabase niet bereikbaar: alleen-lezen storingsdata (niet in sessie-cache)
+        storingsdata = _lees_tijdens_storing(
+            "wedstrijden_planning", "wedstrijden",
+            lambda replica: {wed_id: _planning_projectie(data) for wed_id, data in replica.items()}
+        )
+        if storingsdata is not None:
+            return storingsdata
         st.error(f"Fout bij laden wedstrijden: {e}")
         return {}
 
+def laad_wedstrijd_details(wed_id: str) -> dict:
+    """
+    Laad de detailkolommen van één wedstrijd (lazy, per wedstrijd gecached).
+    
+    Returns:
+        dict met scheids_1_punten_details, scheids_2_punten_details en
+        heraanmeldingen (leeg dict als niet gevonden)
+    """
+    # Volledige sessie-cache bevat de details al
+    volledig = st.session_state.get("_db_cache_wedstrijden")
+    if volledig and wed_id in volledig:
+        return {k: volledig[wed_id].get(k) for k in WEDSTRIJD_DETAIL_KOLOMMEN}
+    
+    cache_key = "_db_cache_wedstrijd_details"
+    if cache_key not in st.session_state:
+        st.session_state[cache_key] = {}
+    if wed_id in st.session_state[cache_key]:
+        return st.session_state[cache_key][wed_id]
+    
+    try:
+        supabase = get_supabase_client()
+        response = supabase.table("wedstrijden").select(
+            ",".join(WEDSTRIJD_DETAIL_KOLOMMEN)
+        ).eq("wed_id", wed_id).execute()
+        
+        details = response.data[0] if response.data else {}
+        st.session_state[cache_key][wed_id] = details
+        return details
+    except Exception as e:
+        st.error(f"Fout bij laden wedstrijddetails {wed_id}: {e}")
+        return {}
+
+def _wedstrijd_naar_record(wed_id: str, data: dict) -> dict:
+    """Bouw een database record van een wedstrijd (inclusief updated_at)"""
+    # Converteer datum naar ISO formaat
+    datum_str = data.get("datum", "")
+    if datum_str:
+        try:
+            dt = datetime.strptime(datum_str, "%Y-%m-%d %H:%M")
+            datum_iso = dt.isoformat()
+        except:
+            datum_iso = datum_str
+    else:
+        datum_iso = None
+    
+    record = {
+        "wed_id": wed_id,
+        "datum": datum_iso,
+        "thuisteam": data.get("thuisteam", ""),
+        "uitteam": data.get("uitteam", ""),
+        "niveau": data.get("niveau", 1),
+        "vereist_bs2": data.get("vereist_bs2", False),
+        "scheids_1": data.get("scheids_1"),
+        "scheids_2": data.get("scheids_2"),
+        "begeleider": data.get("begeleider"),
+        "type": data.get("type", "thuis"),
+        "reistijd_minuten": data.get("reistijd_minuten", 45),
+        "geannuleerd": data.get("geannuleerd", False),
+        "veld": data.get("veld", ""),
+        "updated_at": datetime.now().isoformat(),
+        # NBB wedstrijdnummer voor CP sync (v1.32.6)
+        "nbb_wedstrijd_nr": data.get("nbb_wedstrijd_nr"),
+        # Kolommen voor punten en status
+        "scheids_1_status": data.get("scheids_1_status"),
+        "scheids_2_status": data.get("scheids_2_status"),
+        "scheids_1_bevestigd_op": data.get("scheids_1_bevestigd_op"),
+        "scheids_2_bevestigd_op": data.get("scheids_2_bevestigd_op"),
+        "scheids_1_bevestigd_door": data.get("scheids_1_bevestigd_door"),
+        "scheids_2_bevestigd_door": data.get("scheids_2_bevestigd_door"),
+        "scheids_1_punten_berekend": data.get("scheids_1_punten_berekend"),
+        "scheids_2_punten_berekend": data.get("scheids_2_punten_berekend"),
+        # Afmeldregistratie kolommen (v1.28.0)
+        "afgemeld_door": data.get("afgemeld_door"),  # Lijst van {nbb, positie, afgemeld_op}
+        # Zoekt vervanging en solo (v1.34.0)
+        "scheids_1_zoekt_vervanging": data.get("scheids_1_zoekt_vervanging", False),
+        "scheids_2_zoekt_vervanging": data.get("scheids_2_zoekt_vervanging", False),
+        "solo_compleet": data.get("solo_compleet", False)
+    }
+    # Detailkolommen alleen meesturen als ze geladen zijn (planning view)
+    # heraanmeldingen: lijst van {nbb, positie, heraangemeld_op}
+    for kolom in WEDSTRIJD_DETAIL_KOLOMMEN:
+        if kolom in data:
+            record[kolom] = data[kolom]
+    return record
+
+@_verhoogt_generatie
 def sla_wedstrijden_op(wedstrijden: dict) -> bool:
     """Sla alle wedstrijden op naar Supabase (bulk)"""
     try:
         supabase = get_supabase_client()
         
-        records = []
-        for wed_id, data in wedstrijden.items():
-            # Converteer datum naar ISO formaat
-            datum_str = data.get("datum", "")
-            if datum_str:
-                try:
-                    dt = datetime.strptime(datum_str, "%Y-%m-%d %H:%M")
-                    datum_iso = dt.isoformat()
-                except:
-                    datum_iso = datum_str
-            else:
-                datum_iso = None
-            
-            record = {
-                "wed_id": wed_id,
-                "datum": datum_iso,
-                "thuisteam": data.get("thuisteam", ""),
-                "uitteam": data.get("uitteam", ""),
-                "niveau": data.get("niveau", 1),
-                "vereist_bs2": data.get("vereist_bs2", False),
-                "scheids_1": data.get("scheids_1"),
-                "scheids_2": data.get("scheids_2"),
-                "begeleider": data.get("begeleider"),
-                "type": data.get("type", "thuis"),
-                "reistijd_minuten": data.get("reistijd_minuten", 45),
-                "geannuleerd": data.get("geannuleerd", False),
-                "veld": data.get("veld", ""),
-                "updated_at": datetime.now().isoformat(),
-                # NBB wedstrijdnummer voor CP sync (v1.32.6)
-                "nbb_wedstrijd_nr": data.get("nbb_wedstrijd_nr"),
-                # Kolommen voor punten en status
-                "scheids_1_status": data.get("scheids_1_status"),
-                "scheids_2_status": data.get("scheids_2_status"),
-                "scheids_1_bevestigd_op": data.get("scheids_1_bevestigd_op"),
-                "scheids_2_bevestigd_op": data.get("scheids_2_bevestigd_op"),
-                "scheids_1_bevestigd_door": data.get("scheids_1_bevestigd_door"),
-                "scheids_2_bevestigd_door": data.get("scheids_2_bevestigd_door"),
-                "scheids_1_punten_berekend": data.get("scheids_1_punten_berekend"),
-                "scheids_2_punten_berekend": data.get("scheids_2_punten_berekend"),
-                "scheids_1_punten_details": data.get("scheids_1_punten_details"),
-                "scheids_2_punten_details": data.get("scheids_2_punten_details"),
-                # Afmeldregistratie kolommen (v1.28.0)
-                "afgemeld_door": data.get("afgemeld_door"),  # Lijst van {nbb, positie, afgemeld_op}
-                "heraanmeldingen": data.get("heraanmeldingen"),  # Lijst van {nbb, positie, heraangemeld_op}
-                # Zoekt vervanging en solo (v1.34.0)
-                "scheids_1_zoekt_vervanging": data.get("scheids_1_zoekt_vervanging", False),
-                "scheids_2_zoekt_vervanging": data.get("scheids_2_zoekt_vervanging", False),
-                "solo_compleet": data.get("solo_compleet", False)
-            }
-            records.append(record)
+        records = [_wedstrijd_naar_record(wed_id, data) for wed_id, data in wedstrijden.items()]
         
         # Bulk upsert in batches van 100
         batch_size = 100
@@ -958,79 +1791,308 @@ def sla_wedstrijden_op(wedstrijden: dict) -> bool:
             batch = records[i:i + batch_size]
             supabase.table("wedstrijden").upsert(batch).execute()
         
-        # Invalideer cache
-        if "_db_cache_wedstrijden" in st.session_state:
-            del st.session_state["_db_cache_wedstrijden"]
+        # Invalideer cache (sessie + gedeelde snapshot)
+        invalideer_cache("wedstrijden")
         
         return True
     except Exception as e:
         st.error(f"Fout bij opslaan wedstrijden: {e}")
         return False
 
-def sla_wedstrijd_op(wed_id: str, data: dict) -> bool:
-    """Sla één wedstrijd op naar Supabase"""
-    try:
-        supabase = get_supabase_client()
-        
-        # Converteer datum naar ISO formaat
-        datum_str = data.get("datum", "")
-        if datum_str:
-            try:
-                dt = datetime.strptime(datum_str, "%Y-%m-%d %H:%M")
-                datum_iso = dt.isoformat()
-            except:
-                datum_iso = datum_str
+# ============================================================
+# WIJZIGINGSDETECTIE EN VERSIECHECK (ENKELE WEDSTRIJD)
+# ============================================================
+#
+# sla_wedstrijd_op stuurt alleen de gewijzigde kolommen (PATCH) t.o.v. de
+# versie die deze sessie geladen heeft, met een check op updated_at:
+# - Basis = de (immutable) snapshot-rij waarmee de sessie-cache gevuld is,
+#   bijgehouden in _db_basis_wedstrijden(_planning), plus de updated_at.
+# - Heeft iemand anders de rij intussen gewijzigd, dan wordt de verse rij
+#   opgehaald: raken de wijzigingen andere kolommen, dan wordt samengevoegd;
+#   is dezelfde kolom anders gewijzigd, dan wordt NIET opgeslagen (conflict).
+# - Zonder basis (nieuwe wedstrijd, geen cache) volgt een volledige upsert.
+# ============================================================
+
+_MAX_SAMENVOEG_POGINGEN = 3
+
+def _zet_basis(tabel: str, rijen: dict, versies: dict | None):
+    """Leg de geladen (immutable) rijen + versies vast als basis voor wijzigingsdetectie"""
+    st.session_state[f"_db_basis_{tabel}"] = {
+        "rijen": dict(rijen),
+        "versies": dict(versies or {})
+    }
+
+def _basis_wedstrijd(wed_id: str, data: dict) -> tuple[dict | None, str | None]:
+    """Zoek de basisversie van een wedstrijd voor deze sessie: (rij, updated_at)"""
+    planning = st.session_state.get("_db_cache_wedstrijden_planning") or {}
+    volgorde = ["wedstrijden", "wedstrijden_planning"]
+    if planning.get(wed_id) is data:
+        volgorde.reverse()
+    
+    for tabel in volgorde:
+        basis = st.session_state.get(f"_db_basis_{tabel}")
+        if basis and wed_id in basis["rijen"]:
+            return basis["rijen"][wed_id], basis["versies"].get(wed_id)
+    return None, None
+
+def _werk_basis_bij(wed_id: str, data: dict | None, versie: str | None):
+    """Werk de basisversie van een wedstrijd bij na opslaan (None = verwijderd)"""
+    for tabel in ("wedstrijden", "wedstrijden_planning"):
+        basis = st.session_state.get(f"_db_basis_{tabel}")
+        if not basis:
+            continue
+        if data is None:
+            basis["rijen"].pop(wed_id, None)
+            basis["versies"].pop(wed_id, None)
+            continue
+        rij = copy.deepcopy(data)
+        if tabel == "wedstrijden_planning":
+            rij = _planning_projectie(rij)
         else:
-            datum_iso = None
-        
-        record = {
-            "wed_id": wed_id,
-            "datum": datum_iso,
-            "thuisteam": data.get("thuisteam", ""),
-            "uitteam": data.get("uitteam", ""),
-            "niveau": data.get("niveau", 1),
-            "vereist_bs2": data.get("vereist_bs2", False),
-            "scheids_1": data.get("scheids_1"),
-            "scheids_2": data.get("scheids_2"),
-            "begeleider": data.get("begeleider"),
-            "type": data.get("type", "thuis"),
-            "reistijd_minuten": data.get("reistijd_minuten", 45),
-            "geannuleerd": data.get("geannuleerd", False),
-            "veld": data.get("veld", ""),
-            "updated_at": datetime.now().isoformat(),
-            # NBB wedstrijdnummer voor CP sync (v1.32.6)
-            "nbb_wedstrijd_nr": data.get("nbb_wedstrijd_nr"),
-            # Nieuwe kolommen voor punten en status
-            "scheids_1_status": data.get("scheids_1_status"),
-            "scheids_2_status": data.get("scheids_2_status"),
-            "scheids_1_bevestigd_op": data.get("scheids_1_bevestigd_op"),
-            "scheids_2_bevestigd_op": data.get("scheids_2_bevestigd_op"),
-            "scheids_1_bevestigd_door": data.get("scheids_1_bevestigd_door"),
-            "scheids_2_bevestigd_door": data.get("scheids_2_bevestigd_door"),
-            "scheids_1_punten_berekend": data.get("scheids_1_punten_berekend"),
-            "scheids_2_punten_berekend": data.get("scheids_2_punten_berekend"),
-            "scheids_1_punten_details": data.get("scheids_1_punten_details"),
-            "scheids_2_punten_details": data.get("scheids_2_punten_details"),
-            # Afmeldregistratie kolommen (v1.28.0)
-            "afgemeld_door": data.get("afgemeld_door"),  # Lijst van {nbb, positie, afgemeld_op}
-            "heraanmeldingen": data.get("heraanmeldingen"),  # Lijst van {nbb, positie, heraangemeld_op}
-            # Zoekt vervanging en solo (v1.34.0)
-            "scheids_1_zoekt_vervanging": data.get("scheids_1_zoekt_vervanging", False),
-            "scheids_2_zoekt_vervanging": data.get("scheids_2_zoekt_vervanging", False),
-            "solo_compleet": data.get("solo_compleet", False)
-        }
+            oude_rij = basis["rijen"].get(wed_id) or {}
+            for kolom in WEDSTRIJD_DETAIL_KOLOMMEN:
+                if kolom not in rij and kolom in oude_rij:
+                    rij[kolom] = oude_rij[kolom]
+        basis["rijen"][wed_id] = rij
+        basis["versies"][wed_id] = versie
+
+def _patch_wedstrijd(supabase, wed_id: str, data: dict, wijzigingen: dict,
+                     basis_record: dict, basis_versie: str) -> tuple[str, dict | None, str | None]:
+    """
+    Stuur alleen de gewijzigde kolommen, met versiecheck op updated_at.
+    
+    Returns:
+        (status, rij, versie) met status:
+        - "ok": opgeslagen, rij is None (data is actueel)
+        - "samengevoegd": opgeslagen na samenvoegen, rij = actuele rij
+        - "conflict": niet opgeslagen, rij = actuele rij uit database
+        - "verwijderd": wedstrijd bestaat niet meer
+    """
+    versie = basis_versie
+    verse_data = None
+    
+    for _ in range(_MAX_SAMENVOEG_POGINGEN):
+        patch = {**wijzigingen, "updated_at": datetime.now().isoformat()}
+        response = supabase.table("wedstrijden").update(patch).eq(
+            "wed_id", wed_id
+        ).eq("updated_at", versie).execute()
         
-        supabase.table("wedstrijden").upsert(record).execute()
+        if response.data:
+            nieuwe_versie = response.data[0].get("updated_at", patch["updated_at"])
+            if verse_data is None:
+                return "ok", None, nieuwe_versie
+            samengevoegd = dict(verse_data)
+            for kolom in wijzigingen:
+                samengevoegd[kolom] = data[kolom] if kolom in data else wijzigingen[kolom]
+            return "samengevoegd", samengevoegd, nieuwe_versie
+        
+        # Versie klopt niet meer: haal verse rij op en check op conflicten
+        vers = supabase.table("wedstrijden").select("*").eq("wed_id", wed_id).execute()
+        if not vers.data:
+            return "verwijderd", None, None
+        
+        _, verse_data, versie = _wedstrijd_uit_row(vers.data[0])
+        vers_record = _wedstrijd_naar_record(wed_id, verse_data)
+        
+        conflicten = [
+            kolom for kolom, waarde in wijzigingen.items()
+            if vers_record.get(kolom) != basis_record.get(kolom) and vers_record.get(kolom) != waarde
+        ]
+        if conflicten:
+            return "conflict", verse_data, versie
+    
+    return "conflict", verse_data, versie
+
+@_verhoogt_generatie
+def sla_wedstrijd_op(wed_id: str, data: dict) -> bool:
+    """
+    Sla één wedstrijd op naar Supabase.
+    
+    Alleen gewijzigde kolommen worden verstuurd, met versiecheck op updated_at.
+    Bij een conflict (dezelfde kolom is intussen door iemand anders gewijzigd)
+    wordt niet opgeslagen en wordt de cache bijgewerkt met de actuele rij.
+    """
+    try:
+        supabase = get_supabase_client()
         
-        # Update cache in-place (sneller dan volledig herladen)
-        if "_db_cache_wedstrijden" in st.session_state:
-            st.session_state["_db_cache_wedstrijden"][wed_id] = data
+        record = _wedstrijd_naar_record(wed_id, data)
+        basis_rij, basis_versie = _basis_wedstrijd(wed_id, data)
         
+        if basis_rij is None or not basis_versie:
+            # Nieuwe wedstrijd of onbekende versie: volledige upsert
+            response = supabase.table("wedstrijden").upsert(record).execute()
+            versie = response.data[0].get("updated_at") if response.data else record["updated_at"]
+        else:
+            basis_record = _wedstrijd_naar_record(wed_id, basis_rij)
+            wijzigingen = {
+                kolom: waarde for kolom, waarde in record.items()
+                if kolom not in ("wed_id", "updated_at")
+                and (kolom not in basis_record or basis_record[kolom] != waarde)
+            }
+            if not wijzigingen:
+                return True
+            
+            status, rij, versie = _patch_wedstrijd(
+                supabase, wed_id, data, wijzigingen, basis_record, basis_versie
+            )
+            
+            if status == "verwijderd":
+                st.error(f"Wedstrijd {wed_id} bestaat niet meer.")
+                return False
+            
+            if status == "conflict":
+                gewijzigd = ", ".join(sorted(wijzigingen.keys()))
+                st.warning(
+                    f"⚠️ Deze wedstrijd is intussen door iemand anders gewijzigd ({gewijzigd}). "
+                    "Je wijziging is niet opgeslagen; controleer de actuele gegevens."
+                )
+                if rij is not None:
+                    _werk_wedstrijd_caches_bij(wed_id, rij, versie, vervang=True)
+                return False
+            
+            if status == "samengevoegd":
+                # Neem wijzigingen van anderen over in het eigen object
+                data.update({
+                    k: v for k, v in rij.items()
+                    if k in data or k not in WEDSTRIJD_DETAIL_KOLOMMEN
+                })
+        
+        _werk_wedstrijd_caches_bij(wed_id, data, versie)
         return True
     except Exception as e:
         st.error(f"Fout bij opslaan wedstrijd: {e}")
         return False
 
+def _werk_wedstrijd_caches_bij(wed_id: str, data: dict, versie: str | None, vervang: bool = False):
+    """
+    Werk sessie-caches, basisversie en gedeelde snapshots bij na opslaan.
+    
+    Args:
+        vervang: True = vervang de sessie-rij door een nieuw object (bij conflict)
+    """
+    if vervang:
+        data = copy.deepcopy(data)
+    
+    # Update cache in-place (sneller dan volledig herladen)
+    if "_db_cache_wedstrijden" in st.session_state:
+        volledig = st.session_state["_db_cache_wedstrijden"]
+        oude_rij = volledig.get(wed_id)
+        rij = data
+        if oude_rij is not None and oude_rij is not data:
+            for kolom in WEDSTRIJD_DETAIL_KOLOMMEN:
+                if kolom not in rij and kolom in oude_rij:
+                    rij = WedstrijdRecord({**rij, kolom: oude_rij[kolom]})
+        volledig[wed_id] = rij
+    if "_db_cache_wedstrijden_planning" in st.session_state:
+        planning = st.session_state["_db_cache_wedstrijden_planning"]
+        if planning.get(wed_id) is not data:
+            planning[wed_id] = _planning_projectie(data)
+    st.session_state.get("_db_cache_wedstrijd_details", {}).pop(wed_id, None)
+    
+    _werk_basis_bij(wed_id, data, versie)
+    _werk_wedstrijd_snapshots_bij(wed_id, data, versie)
+
+def _werk_wedstrijd_snapshots_bij(wed_id: str, data: dict, versie: str | None):
+    """Write-through van één opgeslagen wedstrijd naar de gedeelde snapshots"""
+    _werk_snapshot_bij("wedstrijden", wed_id, data, behoud=WEDSTRIJD_DETAIL_KOLOMMEN, versie=versie)
+    _werk_snapshot_bij("wedstrijden_planning", wed_id, _planning_projectie(data), versie=versie)
+
+# ============================================================
+# PUNTEN OPSLAAN (BATCH)
+# ============================================================
+#
+# Na een herberekening van alle wedstrijdpunten veranderen alleen de
+# puntenkolommen. PostgREST kent geen partiële update van meerdere rijen
+# in één request (een upsert met alleen deze kolommen valt over NOT NULL
+# kolommen), dus elke rij krijgt een eigen PATCH met versiecheck, maar
+# die worden parallel verstuurd in plaats van één voor één.
+# ============================================================
+
+PUNTEN_KOLOMMEN = (
+    "scheids_1_punten_berekend", "scheids_1_punten_details",
+    "scheids_2_punten_berekend", "scheids_2_punten_details",
+)
+PUNTEN_MAX_WORKERS = 8
+
+def _patch_punten(supabase, wed_id: str, patch: dict, versie: str | None) -> tuple[str, str | None]:
+    """PATCH de puntenkolommen van één wedstrijd: (status, nieuwe versie), status ok/conflict"""
+    query = supabase.table("wedstrijden").update(patch).eq("wed_id", wed_id)
+    if versie:
+        query = query.eq("updated_at", versie)
+    response = query.execute()
+    if not response.data:
+        return "conflict", None
+    return "ok", response.data[0].get("updated_at", patch["updated_at"])
+
+@_verhoogt_generatie
+def sla_wedstrijdpunten_op(wedstrijden: dict, wed_ids: list) -> dict:
+    """
+    Sla alleen de puntenkolommen van de opgegeven wedstrijden op (parallel).
+    
+    Per wedstrijd met versiecheck op updated_at: is de rij intussen door iemand
+    anders gewijzigd, dan wordt niet opgeslagen en wordt de actuele rij in de
+    cache gezet (conflict).
+    
+    Returns:
+        {"opgeslagen": [wed_id], "conflicten": [wed_id], "fouten": {wed_id: melding}}
+    """
+    resultaat = {"opgeslagen": [], "conflicten": [], "fouten": {}}
+    if not wed_ids:
+        return resultaat
+    
+    try:
+        supabase = get_supabase_client()
+    except Exception as e:
+        st.error(f"Fout bij opslaan punten: {e}")
+        resultaat["fouten"] = {wed_id: str(e) for wed_id in wed_ids}
+        return resultaat
+    
+    # Basisversies en patches op de hoofdthread (sessie-state)
+    taken = {}
+    for wed_id in wed_ids:
+        data = wedstrijden[wed_id]
+        patch = {kolom: data.get(kolom) for kolom in PUNTEN_KOLOMMEN}
+        patch["updated_at"] = datetime.now().isoformat()
+        _, versie = _basis_wedstrijd(wed_id, data)
+        taken[wed_id] = (patch, versie)
+    
+    uitkomsten = {}
+    with ThreadPoolExecutor(max_workers=min(PUNTEN_MAX_WORKERS, len(taken)),
+                            thread_name_prefix="punten") as pool:
+        futures = {
+            wed_id: pool.submit(_patch_punten, supabase, wed_id, patch, versie)
+            for wed_id, (patch, versie) in taken.items()
+        }
+        for wed_id, future in futures.items():
+            try:
+                uitkomsten[wed_id] = future.result()
+            except Exception as e:
+                resultaat["fouten"][wed_id] = str(e)
+    
+    for wed_id, (status, versie) in uitkomsten.items():
+        if status == "ok":
+            _werk_wedstrijd_caches_bij(wed_id, wedstrijden[wed_id], versie)
+            resultaat["opgeslagen"].append(wed_id)
+        else:
+            resultaat["conflicten"].append(wed_id)
+    
+    # Niet opgeslagen: actuele rijen ophalen zodat de cache geen niet-opgeslagen punten toont
+    te_verversen = resultaat["conflicten"] + list(resultaat["fouten"])
+    if te_verversen:
+        try:
+            vers = supabase.table("wedstrijden").select("*").in_("wed_id", te_verversen).execute()
+            for row in vers.data or []:
+                wed_id, data, versie = _wedstrijd_uit_row(row)
+                _werk_wedstrijd_caches_bij(wed_id, data, versie, vervang=True)
+        except Exception as e:
+            print(f"Verversen na niet-opgeslagen punten mislukt: {e} (niet kritisch)")
+    
+    if resultaat["fouten"]:
+        st.error(f"Fout bij opslaan punten van {len(resultaat['fouten'])} wedstrijd(en).")
+    
+    return resultaat
+
+@_verhoogt_generatie
 def verwijder_wedstrijd(wed_id: str) -> bool:
     """Verwijder een wedstrijd"""
     try:
@@ -1038,14 +2100,19 @@ def verwijder_wedstrijd(wed_id: str) -> bool:
         supabase.table("wedstrijden").delete().eq("wed_id", wed_id).execute()
         
         # Update cache in-place
-        if "_db_cache_wedstrijden" in st.session_state:
-            st.session_state["_db_cache_wedstrijden"].pop(wed_id, None)
+        for cache_key in ("_db_cache_wedstrijden", "_db_cache_wedstrijden_planning"):
+            if cache_key in st.session_state:
+                st.session_state[cache_key].pop(wed_id, None)
+        _werk_basis_bij(wed_id, None, None)
+        _werk_snapshot_bij("wedstrijden", wed_id, None)
+        _werk_snapshot_bij("wedstrijden_planning", wed_id, None)
         
         return True
     except Exception as e:
         st.error(f"Fout bij verwijderen wedstrijd: {e}")
         return False
 
+@_verhoogt_generatie
 def verwijder_alle_wedstrijden() -> bool:
     """Verwijder alle wedstrijden"""
     try:
@@ -1054,8 +2121,11 @@ def verwijder_alle_wedstrijden() -> bool:
         supabase.table("wedstrijden").delete().neq("wed_id", "").execute()
         
         # Leeg cache volledig
-        if "_db_cache_wedstrijden" in st.session_state:
-            st.session_state["_db_cache_wedstrijden"] = {}
+        for cache_key in ("_db_cache_wedstrijden", "_db_cache_wedstrijden_planning"):
+            if cache_key in st.session_state:
+                st.session_state[cache_key] = {}
+        _invalideer_snapshot("wedstrijden", volledig=True)
+        _invalideer_snapshot("wedstrijden_planning", volledig=True)
         
         return True
     except Exception as e:
@@ -1075,6 +2145,8 @@ def laad_instellingen() -> dict:
         return st.session_state[cache_key]
     
     try:
+        if not _mag_supabase_proberen("instellingen"):
+            raise ConnectionError("Supabase niet bereikbaar (instellingen), nieuwe poging na backoff")
         supabase = get_supabase_client()
         response = supabase.table("instellingen").select("*").execute()
         
@@ -1091,11 +2163,19 @@ def laad_instellingen() -> dict:
             result[key] = value
         
         st.session_state[cache_key] = result
+        _herstel_storing("instellingen")
+        _replica_vervang("instellingen", result)
         return result
     except Exception as e:
+        # Supabase niet bereikbaar: alleen-lezen storingsdata (niet in sessie-cache)
+        _markeer_storing("instellingen")
+        storingsdata = _lees_tijdens_storing("instellingen")
+        if storingsdata is not None:
+            return storingsdata
         st.error(f"Fout bij laden instellingen: {e}")
         return st.session_state.get(cache_key, {"inschrijf_deadline": "2025-01-08", "niveaus": {}})
 
+@_verhoogt_generatie
 def sla_instellingen_op(instellingen: dict) -> bool:
     """Sla instellingen op naar Supabase"""
     try:
@@ -1123,7 +2203,13 @@ def sla_instellingen_op(instellingen: dict) -> bool:
 # ============================================================
 
 def laad_beloningen() -> dict:
-    """Laad beloningen uit Supabase voor het huidige seizoen (met caching)"""
+    """
+    Laad beloningen uit Supabase voor het huidige seizoen (met caching).
+    
+    Met ledger: standen uit beloning_totalen plus de blob (historie van vóór
+    de ledger), zonder de events af te spelen. Logregels uit de ledger via
+    laad_speler_historie() of laad_beloningen_met_historie().
+    """
     cache_key = "_db_cache_beloningen"
     
     # Return cached versie als beschikbaar
@@ -1133,37 +2219,149 @@ def laad_beloningen() -> dict:
     huidig_seizoen = get_huidig_seizoen()
     
     try:
-        supabase = get_supabase_client()
+        if not _mag_supabase_proberen("beloningen"):
+            raise ConnectionError("Supabase niet bereikbaar (beloningen), nieuwe poging na backoff")
         # Haal expliciet het huidige seizoen op
-        response = supabase.table("beloningen").select("*").eq("seizoen", huidig_seizoen).execute()
-        
-        if response.data:
-            row = response.data[0]
-            result = {
-                "seizoen": row.get("seizoen", huidig_seizoen),
-                "spelers": row.get("spelers", {})
-            }
-        else:
+        result = _haal_beloningen_op(huidig_seizoen)
+        if result is None:
             # Seizoen bestaat nog niet — maak nieuw record aan
             result = {"seizoen": huidig_seizoen, "spelers": {}}
             sla_beloningen_op(result)
         
+        # Punten en strikes uit de ledger (blob = historie van vóór de ledger)
+        if _ledger_beschikbaar():
+            result = _bouw_beloningen_uit_ledger(result, sessie=True, historie=False)
+        
         st.session_state[cache_key] = result
+        _herstel_storing("beloningen")
+        _replica_werk_bij("beloningen", {huidig_seizoen: result})
         return result
     except Exception as e:
+        # Supabase niet bereikbaar: alleen-lezen storingsdata (niet in sessie-cache)
+        _markeer_storing("beloningen")
+        storingsdata = _lees_tijdens_storing("beloningen", projectie=lambda replica: replica.get(huidig_seizoen))
+        if storingsdata is not None:
+            return storingsdata
         st.error(f"Fout bij laden beloningen: {e}")
         return st.session_state.get(cache_key, {"seizoen": huidig_seizoen, "spelers": {}})
 
+def _haal_beloningen_op(seizoen: str) -> dict | None:
+    """Haal de beloningen-blob van een seizoen op (zonder cache); None als die niet bestaat"""
+    supabase = get_supabase_client()
+    response = supabase.table("beloningen").select("*").eq("seizoen", seizoen).execute()
+    if not response.data:
+        return None
+    row = response.data[0]
+    return {
+        "seizoen": row.get("seizoen", seizoen),
+        "spelers": row.get("spelers", {})
+    }
+
+def laad_beloningen_met_historie() -> dict:
+    """
+    Beloningen van het huidige seizoen inclusief alle logregels uit de ledger
+    (alle events afgespeeld, met caching). Alleen voor overzichten en controles
+    over de historie van alle spelers; alleen lezen (boeken via boek_beloning_event).
+    """
+    beloningen = laad_beloningen()
+    cache_key = "_db_cache_beloningen_historie"
+    if cache_key in st.session_state:
+        return st.session_state[cache_key]
+    
+    try:
+        if not _ledger_beschikbaar():
+            return beloningen  # Blob bevat alle historie al
+        blob = _haal_beloningen_op(beloningen["seizoen"]) or {"seizoen": beloningen["seizoen"], "spelers": {}}
+        result = _bouw_beloningen_uit_ledger(blob)
+        st.session_state[cache_key] = result
+        return result
+    except Exception as e:
+        st.error(f"Fout bij laden beloningen historie: {e}")
+        return beloningen
+
+def laad_speler_historie(nbb_nummer: str) -> dict:
+    """
+    Beloningen van één speler inclusief logregels uit de ledger (met caching).
+    Haalt alleen de events van deze speler op; standen uit laad_beloningen().
+    """
+    beloningen = laad_beloningen()
+    speler = beloningen.get("spelers", {}).get(nbb_nummer) or _leeg_speler()
+    
+    historie = st.session_state.get("_db_cache_beloningen_historie")
+    if historie is not None:
+        return historie.get("spelers", {}).get(nbb_nummer) or speler
+    
+    cache = st.session_state.setdefault("_db_cache_beloningen_spelers", {})
+    if nbb_nummer in cache:
+        return cache[nbb_nummer]
+    
+    try:
+        if not _ledger_beschikbaar():
+            return speler  # Blob bevat alle historie al
+        # Blob-historie van de speler plus diens events
+        spelers = {nbb_nummer: {
+            **copy.deepcopy({lijst: speler.get(lijst, []) for lijst in _LEDGER_VASTE_VELDEN}),
+            "punten": 0, "strikes": 0
+        }}
+        for event in _haal_ledger_events_op(beloningen["seizoen"], nbb_nummer):
+            _pas_event_toe(spelers, event)
+        spelers[nbb_nummer]["punten"] = speler.get("punten", 0)
+        spelers[nbb_nummer]["strikes"] = speler.get("strikes", 0)
+        cache[nbb_nummer] = spelers[nbb_nummer]
+        return cache[nbb_nummer]
+    except Exception as e:
+        st.error(f"Fout bij laden historie: {e}")
+        return speler
+
+def _wis_beloningen_cache():
+    """Verwijder de beloningen (standen en historie) uit de sessie-cache"""
+    for naam in ["beloningen"] + _AFGELEIDE_SNAPSHOTS["beloningen"]:
+        st.session_state.pop(f"_db_cache_{naam}", None)
+
+def _werk_beloningen_caches_bij(beloningen: dict, ledger: dict, rijen: list):
+    """
+    Verwerk geboekte events in de sessie-caches: standen in laad_beloningen()
+    en de basis voor wijzigingsdetectie, logregels in de historie-caches.
+    """
+    for rij in rijen:
+        for spelers in (beloningen.setdefault("spelers", {}), ledger["basis"]):
+            speler = spelers.setdefault(rij["nbb_nummer"], _leeg_speler())
+            if rij.get("nieuwe_punten") is not None:
+                speler["punten"] = rij["nieuwe_punten"]
+                speler["strikes"] = rij["nieuwe_strikes"]
+        historie = st.session_state.get("_db_cache_beloningen_historie")
+        if historie is not None:
+            _pas_event_toe(historie.setdefault("spelers", {}), rij)
+        spelers_cache = st.session_state.get("_db_cache_beloningen_spelers", {})
+        if rij["nbb_nummer"] in spelers_cache:
+            _pas_event_toe(spelers_cache, rij)
+
+def _schrijf_beloningen_blob(beloningen: dict):
+    """Schrijf de beloningen-blob van een seizoen weg (upsert)"""
+    supabase = get_supabase_client()
+    record = {
+        "seizoen": beloningen.get("seizoen", get_huidig_seizoen()),
+        "spelers": beloningen.get("spelers", {}),
+        "updated_at": datetime.now().isoformat()
+    }
+    supabase.table("beloningen").upsert(record).execute()
+    _verhoog_klassement_generatie()
+
+@_verhoogt_generatie
 def sla_beloningen_op(beloningen: dict) -> bool:
-    """Sla beloningen op naar Supabase"""
+    """
+    Sla beloningen op naar Supabase.
+    
+    Met ledger worden alleen de wijzigingen t.o.v. de geladen stand als
+    events geboekt; de blob wordt dan alleen nog voor een nieuw seizoen geschreven.
+    """
     try:
-        supabase = get_supabase_client()
-        record = {
-            "seizoen": beloningen.get("seizoen", get_huidig_seizoen()),
-            "spelers": beloningen.get("spelers", {}),
-            "updated_at": datetime.now().isoformat()
-        }
-        supabase.table("beloningen").upsert(record).execute()
+        ledger = st.session_state.get("_db_ledger_beloningen")
+        seizoen = beloningen.get("seizoen", get_huidig_seizoen())
+        if ledger and ledger["seizoen"] == seizoen and _ledger_beschikbaar():
+            return _sla_beloningen_op_via_ledger(beloningen, ledger)
+        
+        _schrijf_beloningen_blob(beloningen)
         
         # Update cache
         if "_db_cache_beloningen" in st.session_state:
@@ -1177,16 +2375,11 @@ def sla_beloningen_op(beloningen: dict) -> bool:
 def laad_beloningen_voor_seizoen(seizoen: str) -> dict:
     """Laad beloningen voor een specifiek seizoen (voor historie)."""
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("beloningen").select("*").eq("seizoen", seizoen).execute()
+        result = _haal_beloningen_op(seizoen) or {"seizoen": seizoen, "spelers": {}}
         
-        if response.data:
-            row = response.data[0]
-            return {
-                "seizoen": row.get("seizoen", seizoen),
-                "spelers": row.get("spelers", {})
-            }
-        return {"seizoen": seizoen, "spelers": {}}
+        if _ledger_beschikbaar():
+            result = _bouw_beloningen_uit_ledger(result)
+        return result
     except Exception as e:
         st.error(f"Fout bij laden beloningen voor seizoen {seizoen}: {e}")
         return {"seizoen": seizoen, "spelers": {}}
@@ -1232,8 +2425,7 @@ def start_nieuw_seizoen(nieuw_seizoen: str) -> dict:
         sla_beloningen_op(nieuw)
         
         # 5. Clear cache zodat app het nieuwe seizoen oppakt
-        if "_db_cache_beloningen" in st.session_state:
-            del st.session_state["_db_cache_beloningen"]
+        _wis_beloningen_cache()
         
         return {
             "success": True,
@@ -1244,61 +2436,608 @@ def start_nieuw_seizoen(nieuw_seizoen: str) -> dict:
     except Exception as e:
         return {"success": False, "reden": str(e)}
 
+# ============================================================
+# BELONINGEN LEDGER
+# ============================================================
+#
+# Punten en strikes worden per gebeurtenis vastgelegd (append-only) i.p.v.
+# steeds de hele seizoens-blob in `beloningen` te herschrijven:
+# - beloning_events: één rij per gebeurtenis (insert = O(1) schrijfactie)
+# - beloning_totalen: gematerialiseerd totaal per speler, bijgewerkt door een
+#   trigger in dezelfde transactie als de insert (geen overschreven punten
+#   meer als twee TC-leden tegelijk bevestigen)
+# - De `beloningen` rij blijft het seizoensregister en het archief van de
+#   historie van vóór de ledger; in ledger-modus wordt die niet meer herschreven.
+# laad_beloningen() levert nog steeds {"seizoen", "spelers": {nbb: {...}}}, met
+# de standen uit beloning_totalen; de logregels uit de ledger worden alleen
+# opgehaald waar ze getoond worden (laad_speler_historie, laad_beloningen_met_historie).
+# Zonder ledger-tabellen werkt alles zoals voorheen via de blob.
+#
+# Benodigde tabellen (Supabase SQL editor):
+#
+#   CREATE TABLE beloning_events (
+#       id bigserial PRIMARY KEY,
+#       seizoen text NOT NULL,
+#       nbb_nummer text NOT NULL,
+#       soort text NOT NULL,
+#       punten integer NOT NULL DEFAULT 0,
+#       strikes integer NOT NULL DEFAULT 0,
+#       wed_id text,
+#       reden text,
+#       details jsonb,
+#       sleutel text UNIQUE,
+#       oude_punten integer, nieuwe_punten integer,
+#       oude_strikes integer, nieuwe_strikes integer,
+#       created_at timestamptz NOT NULL DEFAULT now()
+#   );
+#   CREATE INDEX beloning_events_seizoen_idx ON beloning_events (seizoen, id);
+#   CREATE INDEX beloning_events_wed_idx ON beloning_events (seizoen, wed_id, soort);
+#   CREATE INDEX beloning_events_speler_idx ON beloning_events (seizoen, nbb_nummer, id);
+#
+#   CREATE TABLE beloning_totalen (
+#       seizoen text NOT NULL,
+#       nbb_nummer text NOT NULL,
+#       punten integer NOT NULL DEFAULT 0,
+#       strikes integer NOT NULL DEFAULT 0,
+#       updated_at timestamptz NOT NULL DEFAULT now(),
+#       PRIMARY KEY (seizoen, nbb_nummer)
+#   );
+#
+#   CREATE FUNCTION boek_beloning_totaal() RETURNS trigger AS $$
+#   DECLARE t beloning_totalen%ROWTYPE;
+#   BEGIN
+#       INSERT INTO beloning_totalen (seizoen, nbb_nummer)
+#           VALUES (NEW.seizoen, NEW.nbb_nummer) ON CONFLICT DO NOTHING;
+#       SELECT * INTO t FROM beloning_totalen
+#           WHERE seizoen = NEW.seizoen AND nbb_nummer = NEW.nbb_nummer FOR UPDATE;
+#       -- Sleutel van een wedstrijd uit de ledger zelf (na de lock: ook juist als
+#       -- terugdraaien en opnieuw bevestigen in verschillende sessies gebeurt)
+#       IF NEW.soort = 'wedstrijd' AND NEW.wed_id IS NOT NULL THEN
+#           NEW.sleutel := 'wedstrijd:' || NEW.seizoen || ':' || NEW.nbb_nummer || ':'
+#               || NEW.wed_id || ':' || (SELECT count(*) FROM beloning_events
+#                   WHERE seizoen = NEW.seizoen AND nbb_nummer = NEW.nbb_nummer
+#                   AND wed_id = NEW.wed_id AND soort = 'wedstrijd_terug');
+#       END IF;
+#       NEW.oude_punten := t.punten;
+#       NEW.oude_strikes := t.strikes;
+#       IF NEW.soort = 'basis' THEN
+#           NEW.nieuwe_punten := NEW.punten;
+#           NEW.nieuwe_strikes := NEW.strikes;
+#       ELSIF NEW.soort = 'reset' THEN
+#           NEW.nieuwe_punten := 0;
+#           NEW.nieuwe_strikes := 0;
+#       ELSE
+#           NEW.nieuwe_punten := GREATEST(0, t.punten + NEW.punten);
+#           NEW.nieuwe_strikes := GREATEST(0, t.strikes + NEW.strikes);
+#       END IF;
+#       UPDATE beloning_totalen
+#           SET punten = NEW.nieuwe_punten, strikes = NEW.nieuwe_strikes, updated_at = now()
+#           WHERE seizoen = NEW.seizoen AND nbb_nummer = NEW.nbb_nummer;
+#       RETURN NEW;
+#   END $$ LANGUAGE plpgsql;
+#
+#   CREATE TRIGGER beloning_events_totaal BEFORE INSERT ON beloning_events
+#       FOR EACH ROW EXECUTE FUNCTION boek_beloning_totaal();
+# ============================================================
+
+# Soorten gebeurtenissen:
+# - basis: beginstand bij migratie vanuit de blob
+# - wedstrijd / wedstrijd_terug: bevestigde wedstrijd (met punten) / teruggedraaid
+# - punten / strike: losse boeking met log-regel (negatief = afboeken)
+# - correctie: stand-aanpassing zonder log-regel (bv. herberekening)
+# - reset: punten, strikes en historie van de speler op nul
+LEDGER_SOORTEN = ("basis", "wedstrijd", "wedstrijd_terug", "punten", "strike", "correctie", "reset")
+LEDGER_PAGINA_GROOTTE = 1000
+
+# Vaste velden per log-lijst; overige velden gaan naar events.details
+_LEDGER_VASTE_VELDEN = {
+    "gefloten_wedstrijden": {"wed_id", "punten", "reden", "geregistreerd_op"},
+    "strike_log": {"strikes", "oude_stand", "nieuwe_stand", "reden", "datum"},
+    "punten_log": {"punten", "oude_stand", "nieuwe_stand", "reden", "datum"},
+}
+
+@st.cache_resource
+def _get_ledger_status() -> dict:
+    """Proces-brede status van de ledger-tabellen (cached)"""
+    return {"beschikbaar": None}
+
+def _leeg_speler() -> dict:
+    """Lege beloningen-structuur voor één speler"""
+    return {"punten": 0, "strikes": 0, "gefloten_wedstrijden": [], "strike_log": [], "punten_log": []}
+
+def _is_leeg(speler: dict) -> bool:
+    """Heeft de speler geen punten, strikes of historie?"""
+    return (
+        not speler.get("punten") and not speler.get("strikes")
+        and not any(speler.get(lijst) for lijst in _LEDGER_VASTE_VELDEN)
+    )
+
+def _is_db_fout(e: Exception, *codes: str) -> bool:
+    """Check of een Supabase/PostgREST fout een van de gegeven codes heeft"""
+    code = getattr(e, "code", None)
+    return code in codes or any(c in str(e) for c in codes)
+
+def _ledger_beschikbaar() -> bool:
+    """Zijn de ledger-tabellen aangemaakt? (alleen 'tabel bestaat niet' telt als nee)"""
+    status = _get_ledger_status()
+    if status["beschikbaar"] is None:
+        try:
+            get_supabase_client().table("beloning_totalen").select("nbb_nummer").limit(1).execute()
+            status["beschikbaar"] = True
+        except Exception as e:
+            if not _is_db_fout(e, "42P01", "PGRST205"):
+                raise
+            print(f"Beloningen ledger niet aanwezig, blob wordt gebruikt: {e} (niet kritisch)")
+            status["beschikbaar"] = False
+    return status["beschikbaar"]
+
+def _pas_event_toe(spelers: dict, event: dict):
+    """Verwerk één ledger-event in de klassieke spelers-structuur (in-place)"""
+    nbb = event["nbb_nummer"]
+    soort = event["soort"]
+    speler = spelers.setdefault(nbb, _leeg_speler())
+    for lijst in _LEDGER_VASTE_VELDEN:
+        speler.setdefault(lijst, [])
+    
+    datum = event.get("created_at") or datetime.now().isoformat()
+    details = event.get("details") or {}
+    punten = event.get("punten", 0)
+    strikes = event.get("strikes", 0)
+    
+    # Standen: bij voorkeur zoals de trigger ze berekend heeft
+    oude_punten = event.get("oude_punten")
+    oude_punten = speler.get("punten", 0) if oude_punten is None else oude_punten
+    oude_strikes = event.get("oude_strikes")
+    oude_strikes = speler.get("strikes", 0) if oude_strikes is None else oude_strikes
+    if soort == "basis":
+        nieuwe_punten, nieuwe_strikes = punten, strikes
+    elif soort == "reset":
+        nieuwe_punten, nieuwe_strikes = 0, 0
+    else:
+        nieuwe_punten = max(0, oude_punten + punten)
+        nieuwe_strikes = max(0, oude_strikes + strikes)
+    if event.get("nieuwe_punten") is not None:
+        nieuwe_punten = event["nieuwe_punten"]
+    if event.get("nieuwe_strikes") is not None:
+        nieuwe_strikes = event["nieuwe_strikes"]
+    
+    if soort == "reset":
+        speler.update(_leeg_speler())
+    elif soort == "wedstrijd":
+        speler["gefloten_wedstrijden"].append({
+            "wed_id": event.get("wed_id"),
+            "punten": punten,
+            "reden": event.get("reden", ""),
+            "geregistreerd_op": datum,
+            **details
+        })
+    elif soort == "wedstrijd_terug":
+        speler["gefloten_wedstrijden"] = [
+            w for w in speler["gefloten_wedstrijden"] if w.get("wed_id") != event.get("wed_id")
+        ]
+    elif soort == "strike":
+        speler["strike_log"].append({
+            "strikes": strikes,
+            "oude_stand": oude_strikes,
+            "nieuwe_stand": nieuwe_strikes,
+            "reden": event.get("reden", ""),
+            "datum": datum,
+            **details
+        })
+    elif soort == "punten":
+        speler["punten_log"].append({
+            "punten": punten,
+            "oude_stand": oude_punten,
+            "nieuwe_stand": nieuwe_punten,
+            "reden": event.get("reden", ""),
+            "datum": datum,
+            **details
+        })
+    
+    speler["punten"] = nieuwe_punten
+    speler["strikes"] = nieuwe_strikes
+
+def _nieuw_event(seizoen: str, nbb_nummer: str, soort: str, punten: int = 0, strikes: int = 0,
+                 reden: str = "", wed_id: str = None, details: dict = None) -> dict:
+    """Bouw een ledger-event record"""
+    return {
+        "seizoen": seizoen,
+        "nbb_nummer": nbb_nummer,
+        "soort": soort,
+        "punten": punten,
+        "strikes": strikes,
+        "wed_id": wed_id,
+        "reden": reden,
+        "details": details or None,
+    }
+
+def _zet_ledger_sleutel(event: dict, keer: int = 0):
+    """
+    Unieke sleutel tegen dubbele boekingen (ook tussen sessies):
+    een wedstrijd telt één keer per speler, tot die teruggedraaid is.
+    
+    Args:
+        keer: aantal keer dat de wedstrijd van de speler teruggedraaid is
+    """
+    nbb, wed_id, seizoen = event["nbb_nummer"], event.get("wed_id"), event["seizoen"]
+    if event["soort"] == "basis":
+        event["sleutel"] = f"basis:{seizoen}:{nbb}"
+    elif event["soort"] == "wedstrijd" and wed_id:
+        event["sleutel"] = f"wedstrijd:{seizoen}:{nbb}:{wed_id}:{keer}"
+
+def _zet_ledger_sleutels(events: list):
+    """
+    Zet de sleutels van een reeks events. Het aantal terugdraaiingen per
+    wedstrijd komt uit de ledger in de database (niet uit de sessie), plus de
+    wedstrijd_terug events die eerder in dezelfde reeks staan. De trigger
+    boek_beloning_totaal rekent de sleutel op dezelfde manier opnieuw uit.
+    """
+    wed_ids = {event["wed_id"] for event in events if event["soort"] == "wedstrijd" and event.get("wed_id")}
+    teruggedraaid = {}
+    if wed_ids:
+        seizoen = events[0]["seizoen"]
+        response = get_supabase_client().table("beloning_events").select("nbb_nummer,wed_id").eq(
+            "seizoen", seizoen
+        ).eq("soort", "wedstrijd_terug").in_("wed_id", sorted(wed_ids)).execute()
+        for row in response.data or []:
+            sleutel = (row["nbb_nummer"], row["wed_id"])
+            teruggedraaid[sleutel] = teruggedraaid.get(sleutel, 0) + 1
+    
+    for event in events:
+        sleutel = (event["nbb_nummer"], event.get("wed_id"))
+        _zet_ledger_sleutel(event, teruggedraaid.get(sleutel, 0))
+        if event["soort"] == "wedstrijd_terug" and event.get("wed_id"):
+            teruggedraaid[sleutel] = teruggedraaid.get(sleutel, 0) + 1
+
+def _schrijf_ledger_events(events: list) -> list:
+    """
+    Insert events (in één request); dubbele sleutels worden overgeslagen.
+    
+    Returns:
+        De geboekte rijen (inclusief standen van de trigger)
+    """
+    if not events:
+        return []
+    supabase = get_supabase_client()
+    try:
+        response = supabase.table("beloning_events").insert(events).execute()
+        _verhoog_klassement_generatie()
+        return response.data or []
+    except Exception as e:
+        if not _is_db_fout(e, "23505"):
+            raise
+        if len(events) == 1:
+            print(f"Ledger: dubbele boeking overgeslagen ({events[0].get('sleutel')})")
+            return []
+    
+    # Batch bevat een dubbele sleutel: per event opnieuw
+    geboekt = []
+    for event in events:
+        geboekt.extend(_schrijf_ledger_events([event]))
+    return geboekt
+
+def _haal_ledger_events_op(seizoen: str, nbb_nummer: str = None) -> list:
+    """Haal alle events van een seizoen (optioneel van één speler) op, in volgorde (keyset paginatie op id)"""
+    supabase = get_supabase_client()
+    events = []
+    laatste_id = 0
+    while True:
+        query = supabase.table("beloning_events").select("*").eq("seizoen", seizoen)
+        if nbb_nummer:
+            query = query.eq("nbb_nummer", nbb_nummer)
+        response = query.gt("id", laatste_id).order("id").limit(LEDGER_PAGINA_GROOTTE).execute()
+        rijen = response.data or []
+        events.extend(rijen)
+        if len(rijen) < LEDGER_PAGINA_GROOTTE:
+            return events
+        laatste_id = rijen[-1]["id"]
+
+def _haal_ledger_totalen_op(seizoen: str) -> dict:
+    """Gematerialiseerde totalen per speler: {nbb: (punten, strikes)}"""
+    supabase = get_supabase_client()
+    response = supabase.table("beloning_totalen").select("nbb_nummer,punten,strikes").eq(
+        "seizoen", seizoen
+    ).execute()
+    return {
+        row["nbb_nummer"]: (row.get("punten", 0), row.get("strikes", 0))
+        for row in response.data or []
+    }
+
+def _bouw_beloningen_uit_ledger(beloningen: dict, sessie: bool = False, historie: bool = True) -> dict:
+    """
+    Combineer de blob (historie vóór de ledger) met de ledger tot de klassieke
+    beloningen-structuur. Migreert de blob bij de eerste keer (basis-events).
+    
+    Args:
+        sessie: True = leg basis voor wijzigingsdetectie vast (huidig seizoen)
+        historie: False = alleen de standen uit beloning_totalen, zonder alle
+                  events af te spelen (logregels dan alleen uit de blob)
+    """
+    seizoen = beloningen["seizoen"]
+    blob_spelers = beloningen.get("spelers", {})
+    
+    totalen = _haal_ledger_totalen_op(seizoen)
+    if not totalen:
+        # Eerste keer: beginstand per speler uit de blob (idempotent via sleutel)
+        basis_events = []
+        for nbb, data in blob_spelers.items():
+            if data.get("punten") or data.get("strikes"):
+                event = _nieuw_event(
+                    seizoen, nbb, "basis", data.get("punten", 0), data.get("strikes", 0),
+                    reden="Beginstand (migratie vanuit beloningen)"
+                )
+                _zet_ledger_sleutel(event)
+                basis_events.append(event)
+        if basis_events:
+            _schrijf_ledger_events(basis_events)
+            totalen = _haal_ledger_totalen_op(seizoen)
+    
+    spelers = copy.deepcopy(blob_spelers)
+    if historie:
+        for event in _haal_ledger_events_op(seizoen):
+            _pas_event_toe(spelers, event)
+    
+    # Totalen uit de database zijn leidend (ook bij gelijktijdige boekingen)
+    for nbb, (punten, strikes) in totalen.items():
+        speler = spelers.setdefault(nbb, _leeg_speler())
+        speler["punten"] = punten
+        speler["strikes"] = strikes
+    
+    result = {"seizoen": seizoen, "spelers": spelers}
+    if sessie:
+        st.session_state["_db_ledger_beloningen"] = {
+            "seizoen": seizoen,
+            "basis": copy.deepcopy(spelers)
+        }
+    return result
+
+def _ledger_events_uit_wijzigingen(seizoen: str, basis: dict, spelers: dict) -> list:
+    """
+    Vertaal een gewijzigde spelers-structuur (t.o.v. de geladen basis) naar
+    ledger-events. Zo blijven bestaande aanroepen van sla_beloningen_op werken.
+    """
+    events = []
+    for nbb in list(basis) + [n for n in spelers if n not in basis]:
+        oud = basis.get(nbb) or _leeg_speler()
+        nieuw = spelers.get(nbb)
+        
+        # Speler verwijderd of leeggemaakt: reset
+        if nieuw is None or (_is_leeg(nieuw) and not _is_leeg(oud)):
+            if not _is_leeg(oud):
+                events.append(_nieuw_event(seizoen, nbb, "reset", reden="Reset beloningen"))
+            continue
+        
+        speler_events = []
+        oude_ids = {w.get("wed_id") for w in oud.get("gefloten_wedstrijden", [])}
+        nieuwe_ids = {w.get("wed_id") for w in nieuw.get("gefloten_wedstrijden", [])}
+        for w in nieuw.get("gefloten_wedstrijden", []):
+            if w.get("wed_id") not in oude_ids:
+                details = {k: v for k, v in w.items() if k not in _LEDGER_VASTE_VELDEN["gefloten_wedstrijden"]}
+                speler_events.append(_nieuw_event(
+                    seizoen, nbb, "wedstrijd", punten=w.get("punten", 0),
+                    reden=w.get("reden", ""), wed_id=w.get("wed_id"), details=details
+                ))
+        for wed_id in oude_ids - nieuwe_ids:
+            speler_events.append(_nieuw_event(
+                seizoen, nbb, "wedstrijd_terug", reden="Wedstrijdregistratie verwijderd", wed_id=wed_id
+            ))
+        for lijst, soort, veld in (("strike_log", "strike", "strikes"), ("punten_log", "punten", "punten")):
+            for entry in nieuw.get(lijst, [])[len(oud.get(lijst, [])):]:
+                details = {k: v for k, v in entry.items() if k not in _LEDGER_VASTE_VELDEN[lijst]}
+                speler_events.append(_nieuw_event(
+                    seizoen, nbb, soort, reden=entry.get("reden", ""), details=details,
+                    **{veld: entry.get(veld, 0)}
+                ))
+        
+        # Wat niet door log-regels verklaard wordt: correctie (zelfde afronding als de trigger)
+        punten, strikes = oud.get("punten", 0), oud.get("strikes", 0)
+        for event in speler_events:
+            punten = max(0, punten + event["punten"])
+            strikes = max(0, strikes + event["strikes"])
+        rest_punten = nieuw.get("punten", 0) - punten
+        rest_strikes = nieuw.get("strikes", 0) - strikes
+        if rest_punten or rest_strikes:
+            speler_events.append(_nieuw_event(
+                seizoen, nbb, "correctie", punten=rest_punten, strikes=rest_strikes,
+                reden="Correctie stand"
+            ))
+        events.extend(speler_events)
+    return events
+
+def _sla_beloningen_op_via_ledger(beloningen: dict, ledger: dict) -> bool:
+    """Sla een gewijzigde beloningen-structuur op als ledger-events"""
+    events = _ledger_events_uit_wijzigingen(ledger["seizoen"], ledger["basis"], beloningen.get("spelers", {}))
+    _zet_ledger_sleutels(events)
+    
+    geboekt = _schrijf_ledger_events(events)
+    
+    # Standen van de database overnemen (kunnen afwijken bij gelijktijdige boekingen)
+    spelers = beloningen.setdefault("spelers", {})
+    for rij in geboekt:
+        speler = spelers.get(rij["nbb_nummer"])
+        if speler is not None and rij.get("nieuwe_punten") is not None:
+            speler["punten"] = rij["nieuwe_punten"]
+            speler["strikes"] = rij["nieuwe_strikes"]
+    ledger["basis"] = copy.deepcopy(spelers)
+    
+    if "_db_cache_beloningen" in st.session_state:
+        st.session_state["_db_cache_beloningen"] = beloningen
+    # Logregels volgen bij de volgende historie-load
+    st.session_state.pop("_db_cache_beloningen_historie", None)
+    st.session_state.pop("_db_cache_beloningen_spelers", None)
+    return True
+
+@_verhoogt_generatie
+def boek_beloning_event(nbb_nummer: str, soort: str, punten: int = 0, strikes: int = 0,
+                        reden: str = "", wed_id: str = None, details: dict = None) -> bool:
+    """
+    Boek één punten- of strike-gebeurtenis voor het huidige seizoen.
+    
+    Met ledger: één insert in beloning_events (totaal via trigger).
+    Zonder ledger: verwerkt in de blob en volledig opgeslagen (oude gedrag).
+    
+    Args:
+        soort: zie LEDGER_SOORTEN (bv. "wedstrijd", "punten", "strike")
+        punten / strikes: mutatie (negatief = afboeken)
+        details: extra velden voor de log-regel (bv. berekening, handmatig)
+    
+    Returns:
+        True als geboekt; False bij fout of bij een al geregistreerde wedstrijd
+    """
+    if soort not in LEDGER_SOORTEN:
+        raise ValueError(f"Onbekende soort beloning: {soort}")
+    
+    beloningen = laad_beloningen()
+    seizoen = beloningen.get("seizoen", get_huidig_seizoen())
+    spelers = beloningen.setdefault("spelers", {})
+    
+    event = _nieuw_event(seizoen, nbb_nummer, soort, punten, strikes, reden, wed_id, details)
+    
+    try:
+        if not _ledger_beschikbaar():
+            if soort == "wedstrijd" and wed_id:
+                # Voorkom dubbele bevestiging: check of wed_id al bestaat
+                # (met ledger doet de unieke sleutel dit, ook tussen sessies)
+                bestaande = spelers.get(nbb_nummer, {}).get("gefloten_wedstrijden", [])
+                if any(w.get("wed_id") == wed_id for w in bestaande):
+                    print(f"[boek_beloning_event] Dubbele bevestiging voorkomen: {nbb_nummer} - {wed_id}")
+                    return False
+            _pas_event_toe(spelers, event)
+            return sla_beloningen_op(beloningen)
+        
+        ledger = st.session_state.get("_db_ledger_beloningen")
+        if not ledger or ledger["seizoen"] != seizoen:
+            st.error("Beloning niet geboekt: de actuele stand kon niet geladen worden.")
+            return False
+        
+        _zet_ledger_sleutels([event])
+        geboekt = _schrijf_ledger_events([event])
+        if not geboekt:
+            # Al door een andere sessie geboekt: volgende load haalt de actuele stand op
+            _wis_beloningen_cache()
+            return False
+        
+        _werk_beloningen_caches_bij(beloningen, ledger, geboekt)
+        return True
+    except Exception as e:
+        st.error(f"Fout bij boeken beloning: {e}")
+        return False
+
+def _events_uit_boekingen(seizoen: str, boekingen: list) -> list:
+    """Ledger-events voor een lijst boekingen (argumenten van boek_beloning_event)"""
+    events = []
+    for boeking in boekingen:
+        if boeking["soort"] not in LEDGER_SOORTEN:
+            raise ValueError(f"Onbekende soort beloning: {boeking['soort']}")
+        events.append(_nieuw_event(seizoen, **boeking))
+    return events
+
+@_verhoogt_generatie
+def boek_beloning_events(boekingen: list) -> int:
+    """
+    Boek meerdere gebeurtenissen in één keer (bv. correcties na herberekening).
+    
+    Met ledger: één insert voor alle events. Zonder ledger: verwerkt in de
+    blob en één keer opgeslagen.
+    
+    Args:
+        boekingen: lijst van dicts met de argumenten van boek_beloning_event
+                   (nbb_nummer, soort, punten, strikes, reden, wed_id, details)
+    
+    Returns:
+        Aantal geboekte events
+    """
+    if not boekingen:
+        return 0
+    
+    beloningen = laad_beloningen()
+    seizoen = beloningen.get("seizoen", get_huidig_seizoen())
+    spelers = beloningen.setdefault("spelers", {})
+    
+    events = _events_uit_boekingen(seizoen, boekingen)
+    
+    try:
+        if not _ledger_beschikbaar():
+            for event in events:
+                _pas_event_toe(spelers, event)
+            return len(events) if sla_beloningen_op(beloningen) else 0
+        
+        ledger = st.session_state.get("_db_ledger_beloningen")
+        if not ledger or ledger["seizoen"] != seizoen:
+            st.error("Beloningen niet geboekt: de actuele stand kon niet geladen worden.")
+            return 0
+        
+        _zet_ledger_sleutels(events)
+        geboekt = _schrijf_ledger_events(events)
+        if len(geboekt) < len(events):
+            # Deels al door een andere sessie geboekt: volgende load haalt de actuele stand op
+            _wis_beloningen_cache()
+        else:
+            _werk_beloningen_caches_bij(beloningen, ledger, geboekt)
+        return len(geboekt)
+    except Exception as e:
+        st.error(f"Fout bij boeken beloningen: {e}")
+        return 0
+
 # ============================================================
 # BELONINGSINSTELLINGEN
 # ============================================================
+# Default waarden
+BELONINGSINSTELLINGEN_DEFAULTS = {
+    "punten_per_wedstrijd": 1,
+    "punten_eigen_niveau": 2,
+    "punten_2e_scheids": 1,
+    "punten_bonus_niveau_hoger": 1,
+    "punten_lastig_tijdstip": 1,
+    "punten_inval_48u": 3,
+    "punten_inval_24u": 5,
+    "punten_voor_voucher": 15,
+    "strikes_afmelden_48u": 1,
+    "strikes_afmelden_24u": 2,
+    "strikes_afmelding_48u": 1,
+    "strikes_afmelding_24u": 2,
+    "strikes_no_show": 5,
+    "strikes_waarschuwing_bij": 2,
+    "strikes_gesprek_bij": 3,
+    "strike_reductie_extra_wedstrijd": 1,
+    "strike_reductie_invallen": 2,
+    "strikes_vervallen_einde_seizoen": False
+}
+
+def _haal_beloningsinstellingen_op() -> dict:
+    """Haal de beloningsinstellingen op uit Supabase (zonder cache), aangevuld met defaults"""
+    supabase = get_supabase_client()
+    response = supabase.table("beloningsinstellingen").select("*").eq("id", 1).execute()
+    
+    if not response.data:
+        return BELONINGSINSTELLINGEN_DEFAULTS.copy()
+    
+    row = response.data[0]
+    row.pop("id", None)
+    row.pop("updated_at", None)
+    # Voeg eventueel ontbrekende keys toe met defaults
+    for key, val in BELONINGSINSTELLINGEN_DEFAULTS.items():
+        if key not in row:
+            row[key] = val
+    return row
+
 def laad_beloningsinstellingen() -> dict:
     """Laad beloningsinstellingen uit Supabase (met caching)"""
     cache_key = "_db_cache_beloningsinstellingen"
     
-    # Default waarden
-    defaults = {
-        "punten_per_wedstrijd": 1,
-        "punten_eigen_niveau": 2,
-        "punten_2e_scheids": 1,
-        "punten_bonus_niveau_hoger": 1,
-        "punten_lastig_tijdstip": 1,
-        "punten_inval_48u": 3,
-        "punten_inval_24u": 5,
-        "punten_voor_voucher": 15,
-        "strikes_afmelden_48u": 1,
-        "strikes_afmelden_24u": 2,
-        "strikes_afmelding_48u": 1,
-        "strikes_afmelding_24u": 2,
-        "strikes_no_show": 5,
-        "strikes_waarschuwing_bij": 2,
-        "strikes_gesprek_bij": 3,
-        "strike_reductie_extra_wedstrijd": 1,
-        "strike_reductie_invallen": 2,
-        "strikes_vervallen_einde_seizoen": False
-    }
-    
     # Return cached versie als beschikbaar
     if cache_key in st.session_state:
         return st.session_state[cache_key]
     
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("beloningsinstellingen").select("*").eq("id", 1).execute()
-        
-        if response.data:
-            row = response.data[0]
-            row.pop("id", None)
-            row.pop("updated_at", None)
-            # Voeg eventueel ontbrekende keys toe met defaults
-            for key, val in defaults.items():
-                if key not in row:
-                    row[key] = val
-            result = row
-        else:
-            result = defaults.copy()
-        
+        result = _haal_beloningsinstellingen_op()
         st.session_state[cache_key] = result
         return result
     except Exception as e:
         st.error(f"Fout bij laden beloningsinstellingen: {e}")
-        return st.session_state.get(cache_key, defaults.copy())
+        return st.session_state.get(cache_key, BELONINGSINSTELLINGEN_DEFAULTS.copy())
 
+@_verhoogt_generatie
 def sla_beloningsinstellingen_op(instellingen: dict) -> bool:
     """Sla beloningsinstellingen op naar Supabase"""
     try:
@@ -1319,6 +3058,131 @@ def sla_beloningsinstellingen_op(instellingen: dict) -> bool:
         st.error(f"Fout bij opslaan beloningsinstellingen: {e}")
         return False
 
+# ============================================================
+# ACHTERGRONDTAKEN (ZONDER SESSIE)
+# ============================================================
+#
+# st.session_state hoort bij één browsersessie en wordt door diens reruns
+# gewijzigd; een achtergrondthread (achtergrondcontrole in app.py) mag die
+# niet gebruiken en heeft geen pagina om st.* meldingen op te tonen.
+# Deze functies:
+# - laden uit de gedeelde snapshots (eigen kopie) of direct uit de database
+# - werken na opslaan alleen de gedeelde snapshots bij
+# - roepen geen st.* aan: fouten gaan als exception of als status naar de
+#   aanroeper, die ze in het eigen rapport opneemt
+# ============================================================
+
+def laad_wedstrijden_gedeeld() -> tuple[dict, dict]:
+    """
+    Eigen kopie van alle wedstrijden uit de gedeelde snapshot, zonder sessie-cache.
+    
+    Returns:
+        (wedstrijden, basis) met basis = {"rijen": geladen (immutable) rijen,
+        "versies": updated_at per wedstrijd}, voor sla_wedstrijd_op_gedeeld
+    """
+    entry = _lees_snapshot_entry("wedstrijden", _haal_wedstrijden_volledig, _haal_wedstrijden_delta)
+    basis = {"rijen": dict(entry["data"]), "versies": dict(entry.get("versies") or {})}
+    return copy.deepcopy(entry["data"]), basis
+
+def laad_scheidsrechters_gedeeld() -> dict:
+    """Eigen kopie van alle scheidsrechters uit de gedeelde snapshot, zonder sessie-cache"""
+    return copy.deepcopy(_lees_snapshot("scheidsrechters", _haal_scheidsrechters_op))
+
+def laad_beloningsinstellingen_vers() -> dict:
+    """Beloningsinstellingen direct uit de database, zonder sessie-cache"""
+    return _haal_beloningsinstellingen_op()
+
+def laad_beloningen_vers() -> dict:
+    """Beloningen van het huidige seizoen (blob + ledger) direct uit de database, zonder sessie-cache"""
+    seizoen = get_huidig_seizoen()
+    result = _haal_beloningen_op(seizoen) or {"seizoen": seizoen, "spelers": {}}
+    if _ledger_beschikbaar():
+        result = _bouw_beloningen_uit_ledger(result)
+    return result
+
+def laad_punten_vers() -> dict:
+    """
+    Punten per speler van het huidige seizoen direct uit de database, zonder
+    sessie-cache: {nbb: punten}. Leest alleen de totalen (beloning_totalen),
+    of de blob als de ledger er (nog) niet is.
+    """
+    seizoen = get_huidig_seizoen()
+    if _ledger_beschikbaar():
+        totalen = _haal_ledger_totalen_op(seizoen)
+        if totalen:
+            return {nbb: punten for nbb, (punten, _) in totalen.items()}
+    blob = _haal_beloningen_op(seizoen) or {"spelers": {}}
+    return {nbb: data.get("punten", 0) for nbb, data in blob.get("spelers", {}).items()}
+
+@_verhoogt_generatie
+def sla_wedstrijd_op_gedeeld(wed_id: str, data: dict, basis: dict) -> str:
+    """
+    Sla één wedstrijd op zonder sessie (zie sla_wedstrijd_op): alleen kolommen die
+    afwijken van de basisrij, met versiecheck op updated_at. Na opslaan worden de
+    gedeelde snapshots en de basis (uit laad_wedstrijden_gedeeld) bijgewerkt.
+    
+    Returns:
+        "ok", "conflict" (niet opgeslagen, snapshot verlopen) of "verwijderd"
+    """
+    basis_rij = basis["rijen"].get(wed_id)
+    basis_versie = basis["versies"].get(wed_id)
+    if basis_rij is None or not basis_versie:
+        # Zonder bekende versie kan een andere schrijfactie overschreven worden
+        return "conflict"
+    
+    record = _wedstrijd_naar_record(wed_id, data)
+    basis_record = _wedstrijd_naar_record(wed_id, basis_rij)
+    wijzigingen = {
+        kolom: waarde for kolom, waarde in record.items()
+        if kolom not in ("wed_id", "updated_at")
+        and (kolom not in basis_record or basis_record[kolom] != waarde)
+    }
+    if not wijzigingen:
+        return "ok"
+    
+    status, rij, versie = _patch_wedstrijd(
+        get_supabase_client(), wed_id, data, wijzigingen, basis_record, basis_versie
+    )
+    if status in ("conflict", "verwijderd"):
+        _invalideer_snapshot("wedstrijden")
+        _invalideer_snapshot("wedstrijden_planning")
+        return status
+    
+    if status == "samengevoegd":
+        data.update({
+            k: v for k, v in rij.items()
+            if k in data or k not in WEDSTRIJD_DETAIL_KOLOMMEN
+        })
+    basis["rijen"][wed_id] = copy.deepcopy(data)
+    basis["versies"][wed_id] = versie
+    _werk_wedstrijd_snapshots_bij(wed_id, data, versie)
+    return "ok"
+
+@_verhoogt_generatie
+def boek_beloning_events_gedeeld(boekingen: list) -> int:
+    """
+    Boek gebeurtenissen zonder sessie (zie boek_beloning_events). Zonder ledger
+    wordt de blob vers opgehaald, bijgewerkt en weggeschreven.
+    
+    Returns:
+        Aantal geboekte events
+    """
+    if not boekingen:
+        return 0
+    
+    seizoen = get_huidig_seizoen()
+    events = _events_uit_boekingen(seizoen, boekingen)
+    
+    if not _ledger_beschikbaar():
+        beloningen = _haal_beloningen_op(seizoen) or {"seizoen": seizoen, "spelers": {}}
+        for event in events:
+            _pas_event_toe(beloningen["spelers"], event)
+        _schrijf_beloningen_blob(beloningen)
+        return len(events)
+    
+    _zet_ledger_sleutels(events)
+    return len(_schrijf_ledger_events(events))
+
 # ============================================================
 # BESCHIKBARE KLUSJES
 # ============================================================
@@ -1346,6 +3210,7 @@ def laad_beschikbare_klusjes() -> list:
         st.error(f"Fout bij laden beschikbare klusjes: {e}")
         return st.session_state.get(cache_key, [])  # Return oude cache als fallback
 
+@_verhoogt_generatie
 def sla_beschikbare_klusjes_op(klusjes: list) -> bool:
     """Sla beschikbare klusjes op naar Supabase"""
     try:
@@ -1404,6 +3269,7 @@ def laad_klusjes() -> dict:
         st.error(f"Fout bij laden klusjes: {e}")
         return st.session_state.get(cache_key, {})  # Return oude cache als fallback
 
+@_verhoogt_generatie
 def sla_klusjes_op(klusjes: dict) -> bool:
     """Sla uitgevoerde klusjes op naar Supabase"""
     try:
@@ -1433,6 +3299,7 @@ def sla_klusjes_op(klusjes: dict) -> bool:
         st.error(f"Fout bij opslaan klusjes: {e}")
         return False
 
+@_verhoogt_generatie
 def voeg_klusje_toe(nbb_nummer: str, klusje_id: str) -> bool:
     """Voeg een nieuw uitgevoerd klusje toe"""
     try:
@@ -1478,6 +3345,7 @@ def laad_vervangingsverzoeken() -> dict:
         st.error(f"Fout bij laden vervangingsverzoeken: {e}")
         return st.session_state.get(cache_key, {})  # Return oude cache als fallback
 
+@_verhoogt_generatie
 def sla_vervangingsverzoeken_op(verzoeken: dict) -> bool:
     """Sla vervangingsverzoeken op naar Supabase"""
     try:
@@ -1505,6 +3373,7 @@ def sla_vervangingsverzoeken_op(verzoeken: dict) -> bool:
         st.error(f"Fout bij opslaan vervangingsverzoeken: {e}")
         return False
 
+@_verhoogt_generatie
 def voeg_vervangingsverzoek_toe(wed_id: str, aanvrager_nbb: str, vervanger_nbb: str, positie: str) -> bool:
     """Voeg een nieuw vervangingsverzoek toe"""
     try:
@@ -1551,6 +3420,7 @@ def laad_begeleidingsuitnodigingen() -> dict:
         st.error(f"Fout bij laden begeleidingsuitnodigingen: {e}")
         return st.session_state.get(cache_key, {})  # Return oude cache als fallback
 
+@_verhoogt_generatie
 def sla_begeleidingsuitnodigingen_op(uitnodigingen: dict) -> bool:
     """Sla begeleidingsuitnodigingen op naar Supabase"""
     try:
@@ -1577,6 +3447,7 @@ def sla_begeleidingsuitnodigingen_op(uitnodigingen: dict) -> bool:
         st.error(f"Fout bij opslaan begeleidingsuitnodigingen: {e}")
         return False
 
+@_verhoogt_generatie
 def voeg_begeleidingsuitnodiging_toe(wed_id: str, mse_nbb: str, speler_nbb: str) -> bool:
     """Voeg een nieuwe begeleidingsuitnodiging toe"""
     try:
@@ -1596,64 +3467,156 @@ def voeg_begeleidingsuitnodiging_toe(wed_id: str, mse_nbb: str, speler_nbb: str)
 # ============================================================
 # BULK IMPORT FUNCTIES
 # ============================================================
+#
+# Records worden in batches geüpsert (één HTTP round-trip per batch).
+# Faalt een batch, dan wordt eerst opnieuw geprobeerd (tijdelijke fout),
+# daarna wordt de batch gehalveerd tot de foute rij(en) geïsoleerd zijn.
+# Eén foute rij laat zo niet de hele import mislukken.
+# ============================================================
 
-def import_scheidsrechters_bulk(scheidsrechters: dict) -> tuple[int, int]:
-    """Importeer scheidsrechters in bulk. Returns (success_count, error_count)"""
-    success = 0
-    errors = 0
-    supabase = get_supabase_client()
+IMPORT_BATCH_GROOTTE = 100
+IMPORT_MAX_POGINGEN = 3
+IMPORT_WACHTTIJD = 0.5  # seconden, verdubbelt per poging
+
+def _schrijf_met_isolatie(schrijf, batch: list, pogingen: int, mislukt: list) -> int:
+    """
+    Schrijf één batch met schrijf(batch); bij fout opnieuw proberen en daarna
+    bisecteren. Geïsoleerde foute records komen als (record, fout) in mislukt.
     
-    for nbb_nummer, data in scheidsrechters.items():
+    Returns:
+        Aantal geschreven records
+    """
+    fout = None
+    for poging in range(pogingen):
         try:
-            record = {
-                "nbb_nummer": nbb_nummer,
-                **data
-            }
-            supabase.table("scheidsrechters").upsert(record).execute()
-            success += 1
+            schrijf(batch)
+            return len(batch)
         except Exception as e:
-            errors += 1
-            print(f"Fout bij importeren {nbb_nummer}: {e}")
+            fout = e
+            if poging < pogingen - 1:
+                time.sleep(IMPORT_WACHTTIJD * (2 ** poging))
     
-    return success, errors
+    if len(batch) == 1:
+        mislukt.append((batch[0], fout))
+        return 0
+    
+    # Bisectie: halveer tot de foute rij(en) geïsoleerd zijn
+    midden = len(batch) // 2
+    return (_schrijf_met_isolatie(schrijf, batch[:midden], 1, mislukt)
+            + _schrijf_met_isolatie(schrijf, batch[midden:], 1, mislukt))
 
-def import_wedstrijden_bulk(wedstrijden: dict) -> tuple[int, int]:
-    """Importeer wedstrijden in bulk. Returns (success_count, error_count)"""
+def _upsert_met_isolatie(supabase, tabel: str, batch: list, sleutel: str,
+                         rapport: list, pogingen: int) -> tuple[int, int]:
+    """Upsert één batch; bij fout opnieuw proberen en daarna bisecteren"""
+    mislukt = []
+    ok = _schrijf_met_isolatie(
+        lambda deel: supabase.table(tabel).upsert(deel).execute(), batch, pogingen, mislukt
+    )
+    fouten = {id(record): fout for record, fout in mislukt}
+    for record in batch:
+        fout = fouten.get(id(record))
+        if fout is not None:
+            print(f"Fout bij importeren {record.get(sleutel)}: {fout}")
+        rapport.append({
+            "sleutel": record.get(sleutel),
+            "status": "ok" if fout is None else "fout",
+            "fout": None if fout is None else str(fout)
+        })
+    return ok, len(mislukt)
+
+def _bulk_upsert(tabel: str, records: list, sleutel: str, rapport: list = None) -> tuple[int, int]:
+    """
+    Upsert records in batches met retry en foutisolatie.
+    
+    Records met verschillende kolommen worden apart gebatcht (PostgREST
+    vereist gelijke keys binnen één bulk request).
+    
+    Args:
+        tabel: Naam van de tabel
+        records: Lijst van database records
+        sleutel: Primaire sleutel kolom (voor rapportage)
+        rapport: Optioneel - lijst waaraan per rij {sleutel, status, fout} wordt toegevoegd
+    
+    Returns:
+        (success_count, error_count)
+    """
+    if rapport is None:
+        rapport = []
+    supabase = get_supabase_client()
+    
+    # Groepeer op kolomset, volgorde binnen groep blijft behouden
+    groepen = {}
+    for record in records:
+        groepen.setdefault(tuple(sorted(record.keys())), []).append(record)
+    
     success = 0
     errors = 0
-    supabase = get_supabase_client()
+    for groep in groepen.values():
+        for i in range(0, len(groep), IMPORT_BATCH_GROOTTE):
+            batch = groep[i:i + IMPORT_BATCH_GROOTTE]
+            ok, fout = _upsert_met_isolatie(supabase, tabel, batch, sleutel, rapport, IMPORT_MAX_POGINGEN)
+            success += ok
+            errors += fout
+    
+    return success, errors
+
+@_verhoogt_generatie
+def import_scheidsrechters_bulk(scheidsrechters: dict, rapport: list = None) -> tuple[int, int]:
+    """
+    Importeer scheidsrechters in bulk. Returns (success_count, error_count)
+    
+    Optioneel rapport: lijst waaraan per rij {sleutel, status, fout} wordt toegevoegd.
+    """
+    records = [{"nbb_nummer": nbb_nummer, **data} for nbb_nummer, data in scheidsrechters.items()]
+    
+    success, errors = _bulk_upsert("scheidsrechters", records, "nbb_nummer", rapport)
+    
+    if success:
+        invalideer_cache("scheidsrechters")
     
+    return success, errors
+
+@_verhoogt_generatie
+def import_wedstrijden_bulk(wedstrijden: dict, rapport: list = None) -> tuple[int, int]:
+    """
+    Importeer wedstrijden in bulk. Returns (success_count, error_count)
+    
+    Alleen de importkolommen worden geschreven; statussen en punten van
+    bestaande wedstrijden blijven ongemoeid.
+    Optioneel rapport: lijst waaraan per rij {sleutel, status, fout} wordt toegevoegd.
+    """
+    records = []
     for wed_id, data in wedstrijden.items():
-        try:
-            # Converteer datum naar ISO formaat
-            datum_str = data.get("datum", "")
-            if datum_str:
-                try:
-                    dt = datetime.strptime(datum_str, "%Y-%m-%d %H:%M")
-                    datum_iso = dt.isoformat()
-                except:
-                    datum_iso = datum_str
-            else:
-                datum_iso = None
-            
-            record = {
-                "wed_id": wed_id,
-                "datum": datum_iso,
-                "thuisteam": data.get("thuisteam", ""),
-                "uitteam": data.get("uitteam", ""),
-                "niveau": data.get("niveau", 1),
-                "vereist_bs2": data.get("vereist_bs2", False),
-                "scheids_1": data.get("scheids_1"),
-                "scheids_2": data.get("scheids_2"),
-                "type": data.get("type", "thuis"),
-                "reistijd_minuten": data.get("reistijd_minuten", 45),
-                "geannuleerd": data.get("geannuleerd", False)
-            }
-            supabase.table("wedstrijden").upsert(record).execute()
-            success += 1
-        except Exception as e:
-            errors += 1
-            print(f"Fout bij importeren {wed_id}: {e}")
+        # Converteer datum naar ISO formaat
+        datum_str = data.get("datum", "")
+        if datum_str:
+            try:
+                dt = datetime.strptime(datum_str, "%Y-%m-%d %H:%M")
+                datum_iso = dt.isoformat()
+            except:
+                datum_iso = datum_str
+        else:
+            datum_iso = None
+        
+        records.append({
+            "wed_id": wed_id,
+            "datum": datum_iso,
+            "thuisteam": data.get("thuisteam", ""),
+            "uitteam": data.get("uitteam", ""),
+            "niveau": data.get("niveau", 1),
+            "vereist_bs2": data.get("vereist_bs2", False),
+            "scheids_1": data.get("scheids_1"),
+            "scheids_2": data.get("scheids_2"),
+            "type": data.get("type", "thuis"),
+            "reistijd_minuten": data.get("reistijd_minuten", 45),
+            "geannuleerd": data.get("geannuleerd", False),
+            "updated_at": datetime.now().isoformat()
+        })
+    
+    success, errors = _bulk_upsert("wedstrijden", records, "wed_id", rapport)
+    
+    if success:
+        invalideer_cache("wedstrijden")
     
     return success, errors
 
@@ -1687,6 +3650,7 @@ def laad_begeleiding_feedback() -> dict:
         st.error(f"Fout bij laden feedback: {e}")
         return {}
 
+@_verhoogt_generatie
 def sla_begeleiding_feedback_op(feedback_id: str, data: dict) -> bool:
     """Sla een begeleiding feedback op"""
     try:
@@ -1709,6 +3673,7 @@ def sla_begeleiding_feedback_op(feedback_id: str, data: dict) -> bool:
         st.error(f"Fout bij opslaan feedback: {e}")
         return False
 
+@_verhoogt_generatie
 def verwijder_begeleiding_feedback(feedback_id: str) -> bool:
     """Verwijder een begeleiding feedback"""
     try:
@@ -1723,6 +3688,7 @@ def verwijder_begeleiding_feedback(feedback_id: str) -> bool:
 # RESET FUNCTIES (BEHEERDER)
 # ============================================================
 
+@_verhoogt_generatie
 def reset_speler_beloningen(nbb_nummer: str) -> bool:
     """Reset punten, strikes en logs voor één speler"""
     try:
@@ -1744,6 +3710,7 @@ def reset_speler_beloningen(nbb_nummer: str) -> bool:
         st.error(f"Fout bij resetten beloningen: {e}")
         return False
 
+@_verhoogt_generatie
 def reset_alle_beloningen() -> tuple[bool, int]:
     """Reset punten, strikes en logs voor ALLE spelers. Returns (success, aantal)"""
     try:
@@ -1756,14 +3723,14 @@ def reset_alle_beloningen() -> tuple[bool, int]:
         success = sla_beloningen_op(beloningen)
         
         # Invalideer cache
-        if "_db_cache_beloningen" in st.session_state:
-            del st.session_state["_db_cache_beloningen"]
+        _wis_beloningen_cache()
         
         return success, aantal
     except Exception as e:
         st.error(f"Fout bij resetten alle beloningen: {e}")
         return False, 0
 
+@_verhoogt_generatie
 def reset_alle_begeleidingsuitnodigingen() -> tuple[bool, int]:
     """Verwijder ALLE begeleidingsuitnodigingen. Returns (success, aantal)"""
     try:
@@ -1786,6 +3753,7 @@ def reset_alle_begeleidingsuitnodigingen() -> tuple[bool, int]:
         st.error(f"Fout bij resetten begeleidingsuitnodigingen: {e}")
         return False, 0
 
+@_verhoogt_generatie
 def reset_begeleiders_uit_wedstrijden() -> tuple[bool, int]:
     """Verwijder begeleider uit alle wedstrijden. Returns (success, aantal)"""
     try:
@@ -1797,11 +3765,13 @@ def reset_begeleiders_uit_wedstrijden() -> tuple[bool, int]:
         
         # Update alle wedstrijden - zet begeleider op null
         if aantal > 0:
-            supabase.table("wedstrijden").update({"begeleider": None}).neq("begeleider", None).execute()
+            supabase.table("wedstrijden").update({
+                "begeleider": None,
+                "updated_at": datetime.now().isoformat()
+            }).neq("begeleider", None).execute()
         
-        # Invalideer cache
-        if "_db_cache_wedstrijden" in st.session_state:
-            del st.session_state["_db_cache_wedstrijden"]
+        # Invalideer cache (sessie + gedeelde snapshot)
+        invalideer_cache("wedstrijden")
         
         return True, aantal
     except Exception as e:
@@ -1855,6 +3825,7 @@ def get_reset_statistics() -> dict:
         st.error(f"Fout bij ophalen statistieken: {e}")
         return {}
 
+@_verhoogt_generatie
 def reset_alle_begeleiding_feedback() -> tuple[bool, int]:
     """Verwijder ALLE begeleiding feedback. Returns (success, aantal)"""
     try:
@@ -1948,6 +3919,7 @@ def laad_seizoen_archief(seizoen: str) -> dict:
         st.error(f"Fout bij laden seizoen archief: {e}")
         return {}
 
+@_verhoogt_generatie
 def archiveer_seizoen(seizoen: str, statistieken: dict) -> bool:
     """Archiveer statistieken voor een seizoen."""
     try:
@@ -2021,6 +3993,253 @@ def verzamel_seizoen_statistieken(scheidsrechters: dict, beloningen: dict, wedst
         "totalen": totalen
     }
 
+# ============================================================
+# WRITE-BEHIND LOG QUEUE
+# ============================================================
+#
+# Audit logs (registratie_log, beschikbaarheid_log) horen niet in de
+# kliklatentie van de speler. log_registratie/log_beschikbaarheid zetten
+# records in een proces-brede wachtrij; een achtergrondthread schrijft ze
+# per tabel gebundeld weg:
+# - flush bij LOG_QUEUE_BATCH_GROOTTE records of na LOG_QUEUE_FLUSH_INTERVAL
+# - bij fout: opnieuw proberen met oplopende wachttijd
+# - na LOG_QUEUE_MAX_POGINGEN of bij afsluiten van het proces: records naar
+#   LOG_QUEUE_SPILL_BESTAND, dat bij de volgende start opnieuw wordt ingelezen
+# - weigert de database de inhoud van een batch (bv. ongeldige waarde), dan
+#   wordt de batch gebisecteerd (zie _schrijf_met_isolatie): goede records
+#   worden geschreven, foute gaan naar LOG_QUEUE_QUARANTAINE_BESTAND en worden
+#   niet opnieuw aangeboden. Eén fout record blokkeert de log zo niet.
+#
+# De worker gebruikt géén st.* functies (draait buiten de script-context).
+# ============================================================
+
+LOG_QUEUE_BATCH_GROOTTE = 50
+LOG_QUEUE_FLUSH_INTERVAL = 2.0  # seconden
+LOG_QUEUE_MAX_POGINGEN = 5
+LOG_QUEUE_MAX_WACHTTIJD = 30  # seconden tussen pogingen
+LOG_QUEUE_SPILL_BESTAND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "log_queue_spill.jsonl")
+LOG_QUEUE_QUARANTAINE_BESTAND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "log_queue_quarantaine.jsonl")
+
+@st.cache_resource
+def _get_log_queue() -> dict:
+    """Start de write-behind log worker (één per proces, cached)"""
+    state = {
+        "queue": queue.Queue(),
+        "client": get_supabase_client(),
+        "lock": threading.Lock(),
+        "buffer": [],  # [(tabel, record)] - opgehaald maar nog niet geschreven
+        "gestopt": False,
+        "stats": {"geschreven": 0, "mislukt": 0, "gespild": 0, "geweigerd": 0}
+    }
+    
+    # Records van een vorige run (afgesloten tijdens schrijven) opnieuw aanbieden
+    for tabel, record in _lees_spill_bestand():
+        state["queue"].put((tabel, record))
+    
+    thread = threading.Thread(target=_log_worker, args=(state,), name="bob-log-writer", daemon=True)
+    state["thread"] = thread
+    thread.start()
+    atexit.register(_stop_log_queue, state)
+    return state
+
+def _zet_in_log_queue(tabel: str, records: list):
+    """Zet log records in de wachtrij (niet-blokkerend)"""
+    state = _get_log_queue()
+    for record in records:
+        state["queue"].put((tabel, record))
+
+def _wachtende_logs(tabel: str) -> list:
+    """Records voor een tabel die nog niet naar de database geschreven zijn"""
+    try:
+        state = _get_log_queue()
+        with state["lock"]:
+            wachtend = [r for t, r in state["buffer"] if t == tabel]
+        with state["queue"].mutex:
+            wachtend += [item[1] for item in state["queue"].queue if item and item[0] == tabel]
+        return wachtend
+    except Exception:
+        return []
+
+def _is_record_fout(e: Exception) -> bool:
+    """Weigert de database de inhoud van een record (i.p.v. een verbindings- of tijdelijke fout)?"""
+    code = getattr(e, "code", None)
+    return isinstance(code, str) and code.startswith(("22", "23", "PGRST1", "PGRST2"))
+
+def _schrijf_log_records(state: dict, tabel: str, records: list):
+    """Schrijf records van één tabel in één request"""
+    state["client"].table(tabel).insert(records).execute()
+
+def _flush_log_buffer(state: dict) -> bool:
+    """
+    Schrijf de buffer per tabel weg. Geschreven en geweigerde (quarantaine)
+    records worden verwijderd; bij een verbindingsfout blijven ze staan.
+    """
+    with state["lock"]:
+        per_tabel = {}
+        for tabel, record in state["buffer"]:
+            per_tabel.setdefault(tabel, []).append(record)
+    
+    alles_ok = True
+    for tabel, records in per_tabel.items():
+        try:
+            _schrijf_log_records(state, tabel, records)
+            behouden = set()
+            state["stats"]["geschreven"] += len(records)
+        except Exception as e:
+            if _is_record_fout(e):
+                # Foute record(s) isoleren; de rest wordt gewoon geschreven
+                mislukt = []
+                state["stats"]["geschreven"] += _schrijf_met_isolatie(
+                    lambda deel: _schrijf_log_records(state, tabel, deel), records, 1, mislukt
+                )
+                geweigerd = [(record, fout) for record, fout in mislukt if _is_record_fout(fout)]
+                _quarantaine_log_records(state, tabel, geweigerd)
+                behouden = {id(record) for record, fout in mislukt if not _is_record_fout(fout)}
+                if behouden:
+                    alles_ok = False
+                    state["stats"]["mislukt"] += 1
+            else:
+                alles_ok = False
+                state["stats"]["mislukt"] += 1
+                print(f"Log queue: schrijven naar {tabel} mislukt (niet kritisch): {e}")
+                continue
+        with state["lock"]:
+            state["buffer"] = [(t, r) for t, r in state["buffer"] if t != tabel or id(r) in behouden]
+    return alles_ok
+
+def _quarantaine_log_records(state: dict, tabel: str, geweigerd: list):
+    """Zet door de database geweigerde records (met fout) opzij in het quarantaine bestand"""
+    if not geweigerd:
+        return
+    state["stats"]["geweigerd"] += len(geweigerd)
+    print(f"Log queue: {len(geweigerd)} record(s) voor {tabel} geweigerd, in quarantaine: {geweigerd[0][1]}")
+    try:
+        os.makedirs(os.path.dirname(LOG_QUEUE_QUARANTAINE_BESTAND), exist_ok=True)
+        with open(LOG_QUEUE_QUARANTAINE_BESTAND, "a", encoding="utf-8") as f:
+            for record, fout in geweigerd:
+                f.write(json.dumps({"tabel": tabel, "record": record, "fout": str(fout)}, default=str) + "\n")
+    except Exception as e:
+        print(f"Log queue: quarantaine naar bestand mislukt, {len(geweigerd)} records verloren: {e}")
+
+def _log_worker(state: dict):
+    """Achtergrondthread: verzamel records en schrijf gebundeld weg"""
+    wachtrij = state["queue"]
+    laatste_flush = time.time()
+    pogingen = 0
+    volgende_poging = 0
+    stoppen = False
+    
+    while not stoppen:
+        try:
+            item = wachtrij.get(timeout=LOG_QUEUE_FLUSH_INTERVAL)
+            if item is None:
+                stoppen = True
+            else:
+                with state["lock"]:
+                    state["buffer"].append(item)
+            # Leeg de wachtrij tot batchgrootte
+            while not stoppen and len(state["buffer"]) < LOG_QUEUE_BATCH_GROOTTE:
+                item = wachtrij.get_nowait()
+                if item is None:
+                    stoppen = True
+                else:
+                    with state["lock"]:
+                        state["buffer"].append(item)
+        except queue.Empty:
+            pass
+        
+        nu = time.time()
+        vol = len(state["buffer"]) >= LOG_QUEUE_BATCH_GROOTTE
+        interval_verstreken = nu - laatste_flush >= LOG_QUEUE_FLUSH_INTERVAL
+        
+        if state["buffer"] and (vol or interval_verstreken or stoppen) and (nu >= volgende_poging or stoppen):
+            laatste_flush = nu
+            if _flush_log_buffer(state):
+                pogingen = 0
+                volgende_poging = 0
+            else:
+                pogingen += 1
+                if pogingen >= LOG_QUEUE_MAX_POGINGEN:
+                    # Database blijft onbereikbaar: bewaar lokaal i.p.v. geheugen vol laten lopen
+                    _spill_log_buffer(state)
+                    pogingen = 0
+                    volgende_poging = 0
+                else:
+                    volgende_poging = nu + min(LOG_QUEUE_MAX_WACHTTIJD, 2 ** pogingen)
+    
+    # Afsluiten: wat niet geschreven kon worden gaat naar het spill bestand
+    if state["buffer"]:
+        _spill_log_buffer(state)
+
+def _spill_log_buffer(state: dict):
+    """Schrijf de buffer naar het lokale spill bestand en leeg hem"""
+    with state["lock"]:
+        buffer = state["buffer"]
+        state["buffer"] = []
+    if not buffer:
+        return
+    try:
+        os.makedirs(os.path.dirname(LOG_QUEUE_SPILL_BESTAND), exist_ok=True)
+        with open(LOG_QUEUE_SPILL_BESTAND, "a", encoding="utf-8") as f:
+            for tabel, record in buffer:
+                f.write(json.dumps({"tabel": tabel, "record": record}, default=str) + "\n")
+        state["stats"]["gespild"] += len(buffer)
+    except Exception as e:
+        print(f"Log queue: spill naar bestand mislukt, {len(buffer)} records verloren: {e}")
+
+def _lees_spill_bestand() -> list:
+    """Lees en verwijder het spill bestand van een vorige run"""
+    if not os.path.exists(LOG_QUEUE_SPILL_BESTAND):
+        return []
+    items = []
+    try:
+        with open(LOG_QUEUE_SPILL_BESTAND, "r", encoding="utf-8") as f:
+            for regel in f:
+                regel = regel.strip()
+                if not regel:
+                    continue
+                try:
+                    data = json.loads(regel)
+                    items.append((data["tabel"], data["record"]))
+                except (json.JSONDecodeError, KeyError):
+                    continue
+        os.remove(LOG_QUEUE_SPILL_BESTAND)
+    except Exception as e:
+        print(f"Log queue: spill bestand lezen mislukt: {e}")
+    return items
+
+def _stop_log_queue(state: dict, timeout: float = 5.0):
+    """Stop de worker bij afsluiten van het proces; restanten gaan naar het spill bestand"""
+    if state["gestopt"]:
+        return
+    state["gestopt"] = True
+    state["queue"].put(None)
+    state["thread"].join(timeout)
+    
+    # Worker niet (tijdig) gestopt: spill buffer en wachtrij zelf
+    restant = []
+    while True:
+        try:
+            item = state["queue"].get_nowait()
+        except queue.Empty:
+            break
+        if item is not None:
+            restant.append(item)
+    with state["lock"]:
+        state["buffer"].extend(restant)
+    _spill_log_buffer(state)
+
+def get_log_queue_status() -> dict:
+    """Status van de log queue (voor beheer/debug)"""
+    state = _get_log_queue()
+    with state["lock"]:
+        in_buffer = len(state["buffer"])
+    return {
+        "wachtend": state["queue"].qsize() + in_buffer,
+        "actief": state["thread"].is_alive(),
+        **state["stats"]
+    }
+
 # ============================================================
 # REGISTRATIE LOGGING FUNCTIES
 # ============================================================
@@ -2042,7 +4261,6 @@ def log_registratie(nbb_nummer: str, wed_id: str, positie: str, actie: str,
         True bij succes, False bij fout
     """
     try:
-        supabase = get_supabase_client()
         nu = datetime.now()
         
         # Bereken dagen voor wedstrijd
@@ -2064,7 +4282,9 @@ def log_registratie(nbb_nummer: str, wed_id: str, positie: str, actie: str,
             "wed_datum": wed_datum.isoformat()
         }
         
-        supabase.table("registratie_log").insert(record).execute()
+        # Write-behind: schrijven gebeurt op de achtergrond
+        # (eerste_inschrijvingen wordt door een trigger op registratie_log bijgehouden)
+        _zet_in_log_queue("registratie_log", [record])
         return True
     except Exception as e:
         # Niet kritisch - log failure mag app niet blokkeren
@@ -2090,7 +4310,14 @@ def laad_beschikbaarheid_log(nbb_nummer: str, max_results: int = 20) -> list:
                     .order("tijdstip", desc=True)
                     .limit(max_results)
                     .execute())
-        return response.data or []
+        
+        # Nog niet weggeschreven entries (write-behind queue) meenemen
+        wachtend = [r for r in _wachtende_logs("beschikbaarheid_log") if r.get("nbb_nummer") == nbb_nummer]
+        if not wachtend:
+            return response.data or []
+        logs = wachtend + (response.data or [])
+        logs.sort(key=lambda r: r.get("tijdstip", ""), reverse=True)
+        return logs[:max_results]
     except Exception as e:
         print(f"Fout bij laden beschikbaarheid log: {e}")
         return []
@@ -2115,16 +4342,12 @@ def log_beschikbaarheid(nbb_nummer: str, actie: str, gewijzigde_dagen: list,
         return True  # Niets te loggen
 
     try:
-        supabase = get_supabase_client()
         nu = datetime.now()
 
-        # Haal IP op als niet meegegeven
+        # Haal IP op als niet meegegeven (alleen headers, geen landopzoeking)
         if ip_adres is None:
             try:
-                ip_info = get_ip_info()
-                ip_adres = ip_info.get("ip") or None
-                if ip_adres == "Niet gevonden":
-                    ip_adres = None
+                ip_adres = _bepaal_client_ip()[0] or None
             except:
                 pass
 
@@ -2140,7 +4363,8 @@ def log_beschikbaarheid(nbb_nummer: str, actie: str, gewijzigde_dagen: list,
                 "ip_adres": ip_adres
             })
 
-        supabase.table("beschikbaarheid_log").insert(records).execute()
+        # Write-behind: schrijven gebeurt op de achtergrond
+        _zet_in_log_queue("beschikbaarheid_log", records)
         return True
     except Exception as e:
         # Niet kritisch - log failure mag app niet blokkeren
@@ -2148,10 +4372,179 @@ def log_beschikbaarheid(nbb_nummer: str, actie: str, gewijzigde_dagen: list,
         return False
 
 
+# ============================================================
+# REGISTRATIE LOG ANALYSE
+# ============================================================
+#
+# registratie_log groeit elk seizoen door. Aggregaties worden daarom in de
+# database gedaan (views); raw logs worden per pagina opgehaald met keyset
+# paginatie op (tijdstip, id). Ontbreekt een view, dan wordt lokaal
+# berekend op basis van gepagineerd opgehaalde logs (alleen benodigde kolommen).
+# Nog niet weggeschreven entries (write-behind queue) worden steeds meegeteld.
+#
+# Benodigde views en indexen (Supabase SQL editor):
+#
+#   CREATE VIEW registratie_statistieken AS
+#   SELECT nbb_nummer,
+#          count(*) AS aantal,
+#          sum(coalesce(dagen_voor_wedstrijd, 0)) AS som_dagen,
+#          count(*) FILTER (WHERE coalesce(dagen_voor_wedstrijd, 0) > 7) AS early_bird,
+#          count(*) FILTER (WHERE coalesce(dagen_voor_wedstrijd, 0) BETWEEN 3 AND 7) AS normaal,
+#          count(*) FILTER (WHERE coalesce(dagen_voor_wedstrijd, 0) < 3) AS last_minute
+#   FROM registratie_log WHERE actie = 'inschrijven'
+#   GROUP BY nbb_nummer;
+#
+#   CREATE VIEW registratie_tijdlijn AS
+#   SELECT tijdstip::date AS datum, count(*) AS aantal
+#   FROM registratie_log WHERE actie = 'inschrijven'
+#   GROUP BY 1;
+#
+#   CREATE VIEW registratie_eerste_inschrijving AS
+#   SELECT nbb_nummer, wed_id, min(tijdstip) AS tijdstip
+#   FROM registratie_log WHERE actie = 'inschrijven'
+#   GROUP BY nbb_nummer, wed_id;
+#
+#   CREATE INDEX registratie_log_inschrijven_idx
+#       ON registratie_log (nbb_nummer, wed_id, tijdstip) WHERE actie = 'inschrijven';
+#   CREATE INDEX registratie_log_keyset_idx ON registratie_log (tijdstip DESC, id DESC);
+#
+# Eerste inschrijving per (nbb_nummer, wed_id) als bijgehouden tabel. Een
+# trigger op registratie_log houdt die bij met least(): de vroegste inschrijving
+# wint, ook als logs in een andere volgorde binnenkomen (spill bestand,
+# bisectie na een fout). Eerst de trigger, dan eenmalig vullen vanuit de
+# bestaande logs:
+#
+#   CREATE TABLE eerste_inschrijvingen (
+#       nbb_nummer text NOT NULL,
+#       wed_id text NOT NULL,
+#       tijdstip timestamptz NOT NULL,
+#       PRIMARY KEY (nbb_nummer, wed_id)
+#   );
+#   CREATE INDEX eerste_inschrijvingen_wed_idx ON eerste_inschrijvingen (wed_id);
+#
+#   CREATE FUNCTION boek_eerste_inschrijving() RETURNS trigger AS $$
+#   BEGIN
+#       INSERT INTO eerste_inschrijvingen (nbb_nummer, wed_id, tijdstip)
+#           VALUES (NEW.nbb_nummer, NEW.wed_id, NEW.tijdstip)
+#       ON CONFLICT (nbb_nummer, wed_id) DO UPDATE
+#           SET tijdstip = least(eerste_inschrijvingen.tijdstip, excluded.tijdstip);
+#       RETURN NEW;
+#   END $$ LANGUAGE plpgsql;
+#
+#   CREATE TRIGGER registratie_log_eerste_inschrijving AFTER INSERT ON registratie_log
+#       FOR EACH ROW WHEN (NEW.actie = 'inschrijven')
+#       EXECUTE FUNCTION boek_eerste_inschrijving();
+#
+#   INSERT INTO eerste_inschrijvingen
+#   SELECT nbb_nummer, wed_id, min(tijdstip) FROM registratie_log
+#   WHERE actie = 'inschrijven' GROUP BY nbb_nummer, wed_id
+#   ON CONFLICT (nbb_nummer, wed_id) DO UPDATE
+#       SET tijdstip = least(eerste_inschrijvingen.tijdstip, excluded.tijdstip);
+#
+# Ontbreekt de tabel, dan valt laad_eerste_inschrijvingen_voor terug op de view.
+# ============================================================
+
+REGISTRATIE_PAGINA_GROOTTE = 1000
+EERSTE_INSCHRIJVING_TABEL = "eerste_inschrijvingen"  # Index (nbb_nummer, wed_id) -> eerste inschrijving
+EERSTE_INSCHRIJVING_BATCH = 100  # wed_ids per request
+
+@st.cache_resource
+def _get_ontbrekende_views() -> set:
+    """Analyse-views die niet in de database bestaan (cached per proces)"""
+    return set()
+
+def _lees_analyse_view(view: str, kolommen: str, volgorde: tuple, filters: dict = None) -> list | None:
+    """
+    Lees alle rijen uit een analyse-view (gepagineerd).
+    
+    Returns:
+        Lijst van rijen, of None als de view niet bestaat (dan lokaal berekenen)
+    """
+    ontbrekend = _get_ontbrekende_views()
+    if view in ontbrekend:
+        return None
+    
+    supabase = get_supabase_client()
+    rijen = []
+    start = 0
+    try:
+        while True:
+            query = supabase.table(view).select(kolommen)
+            for kolom, waarde in (filters or {}).items():
+                query = query.eq(kolom, waarde)
+            for kolom in volgorde:
+                query = query.order(kolom)
+            response = query.range(start, start + REGISTRATIE_PAGINA_GROOTTE - 1).execute()
+            pagina = response.data or []
+            rijen.extend(pagina)
+            if len(pagina) < REGISTRATIE_PAGINA_GROOTTE:
+                return rijen
+            start += REGISTRATIE_PAGINA_GROOTTE
+    except Exception as e:
+        if not _is_db_fout(e, "42P01", "PGRST205"):
+            raise
+        print(f"View {view} ontbreekt, lokaal berekenen: {e} (niet kritisch)")
+        ontbrekend.add(view)
+        return None
+
+def laad_registratie_logs_pagina(nbb_nummer: str = None, vanaf: datetime = None, actie: str = None,
+                                 na: tuple = None, limiet: int = 100,
+                                 kolommen: str = "*") -> tuple[list, tuple | None]:
+    """
+    Laad één pagina registratie logs (nieuwste eerst) met keyset paginatie.
+    
+    Args:
+        nbb_nummer: Optioneel - filter op specifieke speler
+        vanaf: Optioneel - alleen logs vanaf deze datum
+        actie: Optioneel - filter op actie (bv. "inschrijven")
+        na: Cursor (tijdstip, id) uit de vorige pagina; None = eerste pagina
+        limiet: Aantal logs per pagina
+        kolommen: Op te halen kolommen (tijdstip en id zijn altijd nodig)
+    
+    Returns:
+        (logs, cursor voor de volgende pagina of None als dit de laatste is)
+    """
+    supabase = get_supabase_client()
+    query = supabase.table("registratie_log").select(kolommen)
+    
+    if nbb_nummer:
+        query = query.eq("nbb_nummer", nbb_nummer)
+    if vanaf:
+        query = query.gte("tijdstip", vanaf.isoformat())
+    if actie:
+        query = query.eq("actie", actie)
+    if na:
+        tijdstip, log_id = na
+        query = query.or_(f'tijdstip.lt."{tijdstip}",and(tijdstip.eq."{tijdstip}",id.lt.{log_id})')
+    
+    response = query.order("tijdstip", desc=True).order("id", desc=True).limit(limiet).execute()
+    logs = response.data or []
+    cursor = (logs[-1]["tijdstip"], logs[-1]["id"]) if len(logs) == limiet else None
+    return logs, cursor
+
+def _iter_registratie_logs(nbb_nummer: str = None, vanaf: datetime = None, actie: str = None,
+                           kolommen: str = "*"):
+    """Loop door alle registratie logs (nieuwste eerst), pagina voor pagina"""
+    cursor = None
+    while True:
+        logs, cursor = laad_registratie_logs_pagina(
+            nbb_nummer, vanaf, actie, na=cursor, limiet=REGISTRATIE_PAGINA_GROOTTE, kolommen=kolommen
+        )
+        yield from logs
+        if cursor is None:
+            return
+
+def _wachtende_inschrijvingen() -> list:
+    """Inschrijf-logs die nog in de write-behind queue staan"""
+    return [r for r in _wachtende_logs("registratie_log") if r.get("actie") == "inschrijven"]
+
 def laad_registratie_logs(nbb_nummer: str = None, vanaf: datetime = None) -> list:
     """
     Laad registratie logs voor analyse.
     
+    Let op: zonder filters is dit de hele tabel. Gebruik voor overzichten
+    laad_registratie_logs_pagina() of de analyse-functies hieronder.
+    
     Args:
         nbb_nummer: Optioneel - filter op specifieke speler
         vanaf: Optioneel - alleen logs vanaf deze datum
@@ -2160,21 +4553,37 @@ def laad_registratie_logs(nbb_nummer: str = None, vanaf: datetime = None) -> lis
         Lijst van registratie logs
     """
     try:
-        supabase = get_supabase_client()
-        query = supabase.table("registratie_log").select("*")
-        
-        if nbb_nummer:
-            query = query.eq("nbb_nummer", nbb_nummer)
-        
-        if vanaf:
-            query = query.gte("tijdstip", vanaf.isoformat())
-        
-        response = query.order("tijdstip", desc=True).execute()
-        return response.data or []
+        logs = list(_iter_registratie_logs(nbb_nummer, vanaf))
+        
+        # Nog niet weggeschreven entries (write-behind queue) meenemen
+        wachtend = [
+            r for r in _wachtende_logs("registratie_log")
+            if (not nbb_nummer or r.get("nbb_nummer") == nbb_nummer)
+            and (not vanaf or r.get("tijdstip", "") >= vanaf.isoformat())
+        ]
+        if not wachtend:
+            return logs
+        logs = wachtend + logs
+        logs.sort(key=lambda r: r.get("tijdstip", ""), reverse=True)
+        return logs
     except Exception as e:
         print(f"Fout bij laden registratie logs: {e}")
         return []
 
+def _tel_inschrijving(tellers: dict, nbb: str, dagen: int, aantal: int = 1):
+    """Tel inschrijving(en) mee in early bird / normaal / last minute"""
+    if nbb not in tellers:
+        tellers[nbb] = {"aantal": 0, "som_dagen": 0, "early_bird": 0, "normaal": 0, "last_minute": 0}
+    teller = tellers[nbb]
+    teller["aantal"] += aantal
+    teller["som_dagen"] += dagen * aantal
+    if dagen > 7:
+        teller["early_bird"] += aantal   # > 7 dagen van tevoren
+    elif dagen >= 3:
+        teller["normaal"] += aantal      # 3-7 dagen van tevoren
+    else:
+        teller["last_minute"] += aantal  # < 3 dagen van tevoren
+
 def get_inschrijf_statistieken() -> dict:
     """
     Bereken inschrijfgedrag statistieken per speler.
@@ -2184,42 +4593,29 @@ def get_inschrijf_statistieken() -> dict:
         early_bird_count, last_minute_count
     """
     try:
-        logs = laad_registratie_logs()
-        
-        # Filter alleen inschrijvingen
-        inschrijvingen = [l for l in logs if l.get("actie") == "inschrijven"]
-        
-        # Groepeer per speler
-        per_speler = {}
-        for log in inschrijvingen:
-            nbb = log.get("nbb_nummer")
-            if nbb not in per_speler:
-                per_speler[nbb] = {
-                    "dagen_lijst": [],
-                    "early_bird": 0,  # > 7 dagen van tevoren
-                    "normaal": 0,     # 3-7 dagen van tevoren
-                    "last_minute": 0  # < 3 dagen van tevoren
+        tellers = {}
+        rijen = _lees_analyse_view(
+            "registratie_statistieken", "nbb_nummer,aantal,som_dagen,early_bird,normaal,last_minute",
+            volgorde=("nbb_nummer",)
+        )
+        if rijen is not None:
+            for rij in rijen:
+                tellers[rij["nbb_nummer"]] = {
+                    k: rij.get(k) or 0 for k in ("aantal", "som_dagen", "early_bird", "normaal", "last_minute")
                 }
-            
-            dagen = log.get("dagen_voor_wedstrijd", 0)
-            per_speler[nbb]["dagen_lijst"].append(dagen)
-            
-            if dagen > 7:
-                per_speler[nbb]["early_bird"] += 1
-            elif dagen >= 3:
-                per_speler[nbb]["normaal"] += 1
-            else:
-                per_speler[nbb]["last_minute"] += 1
+        else:
+            # Lokaal: alleen inschrijvingen en alleen de benodigde kolommen
+            for log in _iter_registratie_logs(actie="inschrijven", kolommen="id,tijdstip,nbb_nummer,dagen_voor_wedstrijd"):
+                _tel_inschrijving(tellers, log.get("nbb_nummer"), log.get("dagen_voor_wedstrijd") or 0)
+        
+        for log in _wachtende_inschrijvingen():
+            _tel_inschrijving(tellers, log.get("nbb_nummer"), log.get("dagen_voor_wedstrijd") or 0)
         
         # Bereken gemiddelden
         resultaat = {}
-        for nbb, data in per_speler.items():
-            if data["dagen_lijst"]:
-                gem = sum(data["dagen_lijst"]) / len(data["dagen_lijst"])
-            else:
-                gem = 0
-            
-            totaal = len(data["dagen_lijst"])
+        for nbb, data in tellers.items():
+            totaal = data["aantal"]
+            gem = data["som_dagen"] / totaal if totaal > 0 else 0
             resultaat[nbb] = {
                 "gem_dagen_voor_wedstrijd": round(gem, 1),
                 "aantal_inschrijvingen": totaal,
@@ -2243,12 +4639,18 @@ def get_inschrijf_tijdlijn() -> list:
         Lijst van dicts met datum en aantal inschrijvingen
     """
     try:
-        logs = laad_registratie_logs()
-        inschrijvingen = [l for l in logs if l.get("actie") == "inschrijven"]
+        per_dag = {}
+        rijen = _lees_analyse_view("registratie_tijdlijn", "datum,aantal", volgorde=("datum",))
+        if rijen is not None:
+            for rij in rijen:
+                dag = str(rij.get("datum", ""))[:10]
+                per_dag[dag] = per_dag.get(dag, 0) + (rij.get("aantal") or 0)
+            logs = _wachtende_inschrijvingen()
+        else:
+            logs = list(_iter_registratie_logs(actie="inschrijven", kolommen="id,tijdstip")) + _wachtende_inschrijvingen()
         
         # Groepeer per dag
-        per_dag = {}
-        for log in inschrijvingen:
+        for log in logs:
             tijdstip = log.get("tijdstip", "")
             if tijdstip:
                 dag = tijdstip[:10]  # YYYY-MM-DD
@@ -2258,3 +4660,186 @@ def get_inschrijf_tijdlijn() -> list:
         return [{"datum": dag, "aantal": aantal} for dag, aantal in sorted(per_dag.items())]
     except:
         return []
+
+def laad_eerste_inschrijvingen(nbb_nummer: str = None) -> dict:
+    """
+    Eerste inschrijfmoment per (nbb_nummer, wed_id).
+    
+    Args:
+        nbb_nummer: Optioneel - alleen voor deze speler
+    
+    Returns:
+        Dict {(nbb_nummer, wed_id): tijdstip (ISO string)}
+    """
+    try:
+        filters = {"nbb_nummer": nbb_nummer} if nbb_nummer else None
+        rijen = _lees_analyse_view(
+            "registratie_eerste_inschrijving", "nbb_nummer,wed_id,tijdstip",
+            volgorde=("nbb_nummer", "wed_id"), filters=filters
+        )
+        if rijen is None:
+            rijen = list(_iter_registratie_logs(
+                nbb_nummer, actie="inschrijven", kolommen="id,tijdstip,nbb_nummer,wed_id"
+            ))
+        rijen = rijen + [
+            r for r in _wachtende_inschrijvingen()
+            if not nbb_nummer or r.get("nbb_nummer") == nbb_nummer
+        ]
+        
+        # Bewaar oudste inschrijving per combinatie
+        eerste = {}
+        for rij in rijen:
+            key = (rij.get("nbb_nummer", ""), rij.get("wed_id", ""))
+            tijdstip = rij.get("tijdstip", "")
+            if tijdstip and (key not in eerste or tijdstip < eerste[key]):
+                eerste[key] = tijdstip
+        return eerste
+    except Exception as e:
+        print(f"Fout bij laden eerste inschrijvingen: {e}")
+        return {}
+
+def laad_eerste_inschrijvingen_voor(slots) -> dict:
+    """
+    Eerste inschrijfmoment voor precies deze (nbb_nummer, wed_id) combinaties,
+    uit de tabel eerste_inschrijvingen (per EERSTE_INSCHRIJVING_BATCH wed_ids
+    één request). Nog niet weggeschreven inschrijvingen tellen mee.
+    
+    Returns:
+        Dict {(nbb_nummer, wed_id): tijdstip (ISO string)}; zonder inschrijving
+        staat de combinatie er niet in
+    """
+    slots = set(slots)
+    if not slots:
+        return {}
+    
+    ontbrekend = _get_ontbrekende_views()
+    if EERSTE_INSCHRIJVING_TABEL in ontbrekend:
+        return {k: v for k, v in laad_eerste_inschrijvingen().items() if k in slots}
+    
+    try:
+        supabase = get_supabase_client()
+        wed_ids = sorted({wed_id for _, wed_id in slots})
+        rijen = []
+        for i in range(0, len(wed_ids), EERSTE_INSCHRIJVING_BATCH):
+            response = supabase.table(EERSTE_INSCHRIJVING_TABEL).select(
+                "nbb_nummer,wed_id,tijdstip"
+            ).in_("wed_id", wed_ids[i:i + EERSTE_INSCHRIJVING_BATCH]).execute()
+            rijen.extend(response.data or [])
+    except Exception as e:
+        if not _is_db_fout(e, "42P01", "PGRST205"):
+            print(f"Fout bij laden eerste inschrijvingen: {e}")
+            return {}
+        print(f"Tabel {EERSTE_INSCHRIJVING_TABEL} ontbreekt, view wordt gebruikt: {e} (niet kritisch)")
+        ontbrekend.add(EERSTE_INSCHRIJVING_TABEL)
+        return {k: v for k, v in laad_eerste_inschrijvingen().items() if k in slots}
+    
+    eerste = {}
+    for rij in rijen + _wachtende_inschrijvingen():
+        key = (rij.get("nbb_nummer", ""), rij.get("wed_id", ""))
+        tijdstip = rij.get("tijdstip", "")
+        if key in slots and tijdstip and (key not in eerste or tijdstip < eerste[key]):
+            eerste[key] = tijdstip
+    return eerste
+
+# ============================================================
+# PARALLEL PREFETCH (PAGINA DATA)
+# ============================================================
+#
+# De views laden bij een koude start 7-8 tabellen na elkaar, elk een eigen
+# HTTPS round-trip naar Supabase. prefetch_pagina_data() start de loaders die
+# nog niet in de sessie-cache staan tegelijk op een thread pool, zodat de
+# wachttijd ongeveer één round-trip is. De loaders zelf blijven de bron van
+# waarheid (sessie-cache, snapshot, replica fallback): de worker-threads
+# krijgen de script run context van de sessie mee.
+# ============================================================
+
+PREFETCH_MAX_WORKERS = 8
+
+@dataclass
+class DataBundel:
+    """Resultaat van prefetch_pagina_data (None = niet opgevraagd)"""
+    scheidsrechters: dict | None = None
+    wedstrijden: dict | None = None
+    wedstrijden_planning: dict | None = None
+    instellingen: dict | None = None
+    beloningen: dict | None = None
+    beloningsinstellingen: dict | None = None
+    klusjes: dict | None = None
+    beschikbare_klusjes: list | None = None
+    vervangingsverzoeken: dict | None = None
+    begeleidingsuitnodigingen: dict | None = None
+    begeleiding_feedback: dict | None = None
+
+def _prefetch_loaders() -> dict:
+    """Tabelnaam -> loader (veldnamen van DataBundel)"""
+    return {
+        "scheidsrechters": laad_scheidsrechters,
+        "wedstrijden": laad_wedstrijden,
+        "wedstrijden_planning": laad_wedstrijden_planning,
+        "instellingen": laad_instellingen,
+        "beloningen": laad_beloningen,
+        "beloningsinstellingen": laad_beloningsinstellingen,
+        "klusjes": laad_klusjes,
+        "beschikbare_klusjes": laad_beschikbare_klusjes,
+        "vervangingsverzoeken": laad_vervangingsverzoeken,
+        "begeleidingsuitnodigingen": laad_begeleidingsuitnodigingen,
+        "begeleiding_feedback": laad_begeleiding_feedback,
+    }
+
+def prefetch_pagina_data(*tabellen: str) -> DataBundel:
+    """
+    Laad de opgegeven tabellen parallel en geef ze terug als DataBundel.
+    
+    Tabellen die al in de sessie-cache staan worden niet opnieuw opgehaald.
+    Na afloop staan de resultaten in de sessie-cache, dus de gewone laad_*
+    aanroepen verderop in de pagina kosten geen extra round-trip.
+    Zonder script run context (of bij één tabel) wordt sequentieel geladen.
+    
+    Args:
+        tabellen: veldnamen van DataBundel; leeg = alles
+    """
+    loaders = _prefetch_loaders()
+    tabellen = tabellen or tuple(loaders)
+    onbekend = [t for t in tabellen if t not in loaders]
+    if onbekend:
+        raise ValueError(f"Onbekende tabel(len) voor prefetch: {', '.join(onbekend)}")
+    
+    # Gedeelde resources eerst op de hoofdthread aanmaken (cache_resource)
+    get_supabase_client()
+    _get_snapshot_store()
+    _get_replica()
+    
+    # begeleiding_feedback heeft geen sessie-cache: altijd ophalen
+    te_laden = [
+        t for t in tabellen
+        if t == "begeleiding_feedback" or f"_db_cache_{t}" not in st.session_state
+    ]
+    
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except ImportError:
+        ctx = None
+    
+    resultaten = {}
+    if ctx is not None and len(te_laden) > 1:
+        def _laad_in_thread(loader):
+            add_script_run_ctx(threading.current_thread(), ctx)
+            return loader()
+        
+        workers = min(PREFETCH_MAX_WORKERS, len(te_laden))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch") as pool:
+            futures = {t: pool.submit(_laad_in_thread, loaders[t]) for t in te_laden}
+            for tabel, future in futures.items():
+                try:
+                    resultaten[tabel] = future.result()
+                except Exception as e:
+                    # Niet fataal: hieronder nogmaals via de gewone loader
+                    print(f"Prefetch {tabel} mislukt, sequentieel opnieuw: {e} (niet kritisch)")
+    
+    # Rest (cache hits, sequentieel, mislukte prefetch) via de gewone loaders
+    for tabel in tabellen:
+        if tabel not in resultaten:
+            resultaten[tabel] = loaders[tabel]()
+    
+    return DataBundel(**resultaten)
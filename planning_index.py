@@ -0,0 +1,1006 @@
+"""
+Planning index
+BV Waterdragers
+
+Vooraf berekende opzoekstructuren voor de planning. De index wordt één keer
+per data-snapshot opgebouwd uit wedstrijden en scheidsrechters (zie
+get_planning_index in app.py), zodat checks die per (scheidsrechter,
+wedstrijd) gedaan worden niet telkens alle wedstrijden hoeven te doorlopen.
+
+Ook het wedstrijdrecord (WedstrijdRecord) staat hier: de loaders in
+database.py leveren wedstrijden als dit type, zodat de datum maar één keer
+geparsed wordt.
+
+Deze module gebruikt geen Streamlit of database; alleen de data die
+meegegeven wordt.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+
+import numpy as np
+
+# Wedstrijd duurt ongeveer 1,5 uur
+WED_DUUR = timedelta(hours=1, minutes=30)
+
+# Thuiswedstrijd / fluiten: 30 min van tevoren aanwezig
+AANWEZIG_VOOR = timedelta(minutes=30)
+
+# Formaat van wed["datum"]
+DATUM_FORMAAT = "%Y-%m-%d %H:%M"
+
+# Reistijd als een uitwedstrijd geen reistijd_minuten heeft
+STANDAARD_REISTIJD_MINUTEN = 60
+
+MAAND_NAMEN = ["januari", "februari", "maart", "april", "mei", "juni",
+               "juli", "augustus", "september", "oktober", "november", "december"]
+
+# Tijden in de pool-engine: gehele microseconden sinds dit moment (exact, geen afronding)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECONDE = timedelta(microseconds=1)
+
+
+class WedstrijdRecord(dict):
+    """
+    Wedstrijd zoals de loaders hem leveren: een gewone dict (bestaande code
+    blijft werken), plus afgeleide datumvelden die één keer berekend worden.
+    
+    - datum_dt: datetime van wed["datum"]
+    - epoch_minuten: minuten sinds 1970-01-01 (vergelijken/sorteren)
+    - datum_key: "YYYY-MM-DD"
+    - weekdag: 0 = maandag ... 6 = zondag
+    
+    Wordt "datum" gewijzigd, dan wordt bij de volgende opvraag opnieuw geparsed.
+    """
+    
+    __slots__ = ("_geparsed",)
+    
+    def _datum_velden(self) -> tuple:
+        """(datum string, datetime, epoch minuten, datum key, weekdag), gecached"""
+        datum = self["datum"]
+        geparsed = getattr(self, "_geparsed", None)
+        if geparsed is None or geparsed[0] != datum:
+            dt = datetime.strptime(datum, DATUM_FORMAAT)
+            geparsed = (datum, dt, (dt - _EPOCH) // timedelta(minutes=1), dt.strftime("%Y-%m-%d"), dt.weekday())
+            self._geparsed = geparsed
+        return geparsed
+    
+    @property
+    def datum_dt(self) -> datetime:
+        return self._datum_velden()[1]
+    
+    @property
+    def epoch_minuten(self) -> int:
+        return self._datum_velden()[2]
+    
+    @property
+    def datum_key(self) -> str:
+        return self._datum_velden()[3]
+    
+    @property
+    def weekdag(self) -> int:
+        return self._datum_velden()[4]
+
+
+def wed_datum(wed: dict) -> datetime:
+    """
+    Datum van een wedstrijd als datetime.
+    Voor WedstrijdRecords zonder opnieuw te parsen; gewone dicts (bijv. zelf
+    samengestelde wedstrijden) worden zoals vroeger met strptime geparsed.
+    """
+    if isinstance(wed, WedstrijdRecord):
+        return wed.datum_dt
+    return datetime.strptime(wed["datum"], DATUM_FORMAAT)
+
+
+def normaliseer_team(team: str) -> str:
+    """Normaliseer een teamnaam zoals team_match: uppercase, zonder sterretjes"""
+    return str(team).upper().replace("*", "").strip()
+
+
+def blokkade_venster(wed: dict) -> tuple[datetime, datetime]:
+    """
+    Tijdsvenster waarin een speler door een eigen wedstrijd niet kan fluiten.
+    Bij uitwedstrijden: reistijd ervoor en erna; thuis: 30 min ervoor aanwezig.
+    """
+    datum = wed_datum(wed)
+    if wed.get("type") == "uit":
+        reistijd = timedelta(minutes=wed.get("reistijd_minuten", STANDAARD_REISTIJD_MINUTEN))
+        return datum - reistijd, datum + WED_DUUR + reistijd
+    return datum - AANWEZIG_VOOR, datum + WED_DUUR
+
+
+def tijd_us(moment: datetime) -> int:
+    """Tijdstip als geheel aantal microseconden (voor NumPy vergelijkingen)"""
+    return (moment - _EPOCH) // _MICROSECONDE
+
+
+def blessure_maand(geblesseerd_tm) -> int:
+    """
+    "maand jaar" (bijv. "maart 2026") als jaar * 12 + maand, -1 als er geen
+    (geldige) blessure is. Wedstrijden met jaar * 12 + maand <= deze waarde
+    vallen binnen de blessureperiode.
+    """
+    if not geblesseerd_tm:
+        return -1
+    try:
+        delen = geblesseerd_tm.split()
+        if len(delen) == 2:
+            maand_naam, jaar = delen[0].lower(), int(delen[1])
+            if maand_naam in MAAND_NAMEN:
+                return jaar * 12 + MAAND_NAMEN.index(maand_naam) + 1
+    except:
+        pass
+    return -1
+
+
+class BeschikbaarheidsKalender:
+    """
+    Vaste onbeschikbaarheid per scheidsrechter, één keer voorbewerkt:
+    - geblokkeerde dagen als bitmap (bit i = startdag + i dagen)
+    - blessure t/m maand als jaar * 12 + maand (zie blessure_maand)
+    - niet-op-zondag vlag
+    
+    Elke check is daarmee een bit-test of vergelijking, zonder maandnamen te
+    parsen of de lijst met geblokkeerde dagen te doorzoeken. Bijwerken gaat
+    per scheidsrechter (werk_bij) of voor alleen de gewijzigde scheidsrechters
+    (synchroniseer).
+    """
+    
+    def __init__(self, scheidsrechters: dict, generatie: int = 0):
+        self.scheidsrechters = scheidsrechters
+        self.generatie = generatie
+        # {nbb: (startdag ordinal, bitmap, blessure maand, niet op zondag)}
+        self.per_scheids = {}
+        self._bronnen = {}
+        self.synchroniseer()
+    
+    @staticmethod
+    def _bron(scheids: dict) -> tuple:
+        dagen = scheids.get("geblokkeerde_dagen")
+        if isinstance(dagen, list):
+            dagen = tuple(dagen)
+        return dagen, scheids.get("geblesseerd_tm"), scheids.get("niet_op_zondag")
+    
+    def werk_bij(self, nbb_nummer: str):
+        """Verwerk de (gewijzigde) beschikbaarheid van één scheidsrechter"""
+        scheids = self.scheidsrechters.get(nbb_nummer)
+        if scheids is None:
+            self.per_scheids.pop(nbb_nummer, None)
+            self._bronnen.pop(nbb_nummer, None)
+            return
+        
+        bron = self._bron(scheids)
+        if nbb_nummer in self.per_scheids and self._bronnen.get(nbb_nummer) == bron:
+            return
+        self._bronnen[nbb_nummer] = bron
+        
+        # Alleen "YYYY-MM-DD" telt (zoals de vergelijking met strftime voorheen)
+        dagen = []
+        for dag in scheids.get("geblokkeerde_dagen", []) or []:
+            try:
+                geblokkeerd = date.fromisoformat(dag)
+            except (TypeError, ValueError):
+                continue
+            if geblokkeerd.isoformat() == dag:
+                dagen.append(geblokkeerd.toordinal())
+        
+        start = min(dagen) if dagen else 0
+        bitmap = 0
+        for dag in dagen:
+            bitmap |= 1 << (dag - start)
+        
+        self.per_scheids[nbb_nummer] = (
+            start,
+            bitmap,
+            blessure_maand(scheids.get("geblesseerd_tm", "")),
+            bool(scheids.get("niet_op_zondag", False))
+        )
+    
+    def synchroniseer(self):
+        """Breng de kalender in lijn met de scheidsrechters (alleen verschillen)"""
+        for nbb in [n for n in self.per_scheids if n not in self.scheidsrechters]:
+            self.werk_bij(nbb)
+        for nbb in self.scheidsrechters:
+            self.werk_bij(nbb)
+    
+    def gegevens(self, nbb_nummer: str) -> tuple:
+        """(startdag ordinal, bitmap, blessure maand, niet op zondag) van een scheidsrechter"""
+        if nbb_nummer not in self.per_scheids:
+            self.werk_bij(nbb_nummer)
+        return self.per_scheids.get(nbb_nummer, (0, 0, -1, False))
+    
+    def is_geblokkeerd(self, nbb_nummer: str, dag: date) -> bool:
+        """Heeft de scheidsrechter deze dag zelf geblokkeerd?"""
+        start, bitmap, _, _ = self.gegevens(nbb_nummer)
+        if not bitmap:
+            return False
+        i = dag.toordinal() - start
+        return i >= 0 and (bitmap >> i) & 1 == 1
+    
+    def is_geblesseerd(self, nbb_nummer: str, dag: date) -> bool:
+        """Valt de dag in of voor de laatste blessuremaand?"""
+        return dag.year * 12 + dag.month <= self.gegevens(nbb_nummer)[2]
+    
+    def is_zondag_uitgesloten(self, nbb_nummer: str, dag: date) -> bool:
+        """Is het zondag en fluit de scheidsrechter niet op zondag?"""
+        return self.gegevens(nbb_nummer)[3] and dag.weekday() == 6
+    
+    def is_beschikbaar(self, nbb_nummer: str, dag: date) -> bool:
+        """Niet geblokkeerd, niet geblesseerd en geen uitgesloten zondag"""
+        return not (
+            self.is_zondag_uitgesloten(nbb_nummer, dag)
+            or self.is_geblesseerd(nbb_nummer, dag)
+            or self.is_geblokkeerd(nbb_nummer, dag)
+        )
+
+
+class TeamResolver:
+    """
+    Teamidentiteit: alle teamnamen één keer genormaliseerd en vooraf gematcht.
+    
+    Zelfde semantiek als team_match (Waterdragers team + eigen team als
+    substring), maar per wedstrijd opgeslagen als verzameling eigen teams
+    zodat "welke teams spelen in wedstrijd X" en "welke scheidsrechters
+    hebben een eigen team in wedstrijd X" O(1) lookups zijn.
+    """
+    
+    def __init__(self, wedstrijden: dict, scheidsrechters: dict):
+        # Lege eigen teams matchen nooit (zoals team_match)
+        self.eigen_teams = {
+            nbb: tuple(et for et in (scheids.get("eigen_teams") or []) if et)
+            for nbb, scheids in scheidsrechters.items()
+        }
+        self.scheidsrechters_per_team = {}
+        for nbb, teams in self.eigen_teams.items():
+            for team in teams:
+                self.scheidsrechters_per_team.setdefault(team, set()).add(nbb)
+        
+        self.genormaliseerd = {team: normaliseer_team(team) for team in self.scheidsrechters_per_team}
+        
+        # Per wedstrijd: eigen teams die als thuis- resp. uitteam spelen
+        self.thuis_teams = {}
+        self.uit_teams = {}
+        self._scheidsrechters_in_wedstrijd = {}
+        for wed_id, wed in wedstrijden.items():
+            self.thuis_teams[wed_id] = self._match_teams(wed.get("thuisteam"))
+            self.uit_teams[wed_id] = self._match_teams(wed.get("uitteam"))
+    
+    def _match_teams(self, volledig_team) -> frozenset:
+        """Eigen teams die matchen met een volledige teamnaam"""
+        if not volledig_team or not self.genormaliseerd:
+            return frozenset()
+        volledig = normaliseer_team(volledig_team)
+        if "WATERDRAGERS" not in volledig:
+            return frozenset()
+        return frozenset(team for team, eigen in self.genormaliseerd.items() if eigen in volledig)
+    
+    def teams_in_wedstrijd(self, wed_id: str) -> frozenset:
+        """Eigen teams (zoals bij scheidsrechters ingevuld) die in deze wedstrijd spelen"""
+        return self.thuis_teams.get(wed_id, frozenset()) | self.uit_teams.get(wed_id, frozenset())
+    
+    def scheidsrechters_in_wedstrijd(self, wed_id: str) -> frozenset:
+        """NBB-nummers van scheidsrechters van wie een eigen team in deze wedstrijd speelt"""
+        if wed_id not in self._scheidsrechters_in_wedstrijd:
+            nbbs = set()
+            for team in self.teams_in_wedstrijd(wed_id):
+                nbbs |= self.scheidsrechters_per_team[team]
+            self._scheidsrechters_in_wedstrijd[wed_id] = frozenset(nbbs)
+        return self._scheidsrechters_in_wedstrijd[wed_id]
+    
+    def speelt_eigen_team(self, nbb_nummer: str, wed_id: str) -> bool:
+        """Speelt een eigen team van deze scheidsrechter in de wedstrijd (thuis of uit)?"""
+        return nbb_nummer in self.scheidsrechters_in_wedstrijd(wed_id)
+
+
+class ToewijzingIndex:
+    """
+    Per scheidsrechter de huidige toewijzingen (scheids_1 / scheids_2):
+    - per_scheids: gesorteerde lijst van (aanvangstijd, wed_id). Net als
+      voorheen tellen voor overlap alle wedstrijden mee, ook geannuleerde.
+    - werklast: tellers over niet-geannuleerde wedstrijden (totaal, als_1e,
+      als_2e en per_niveau), zoals tel_wedstrijden_scheidsrechter telt.
+    
+    Wordt incrementeel bijgewerkt: werk_bij(wed_id) na het wijzigen van een
+    positie, synchroniseer() na een data-generatie wissel (alleen wedstrijden
+    waarvan datum, posities, niveau of annulering veranderd zijn worden
+    opnieuw verwerkt).
+    """
+    
+    def __init__(self, wedstrijden: dict, generatie: int = 0):
+        self.wedstrijden = wedstrijden
+        self.generatie = generatie
+        self.per_scheids = {}
+        self.werklast = {}
+        self._slots = {}
+        self.synchroniseer()
+    
+    @staticmethod
+    def _slot(wed: dict) -> tuple:
+        return (wed.get("datum"), wed.get("scheids_1"), wed.get("scheids_2"),
+                bool(wed.get("geannuleerd", False)), wed.get("niveau", 1))
+    
+    def _tel(self, slot: tuple, delta: int):
+        """Verwerk een wedstrijd (+1) of haal hem weg (-1) uit de werklast-tellers"""
+        _, scheids_1, scheids_2, geannuleerd, niveau = slot
+        if geannuleerd:
+            return
+        for nbb in {nbb for nbb in (scheids_1, scheids_2) if nbb}:
+            tellers = self.werklast.setdefault(nbb, {"totaal": 0, "als_1e": 0, "als_2e": 0, "per_niveau": {}})
+            tellers["totaal"] += delta
+            tellers["als_1e"] += delta if scheids_1 == nbb else 0
+            tellers["als_2e"] += delta if scheids_2 == nbb else 0
+            per_niveau = tellers["per_niveau"]
+            per_niveau[niveau] = per_niveau.get(niveau, 0) + delta
+            if not per_niveau[niveau]:
+                del per_niveau[niveau]
+            if not tellers["totaal"]:
+                del self.werklast[nbb]
+    
+    def werk_bij(self, wed_id: str):
+        """Verwerk de huidige posities van één wedstrijd (of het verwijderen ervan)"""
+        wed = self.wedstrijden.get(wed_id)
+        slot = self._slot(wed) if wed is not None else None
+        oud = self._slots.get(wed_id)
+        if slot == oud:
+            return
+        
+        if oud is not None:
+            self._tel(oud, -1)
+            for nbb in {nbb for nbb in oud[1:3] if nbb}:
+                over = [t for t in self.per_scheids.get(nbb, []) if t[1] != wed_id]
+                if over:
+                    self.per_scheids[nbb] = over
+                else:
+                    self.per_scheids.pop(nbb, None)
+        
+        if slot is None:
+            self._slots.pop(wed_id, None)
+            return
+        
+        self._slots[wed_id] = slot
+        self._tel(slot, 1)
+        nbbs = {nbb for nbb in slot[1:3] if nbb}
+        if nbbs:
+            tijd = wed_datum(wed)
+            for nbb in nbbs:
+                insort(self.per_scheids.setdefault(nbb, []), (tijd, wed_id))
+    
+    def synchroniseer(self):
+        """Breng de index in lijn met de wedstrijden (alleen verschillen worden verwerkt)"""
+        for wed_id in [w for w in self._slots if w not in self.wedstrijden]:
+            self.werk_bij(wed_id)
+        for wed_id in self.wedstrijden:
+            self.werk_bij(wed_id)
+    
+    def heeft_overlap(self, nbb_nummer: str, huidige_wed_id: str, datum_tijd: datetime) -> bool:
+        """
+        Is de scheidsrechter al ingeschreven voor een andere wedstrijd die overlapt?
+        Fluitvensters (30 min ervoor tot 1,5 uur erna) overlappen als de
+        aanvangstijden minder dan 2 uur uit elkaar liggen.
+        """
+        toewijzingen = self.per_scheids.get(nbb_nummer)
+        if not toewijzingen:
+            return False
+        marge = WED_DUUR + AANWEZIG_VOOR
+        van = bisect_right(toewijzingen, datum_tijd - marge, key=itemgetter(0))
+        tot = bisect_left(toewijzingen, datum_tijd + marge, key=itemgetter(0))
+        return any(wed_id != huidige_wed_id for _, wed_id in toewijzingen[van:tot])
+    
+    def aantal(self, nbb_nummer: str) -> int:
+        """Aantal wedstrijden waarvoor de scheidsrechter ingeschreven is"""
+        return len(self.per_scheids.get(nbb_nummer, ()))
+    
+    def wedstrijd_ids(self, nbb_nummer: str) -> list:
+        """wed_ids van de toewijzingen van de scheidsrechter, op aanvangstijd"""
+        return [wed_id for _, wed_id in self.per_scheids.get(nbb_nummer, ())]
+    
+    def werklast_van(self, nbb_nummer: str) -> dict:
+        """Kopie van de werklast-tellers: {totaal, als_1e, als_2e, per_niveau}"""
+        tellers = self.werklast.get(nbb_nummer)
+        if not tellers:
+            return {"totaal": 0, "als_1e": 0, "als_2e": 0, "per_niveau": {}}
+        return {**tellers, "per_niveau": dict(tellers["per_niveau"])}
+    
+    def aantal_wedstrijden(self, nbb_nummer: str, alleen_niveau: int = None) -> int:
+        """Niet-geannuleerde wedstrijden van de scheidsrechter (optioneel van exact dit niveau)"""
+        tellers = self.werklast.get(nbb_nummer)
+        if not tellers:
+            return 0
+        if alleen_niveau is not None:
+            return tellers["per_niveau"].get(alleen_niveau, 0)
+        return tellers["totaal"]
+    
+    def aantal_op_niveau(self, nbb_nummer: str, min_niveau: int) -> int:
+        """Niet-geannuleerde wedstrijden op min_niveau of hoger"""
+        tellers = self.werklast.get(nbb_nummer)
+        if not tellers:
+            return 0
+        return sum(aantal for niveau, aantal in tellers["per_niveau"].items() if niveau >= min_niveau)
+
+
+class PlanningIndex:
+    """
+    Index over één versie van wedstrijden + scheidsrechters.
+    
+    - teams: TeamResolver (welke eigen teams spelen in welke wedstrijd)
+    - kalender: BeschikbaarheidsKalender (blokkades, blessure, zondag)
+    - team_vensters: per eigen team (zoals ingevuld bij scheidsrechters) de
+      gesorteerde blokkadevensters van de wedstrijden van dat team, met de
+      lopende maximale eindtijd zodat een overlapcheck één binary search is.
+    - bereken_pools: poolgrootte van alle wedstrijden in één keer via een
+      scheidsrechter x wedstrijd matrix (NumPy), per index bewaard.
+    """
+    
+    def __init__(self, wedstrijden: dict, scheidsrechters: dict, generatie: int = 0,
+                 kalender: BeschikbaarheidsKalender = None):
+        self.wedstrijden = wedstrijden
+        self.scheidsrechters = scheidsrechters
+        self.generatie = generatie
+        
+        if kalender is None:
+            kalender = BeschikbaarheidsKalender(scheidsrechters, generatie)
+        self.kalender = kalender
+        self.teams = TeamResolver(wedstrijden, scheidsrechters)
+        self.team_vensters = self._bouw_team_vensters()
+        self._matrix = None
+        self._pools = {}
+        self._dagen = None
+        self._eigen_per_dag = None
+    
+    def _bouw_team_vensters(self) -> dict:
+        """{eigen team: (starttijden, lopende max eindtijd)} voor alle eigen teams"""
+        vensters_per_team = {team: [] for team in self.teams.scheidsrechters_per_team}
+        for wed_id, wed in self.wedstrijden.items():
+            # Bij uitwedstrijd: thuisteam is het eigen team dat uit speelt
+            teams = self.teams.thuis_teams[wed_id]
+            if wed.get("type") != "uit":
+                teams = teams | self.teams.uit_teams[wed_id]
+            if teams:
+                venster = blokkade_venster(wed)
+                for team in teams:
+                    vensters_per_team[team].append(venster)
+        
+        for team, vensters in vensters_per_team.items():
+            vensters.sort()
+            starts = [start for start, _ in vensters]
+            max_eind = []
+            for _, eind in vensters:
+                max_eind.append(max(eind, max_eind[-1]) if max_eind else eind)
+            vensters_per_team[team] = (starts, max_eind)
+        return vensters_per_team
+    
+    def heeft_eigen_wedstrijd(self, nbb_nummer: str, datum_tijd: datetime) -> bool:
+        """
+        Heeft de scheidsrechter rond datum_tijd een eigen wedstrijd?
+        Zelfde regels als voorheen: fluiten = 30 min ervoor tot 1,5 uur erna.
+        """
+        fluit_start = datum_tijd - AANWEZIG_VOOR
+        fluit_eind = datum_tijd + WED_DUUR
+        
+        for team in self.teams.eigen_teams.get(nbb_nummer, ()):
+            starts, max_eind = self.team_vensters.get(team, ((), ()))
+            # Vensters die vóór het einde van het fluiten beginnen...
+            i = bisect_left(starts, fluit_eind)
+            # ...overlappen als er één na het begin van het fluiten eindigt
+            if i and max_eind[i - 1] > fluit_start:
+                return True
+        return False
+    
+    def eigen_wedstrijden_op_dag(self, nbb_nummer: str, dag: date) -> list:
+        """
+        Eigen wedstrijden van de scheidsrechter op deze dag: [(aanvangstijd, is_thuis)].
+        Zelfde regels als is_lastig_tijdstip: bij een uitwedstrijd telt alleen het
+        thuisteam (het eigen team speelt uit), anders thuis- of uitteam.
+        Wordt per index één keer voor alle scheidsrechters en dagen opgebouwd.
+        """
+        if self._eigen_per_dag is None:
+            per_dag = {}
+            for wed_id, wed in self.wedstrijden.items():
+                if wed.get("type") == "uit":
+                    teams = self.teams.thuis_teams.get(wed_id, frozenset())
+                else:
+                    teams = self.teams.teams_in_wedstrijd(wed_id)
+                if not teams:
+                    continue
+                datum = wed_datum(wed)
+                is_thuis = wed.get("type") != "uit"
+                nbbs = set()
+                for team in teams:
+                    nbbs |= self.teams.scheidsrechters_per_team[team]
+                for nbb in nbbs:
+                    per_dag.setdefault((nbb, datum.date()), []).append((datum, is_thuis))
+            self._eigen_per_dag = per_dag
+        return self._eigen_per_dag.get((nbb_nummer, dag), [])
+    
+    # ------------------------------------------------------------
+    # Pool-engine
+    # ------------------------------------------------------------
+    
+    def bereken_pools(self, negeer_ingeschreven: bool = True) -> dict:
+        """
+        Poolgrootte per wedstrijd: {wed_id: aantal beschikbare scheidsrechters}.
+        
+        Zelfde regels als de oude per-wedstrijd berekening (bereken_pool_voor_wedstrijd):
+        uitgesloten/status, afgemeld, BS2, niveau, eigen team, zondag, blessure,
+        geblokkeerde dagen en eigen wedstrijd. Met negeer_ingeschreven=False tellen
+        ingeschreven scheidsrechters en overlappende fluitwedstrijden ook niet mee.
+        """
+        negeer_ingeschreven = bool(negeer_ingeschreven)
+        if negeer_ingeschreven not in self._pools:
+            self._pools[negeer_ingeschreven] = self._bereken_pools(negeer_ingeschreven)
+        return self._pools[negeer_ingeschreven]
+    
+    def _bereken_pools(self, negeer_ingeschreven: bool) -> dict:
+        """Tel per kolom van de beschikbaarheidsmatrix, zonder afgemelde scheidsrechters"""
+        wed_ids, positie, basis, wed_tijd = self._basis_matrix()
+        if basis is None:
+            return {wed_id: 0 for wed_id in wed_ids}
+        
+        beschikbaar = basis.copy()
+        for j, wed in enumerate(self.wedstrijden.values()):
+            for a in wed.get("afgemeld_door") or []:
+                nbb = a.get("nbb") if isinstance(a, dict) else a
+                if nbb in positie:
+                    beschikbaar[positie[nbb], j] = False
+        
+        if not negeer_ingeschreven:
+            self._sluit_ingeschreven_uit(beschikbaar, positie, wed_tijd)
+        
+        return dict(zip(wed_ids, beschikbaar.sum(axis=0).tolist()))
+    
+    def _basis_matrix(self) -> tuple:
+        """
+        Beschikbaarheidsmatrix (scheidsrechters x wedstrijden), per index bewaard:
+        (wed_ids, positie per nbb, matrix of None, aanvangstijden in us).
+        Uitgesloten/status, BS2, niveau, eigen team, zondag, blessure, geblokkeerde
+        dagen en eigen wedstrijd; afmeldingen en inschrijvingen komen er later bij.
+        """
+        if self._matrix is None:
+            self._matrix = self._bouw_basis_matrix()
+        return self._matrix
+    
+    def _bouw_basis_matrix(self) -> tuple:
+        wed_ids = list(self.wedstrijden)
+        nbbs = list(self.scheidsrechters)
+        positie = {nbb: i for i, nbb in enumerate(nbbs)}
+        if not wed_ids or not nbbs:
+            return wed_ids, positie, None, None
+        
+        weds = [self.wedstrijden[wed_id] for wed_id in wed_ids]
+        scheids_lijst = [self.scheidsrechters[nbb] for nbb in nbbs]
+        datums = [wed_datum(wed) for wed in weds]
+        
+        # Eigenschappen per wedstrijd (kolommen)
+        wed_niveau = np.array([wed.get("niveau", 1) for wed in weds])
+        wed_bs2 = np.array([bool(wed.get("vereist_bs2", False)) for wed in weds])
+        wed_zondag = np.array([d.weekday() == 6 for d in datums])
+        wed_maand = np.array([d.year * 12 + d.month for d in datums], dtype=np.int64)
+        wed_tijd = np.array([tijd_us(d) for d in datums], dtype=np.int64)
+        
+        # Eigenschappen per scheidsrechter (rijen)
+        actief = np.array([
+            not scheids.get("uitgesloten_van_pool", False)
+            and scheids.get("scheids_status", "Actief") == "Actief"
+            for scheids in scheids_lijst
+        ])
+        niveau_1e = np.array([scheids.get("niveau_1e_scheids", 1) for scheids in scheids_lijst])
+        heeft_bs2 = np.array([bool(scheids.get("bs2_diploma", False)) for scheids in scheids_lijst])
+        kalender = [self.kalender.gegevens(nbb) for nbb in nbbs]
+        niet_zondag = np.array([k[3] for k in kalender])
+        geblesseerd_tm = np.array([k[2] for k in kalender], dtype=np.int64)
+        
+        beschikbaar = (
+            actief[:, None]
+            & (wed_niveau[None, :] <= niveau_1e[:, None])
+            & ~(wed_bs2[None, :] & ~heeft_bs2[:, None])
+            & ~(wed_zondag[None, :] & niet_zondag[:, None])
+            & ~(wed_maand[None, :] <= geblesseerd_tm[:, None])
+        )
+        
+        # Geblokkeerde dagen: bit-test per unieke wedstrijddag
+        dagen, dag_van_wed = np.unique([d.toordinal() for d in datums], return_inverse=True)
+        for i, (start, bitmap, _, _) in enumerate(kalender):
+            if bitmap:
+                geblokkeerd = np.array([d >= start and (bitmap >> (d - start)) & 1 == 1 for d in dagen.tolist()])
+                beschikbaar[i] &= ~geblokkeerd[dag_van_wed]
+        
+        # Eigen team speelt in de wedstrijd
+        for j, wed_id in enumerate(wed_ids):
+            for nbb in self.teams.scheidsrechters_in_wedstrijd(wed_id):
+                beschikbaar[positie[nbb], j] = False
+        
+        # Eigen wedstrijd rond het fluiten (zie heeft_eigen_wedstrijd), per eigen team
+        fluit_start = wed_tijd - tijd_us(_EPOCH + AANWEZIG_VOOR)
+        fluit_eind = wed_tijd + tijd_us(_EPOCH + WED_DUUR)
+        team_bezet = {}
+        for team, (starts, max_eind) in self.team_vensters.items():
+            if not starts:
+                continue
+            starts_us = np.array([tijd_us(t) for t in starts], dtype=np.int64)
+            max_eind_us = np.array([tijd_us(t) for t in max_eind], dtype=np.int64)
+            i = np.searchsorted(starts_us, fluit_eind, side="left")
+            team_bezet[team] = (i > 0) & (max_eind_us[np.maximum(i - 1, 0)] > fluit_start)
+        for nbb, teams in self.teams.eigen_teams.items():
+            for team in teams:
+                if team in team_bezet:
+                    beschikbaar[positie[nbb]] &= ~team_bezet[team]
+        
+        return wed_ids, positie, beschikbaar, wed_tijd
+    
+    def _sluit_ingeschreven_uit(self, beschikbaar, positie: dict, wed_tijd):
+        """
+        Zet ingeschreven scheidsrechters uit, plus scheidsrechters die een andere
+        fluitwedstrijd hebben die overlapt (fluitvensters overlappen als de
+        aanvangstijden minder dan 2 uur uit elkaar liggen).
+        """
+        fluit_tijden = {}
+        for j, wed in enumerate(self.wedstrijden.values()):
+            for veld in ("scheids_1", "scheids_2"):
+                nbb = wed.get(veld)
+                if nbb in positie:
+                    beschikbaar[positie[nbb], j] = False
+                    fluit_tijden.setdefault(nbb, set()).add(int(wed_tijd[j]))
+        
+        marge = tijd_us(_EPOCH + WED_DUUR + AANWEZIG_VOOR)
+        for nbb, tijden in fluit_tijden.items():
+            tijden = np.array(sorted(tijden), dtype=np.int64)
+            binnen = (
+                np.searchsorted(tijden, wed_tijd + marge, side="left")
+                - np.searchsorted(tijden, wed_tijd - marge, side="right")
+            )
+            beschikbaar[positie[nbb]] &= ~(binnen > 0)
+    
+    # ------------------------------------------------------------
+    # Dagoverzicht
+    # ------------------------------------------------------------
+    
+    def dag_overzicht(self) -> dict:
+        """
+        Samenvatting per speeldag ("YYYY-MM-DD"), voor alle dagen in één keer:
+        - wedstrijden: thuiswedstrijden van die dag (niet geannuleerd)
+        - pools: poolgrootte van de wedstrijden met een open positie
+        - laagste_pool: kleinste van die pools (None als alles bezet is)
+        - teams_niveau: {eigen team: hoogste niveau} van scheidsrechters die
+          minstens één wedstrijd van die dag kunnen fluiten
+        - teams: die teams, hoogste niveau eerst en dan alfabetisch
+        """
+        if self._dagen is None:
+            self._dagen = self._bereken_dag_overzicht()
+        return self._dagen
+    
+    def _bereken_dag_overzicht(self) -> dict:
+        wed_ids, positie, basis, wed_tijd = self._basis_matrix()
+        pools = self.bereken_pools(True)
+        
+        kolommen_per_dag = {}
+        for j, (wed_id, wed) in enumerate(self.wedstrijden.items()):
+            if wed.get("geannuleerd", False) or wed.get("type") == "uit":
+                continue
+            kolommen_per_dag.setdefault(wed["datum"][:10], []).append(j)
+        
+        kan_fluiten = None
+        if basis is not None:
+            kan_fluiten = basis.copy()
+            self._sluit_overlap_uit(kan_fluiten, positie, wed_tijd)
+        nbbs = list(positie)
+        
+        dagen = {}
+        for dag, kolommen in kolommen_per_dag.items():
+            dag_wed_ids = [wed_ids[j] for j in kolommen]
+            dag_pools = {
+                wed_id: pools[wed_id] for wed_id in dag_wed_ids
+                if not (self.wedstrijden[wed_id].get("scheids_1") and self.wedstrijden[wed_id].get("scheids_2"))
+            }
+            
+            teams_niveau = {}
+            if kan_fluiten is not None:
+                for i in np.flatnonzero(kan_fluiten[:, kolommen].any(axis=1)).tolist():
+                    scheids = self.scheidsrechters[nbbs[i]]
+                    niveau_1e = scheids.get("niveau_1e_scheids", 1)
+                    for team in scheids.get("eigen_teams", []):
+                        teams_niveau[team] = max(teams_niveau.get(team, niveau_1e), niveau_1e)
+            
+            dagen[dag] = {
+                "wedstrijden": dag_wed_ids,
+                "pools": dag_pools,
+                "laagste_pool": min(dag_pools.values()) if dag_pools else None,
+                "teams_niveau": teams_niveau,
+                "teams": [team for team, _ in sorted(teams_niveau.items(), key=lambda x: (-x[1], x[0]))]
+            }
+        return dagen
+    
+    def _sluit_overlap_uit(self, beschikbaar, positie: dict, wed_tijd):
+        """
+        Zet scheidsrechters uit die al voor een andere wedstrijd ingeschreven
+        zijn die overlapt (zoals ToewijzingIndex.heeft_overlap); een inschrijving
+        voor de wedstrijd zelf telt hier niet.
+        """
+        fluit_tijden = {}
+        zelf = {}
+        for j, wed in enumerate(self.wedstrijden.values()):
+            for nbb in {wed.get("scheids_1"), wed.get("scheids_2")}:
+                if nbb in positie:
+                    fluit_tijden.setdefault(nbb, []).append(int(wed_tijd[j]))
+                    zelf.setdefault(nbb, []).append(j)
+        
+        marge = tijd_us(_EPOCH + WED_DUUR + AANWEZIG_VOOR)
+        for nbb, tijden in fluit_tijden.items():
+            tijden = np.array(sorted(tijden), dtype=np.int64)
+            binnen = (
+                np.searchsorted(tijden, wed_tijd + marge, side="left")
+                - np.searchsorted(tijden, wed_tijd - marge, side="right")
+            )
+            binnen[zelf[nbb]] -= 1
+            beschikbaar[positie[nbb]] &= ~(binnen > 0)
+
+
+class OpenLijsten:
+    """
+    Per scheidsrechter de wedstrijden die open staan "voor mij", als 1e en
+    als 2e scheidsrechter: gesorteerde lijsten van (aanvangstijd, wed_id).
+    
+    Zelfde regels als het wedstrijdenoverzicht in de speler view, behalve de
+    tijdsafhankelijke (wedstrijd in het verleden, inschrijfdeadline): die
+    worden bij het tonen gecheckt.
+    - thuiswedstrijd, niet geannuleerd, geen eigen team
+    - positie vrij, niet al ingeschreven op de andere positie
+    - BS2, zondag, eigen wedstrijd, overlap met een andere fluitwedstrijd
+    - 1e: niveau <= eigen niveau; 2e: max 1 niveau hoger, of hoger met MSE als 1e
+    
+    Een lijst wordt pas opgebouwd als hij gevraagd wordt. Bij een gewijzigde
+    positie (werk_bij) wordt alleen die wedstrijd opnieuw beoordeeld; voor de
+    betrokken scheidsrechters vervalt de lijst (overlap kan veranderd zijn).
+    Wijzigingen aan het programma zelf (datum, teams, niveau, ...) of aan
+    een MSE-status maken alle lijsten ongeldig.
+    """
+    
+    def __init__(self, index: "PlanningIndex", toewijzingen: ToewijzingIndex, generatie: int = 0):
+        self.wedstrijden = index.wedstrijden
+        self.scheidsrechters = index.scheidsrechters
+        self.generatie = generatie
+        self.index = index
+        self.toewijzingen = toewijzingen
+        self._lijsten = {}
+        self._wed_bronnen = {wed_id: self._wed_bron(wed) for wed_id, wed in self.wedstrijden.items()}
+        self._scheids_bronnen = {nbb: self._scheids_bron(s) for nbb, s in self.scheidsrechters.items()}
+    
+    @staticmethod
+    def _wed_bron(wed: dict) -> tuple:
+        """(programma, posities) van een wedstrijd; programma-wijzigingen raken alle lijsten"""
+        programma = (wed.get("datum"), wed.get("type"), wed.get("thuisteam"), wed.get("uitteam"),
+                     wed.get("niveau", 1), wed.get("vereist_bs2", False), wed.get("geannuleerd", False),
+                     wed.get("reistijd_minuten"))
+        return programma, (wed.get("scheids_1"), wed.get("scheids_2"))
+    
+    @staticmethod
+    def _scheids_bron(scheids: dict) -> tuple:
+        return (scheids.get("niveau_1e_scheids", 1), scheids.get("bs2_diploma", False),
+                scheids.get("niet_op_zondag", False), tuple(scheids.get("eigen_teams") or []))
+    
+    @staticmethod
+    def is_mse(scheids: dict) -> bool:
+        """MSE-scheidsrechter: niveau 5 of een MSE eigen team"""
+        return (scheids.get("niveau_1e_scheids", 1) == 5
+                or any("MSE" in t.upper() for t in scheids.get("eigen_teams", [])))
+    
+    def _beoordeel(self, nbb_nummer: str, wed_id: str) -> tuple[bool, bool]:
+        """(kan als 1e, kan als 2e) voor één scheidsrechter en wedstrijd"""
+        wed = self.wedstrijden.get(wed_id)
+        scheids = self.scheidsrechters.get(nbb_nummer)
+        if wed is None or scheids is None:
+            return False, False
+        if wed.get("type") == "uit" or wed.get("geannuleerd", False):
+            return False, False
+        
+        scheids_1 = wed.get("scheids_1")
+        scheids_2 = wed.get("scheids_2")
+        if nbb_nummer in (scheids_1, scheids_2):
+            return False, False
+        if scheids_1 is not None and scheids_2 is not None:
+            return False, False
+        if wed.get("vereist_bs2", False) and not scheids.get("bs2_diploma", False):
+            return False, False
+        if self.index.teams.speelt_eigen_team(nbb_nummer, wed_id):
+            return False, False
+        
+        datum = wed_datum(wed)
+        if scheids.get("niet_op_zondag", False) and datum.weekday() == 6:
+            return False, False
+        if self.index.heeft_eigen_wedstrijd(nbb_nummer, datum):
+            return False, False
+        if self.toewijzingen.heeft_overlap(nbb_nummer, wed_id, datum):
+            return False, False
+        
+        wed_niveau = wed.get("niveau", 1)
+        eigen_niveau = scheids.get("niveau_1e_scheids", 1)
+        als_1e = scheids_1 is None and wed_niveau <= eigen_niveau
+        als_2e = scheids_2 is None and (
+            wed_niveau <= min(eigen_niveau + 1, 5)
+            or (scheids_1 is not None and self.is_mse(self.scheidsrechters.get(scheids_1, {})))
+        )
+        return als_1e, als_2e
+    
+    def _lijst(self, nbb_nummer: str) -> tuple:
+        """(open_1e, open_2e, ids_1e, ids_2e) van een scheidsrechter, zo nodig opgebouwd"""
+        lijst = self._lijsten.get(nbb_nummer)
+        if lijst is None:
+            open_1e, open_2e = [], []
+            for wed_id, wed in self.wedstrijden.items():
+                als_1e, als_2e = self._beoordeel(nbb_nummer, wed_id)
+                if als_1e:
+                    open_1e.append((wed_datum(wed), wed_id))
+                if als_2e:
+                    open_2e.append((wed_datum(wed), wed_id))
+            open_1e.sort()
+            open_2e.sort()
+            lijst = (open_1e, open_2e, {w for _, w in open_1e}, {w for _, w in open_2e})
+            self._lijsten[nbb_nummer] = lijst
+        return lijst
+    
+    def open_als_1e(self, nbb_nummer: str) -> list:
+        """Wedstrijd-ID's (op aanvangstijd) waarvoor deze scheidsrechter zich als 1e kan inschrijven"""
+        return [wed_id for _, wed_id in self._lijst(nbb_nummer)[0]]
+    
+    def open_als_2e(self, nbb_nummer: str) -> list:
+        """Wedstrijd-ID's (op aanvangstijd) waarvoor deze scheidsrechter zich als 2e kan inschrijven"""
+        return [wed_id for _, wed_id in self._lijst(nbb_nummer)[1]]
+    
+    def kan_inschrijven(self, nbb_nummer: str, wed_id: str) -> tuple[bool, bool]:
+        """(open als 1e, open als 2e) voor deze wedstrijd, zonder tijd/deadline"""
+        lijst = self._lijst(nbb_nummer)
+        return wed_id in lijst[2], wed_id in lijst[3]
+    
+    def _plaats(self, nbb_nummer: str, wed_id: str):
+        """Beoordeel één wedstrijd opnieuw in een al opgebouwde lijst"""
+        open_1e, open_2e, ids_1e, ids_2e = self._lijsten[nbb_nummer]
+        als_1e, als_2e = self._beoordeel(nbb_nummer, wed_id)
+        for lijst, ids, kan in ((open_1e, ids_1e, als_1e), (open_2e, ids_2e, als_2e)):
+            if wed_id in ids and not kan:
+                ids.discard(wed_id)
+                lijst[:] = [t for t in lijst if t[1] != wed_id]
+            elif kan and wed_id not in ids:
+                ids.add(wed_id)
+                insort(lijst, (wed_datum(self.wedstrijden[wed_id]), wed_id))
+    
+    def werk_bij(self, wed_id: str):
+        """Verwerk een gewijzigde (of verwijderde) wedstrijd; de toewijzingsindex moet al bijgewerkt zijn"""
+        wed = self.wedstrijden.get(wed_id)
+        bron = self._wed_bron(wed) if wed is not None else None
+        oud = self._wed_bronnen.get(wed_id)
+        if bron == oud:
+            return
+        
+        if bron is None or oud is None or bron[0] != oud[0]:
+            # Programma gewijzigd: eigen-wedstrijdvensters van anderen kunnen ook veranderd zijn
+            self._lijsten.clear()
+        else:
+            betrokken = {nbb for nbb in oud[1] + bron[1] if nbb}
+            for nbb in list(self._lijsten):
+                if nbb in betrokken:
+                    del self._lijsten[nbb]
+                else:
+                    self._plaats(nbb, wed_id)
+        
+        if bron is None:
+            self._wed_bronnen.pop(wed_id, None)
+        else:
+            self._wed_bronnen[wed_id] = bron
+    
+    def synchroniseer(self, index: "PlanningIndex", toewijzingen: ToewijzingIndex):
+        """Breng de lijsten in lijn met een nieuwe index (alleen verschillen worden verwerkt)"""
+        self.index = index
+        self.toewijzingen = toewijzingen
+        
+        bronnen = {nbb: self._scheids_bron(s) for nbb, s in self.scheidsrechters.items()}
+        if bronnen != self._scheids_bronnen:
+            mse_oud = {nbb for nbb, b in self._scheids_bronnen.items() if b[0] == 5 or any("MSE" in t.upper() for t in b[3])}
+            mse_nieuw = {nbb for nbb, s in self.scheidsrechters.items() if self.is_mse(s)}
+            if mse_oud != mse_nieuw:
+                self._lijsten.clear()
+            else:
+                for nbb in set(bronnen) | set(self._scheids_bronnen):
+                    if bronnen.get(nbb) != self._scheids_bronnen.get(nbb):
+                        self._lijsten.pop(nbb, None)
+            self._scheids_bronnen = bronnen
+        
+        for wed_id in [w for w in self._wed_bronnen if w not in self.wedstrijden]:
+            self.werk_bij(wed_id)
+        for wed_id in self.wedstrijden:
+            self.werk_bij(wed_id)
+
+
+class GeneratieMemo:
+    """
+    Begrensde LRU-cache voor rekenresultaten, geldig binnen één data-generatie.
+    
+    Bij een andere generatie wordt de cache geleegd. Resultaten die van
+    meegegeven dicts afhangen bewaren die dicts als bronnen: een treffer telt
+    alleen als het precies dezelfde objecten zijn (geen hergebruikte id()).
+    """
+    
+    def __init__(self, max_grootte: int = 512):
+        self.max_grootte = max_grootte
+        self.generatie = None
+        self.treffers = 0
+        self.missers = 0
+        self.invalidaties = 0
+        self._cache = OrderedDict()
+    
+    def haal_op(self, sleutel: tuple, generatie: int, bereken, bronnen: tuple = ()):
+        """Resultaat uit de cache, of bereken(), bewaar en geef het terug"""
+        if generatie != self.generatie:
+            if self._cache:
+                self.invalidaties += 1
+            self._cache.clear()
+            self.generatie = generatie
+        
+        sleutel = (sleutel, tuple(id(bron) for bron in bronnen))
+        item = self._cache.get(sleutel)
+        if item is not None and all(a is b for a, b in zip(item[0], bronnen)):
+            self._cache.move_to_end(sleutel)
+            self.treffers += 1
+            return item[1]
+        
+        self.missers += 1
+        resultaat = bereken()
+        self._cache[sleutel] = (bronnen, resultaat)
+        self._cache.move_to_end(sleutel)
+        while len(self._cache) > self.max_grootte:
+            self._cache.popitem(last=False)
+        return resultaat
+    
+    def leeg(self):
+        """Leeg de cache en zet de statistieken op nul"""
+        self._cache.clear()
+        self.treffers = self.missers = self.invalidaties = 0
+    
+    def statistieken(self) -> dict:
+        """{treffers, missers, hit_ratio, grootte, max_grootte, invalidaties, generatie}"""
+        totaal = self.treffers + self.missers
+        return {
+            "treffers": self.treffers,
+            "missers": self.missers,
+            "hit_ratio": self.treffers / totaal if totaal else 0.0,
+            "grootte": len(self._cache),
+            "max_grootte": self.max_grootte,
+            "invalidaties": self.invalidaties,
+            "generatie": self.generatie
+        }
+
+
+
+class Klassement:
+    """
+    Ranglijst op één score (hoogste eerst, bij gelijke stand op naam).
+    
+    Eén keer gesorteerd; de positie van een speler in de lijst is een
+    dict-lookup, de positie van een score die niet in de lijst staat een
+    bisect op de (oplopend bewaarde, negatieve) scores.
+    """
+    
+    def __init__(self, items: list, veld: str):
+        self.veld = veld
+        self.items = sorted(items, key=lambda item: (-item[veld], item["naam"]))
+        self._posities = {item["nbb"]: i + 1 for i, item in enumerate(self.items)}
+        self._scores = [-item[veld] for item in self.items]
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def top(self, n: int) -> list:
+        """De eerste n items (kopieën)"""
+        return [dict(item) for item in self.items[:n]]
+    
+    def eigen(self, nbb: str) -> dict | None:
+        """{"positie": N, **item} voor een speler in de lijst, anders None"""
+        positie = self._posities.get(nbb)
+        if positie is None:
+            return None
+        return {"positie": positie, **self.items[positie - 1]}
+    
+    def positie_voor_score(self, score) -> int:
+        """Positie voor een score buiten de lijst: 1 + aantal items met een hogere score"""
+        return bisect_left(self._scores, -score) + 1
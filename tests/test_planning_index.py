@@ -0,0 +1,411 @@
+"""
+Tests voor planning_index.py
+BV Waterdragers
+
+De index vervangt checks die per (scheidsrechter, wedstrijd) alle
+wedstrijden doorliepen. Deze tests vergelijken de index met die
+oorspronkelijke per-wedstrijd logica uit app.py (hieronder overgenomen als
+referentie, app.py zelf importeert Streamlit), op vaste randgevallen en op
+willekeurige seizoenen met een vaste seed.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from planning_index import PlanningIndex, TeamResolver, WedstrijdRecord
+
+# ============================================================
+# REFERENTIE (OORSPRONKELIJKE LOGICA UIT APP.PY)
+# ============================================================
+
+def team_match(volledig_team: str, eigen_team: str) -> bool:
+    """Referentie: team_match uit app.py"""
+    if not volledig_team or not eigen_team:
+        return False
+    
+    volledig = str(volledig_team).upper().replace("*", "").strip()
+    eigen = str(eigen_team).upper().replace("*", "").strip()
+    
+    if "WATERDRAGERS" not in volledig:
+        return False
+    
+    return eigen in volledig
+
+def referentie_heeft_eigen_wedstrijd(nbb_nummer: str, datum_tijd: datetime, wedstrijden: dict, scheidsrechters: dict) -> bool:
+    """Referentie: heeft_eigen_wedstrijd uit app.py, vóór de planning index"""
+    scheids = scheidsrechters.get(nbb_nummer, {})
+    eigen_teams = scheids.get("eigen_teams", [])
+    
+    if not eigen_teams:
+        return False
+    
+    for wed_id, wed in wedstrijden.items():
+        is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams)
+        is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams)
+        
+        if wed.get("type") == "uit":
+            is_eigen_wed = is_eigen_thuis
+        else:
+            is_eigen_wed = is_eigen_thuis or is_eigen_uit
+        
+        if not is_eigen_wed:
+            continue
+        
+        wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        wed_duur = timedelta(hours=1, minutes=30)
+        
+        if wed.get("type") == "uit":
+            reistijd = timedelta(minutes=wed.get("reistijd_minuten", 60))
+            wed_start = wed_datum - reistijd
+            wed_eind = wed_datum + wed_duur + reistijd
+        else:
+            wed_start = wed_datum - timedelta(minutes=30)
+            wed_eind = wed_datum + wed_duur
+        
+        fluit_start = datum_tijd - timedelta(minutes=30)
+        fluit_eind = datum_tijd + wed_duur
+        
+        if fluit_start < wed_eind and fluit_eind > wed_start:
+            return True
+    
+    return False
+
+def referentie_heeft_overlappende_fluitwedstrijd(nbb_nummer: str, huidige_wed_id: str, datum_tijd: datetime, wedstrijden: dict) -> bool:
+    """Referentie: heeft_overlappende_fluitwedstrijd uit app.py, vóór de toewijzingsindex"""
+    wed_duur = timedelta(hours=1, minutes=30)
+    aanwezig_voor = timedelta(minutes=30)
+    
+    nieuwe_start = datum_tijd - aanwezig_voor
+    nieuwe_eind = datum_tijd + wed_duur
+    
+    for wed_id, wed in wedstrijden.items():
+        if wed_id == huidige_wed_id:
+            continue
+        
+        if wed.get("scheids_1") != nbb_nummer and wed.get("scheids_2") != nbb_nummer:
+            continue
+        
+        bestaande_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        bestaande_start = bestaande_datum - aanwezig_voor
+        bestaande_eind = bestaande_datum + wed_duur
+        
+        if nieuwe_start < bestaande_eind and nieuwe_eind > bestaande_start:
+            return True
+    
+    return False
+
+def referentie_pool(wed_id: str, wedstrijden: dict, scheidsrechters: dict, negeer_ingeschreven: bool = True) -> int:
+    """Referentie: bereken_pool_voor_wedstrijd uit app.py, vóór de pool-engine"""
+    if wed_id not in wedstrijden:
+        return 0
+    
+    wed = wedstrijden[wed_id]
+    wed_datum = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+    wed_niveau = wed.get("niveau", 1)
+    
+    afgemeld_door = wed.get("afgemeld_door") or []
+    afgemelde_nbbs = [a.get("nbb") if isinstance(a, dict) else a for a in afgemeld_door]
+    
+    pool_count = 0
+    for nbb, scheids in scheidsrechters.items():
+        if scheids.get("uitgesloten_van_pool", False):
+            continue
+        
+        if not negeer_ingeschreven:
+            if wed.get("scheids_1") == nbb or wed.get("scheids_2") == nbb:
+                continue
+        
+        if nbb in afgemelde_nbbs:
+            continue
+        
+        if scheids.get("scheids_status", "Actief") != "Actief":
+            continue
+        
+        niveau_1e = scheids.get("niveau_1e_scheids", 1)
+        
+        if wed.get("vereist_bs2", False) and not scheids.get("bs2_diploma", False):
+            continue
+        
+        if wed_niveau > niveau_1e:
+            continue
+        
+        eigen_teams_scheids = scheids.get("eigen_teams", [])
+        is_eigen_thuis = any(team_match(wed["thuisteam"], et) for et in eigen_teams_scheids)
+        is_eigen_uit = any(team_match(wed["uitteam"], et) for et in eigen_teams_scheids)
+        if is_eigen_thuis or is_eigen_uit:
+            continue
+        
+        if scheids.get("niet_op_zondag", False) and wed_datum.weekday() == 6:
+            continue
+        
+        geblesseerd_tm = scheids.get("geblesseerd_tm", "")
+        if geblesseerd_tm:
+            try:
+                maand_namen = ["januari", "februari", "maart", "april", "mei", "juni",
+                               "juli", "augustus", "september", "oktober", "november", "december"]
+                delen = geblesseerd_tm.split()
+                if len(delen) == 2:
+                    maand_naam, jaar = delen[0].lower(), int(delen[1])
+                    if maand_naam in maand_namen:
+                        blessure_maand = maand_namen.index(maand_naam) + 1
+                        if (wed_datum.year < jaar or
+                            (wed_datum.year == jaar and wed_datum.month <= blessure_maand)):
+                            continue
+            except:
+                pass
+        
+        geblokkeerde_dagen = scheids.get("geblokkeerde_dagen", [])
+        if geblokkeerde_dagen:
+            if wed_datum.strftime("%Y-%m-%d") in geblokkeerde_dagen:
+                continue
+        
+        if referentie_heeft_eigen_wedstrijd(nbb, wed_datum, wedstrijden, scheidsrechters):
+            continue
+        
+        if not negeer_ingeschreven:
+            if referentie_heeft_overlappende_fluitwedstrijd(nbb, wed_id, wed_datum, wedstrijden):
+                continue
+        
+        pool_count += 1
+    
+    return pool_count
+
+# ============================================================
+# TESTDATA
+# ============================================================
+
+# Teamnamen zoals ze uit de wedstrijdimport komen (hoofdletters, sterretjes, andere clubs)
+TEAMNAMEN = [
+    "Waterdragers - M18-1",
+    "Waterdragers - M18-10",
+    "Waterdragers - M18-3**",
+    "Waterdragers - X14-1*",
+    "waterdragers - v16-2",
+    "Waterdragers - MSE-1",
+    "Simple Dribble - M18-1",
+    "Rivalen - X14-1",
+]
+
+# Eigen teams zoals scheidsrechters ze invullen; "M18-1" matcht ook "M18-10"
+EIGEN_TEAMS = ["M18-1", "m18-1", "M18-1*", "M18-10", "M18-3", "X14-1", "V16-2",
+               "MSE-1", "WATERDRAGERS", "Onbekend", ""]
+
+SEIZOEN_START = datetime(2026, 1, 3)
+
+def wedstrijd(datum: str, thuisteam: str, uitteam: str, **velden) -> WedstrijdRecord:
+    """Wedstrijd zoals de loaders hem leveren"""
+    return WedstrijdRecord({"datum": datum, "thuisteam": thuisteam, "uitteam": uitteam, **velden})
+
+def willekeurig_seizoen(seed: int, aantal_wedstrijden: int = 40, aantal_scheidsrechters: int = 25) -> tuple[dict, dict]:
+    """
+    Seizoen met een vaste seed: (wedstrijden, scheidsrechters).
+    Aanvangstijden per kwartier op een handvol dagen, zodat vensters vaak
+    precies tegen elkaar aan liggen.
+    """
+    rnd = random.Random(seed)
+    
+    wedstrijden = {}
+    for i in range(aantal_wedstrijden):
+        aanvang = SEIZOEN_START + timedelta(days=rnd.randrange(0, 15), hours=rnd.randrange(9, 21),
+                                            minutes=rnd.choice([0, 15, 30, 45]))
+        velden = {
+            "type": rnd.choice(["thuis", "thuis", "uit"]),
+            "niveau": rnd.randint(1, 5),
+            "vereist_bs2": rnd.random() < 0.2,
+            "geannuleerd": rnd.random() < 0.15,
+        }
+        if velden["type"] == "uit" and rnd.random() < 0.7:
+            velden["reistijd_minuten"] = rnd.choice([0, 30, 45, 60, 90])
+        thuisteam, uitteam = rnd.sample(TEAMNAMEN, 2)
+        wedstrijden[f"wed_{i}"] = wedstrijd(aanvang.strftime("%Y-%m-%d %H:%M"), thuisteam, uitteam, **velden)
+    
+    scheidsrechters = {}
+    for i in range(aantal_scheidsrechters):
+        scheids = {
+            "naam": f"Scheids {i}",
+            "niveau_1e_scheids": rnd.randint(1, 5),
+            "bs2_diploma": rnd.random() < 0.4,
+            "scheids_status": rnd.choice(["Actief", "Actief", "Actief", "Op te leiden", "Inactief"]),
+            "uitgesloten_van_pool": rnd.random() < 0.1,
+            "niet_op_zondag": rnd.random() < 0.3,
+            "geblesseerd_tm": rnd.choice(["", "", "", "januari 2026", "december 2025", "onzin", "maart abc"]),
+            "geblokkeerde_dagen": [
+                wed["datum"][:10] for wed in rnd.sample(list(wedstrijden.values()), rnd.randint(0, 3))
+            ],
+        }
+        # Een deel zonder eigen team (lege lijst of veld ontbreekt), een deel met meerdere
+        aantal_teams = rnd.choice([0, 1, 1, 2, 3])
+        if aantal_teams or rnd.random() < 0.5:
+            scheids["eigen_teams"] = rnd.sample(EIGEN_TEAMS, aantal_teams)
+        scheidsrechters[f"nbb_{i}"] = scheids
+    
+    # Inschrijvingen en afmeldingen (afgemeld_door als dict of als los NBB-nummer)
+    nbbs = list(scheidsrechters)
+    for wed in wedstrijden.values():
+        if rnd.random() < 0.5:
+            wed["scheids_1"] = rnd.choice(nbbs)
+        if rnd.random() < 0.3:
+            wed["scheids_2"] = rnd.choice(nbbs)
+        if rnd.random() < 0.3:
+            wed["afgemeld_door"] = [
+                {"nbb": nbb} if rnd.random() < 0.5 else nbb
+                for nbb in rnd.sample(nbbs, rnd.randint(1, 2))
+            ]
+    
+    return wedstrijden, scheidsrechters
+
+# ============================================================
+# TEAMRESOLVER EN HEEFT_EIGEN_WEDSTRIJD
+# ============================================================
+
+def test_team_resolver_varianten_teamnaam():
+    wedstrijden = {
+        "w1": wedstrijd("2026-01-10 12:00", "Waterdragers - M18-3**", "Rivalen - M18-1"),
+        "w2": wedstrijd("2026-01-10 14:00", "Simple Dribble - M18-1", "waterdragers - m18-10*"),
+        "w3": wedstrijd("2026-01-10 16:00", "Rivalen - X14-1", "Simple Dribble - M18-3"),
+    }
+    scheidsrechters = {
+        "sterretjes": {"eigen_teams": ["m18-3*"]},
+        "substring": {"eigen_teams": ["M18-1"]},
+        "meerdere": {"eigen_teams": ["M18-3", "M18-10"]},
+        "leeg": {"eigen_teams": []},
+        "geen_veld": {},
+        "lege_naam": {"eigen_teams": [""]},
+    }
+    teams = TeamResolver(wedstrijden, scheidsrechters)
+    
+    assert teams.scheidsrechters_in_wedstrijd("w1") == {"sterretjes", "meerdere"}
+    # "M18-1" zit in "M18-10"; het uitteam telt ook mee
+    assert teams.scheidsrechters_in_wedstrijd("w2") == {"substring", "meerdere"}
+    # Geen Waterdragers team in de wedstrijd
+    assert teams.scheidsrechters_in_wedstrijd("w3") == frozenset()
+    assert teams.teams_in_wedstrijd("w1") == {"m18-3*", "M18-3"}
+
+@pytest.mark.parametrize("seed", range(10))
+def test_team_resolver_volgt_team_match(seed):
+    wedstrijden, scheidsrechters = willekeurig_seizoen(seed)
+    teams = TeamResolver(wedstrijden, scheidsrechters)
+    
+    for wed_id, wed in wedstrijden.items():
+        for nbb, scheids in scheidsrechters.items():
+            eigen_teams = scheids.get("eigen_teams", [])
+            verwacht = (any(team_match(wed["thuisteam"], et) for et in eigen_teams)
+                        or any(team_match(wed["uitteam"], et) for et in eigen_teams))
+            assert teams.speelt_eigen_team(nbb, wed_id) == verwacht, (wed_id, nbb)
+
+@pytest.mark.parametrize("type_wed, reistijd, vroegst, laatst", [
+    # Thuis om 12:00: eigen venster 11:30-13:30, fluiten van t-30 tot t+90
+    ("thuis", None, "10:01", "13:59"),
+    # Uit om 12:00 met 45 min reistijd: eigen venster 11:15-14:15
+    ("uit", 45, "09:46", "14:44"),
+    # Uit zonder reistijd_minuten: standaard 60 min, venster 11:00-14:30
+    ("uit", None, "09:31", "14:59"),
+])
+def test_heeft_eigen_wedstrijd_randen_tijdvenster(type_wed, reistijd, vroegst, laatst):
+    velden = {"type": type_wed}
+    if reistijd is not None:
+        velden["reistijd_minuten"] = reistijd
+    wedstrijden = {"eigen": wedstrijd("2026-01-10 12:00", "Waterdragers - M18-1", "Rivalen - M18-2", **velden)}
+    scheidsrechters = {"speler": {"eigen_teams": ["M18-1"]}}
+    index = PlanningIndex(wedstrijden, scheidsrechters)
+    
+    def fluit_om(tijd: str, minuten: int = 0) -> datetime:
+        return datetime.strptime(f"2026-01-10 {tijd}", "%Y-%m-%d %H:%M") + timedelta(minutes=minuten)
+    
+    for moment, verwacht in [
+        (fluit_om(vroegst, -1), False),
+        (fluit_om(vroegst), True),
+        (fluit_om(laatst), True),
+        (fluit_om(laatst, 1), False),
+    ]:
+        assert index.heeft_eigen_wedstrijd("speler", moment) == verwacht, moment
+        assert referentie_heeft_eigen_wedstrijd("speler", moment, wedstrijden, scheidsrechters) == verwacht, moment
+
+def test_heeft_eigen_wedstrijd_uitwedstrijd_alleen_thuisteam():
+    # Bij een uitwedstrijd is het thuisteam het eigen team; het uitteam telt niet
+    wedstrijden = {"w1": wedstrijd("2026-01-10 12:00", "Rivalen - M18-1", "Waterdragers - M18-1", type="uit")}
+    scheidsrechters = {"speler": {"eigen_teams": ["M18-1"]}}
+    index = PlanningIndex(wedstrijden, scheidsrechters)
+    
+    assert not index.heeft_eigen_wedstrijd("speler", datetime(2026, 1, 10, 12, 0))
+    assert not referentie_heeft_eigen_wedstrijd("speler", datetime(2026, 1, 10, 12, 0), wedstrijden, scheidsrechters)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_heeft_eigen_wedstrijd_volgt_referentie(seed):
+    wedstrijden, scheidsrechters = willekeurig_seizoen(seed)
+    index = PlanningIndex(wedstrijden, scheidsrechters)
+    
+    # Alle aanvangstijden plus momenten net naast de randen van de vensters
+    momenten = set()
+    for wed in wedstrijden.values():
+        aanvang = datetime.strptime(wed["datum"], "%Y-%m-%d %H:%M")
+        for minuten in (-180, -120, -90, 0, 90, 119, 120, 180):
+            momenten.add(aanvang + timedelta(minutes=minuten))
+    
+    for nbb in scheidsrechters:
+        for moment in momenten:
+            verwacht = referentie_heeft_eigen_wedstrijd(nbb, moment, wedstrijden, scheidsrechters)
+            assert index.heeft_eigen_wedstrijd(nbb, moment) == verwacht, (nbb, moment)
+
+# ============================================================
+# POOL-ENGINE (BEREKEN_POOLS)
+# ============================================================
+
+@pytest.mark.parametrize("negeer_ingeschreven", [True, False])
+@pytest.mark.parametrize("seed", range(8))
+def test_bereken_pools_volgt_referentie(seed, negeer_ingeschreven):
+    wedstrijden, scheidsrechters = willekeurig_seizoen(seed)
+    assert any(wed.get("geannuleerd") for wed in wedstrijden.values())
+    
+    pools = PlanningIndex(wedstrijden, scheidsrechters).bereken_pools(negeer_ingeschreven)
+    
+    verwacht = {
+        wed_id: referentie_pool(wed_id, wedstrijden, scheidsrechters, negeer_ingeschreven)
+        for wed_id in wedstrijden
+    }
+    assert pools == verwacht
+
+@pytest.mark.parametrize("negeer_ingeschreven", [True, False])
+def test_bereken_pools_randen_tijdvenster(negeer_ingeschreven):
+    # Fluitwedstrijd om 12:00; eigen wedstrijden en inschrijvingen precies op
+    # en net binnen de grens van het venster (ook geannuleerde wedstrijden tellen mee)
+    wedstrijden = {
+        "fluit": wedstrijd("2026-01-10 12:00", "Waterdragers - M18-2", "Rivalen - M18-2"),
+        # Eigen thuiswedstrijd om 14:00: venster 13:30-15:30, fluiten tot 13:30 -> geen overlap
+        "thuis_rand": wedstrijd("2026-01-10 14:00", "Waterdragers - V16-1", "Rivalen - V16-1"),
+        # Eigen thuiswedstrijd om 13:59 -> net overlap
+        "thuis_binnen": wedstrijd("2026-01-10 13:59", "Waterdragers - X14-1", "Rivalen - X14-1"),
+        # Uitwedstrijd om 15:00 met 30 min reistijd: venster 14:30-17:00 -> geen overlap
+        "uit_rand": wedstrijd("2026-01-10 15:00", "Waterdragers - M18-1", "Rivalen - M18-1",
+                              type="uit", reistijd_minuten=30),
+        # Geannuleerde eigen wedstrijd om 11:00 -> telt (zoals voorheen) toch mee
+        "geannuleerd": wedstrijd("2026-01-10 11:00", "Waterdragers - MSE-1", "Rivalen - MSE-1",
+                                 geannuleerd=True),
+        # Inschrijvingen: precies 2 uur later (geen overlap) en 1:59 eerder (overlap)
+        "fluit_rand": wedstrijd("2026-01-10 14:00", "Rivalen - M22-1", "Rivalen - M22-2", scheids_1="ingeschreven_rand"),
+        "fluit_binnen": wedstrijd("2026-01-10 10:01", "Rivalen - M22-3", "Rivalen - M22-4", scheids_2="ingeschreven_binnen"),
+    }
+    scheidsrechters = {
+        "vrij": {},
+        "thuis_rand": {"eigen_teams": ["V16-1"]},
+        "thuis_binnen": {"eigen_teams": ["X14-1"]},
+        "uit_rand": {"eigen_teams": ["M18-1"]},
+        "geannuleerd": {"eigen_teams": ["MSE-1"]},
+        "ingeschreven_rand": {},
+        "ingeschreven_binnen": {},
+        "eigen_team": {"eigen_teams": ["M18-2"]},
+    }
+    
+    pools = PlanningIndex(wedstrijden, scheidsrechters).bereken_pools(negeer_ingeschreven)
+    
+    beschikbaar = {"vrij", "thuis_rand", "uit_rand", "ingeschreven_rand"}
+    if negeer_ingeschreven:
+        beschikbaar.add("ingeschreven_binnen")
+    assert pools["fluit"] == len(beschikbaar)
+    assert pools["fluit"] == referentie_pool("fluit", wedstrijden, scheidsrechters, negeer_ingeschreven)
+    assert pools == {
+        wed_id: referentie_pool(wed_id, wedstrijden, scheidsrechters, negeer_ingeschreven)
+        for wed_id in wedstrijden
+    }